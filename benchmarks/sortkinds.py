@@ -0,0 +1,72 @@
+"""Compare the sort kinds of numpy on some typical distributions of data.
+
+Run as ``python sortkinds.py [N]``; the times are the best of a few runs,
+in milliseconds, for sorting N elements.
+"""
+import sys
+from timeit import Timer
+
+import numpy as np
+
+N = 10**6
+if len(sys.argv) > 1:
+    N = int(sys.argv[1])
+
+rs = np.random.RandomState(1234)
+
+def nearly_sorted(dtype):
+    a = np.arange(N).astype(dtype)
+    i = rs.randint(0, N, N // 100)
+    a[i] = a[i[::-1]]
+    return a
+
+def runs(dtype):
+    a = rs.randint(0, N, N)
+    return np.concatenate([np.sort(p) for p in np.array_split(a, 16)]
+                          ).astype(dtype)
+
+def time_series(dtype):
+    return (rs.standard_normal(N).cumsum()*100).astype(dtype)
+
+distributions = [
+    ('random int32', lambda: rs.randint(-2**31, 2**31 - 1, N).astype('i4')),
+    ('random int64', lambda: rs.randint(-2**31, 2**31 - 1, N).astype('i8')),
+    ('uint8', lambda: rs.randint(0, 256, N).astype('u1')),
+    ('int16', lambda: rs.randint(-2**15, 2**15, N).astype('i2')),
+    ('small range int64', lambda: rs.randint(0, 1000, N).astype('i8')),
+    ('bool', lambda: rs.randint(0, 2, N).astype('?')),
+    ('sorted int64', lambda: np.arange(N, dtype='i8')),
+    ('reversed int64', lambda: np.arange(N, dtype='i8')[::-1].copy()),
+    ('nearly sorted int64', lambda: nearly_sorted('i8')),
+    ('16 sorted runs int64', lambda: runs('i8')),
+    ('random float64', lambda: rs.rand(N)),
+    ('nearly sorted float64', lambda: nearly_sorted('f8')),
+    ('16 sorted runs float64', lambda: runs('f8')),
+    ('random walk float64', lambda: time_series('f8')),
+    ]
+
+kinds = ['quicksort', 'mergesort', 'heapsort', 'timsort', 'radix']
+
+def best(stmt, a, kind, reps=3):
+    timer = Timer(stmt, 'from __main__ import a, kind, np')
+    globals()['a'] = a
+    globals()['kind'] = kind
+    return min(timer.repeat(reps, 1))*1000
+
+def run(stmt, title):
+    print title
+    print '%-24s' % 'data' + ''.join(['%11s' % k for k in kinds])
+    print '-'*(24 + 11*len(kinds))
+    for name, make in distributions:
+        a = make()
+        line = '%-24s' % name
+        for kind in kinds:
+            try:
+                line += '%11.2f' % best(stmt, a, kind)
+            except TypeError:
+                line += '%11s' % '-'
+        print line
+    print
+
+run('np.sort(a, kind=kind)', 'sort of %d elements (ms)' % N)
+run('a.argsort(kind=kind)', 'argsort of %d elements (ms)' % N)
@@ -284,6 +284,107 @@ add_newdoc('numpy.core', 'broadcast', ('size',
 
     """))
 
+add_newdoc('numpy.core', 'nditer',
+    """
+    nditer(op, flags=None, op_flags=None, op_dtypes=None, order='K',
+           buffersize=0)
+
+    Efficient multi-dimensional iterator over several arrays at once.
+
+    The operands are broadcast against each other, the axes are visited
+    in the order that best follows the memory layout of the operands, and
+    axes which can be traversed as one are coalesced.  Each step of the
+    iteration yields the current inner loop as 1-d arrays.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    op : array_like or sequence of array_like
+        The array(s) to iterate over.  ``None`` entries are allocated with
+        the broadcast shape, laid out like the other operands.
+    flags : sequence of str, optional
+        Flags controlling the iterator.  ``'buffered'`` enables buffering,
+        which is needed for casts and copies aligned, contiguous data of
+        misaligned, byte-swapped or strided operands into buffers.
+    op_flags : sequence of str or sequence of sequences of str, optional
+        Flags for each operand, among ``'readonly'``, ``'writeonly'``,
+        ``'readwrite'``, ``'allocate'`` and ``'contig'`` (the inner loop
+        must be contiguous).  A single sequence applies to all operands.
+        By default, operands are read-only and ``None`` operands are
+        allocated and write-only.
+    op_dtypes : dtype or sequence of dtypes, optional
+        The data types the operands are seen with.  Operands of another
+        data type are cast in buffers.
+    order : {'C', 'F', 'K'}, optional
+        The iteration order.  'K' (default) follows the memory layout of
+        the operands, 'C' and 'F' force C or Fortran order.
+    buffersize : int, optional
+        The number of elements in each buffer, 0 for the default.
+
+    Attributes
+    ----------
+    operands : tuple of ndarray
+        The operands, including the allocated ones.
+    itersize : int
+        The total number of elements visited.
+    ndim : int
+        The number of dimensions iterated over, after coalescing.
+    nop : int
+        The number of operands.
+
+    Notes
+    -----
+    The arrays returned for buffered operands are views of the buffers,
+    which are reused by the next step: copy them to keep their values.
+    Buffers of write operands are written back when the iterator moves
+    on to the next step.
+
+    Examples
+    --------
+    >>> a = np.arange(6).reshape(2, 3)
+    >>> for x in np.nditer(a.T):
+    ...     print x
+    [0 1 2 3 4 5]
+
+    >>> it = np.nditer([a, None])
+    >>> for x, y in it:
+    ...     y[...] = 2*x
+    >>> it.operands[1]
+    array([[ 0,  2,  4],
+           [ 6,  8, 10]])
+
+    >>> it = np.nditer(a, flags=['buffered'], op_dtypes=np.float32,
+    ...                buffersize=4)
+    >>> [x.copy() for x in it]
+    [array([ 0.,  1.,  2.,  3.], dtype=float32), array([ 4.,  5.], dtype=float32)]
+
+    """)
+
+add_newdoc('numpy.core', 'nditer', ('operands',
+    """
+    Tuple of the operands, including the allocated ones.
+
+    """))
+
+add_newdoc('numpy.core', 'nditer', ('itersize',
+    """
+    Total number of elements visited by the iterator.
+
+    """))
+
+add_newdoc('numpy.core', 'nditer', ('ndim',
+    """
+    Number of dimensions iterated over, after coalescing.
+
+    """))
+
+add_newdoc('numpy.core', 'nditer', ('nop',
+    """
+    Number of operands.
+
+    """))
+
 
 ###############################################################################
 #
@@ -413,6 +514,36 @@ add_newdoc('numpy.core.multiarray', 'empty',
 
     """)
 
+add_newdoc('numpy.core.multiarray', 'empty_like',
+    """
+    empty_like(prototype, dtype=None, order='K', subok=True)
+
+    Return a new array with the same shape as a given array, without
+    initializing entries.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    prototype : array_like
+        The shape of `prototype` defines the shape of the returned array.
+    dtype : data-type, optional
+        Overrides the data type of the result.
+    order : {'C', 'F', 'A', 'K'}, optional
+        Memory layout of the result.  'C' and 'F' select C or Fortran
+        order, 'A' selects Fortran order if `prototype` is Fortran
+        contiguous and C order otherwise, and 'K' lays the axes out in the
+        same order as those of `prototype`.
+    subok : bool, optional
+        If True (default), the result has the array subclass of
+        `prototype`, otherwise it is a base-class array.
+
+    See Also
+    --------
+    numpy.empty_like
+
+    """)
+
 
 add_newdoc('numpy.core.multiarray', 'scalar',
     """
@@ -1034,7 +1165,7 @@ add_newdoc('numpy.core.multiarray', 'where',
 
 add_newdoc('numpy.core.multiarray', 'lexsort',
     """
-    lexsort(keys, axis=-1)
+    lexsort(keys, axis=-1, kind='mergesort')
 
     Perform an indirect sort using a sequence of keys.
 
@@ -1054,6 +1185,12 @@ add_newdoc('numpy.core.multiarray', 'lexsort',
         `keys` is a 2D array) is the primary sort key.
     axis : int, optional
         Axis to be indirectly sorted.  By default, sort over the last axis.
+    kind : {'mergesort', 'timsort', 'radix'}, optional
+        Stable sorting algorithm used for each key.  Keys whose type does
+        not support it, such as non-integer keys with 'radix', are sorted
+        with 'mergesort'.  See `sort` for the algorithms.
+
+        .. versionadded:: 2.0
 
     Returns
     -------
@@ -2073,7 +2210,7 @@ add_newdoc('numpy.core.multiarray', 'ndarray', ('__setstate__',
 
 add_newdoc('numpy.core.multiarray', 'ndarray', ('all',
     """
-    a.all(axis=None, out=None)
+    a.all(axis=None, out=None, keepdims=False)
 
     Returns True if all elements evaluate to True.
 
@@ -2088,7 +2225,7 @@ add_newdoc('numpy.core.multiarray', 'ndarray', ('all',
 
 add_newdoc('numpy.core.multiarray', 'ndarray', ('any',
     """
-    a.any(axis=None, out=None)
+    a.any(axis=None, out=None, keepdims=False)
 
     Returns True if any of the elements of `a` evaluate to True.
 
@@ -2146,6 +2283,23 @@ add_newdoc('numpy.core.multiarray', 'ndarray', ('argsort',
     """))
 
 
+add_newdoc('numpy.core.multiarray', 'ndarray', ('argpartition',
+    """
+    a.argpartition(kth, axis=-1, kind='introselect', order=None)
+
+    Returns the indices that would partition this array.
+
+    Refer to `numpy.argpartition` for full documentation.
+
+    .. versionadded:: 2.0
+
+    See Also
+    --------
+    numpy.argpartition : equivalent function
+
+    """))
+
+
 add_newdoc('numpy.core.multiarray', 'ndarray', ('astype',
     """
     a.astype(t)
@@ -2292,11 +2446,16 @@ add_newdoc('numpy.core.multiarray', 'ndarray', ('copy',
 
     Parameters
     ----------
-    order : {'C', 'F', 'A'}, optional
+    order : {'C', 'F', 'A', 'K'}, optional
         By default, the result is stored in C-contiguous (row-major) order in
         memory.  If `order` is `F`, the result has 'Fortran' (column-major)
         order.  If order is 'A' ('Any'), then the result has the same order
-        as the input.
+        as the input.  If order is 'K' ('Keep'), the axes of the result are
+        laid out in memory in the same order as those of the input, which
+        also holds for transposed or otherwise permuted arrays.
+
+        .. versionadded:: 2.0
+           The 'K' order.
 
     Examples
     --------
@@ -2614,7 +2773,7 @@ add_newdoc('numpy.core.multiarray', 'ndarray', ('itemset',
 
 add_newdoc('numpy.core.multiarray', 'ndarray', ('max',
     """
-    a.max(axis=None, out=None)
+    a.max(axis=None, out=None, keepdims=False)
 
     Return the maximum along a given axis.
 
@@ -2629,7 +2788,7 @@ add_newdoc('numpy.core.multiarray', 'ndarray', ('max',
 
 add_newdoc('numpy.core.multiarray', 'ndarray', ('mean',
     """
-    a.mean(axis=None, dtype=None, out=None)
+    a.mean(axis=None, dtype=None, out=None, keepdims=False)
 
     Returns the average of the array elements along given axis.
 
@@ -2644,7 +2803,7 @@ add_newdoc('numpy.core.multiarray', 'ndarray', ('mean',
 
 add_newdoc('numpy.core.multiarray', 'ndarray', ('min',
     """
-    a.min(axis=None, out=None)
+    a.min(axis=None, out=None, keepdims=False)
 
     Return the minimum along a given axis.
 
@@ -2716,7 +2875,7 @@ add_newdoc('numpy.core.multiarray', 'ndarray', ('nonzero',
 
 add_newdoc('numpy.core.multiarray', 'ndarray', ('prod',
     """
-    a.prod(axis=None, dtype=None, out=None)
+    a.prod(axis=None, dtype=None, out=None, keepdims=False)
 
     Return the product of the array elements over the given axis
 
@@ -3091,6 +3250,55 @@ add_newdoc('numpy.core.multiarray', 'ndarray', ('setflags',
     """))
 
 
+add_newdoc('numpy.core.multiarray', 'ndarray', ('partition',
+    """
+    a.partition(kth, axis=-1, kind='introselect', order=None)
+
+    Rearranges the elements in the array in such a way that the element in
+    the kth position is the one that would be there in a sorted array, no
+    element before it is larger and no element after it is smaller. The
+    ordering of the elements in the two partitions is undefined.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    kth : int or sequence of ints
+        Element index to partition by. If provided with a sequence of kth
+        it will put all of them into their sorted position at once.
+    axis : int, optional
+        Axis along which to partition. Default is -1, which means partition
+        along the last axis.
+    kind : {'introselect'}, optional
+        Selection algorithm. Default is 'introselect'.
+    order : list, optional
+        When `a` is an array with fields defined, this argument specifies
+        which fields to compare first, second, etc.  Not all fields need be
+        specified.
+
+    See Also
+    --------
+    numpy.partition : Return a partitioned copy of an array.
+    argpartition : Indirect partition.
+    sort : Full sort.
+
+    Notes
+    -----
+    See ``np.partition`` for notes on the different algorithms.
+
+    Examples
+    --------
+    >>> a = np.array([3, 4, 2, 1])
+    >>> a.partition(3)
+    >>> a[3]
+    4
+    >>> a.partition((0, 1))
+    >>> a[:2]
+    array([1, 2])
+
+    """))
+
+
 add_newdoc('numpy.core.multiarray', 'ndarray', ('sort',
     """
     a.sort(axis=-1, kind='quicksort', order=None)
@@ -3102,7 +3310,7 @@ add_newdoc('numpy.core.multiarray', 'ndarray', ('sort',
     axis : int, optional
         Axis along which to sort. Default is -1, which means sort along the
         last axis.
-    kind : {'quicksort', 'mergesort', 'heapsort'}, optional
+    kind : {'quicksort', 'mergesort', 'heapsort', 'timsort', 'radix'}, optional
         Sorting algorithm. Default is 'quicksort'.
     order : list, optional
         When `a` is an array with fields defined, this argument specifies
@@ -3161,7 +3369,7 @@ add_newdoc('numpy.core.multiarray', 'ndarray', ('squeeze',
 
 add_newdoc('numpy.core.multiarray', 'ndarray', ('std',
     """
-    a.std(axis=None, dtype=None, out=None, ddof=0)
+    a.std(axis=None, dtype=None, out=None, ddof=0, keepdims=False)
 
     Returns the standard deviation of the array elements along given axis.
 
@@ -3176,7 +3384,7 @@ add_newdoc('numpy.core.multiarray', 'ndarray', ('std',
 
 add_newdoc('numpy.core.multiarray', 'ndarray', ('sum',
     """
-    a.sum(axis=None, dtype=None, out=None)
+    a.sum(axis=None, dtype=None, out=None, keepdims=False)
 
     Return the sum of the array elements over the given axis.
 
@@ -3397,7 +3605,7 @@ add_newdoc('numpy.core.multiarray', 'ndarray', ('transpose',
 
 add_newdoc('numpy.core.multiarray', 'ndarray', ('var',
     """
-    a.var(axis=None, dtype=None, out=None, ddof=0)
+    a.var(axis=None, dtype=None, out=None, ddof=0, keepdims=False)
 
     Returns the variance of the array elements, along given axis.
 
@@ -3830,6 +4038,11 @@ add_newdoc('numpy.lib._compiled_base', 'bincount',
     --------
     histogram, digitize, unique
 
+    Notes
+    -----
+    Large inputs are counted in several threads when `setnumthreads`
+    allows it, each thread counting a part of `x` in bins of its own.
+
     Examples
     --------
     >>> np.bincount(np.arange(5))
@@ -4191,7 +4404,7 @@ add_newdoc('numpy.core', 'ufunc', ('types',
 
 add_newdoc('numpy.core', 'ufunc', ('reduce',
     """
-    reduce(a, axis=0, dtype=None, out=None)
+    reduce(a, axis=0, dtype=None, out=None, keepdims=False, where=None)
 
     Reduces `a`'s dimension by one, by applying ufunc along one axis.
 
@@ -4213,8 +4426,16 @@ add_newdoc('numpy.core', 'ufunc', ('reduce',
     ----------
     a : array_like
         The array to act on.
-    axis : int, optional
-        The axis along which to apply the reduction.
+    axis : None or int or tuple of ints, optional
+        The axis or axes along which to apply the reduction. If this is
+        a tuple of ints, the reduction is performed over all of the
+        axes in a single pass, as if they had been flattened into one
+        axis in C order. None reduces over all the axes. Several axes
+        are only allowed for ufuncs whose result does not depend on the
+        order of the values, such as `add` or `maximum`.
+
+        .. versionadded:: 2.0
+           Tuples of axes and None.
     dtype : data-type code, optional
         The type used to represent the intermediate results. Defaults
         to the data-type of the output array if this is provided, or
@@ -4222,6 +4443,19 @@ add_newdoc('numpy.core', 'ufunc', ('reduce',
     out : ndarray, optional
         A location into which the result is stored. If not provided, a
         freshly-allocated array is returned.
+    keepdims : bool, optional
+        If this is set to True, the axes which are reduced are left in
+        the result as dimensions with size one, so that the result
+        broadcasts correctly against `a`. An `out` array must then have
+        this shape too.
+
+        .. versionadded:: 2.0
+    where : array_like of bool, optional
+        A boolean array which is broadcast against `a`, selecting the
+        elements to include in the reduction. Each result starts from
+        the identity of the ufunc, which therefore must have one.
+
+        .. versionadded:: 2.0
 
     Returns
     -------
@@ -4254,6 +4488,19 @@ add_newdoc('numpy.core', 'ufunc', ('reduce',
     array([[ 1,  5],
            [ 9, 13]])
 
+    Several axes can be reduced at once:
+
+    >>> np.add.reduce(X, (0, 2))
+    array([10, 18])
+    >>> np.add.reduce(X, (0, 2), keepdims=True)
+    array([[[10],
+            [18]]])
+
+    Only some elements can be included with a mask:
+
+    >>> np.add.reduce(X, (0, 2), where=(X % 2 == 0))
+    array([4, 8])
+
     """))
 
 add_newdoc('numpy.core', 'ufunc', ('accumulate',
@@ -20,6 +20,7 @@ from function_base import *
 from machar import *
 from getlimits import *
 from shape_base import *
+from expression import *
 del nt
 
 from fromnumeric import amax as max, amin as min, \
@@ -35,6 +36,7 @@ __all__ += function_base.__all__
 __all__ += machar.__all__
 __all__ += getlimits.__all__
 __all__ += shape_base.__all__
+__all__ += expression.__all__
 
 
 from numpy.testing import Tester
@@ -26,6 +26,7 @@ API_FILES = [join('multiarray', 'methods.c'),
              join('multiarray', 'flagsobject.c'),
              join('multiarray', 'descriptor.c'),
              join('multiarray', 'iterators.c'),
+             join('multiarray', 'nditer.c'),
              join('multiarray', 'getset.c'),
              join('multiarray', 'number.c'),
              join('multiarray', 'sequence.c'),
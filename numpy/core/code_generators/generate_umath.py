@@ -588,7 +588,8 @@ defdict = {
 'sqrt' :
     Ufunc(1, 1, None,
           docstrings.get('numpy.core.umath.sqrt'),
-          TD(inexact, f='sqrt'),
+          TD(flts),
+          TD(cmplx, f='sqrt'),
           TD(P, f='sqrt'),
           ),
 'ceil' :
@@ -251,6 +251,24 @@ multiarray_funcs_api = {
     'PyArray_TimedeltaToTimedeltaStruct':   218,
     'PyArray_DatetimeStructToDatetime':     219,
     'PyArray_TimedeltaStructToTimedelta':   220,
+    'NpyIter_New':                          221,
+    'NpyIter_Deallocate':                   222,
+    'NpyIter_Next':                         223,
+    'NpyIter_GetIterSize':                  224,
+    'NpyIter_GetNDim':                      225,
+    'NpyIter_GetNOp':                       226,
+    'NpyIter_GetDataPtrArray':              227,
+    'NpyIter_GetInnerStrideArray':          228,
+    'NpyIter_GetInnerLoopSizePtr':          229,
+    'NpyIter_GetOperandArray':              230,
+    'NpyIter_GetDescrArray':                231,
+    'PyArray_NewLikeArray':                 232,
+    'PyArray_RegisterPartitionFunc':        233,
+    'PyArray_Partition':                    234,
+    'PyArray_ArgPartition':                 235,
+    'PyArray_SelectkindConverter':          236,
+    'PyArray_RegisterSortFunc':             237,
+    'PyArray_LexSortKind':                  238,
 }
 
 ufunc_types_api = {
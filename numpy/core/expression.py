@@ -0,0 +1,521 @@
+"""
+Blockwise evaluation of array expressions.
+
+`evaluate` turns an expression such as ``a*b + c*d - e`` into a chain of
+ufunc calls and runs the whole chain over one block of the operands at
+a time.  The intermediate results only ever hold a block, so they stay
+in the cache and no full-size temporary is created.
+
+"""
+__all__ = ['evaluate']
+
+import sys
+import types
+
+import numeric as _nx
+import umath
+from numeric import asarray, empty, ndarray, ufunc
+
+# Names that are not ufuncs but are understood in expressions
+_aliases = {'abs': 'absolute'}
+
+
+class _Node(object):
+    """A leaf (value) or a ufunc applied to other nodes (ufunc, args).
+
+    The operators build the expression graph instead of computing.
+    """
+    def __init__(self, ufunc=None, args=(), value=None):
+        self.ufunc = ufunc
+        self.args = args
+        self.value = value
+
+    def __nonzero__(self):
+        raise TypeError("the truth value of an array expression is not "
+                        "defined, use the &, | and ~ operators instead of "
+                        "and, or and not")
+
+    __bool__ = __nonzero__
+
+
+def _as_node(x):
+    if isinstance(x, _Node):
+        return x
+    if isinstance(x, _Function):
+        raise TypeError("ufunc %s used without calling it" % x.ufunc.__name__)
+    if not isinstance(x, ndarray):
+        x = asarray(x)
+    return _Node(value=x)
+
+def _unary(ufunc):
+    def op(self):
+        return _Node(ufunc, (self,))
+    return op
+
+def _binary(ufunc):
+    def op(self, other):
+        return _Node(ufunc, (self, _as_node(other)))
+    return op
+
+def _rbinary(ufunc):
+    def op(self, other):
+        return _Node(ufunc, (_as_node(other), self))
+    return op
+
+for _name, _ufunc in [('add', umath.add), ('sub', umath.subtract),
+                      ('mul', umath.multiply), ('div', umath.divide),
+                      ('truediv', umath.true_divide),
+                      ('floordiv', umath.floor_divide),
+                      ('mod', umath.remainder), ('pow', umath.power),
+                      ('and', umath.bitwise_and), ('or', umath.bitwise_or),
+                      ('xor', umath.bitwise_xor),
+                      ('lshift', umath.left_shift),
+                      ('rshift', umath.right_shift)]:
+    setattr(_Node, '__%s__' % _name, _binary(_ufunc))
+    setattr(_Node, '__r%s__' % _name, _rbinary(_ufunc))
+
+for _name, _ufunc in [('lt', umath.less), ('le', umath.less_equal),
+                      ('eq', umath.equal), ('ne', umath.not_equal),
+                      ('gt', umath.greater), ('ge', umath.greater_equal)]:
+    setattr(_Node, '__%s__' % _name, _binary(_ufunc))
+
+for _name, _ufunc in [('neg', umath.negative), ('pos', None),
+                      ('abs', umath.absolute), ('invert', umath.invert)]:
+    if _ufunc is None:
+        setattr(_Node, '__%s__' % _name, lambda self: self)
+    else:
+        setattr(_Node, '__%s__' % _name, _unary(_ufunc))
+
+del _name, _ufunc
+
+
+class _Function(object):
+    """A ufunc called in an expression."""
+    def __init__(self, ufunc):
+        if ufunc.nout != 1:
+            raise ValueError("ufunc %s has more than one output and cannot "
+                             "be used in an expression" % ufunc.__name__)
+        self.ufunc = ufunc
+
+    def __call__(self, *args):
+        if len(args) != self.ufunc.nin:
+            raise TypeError("%s() takes exactly %d arguments (%d given)" %
+                            (self.ufunc.__name__, self.ufunc.nin, len(args)))
+        return _Node(self.ufunc, tuple([_as_node(x) for x in args]))
+
+
+class _Module(object):
+    """A module in an expression, only its ufuncs can be used."""
+    def __init__(self, module):
+        self._module = module
+
+    def __getattr__(self, name):
+        value = getattr(self._module, name)
+        if not isinstance(value, ufunc):
+            raise TypeError("%s.%s is not a ufunc" %
+                            (self._module.__name__, name))
+        return _Function(value)
+
+
+def _lookup(name, local_dict, global_dict):
+    """The value of name, None if it is unknown."""
+    if name in local_dict:
+        return local_dict[name]
+    if name in global_dict:
+        return global_dict[name]
+    value = getattr(umath, _aliases.get(name, name), None)
+    if isinstance(value, ufunc):
+        return value
+    return None
+
+def _symbol(value):
+    """The expression object for a value."""
+    if isinstance(value, ufunc):
+        return _Function(value)
+    if isinstance(value, types.ModuleType):
+        return _Module(value)
+    return _as_node(value)
+
+def _attribute_bases(ex):
+    """The names whose attributes are taken in ex.
+
+    Only attributes of plain names, ufuncs of modules, are allowed.
+    """
+    bases = []
+    try:
+        import ast
+    except ImportError:
+        # Python < 2.6
+        import compiler
+        nodes = [compiler.parse(ex, 'eval')]
+        while nodes:
+            node = nodes.pop()
+            if isinstance(node, compiler.ast.Getattr):
+                if (not isinstance(node.expr, compiler.ast.Name) or
+                        node.attrname.startswith('_')):
+                    raise ValueError("attributes can only be used to "
+                                     "take ufuncs from modules")
+                bases.append(node.expr.name)
+            nodes.extend(node.getChildNodes())
+        return bases
+    for node in ast.walk(ast.parse(ex, mode='eval')):
+        if isinstance(node, ast.Attribute):
+            if (not isinstance(node.value, ast.Name) or
+                    node.attr.startswith('_')):
+                raise ValueError("attributes can only be used to take "
+                                 "ufuncs from modules")
+            bases.append(node.value.id)
+    return bases
+
+_codes = {}
+
+def _compile(ex):
+    """The code of ex and the names whose attributes it takes."""
+    compiled = _codes.get(ex)
+    if compiled is None:
+        # Do not inherit the future statements of this module, so that
+        # division means the same as in the caller
+        code = compile(ex, '<expression>', 'eval', 0, True)
+        compiled = code, _attribute_bases(ex)
+        if len(_codes) > 256:
+            _codes.clear()
+        _codes[ex] = compiled
+    return compiled
+
+def _postorder(root):
+    """The ufunc nodes of the graph, arguments before their users."""
+    order = []
+    seen = {}
+    def visit(node):
+        if node.ufunc is None or id(node) in seen:
+            return
+        seen[id(node)] = None
+        for arg in node.args:
+            visit(arg)
+        order.append(node)
+    visit(root)
+    return order
+
+def _broadcast_shape(shapes):
+    nd = max([len(s) for s in shapes])
+    result = [1]*nd
+    for s in shapes:
+        for i in range(len(s)):
+            j = nd - len(s) + i
+            if result[j] == 1:
+                result[j] = s[i]
+            elif s[i] != 1 and s[i] != result[j]:
+                raise ValueError("shape mismatch: objects cannot be "
+                                 "broadcast to a single shape")
+    return tuple(result)
+
+class _Interface(object):
+    """An object exposing an array interface, which keeps base alive."""
+    def __init__(self, interface, base):
+        self.__array_interface__ = interface
+        self.base = base
+
+def _broadcast_to(a, shape):
+    nd = len(shape) - a.ndim
+    strides = [0]*nd
+    for i in range(a.ndim):
+        if a.shape[i] == shape[nd + i]:
+            strides.append(a.strides[i])
+        else:
+            strides.append(0)
+    interface = dict(a.__array_interface__)
+    interface['shape'] = tuple(shape)
+    interface['strides'] = tuple(strides)
+    return asarray(_Interface(interface, a))
+
+def _byte_bounds(a):
+    """The first byte of a and the byte after its last one."""
+    low = high = a.__array_interface__['data'][0]
+    for n, stride in zip(a.shape, a.strides):
+        if stride < 0:
+            low += (n - 1)*stride
+        else:
+            high += (n - 1)*stride
+    return low, high + a.itemsize
+
+def _may_share_memory(a, b):
+    alow, ahigh = _byte_bounds(a)
+    blow, bhigh = _byte_bounds(b)
+    return alow < bhigh and blow < ahigh
+
+def _blocks(shape, blocksize):
+    """Split shape into blocks of about blocksize elements.
+
+    Returns the indices of the blocks, in C order, and the shape of the
+    largest block.  All but the first axis of a block are full.
+    """
+    inner = 1
+    k = len(shape)
+    while k > 0 and inner*shape[k-1] <= blocksize:
+        k -= 1
+        inner *= shape[k]
+    if k == 0:
+        return [()], shape
+    ax = k - 1
+    step = max(1, blocksize // inner)
+    nouter = 1
+    for n in shape[:ax]:
+        nouter *= n
+    indices = []
+    for i in xrange(nouter):
+        index = []
+        for n in shape[:ax][::-1]:
+            i, j = divmod(i, n)
+            index.append(j)
+        index.reverse()
+        for start in xrange(0, shape[ax], step):
+            indices.append(tuple(index) + (slice(start, start + step),))
+    return indices, (min(step, shape[ax]),) + shape[k:]
+
+
+def evaluate(ex, local_dict=None, global_dict=None, out=None,
+             blocksize=None):
+    """
+    Evaluate an array expression blockwise, without full-size temporaries.
+
+    The expression is turned into the ufunc calls Python would make for
+    it, but instead of running each call over the whole arrays the chain
+    of calls is run over one block of the operands at a time, so that
+    the intermediate results stay small and in the cache.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    ex : str
+        The expression.  It can use the arithmetic, comparison and
+        bitwise operators and call ufuncs, either by name (``sin(a)``) or
+        through a module (``np.sin(a)``).  ``abs`` is `absolute`.  No
+        other attribute can be used.
+    local_dict, global_dict : dict, optional
+        Where the names in `ex` are looked up.  Default to the locals and
+        globals of the caller.  Names found in neither are looked up
+        among the ufuncs of numpy.
+    out : ndarray, optional
+        Array to put the result in.  It must have the broadcast shape of
+        the operands.
+    blocksize : int, optional
+        Number of elements in a block.  Defaults to the ufunc buffer
+        size, see `setbufsize`.
+
+    Returns
+    -------
+    out : ndarray
+        The value of the expression, `out` if it was given.
+
+    See Also
+    --------
+    setbufsize
+
+    Notes
+    -----
+    The result is the same as evaluating the expression with Python
+    operators: the same ufunc loops are used and types are resolved in
+    the same way.  An operation on scalars only is done once, before the
+    arrays are traversed.
+
+    Floating point errors are handled by `seterr` as for every block, so
+    an error callback may be called several times.
+
+    Expressions using subclasses of ndarray are evaluated by Python as
+    usual, without blocks, so that their own operators apply.
+
+    Examples
+    --------
+    >>> a = np.arange(5.)
+    >>> b = np.ones(5)
+    >>> np.evaluate("2*a + b")
+    array([ 1.,  3.,  5.,  7.,  9.])
+    >>> np.evaluate("sin(x)**2 + cos(x)**2", {'x': a})
+    array([ 1.,  1.,  1.,  1.,  1.])
+
+    """
+    frame = sys._getframe(1)
+    if local_dict is None:
+        local_dict = frame.f_locals
+    if global_dict is None:
+        global_dict = frame.f_globals
+    del frame
+    if blocksize is None:
+        blocksize = _nx.getbufsize()
+    if blocksize < 1:
+        raise ValueError("blocksize must be positive")
+
+    code, bases = _compile(ex)
+    values = {}
+    for name in code.co_names:
+        value = _lookup(name, local_dict, global_dict)
+        if value is not None:
+            values[name] = value
+    for name in bases:
+        if name in values and not isinstance(values[name],
+                                             types.ModuleType):
+            raise ValueError("attributes can only be used to take ufuncs "
+                             "from modules, %s is not a module" % name)
+    names = {}
+    for name, value in values.items():
+        if isinstance(value, ndarray) and type(value) is not ndarray:
+            result = eval(code, {'__builtins__': {}}, values)
+            if out is not None:
+                out[...] = result
+                return out
+            return result
+        names[name] = _symbol(value)
+    root = _as_node(eval(code, {'__builtins__': {}}, names))
+
+    order = _postorder(root)
+    leaves = []
+    seen = {}
+    for node in order:
+        for arg in node.args:
+            if (arg.ufunc is None and arg.value.ndim > 0 and
+                    id(arg) not in seen):
+                seen[id(arg)] = None
+                leaves.append(arg)
+
+    # Fold the operations on scalars and find the types of the others
+    # by running them on empty arrays
+    for node in order:
+        probes = []
+        folded = True
+        for arg in node.args:
+            if arg.ufunc is not None:
+                probes.append(arg.probe)
+                folded = False
+            elif arg.value.ndim > 0:
+                probes.append(empty((0,), dtype=arg.value.dtype))
+                folded = False
+            else:
+                probes.append(arg.value)
+        if folded:
+            node.value = asarray(node.ufunc(*probes))
+            node.ufunc = None
+            node.args = ()
+        else:
+            node.probe = node.ufunc(*probes)
+
+    if root.ufunc is None:
+        value = root.value
+        if out is None:
+            return value.copy()
+        out[...] = value
+        return out
+
+    order = [node for node in order if node.ufunc is not None]
+    leaves = [leaf for leaf in leaves if leaf.value.ndim > 0]
+    shape = _broadcast_shape([leaf.value.shape for leaf in leaves])
+    if out is None:
+        fortran = len(shape) > 1
+        for leaf in leaves:
+            value = leaf.value
+            if value.shape != shape or not value.flags.fnc:
+                fortran = False
+        if fortran:
+            result = empty(shape, dtype=root.probe.dtype, order='F')
+        else:
+            result = empty(shape, dtype=root.probe.dtype)
+    else:
+        if _broadcast_shape([shape, out.shape]) != out.shape:
+            raise ValueError("output array has the wrong shape")
+        shape = out.shape
+        fortran = len(shape) > 1 and out.flags.fnc
+        result = out
+        for leaf in leaves:
+            value = leaf.value
+            if _may_share_memory(out, value) and not (
+                    value.shape == out.shape and
+                    value.strides == out.strides and
+                    value.__array_interface__['data'][0] ==
+                    out.__array_interface__['data'][0]):
+                # Blocks of out would overwrite inputs of later blocks
+                result = empty(shape, dtype=root.probe.dtype)
+                fortran = False
+                break
+    if result.size == 0:
+        if out is not None:
+            return out
+        return result
+
+    # The program: a register for every intermediate result, reused as
+    # soon as the last user of the result has run
+    views = []
+    for leaf in leaves:
+        value = leaf.value
+        if value.shape != shape:
+            value = _broadcast_to(value, shape)
+        if fortran:
+            value = value.T
+        views.append(value)
+    target = result
+    if fortran:
+        target = result.T
+        shape = shape[::-1]
+    indices, blockshape = _blocks(shape, blocksize)
+
+    slot = {}
+    for i in range(len(leaves)):
+        slot[id(leaves[i])] = ('leaf', i)
+    users = {}
+    for node in order:
+        for arg in node.args:
+            users[id(arg)] = users.get(id(arg), 0) + 1
+    registers = []
+    free = {}
+    program = []
+    for node in order:
+        args = []
+        for arg in node.args:
+            if arg.ufunc is None and arg.value.ndim == 0:
+                args.append(('const', arg.value))
+                continue
+            kind, n = slot[id(arg)]
+            args.append((kind, n))
+            if kind == 'reg':
+                users[id(arg)] -= 1
+                if users[id(arg)] == 0:
+                    free.setdefault(registers[n].dtype, []).append(n)
+        if node is root:
+            reg = -1
+        else:
+            dtype = node.probe.dtype
+            if free.get(dtype):
+                reg = free[dtype].pop()
+            else:
+                reg = len(registers)
+                registers.append(empty(blockshape, dtype=dtype))
+            slot[id(node)] = ('reg', reg)
+        program.append((node.ufunc, args, reg))
+
+    full = blockshape[:1]
+    for index in indices:
+        blockout = target[index]
+        if blockout.shape[:1] == full:
+            regs = registers
+        else:
+            n = blockout.shape[0]
+            regs = [r[:n] for r in registers]
+        blockin = [v[index] for v in views]
+        for ufunc, args, reg in program:
+            ops = []
+            for kind, n in args:
+                if kind == 'reg':
+                    ops.append(regs[n])
+                elif kind == 'leaf':
+                    ops.append(blockin[n])
+                else:
+                    ops.append(n)
+            if reg < 0:
+                ops.append(blockout)
+            else:
+                ops.append(regs[reg])
+            ufunc(*ops)
+
+    if out is not None and result is not out:
+        out[...] = result
+        return out
+    return result
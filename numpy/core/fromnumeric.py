@@ -3,7 +3,8 @@ __docformat__ = "restructuredtext en"
 
 # functions that are now methods
 __all__ = ['take', 'reshape', 'choose', 'repeat', 'put',
-           'swapaxes', 'transpose', 'sort', 'argsort', 'argmax', 'argmin',
+           'swapaxes', 'transpose', 'sort', 'argsort', 'partition',
+           'argpartition', 'argmax', 'argmin',
            'searchsorted', 'alen',
            'resize', 'diagonal', 'trace', 'ravel', 'nonzero', 'shape',
            'compress', 'clip', 'sum', 'product', 'prod', 'sometrue', 'alltrue',
@@ -41,6 +42,120 @@ def _wrapit(obj, method, *args, **kwds):
         result = wrap(result)
     return result
 
+# reductions over a tuple of axes or keeping the reduced dimensions
+# go straight to ufunc.reduce for base class arrays, which handles both in
+# a single pass; subclasses are reduced with their own methods
+def _reduce(ufunc, a, axis, dtype, out, keepdims, method):
+    arr = asanyarray(a)
+    if type(arr) is not mu.ndarray:
+        if method in ('sum', 'prod'):
+            return _reduce_method(arr, method, axis, out, keepdims,
+                                  dtype=dtype)
+        return _reduce_method(arr, method, axis, out, keepdims)
+    if arr.ndim == 0 and (axis is None or axis == ()):
+        return ufunc.reduce(arr.reshape(1), 0, dtype, out)
+    return ufunc.reduce(arr, axis, dtype, out, keepdims)
+
+def _reduce_method(arr, method, axis, out, keepdims, **kwds):
+    # The methods of subclasses reduce over a single axis or all of them,
+    # so other sets of reduced axes are moved to the end and merged.
+    nd = arr.ndim
+    if axis is None:
+        axis = tuple(range(nd))
+    elif not isinstance(axis, tuple):
+        axis = (axis,)
+    axes = []
+    for ax in axis:
+        ax = int(ax)
+        if ax < 0:
+            ax += nd
+        if ax < 0 or ax >= nd:
+            raise ValueError("axis not in array")
+        if ax in axes:
+            raise ValueError("duplicate value in 'axis'")
+        axes.append(ax)
+    kept = [ax for ax in range(nd) if ax not in axes]
+    if keepdims:
+        keptshape = [1] * nd
+        for ax in kept:
+            keptshape[ax] = arr.shape[ax]
+        result, out = out, None
+    if len(axes) == nd:
+        axis = None
+    elif len(axes) == 1:
+        axis = axes[0]
+    else:
+        n = 1
+        for ax in axes:
+            n *= arr.shape[ax]
+        shape = [arr.shape[ax] for ax in kept]
+        arr = arr.transpose(kept + axes).reshape(shape + [n])
+        axis = -1
+    ret = getattr(arr, method)(axis=axis, out=out, **kwds)
+    if keepdims:
+        if isinstance(ret, mu.ndarray):
+            ret = ret.reshape(keptshape)
+        else:
+            ret = arr.__array_wrap__(asarray(ret).reshape(keptshape))
+        if result is not None:
+            result[...] = ret
+            ret = result
+    return ret
+
+def _count_reduce_items(arr, axis):
+    if axis is None:
+        return arr.size
+    if not isinstance(axis, tuple):
+        axis = (axis,)
+    items = 1
+    for ax in axis:
+        items *= arr.shape[ax]
+    return items
+
+def _mean(a, axis, dtype, out, keepdims):
+    arr = asanyarray(a)
+    if type(arr) is not mu.ndarray:
+        return _reduce_method(arr, 'mean', axis, out, keepdims, dtype=dtype)
+    if dtype is None and issubclass(arr.dtype.type, (nt.integer, nt.bool_)):
+        dtype = mu.dtype('f8')
+    ret = _reduce(um.add, arr, axis, dtype, out, keepdims, 'sum')
+    n = _count_reduce_items(arr, axis)
+    if out is None:
+        return ret / float(n)
+    return um.divide(out, float(n), out)
+
+def _var(a, axis, dtype, out, ddof, keepdims):
+    arr = asanyarray(a)
+    if type(arr) is not mu.ndarray:
+        return _reduce_method(arr, 'var', axis, out, keepdims, dtype=dtype,
+                              ddof=ddof)
+    if dtype is None and issubclass(arr.dtype.type, (nt.integer, nt.bool_)):
+        dtype = mu.dtype('f8')
+    x = arr - _mean(arr, axis, dtype, None, True)
+    if issubclass(x.dtype.type, nt.complexfloating):
+        x = um.multiply(x, um.conjugate(x)).real
+        if dtype is not None and \
+               issubclass(mu.dtype(dtype).type, nt.complexfloating):
+            dtype = x.dtype
+    else:
+        x = um.multiply(x, x)
+    ret = _reduce(um.add, x, axis, dtype, out, keepdims, 'sum')
+    n = _count_reduce_items(arr, axis) - ddof
+    if n == 0:
+        n = 1
+    if out is None:
+        return ret * (1.0 / n)
+    return um.multiply(out, 1.0 / n, out)
+
+def _std(a, axis, dtype, out, ddof, keepdims):
+    arr = asanyarray(a)
+    if type(arr) is not mu.ndarray:
+        return _reduce_method(arr, 'std', axis, out, keepdims, dtype=dtype,
+                              ddof=ddof)
+    ret = _var(arr, axis, dtype, out, ddof, keepdims)
+    if isinstance(ret, mu.ndarray):
+        return um.sqrt(ret, ret)
+    return um.sqrt(ret)
 
 def take(a, indices, axis=None, out=None, mode='raise'):
     """
@@ -486,6 +601,148 @@ def transpose(a, axes=None):
     return transpose(axes)
 
 
+def partition(a, kth, axis=-1, kind='introselect', order=None):
+    """
+    Return a partitioned copy of an array.
+
+    Creates a copy of the array with its elements rearranged in such a way
+    that the element in the kth position is the one that would be there in
+    a sorted array, no element before it is larger and no element after it
+    is smaller. The ordering of the elements in the two partitions is
+    undefined.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    a : array_like
+        Array to be partitioned.
+    kth : int or sequence of ints
+        Element index to partition by. The kth element will be in its
+        final sorted position, with no larger element before it and no
+        smaller element after it. If provided with a sequence of kth it
+        will put all of them into their sorted position at once.
+        Negative indices count from the end of the axis.
+    axis : int or None, optional
+        Axis along which to partition. If None, the array is flattened
+        before partitioning. The default is -1, which partitions along the
+        last axis.
+    kind : {'introselect'}, optional
+        Selection algorithm. Default is 'introselect'.
+    order : list, optional
+        When `a` is a structured array, this argument specifies which fields
+        to compare first, second, and so on.  This list does not need to
+        include all of the fields.
+
+    Returns
+    -------
+    partitioned_array : ndarray
+        Array of the same type and shape as `a`.
+
+    See Also
+    --------
+    ndarray.partition : Method to partition an array in-place.
+    argpartition : Indirect partition.
+    sort : Full sorting.
+
+    Notes
+    -----
+    The 'introselect' algorithm is a quickselect that switches to median
+    of medians pivots when it makes too little progress. Its average and
+    worst case times are both O(n) and it needs no work space. Partitioning
+    by several kth at once costs about as much as by the largest range
+    between two of them.
+
+    Types without a selection function, such as object and structured
+    arrays, are fully sorted instead, which is also a valid partition.
+
+    The order of the elements, including nan, is the one `sort` uses.
+
+    Examples
+    --------
+    >>> a = np.array([7, 1, 9, 3, 5, 8, 2])
+    >>> p = np.partition(a, 3)
+    >>> p[3]
+    5
+    >>> np.all(p[:3] <= 5) and np.all(p[4:] >= 5)
+    True
+
+    The smallest and the largest value at once:
+
+    >>> p = np.partition(a, (0, -1))
+    >>> p[0], p[-1]
+    (1, 9)
+
+    """
+    if axis is None:
+        a = asanyarray(a).flatten()
+        axis = 0
+    else:
+        a = asanyarray(a).copy()
+    a.partition(kth, axis=axis, kind=kind, order=order)
+    return a
+
+
+def argpartition(a, kth, axis=-1, kind='introselect', order=None):
+    """
+    Perform an indirect partition along the given axis using the algorithm
+    specified by the `kind` keyword. It returns an array of indices of the
+    same shape as `a` that index data along the given axis in partitioned
+    order.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    a : array_like
+        Array to partition.
+    kth : int or sequence of ints
+        Element index to partition by. The kth element will be in its
+        final sorted position, with no larger element before it and no
+        smaller element after it. If provided with a sequence of kth it
+        will put all of them into their sorted position at once.
+    axis : int or None, optional
+        Axis along which to partition.  The default is -1 (the last axis).
+        If None, the flattened array is used.
+    kind : {'introselect'}, optional
+        Selection algorithm. Default is 'introselect'.
+    order : list, optional
+        When `a` is an array with fields defined, this argument specifies
+        which fields to compare first, second, etc.  Not all fields need be
+        specified.
+
+    Returns
+    -------
+    index_array : ndarray, int
+        Array of indices that partition `a` along the specified axis.
+        In other words, ``a[index_array]`` yields a partitioned `a`.
+
+    See Also
+    --------
+    partition : Describes partition algorithms used.
+    ndarray.partition : Inplace partition.
+    argsort : Full indirect sort.
+
+    Examples
+    --------
+    >>> x = np.array([7, 1, 9, 3, 5, 8, 2])
+    >>> i = np.argpartition(x, 3)
+    >>> i[3], x[i[3]]
+    (4, 5)
+
+    The indices of the two smallest values:
+
+    >>> np.sort(np.argpartition(x, 1)[:2])
+    array([1, 6])
+
+    """
+    try:
+        argpartition = a.argpartition
+    except AttributeError:
+        return _wrapit(a, 'argpartition', kth, axis, kind, order)
+    return argpartition(kth, axis, kind=kind, order=order)
+
+
 def sort(a, axis=-1, kind='quicksort', order=None):
     """
     Return a sorted copy of an array.
@@ -497,7 +754,7 @@ def sort(a, axis=-1, kind='quicksort', order=None):
     axis : int or None, optional
         Axis along which to sort. If None, the array is flattened before
         sorting. The default is -1, which sorts along the last axis.
-    kind : {'quicksort', 'mergesort', 'heapsort'}, optional
+    kind : {'quicksort', 'mergesort', 'heapsort', 'timsort', 'radix'}, optional
         Sorting algorithm. Default is 'quicksort'.
     order : list, optional
         When `a` is a structured array, this argument specifies which fields
@@ -521,7 +778,7 @@ def sort(a, axis=-1, kind='quicksort', order=None):
     The various sorting algorithms are characterized by their average speed,
     worst case performance, work space size, and whether they are stable. A
     stable sort keeps items with the same key in the same relative
-    order. The three available algorithms have the following
+    order. The five available algorithms have the following
     properties:
 
     =========== ======= ============= ============ =======
@@ -530,8 +787,20 @@ def sort(a, axis=-1, kind='quicksort', order=None):
     'quicksort'    1     O(n^2)            0          no
     'mergesort'    2     O(n*log(n))      ~n/2        yes
     'heapsort'     3     O(n*log(n))       0          no
+    'timsort'      2     O(n*log(n))      ~n/2        yes
+    'radix'        1     O(n*k)            n          yes
     =========== ======= ============= ============ =======
 
+    'timsort' is adaptive: it merges the runs of ascending or descending
+    elements it finds in the data, so sorted, reversed or nearly sorted
+    data, or data made of a few sorted pieces, take close to O(n) time.
+    It is available for the numeric types.
+
+    'radix' is only available for the boolean and integer types. It sorts
+    on the k bytes of the keys, skipping the bytes that are the same in
+    all of them, and is much faster than the comparison sorts for small
+    integer types or a small range of values.
+
     All the sort algorithms make temporary copies of the data when
     sorting along any but the last axis.  Consequently, sorting along
     the last axis is faster and uses less space than sorting along
@@ -609,7 +878,7 @@ def argsort(a, axis=-1, kind='quicksort', order=None):
     axis : int or None, optional
         Axis along which to sort.  The default is -1 (the last axis). If None,
         the flattened array is used.
-    kind : {'quicksort', 'mergesort', 'heapsort'}, optional
+    kind : {'quicksort', 'mergesort', 'heapsort', 'timsort', 'radix'}, optional
         Sorting algorithm.
     order : list, optional
         When `a` is an array with fields defined, this argument specifies
@@ -1345,7 +1614,7 @@ def clip(a, a_min, a_max, out=None):
     return clip(a_min, a_max, out)
 
 
-def sum(a, axis=None, dtype=None, out=None):
+def sum(a, axis=None, dtype=None, out=None, keepdims=False):
     """
     Sum of array elements over a given axis.
 
@@ -1353,9 +1622,15 @@ def sum(a, axis=None, dtype=None, out=None):
     ----------
     a : array_like
         Elements to sum.
-    axis : integer, optional
+    axis : None or int or tuple of ints, optional
         Axis over which the sum is taken. By default `axis` is None,
         and all elements are summed.
+
+        If this is a tuple of ints, the operation is performed on all of
+        the axes specified in the tuple in a single pass.
+
+        .. versionadded:: 2.0
+           Tuples of axes.
     dtype : dtype, optional
         The type of the returned array and of the accumulator in which
         the elements are summed.  By default, the dtype of `a` is used.
@@ -1368,6 +1643,12 @@ def sum(a, axis=None, dtype=None, out=None):
         (the shape of `a` with `axis` removed, i.e.,
         ``numpy.delete(a.shape, axis)``).  Its type is preserved. See
         `doc.ufuncs` (Section "Output arguments") for more details.
+    keepdims : bool, optional
+        If this is set to True, the axes which are reduced are left
+        in the result as dimensions with size one, so that the result
+        broadcasts correctly against the original `a`.
+
+        .. versionadded:: 2.0
 
     Returns
     -------
@@ -1392,6 +1673,11 @@ def sum(a, axis=None, dtype=None, out=None):
     Arithmetic is modular when using integer types, and no error is
     raised on overflow.
 
+    Floating point and complex sums add the elements pairwise in blocks,
+    so the rounding error grows only logarithmically with the number of
+    elements summed along each row.  The result may therefore differ in
+    the last bits from a serial left-to-right sum.
+
     Examples
     --------
     >>> np.sum([0.5, 1.5])
@@ -1417,6 +1703,8 @@ def sum(a, axis=None, dtype=None, out=None):
             out[...] = res
             return out
         return res
+    if isinstance(axis, tuple) or keepdims:
+        return _reduce(um.add, a, axis, dtype, out, keepdims, 'sum')
     try:
         sum = a.sum
     except AttributeError:
@@ -1474,7 +1762,7 @@ def alltrue (a, axis=None, out=None):
     return all(axis, out)
 
 
-def any(a,axis=None, out=None):
+def any(a, axis=None, out=None, keepdims=False):
     """
     Test whether any array element along a given axis evaluates to True.
 
@@ -1484,17 +1772,29 @@ def any(a,axis=None, out=None):
     ----------
     a : array_like
         Input array or object that can be converted to an array.
-    axis : int, optional
+    axis : None or int or tuple of ints, optional
         Axis along which a logical OR is performed.  The default
         (`axis` = `None`) is to perform a logical OR over a flattened
         input array. `axis` may be negative, in which case it counts
         from the last to the first axis.
+
+        If this is a tuple of ints, the operation is performed on all of
+        the axes specified in the tuple in a single pass.
+
+        .. versionadded:: 2.0
+           Tuples of axes.
     out : ndarray, optional
         Alternate output array in which to place the result.  It must have
         the same shape as the expected output and its type is preserved
         (e.g., if it is of type float, then it will remain so, returning
         1.0 for True and 0.0 for False, regardless of the type of `a`).
         See `doc.ufuncs` (Section "Output arguments") for details.
+    keepdims : bool, optional
+        If this is set to True, the axes which are reduced are left
+        in the result as dimensions with size one, so that the result
+        broadcasts correctly against the original `a`.
+
+        .. versionadded:: 2.0
 
     Returns
     -------
@@ -1538,6 +1838,9 @@ def any(a,axis=None, out=None):
     (191614240, 191614240)
 
     """
+    if isinstance(axis, tuple) or keepdims:
+        return _reduce(um.logical_or, a, axis, nt.bool_, out, keepdims,
+                       'any')
     try:
         any = a.any
     except AttributeError:
@@ -1545,7 +1848,7 @@ def any(a,axis=None, out=None):
     return any(axis, out)
 
 
-def all(a,axis=None, out=None):
+def all(a, axis=None, out=None, keepdims=False):
     """
     Test whether all array elements along a given axis evaluate to True.
 
@@ -1553,17 +1856,29 @@ def all(a,axis=None, out=None):
     ----------
     a : array_like
         Input array or object that can be converted to an array.
-    axis : int, optional
+    axis : None or int or tuple of ints, optional
         Axis along which a logical AND is performed.
         The default (`axis` = `None`) is to perform a logical AND
         over a flattened input array.  `axis` may be negative, in which
         case it counts from the last to the first axis.
+
+        If this is a tuple of ints, the operation is performed on all of
+        the axes specified in the tuple in a single pass.
+
+        .. versionadded:: 2.0
+           Tuples of axes.
     out : ndarray, optional
         Alternate output array in which to place the result.
         It must have the same shape as the expected output and its
         type is preserved (e.g., if ``dtype(out)`` is float, the result
         will consist of 0.0's and 1.0's).  See `doc.ufuncs` (Section
         "Output arguments") for more details.
+    keepdims : bool, optional
+        If this is set to True, the axes which are reduced are left
+        in the result as dimensions with size one, so that the result
+        broadcasts correctly against the original `a`.
+
+        .. versionadded:: 2.0
 
     Returns
     -------
@@ -1602,6 +1917,9 @@ def all(a,axis=None, out=None):
     (28293632, 28293632, array([ True], dtype=bool))
 
     """
+    if isinstance(axis, tuple) or keepdims:
+        return _reduce(um.logical_and, a, axis, nt.bool_, out, keepdims,
+                       'all')
     try:
         all = a.all
     except AttributeError:
@@ -1740,7 +2058,7 @@ def ptp(a, axis=None, out=None):
     return ptp(axis, out)
 
 
-def amax(a, axis=None, out=None):
+def amax(a, axis=None, out=None, keepdims=False):
     """
     Return the maximum of an array or maximum along an axis.
 
@@ -1748,12 +2066,24 @@ def amax(a, axis=None, out=None):
     ----------
     a : array_like
         Input data.
-    axis : int, optional
+    axis : None or int or tuple of ints, optional
         Axis along which to operate.  By default flattened input is used.
+
+        If this is a tuple of ints, the operation is performed on all of
+        the axes specified in the tuple in a single pass.
+
+        .. versionadded:: 2.0
+           Tuples of axes.
     out : ndarray, optional
         Alternate output array in which to place the result.  Must be of
         the same shape and buffer length as the expected output.  See
         `doc.ufuncs` (Section "Output arguments") for more details.
+    keepdims : bool, optional
+        If this is set to True, the axes which are reduced are left
+        in the result as dimensions with size one, so that the result
+        broadcasts correctly against the original `a`.
+
+        .. versionadded:: 2.0
 
     Returns
     -------
@@ -1793,6 +2123,8 @@ def amax(a, axis=None, out=None):
     4.0
 
     """
+    if isinstance(axis, tuple) or keepdims:
+        return _reduce(um.maximum, a, axis, None, out, keepdims, 'max')
     try:
         amax = a.max
     except AttributeError:
@@ -1800,7 +2132,7 @@ def amax(a, axis=None, out=None):
     return amax(axis, out)
 
 
-def amin(a, axis=None, out=None):
+def amin(a, axis=None, out=None, keepdims=False):
     """
     Return the minimum of an array or minimum along an axis.
 
@@ -1808,12 +2140,24 @@ def amin(a, axis=None, out=None):
     ----------
     a : array_like
         Input data.
-    axis : int, optional
+    axis : None or int or tuple of ints, optional
         Axis along which to operate.  By default a flattened input is used.
+
+        If this is a tuple of ints, the operation is performed on all of
+        the axes specified in the tuple in a single pass.
+
+        .. versionadded:: 2.0
+           Tuples of axes.
     out : ndarray, optional
         Alternative output array in which to place the result.  Must
         be of the same shape and buffer length as the expected output.
         See `doc.ufuncs` (Section "Output arguments") for more details.
+    keepdims : bool, optional
+        If this is set to True, the axes which are reduced are left
+        in the result as dimensions with size one, so that the result
+        broadcasts correctly against the original `a`.
+
+        .. versionadded:: 2.0
 
     Returns
     -------
@@ -1855,6 +2199,8 @@ def amin(a, axis=None, out=None):
     0.0
 
     """
+    if isinstance(axis, tuple) or keepdims:
+        return _reduce(um.minimum, a, axis, None, out, keepdims, 'min')
     try:
         amin = a.min
     except AttributeError:
@@ -1895,7 +2241,7 @@ def alen(a):
         return len(array(a,ndmin=1))
 
 
-def prod(a, axis=None, dtype=None, out=None):
+def prod(a, axis=None, dtype=None, out=None, keepdims=False):
     """
     Return the product of array elements over a given axis.
 
@@ -1903,9 +2249,15 @@ def prod(a, axis=None, dtype=None, out=None):
     ----------
     a : array_like
         Input data.
-    axis : int, optional
+    axis : None or int or tuple of ints, optional
         Axis over which the product is taken.  By default, the product
         of all elements is calculated.
+
+        If this is a tuple of ints, the operation is performed on all of
+        the axes specified in the tuple in a single pass.
+
+        .. versionadded:: 2.0
+           Tuples of axes.
     dtype : data-type, optional
         The data-type of the returned array, as well as of the accumulator
         in which the elements are multiplied.  By default, if `a` is of
@@ -1916,6 +2268,12 @@ def prod(a, axis=None, dtype=None, out=None):
         Alternative output array in which to place the result. It must have
         the same shape as the expected output, but the type of the
         output values will be cast if necessary.
+    keepdims : bool, optional
+        If this is set to True, the axes which are reduced are left
+        in the result as dimensions with size one, so that the result
+        broadcasts correctly against the original `a`.
+
+        .. versionadded:: 2.0
 
     Returns
     -------
@@ -1969,6 +2327,8 @@ def prod(a, axis=None, dtype=None, out=None):
     True
 
     """
+    if isinstance(axis, tuple) or keepdims:
+        return _reduce(um.multiply, a, axis, dtype, out, keepdims, 'prod')
     try:
         prod = a.prod
     except AttributeError:
@@ -2263,7 +2623,7 @@ def round_(a, decimals=0, out=None):
     return round(decimals, out)
 
 
-def mean(a, axis=None, dtype=None, out=None):
+def mean(a, axis=None, dtype=None, out=None, keepdims=False):
     """
     Compute the arithmetic mean along the specified axis.
 
@@ -2276,9 +2636,15 @@ def mean(a, axis=None, dtype=None, out=None):
     a : array_like
         Array containing numbers whose mean is desired. If `a` is not an
         array, a conversion is attempted.
-    axis : int, optional
+    axis : None or int or tuple of ints, optional
         Axis along which the means are computed. The default is to compute
         the mean of the flattened array.
+
+        If this is a tuple of ints, the operation is performed on all of
+        the axes specified in the tuple in a single pass.
+
+        .. versionadded:: 2.0
+           Tuples of axes.
     dtype : data-type, optional
         Type to use in computing the mean.  For integer inputs, the default
         is `float64`; for floating point inputs, it is the same as the
@@ -2288,6 +2654,12 @@ def mean(a, axis=None, dtype=None, out=None):
         is ``None``; if provided, it must have the same shape as the
         expected output, but the type will be cast if necessary.
         See `doc.ufuncs` for details.
+    keepdims : bool, optional
+        If this is set to True, the axes which are reduced are left
+        in the result as dimensions with size one, so that the result
+        broadcasts correctly against the original `a`.
+
+        .. versionadded:: 2.0
 
     Returns
     -------
@@ -2334,6 +2706,8 @@ def mean(a, axis=None, dtype=None, out=None):
     0.55000000074505806
 
     """
+    if isinstance(axis, tuple) or keepdims:
+        return _mean(a, axis, dtype, out, keepdims)
     try:
         mean = a.mean
     except AttributeError:
@@ -2341,7 +2715,7 @@ def mean(a, axis=None, dtype=None, out=None):
     return mean(axis, dtype, out)
 
 
-def std(a, axis=None, dtype=None, out=None, ddof=0):
+def std(a, axis=None, dtype=None, out=None, ddof=0, keepdims=False):
     """
     Compute the standard deviation along the specified axis.
 
@@ -2353,9 +2727,15 @@ def std(a, axis=None, dtype=None, out=None, ddof=0):
     ----------
     a : array_like
         Calculate the standard deviation of these values.
-    axis : int, optional
+    axis : None or int or tuple of ints, optional
         Axis along which the standard deviation is computed. The default is
         to compute the standard deviation of the flattened array.
+
+        If this is a tuple of ints, the operation is performed on all of
+        the axes specified in the tuple in a single pass.
+
+        .. versionadded:: 2.0
+           Tuples of axes.
     dtype : dtype, optional
         Type to use in computing the standard deviation. For arrays of
         integer type the default is float64, for arrays of float types it is
@@ -2368,6 +2748,12 @@ def std(a, axis=None, dtype=None, out=None, ddof=0):
         Means Delta Degrees of Freedom.  The divisor used in calculations
         is ``N - ddof``, where ``N`` represents the number of elements.
         By default `ddof` is zero.
+    keepdims : bool, optional
+        If this is set to True, the axes which are reduced are left
+        in the result as dimensions with size one, so that the result
+        broadcasts correctly against the original `a`.
+
+        .. versionadded:: 2.0
 
     Returns
     -------
@@ -2427,6 +2813,8 @@ def std(a, axis=None, dtype=None, out=None, ddof=0):
     0.44999999925552653
 
     """
+    if isinstance(axis, tuple) or keepdims:
+        return _std(a, axis, dtype, out, ddof, keepdims)
     try:
         std = a.std
     except AttributeError:
@@ -2434,7 +2822,7 @@ def std(a, axis=None, dtype=None, out=None, ddof=0):
     return std(axis, dtype, out, ddof)
 
 
-def var(a, axis=None, dtype=None, out=None, ddof=0):
+def var(a, axis=None, dtype=None, out=None, ddof=0, keepdims=False):
     """
     Compute the variance along the specified axis.
 
@@ -2447,9 +2835,15 @@ def var(a, axis=None, dtype=None, out=None, ddof=0):
     a : array_like
         Array containing numbers whose variance is desired.  If `a` is not an
         array, a conversion is attempted.
-    axis : int, optional
+    axis : None or int or tuple of ints, optional
         Axis along which the variance is computed.  The default is to compute
         the variance of the flattened array.
+
+        If this is a tuple of ints, the operation is performed on all of
+        the axes specified in the tuple in a single pass.
+
+        .. versionadded:: 2.0
+           Tuples of axes.
     dtype : data-type, optional
         Type to use in computing the variance.  For arrays of integer type
         the default is `float32`; for arrays of float types it is the same as
@@ -2462,6 +2856,12 @@ def var(a, axis=None, dtype=None, out=None, ddof=0):
         "Delta Degrees of Freedom": the divisor used in the calculation is
         ``N - ddof``, where ``N`` represents the number of elements. By
         default `ddof` is zero.
+    keepdims : bool, optional
+        If this is set to True, the axes which are reduced are left
+        in the result as dimensions with size one, so that the result
+        broadcasts correctly against the original `a`.
+
+        .. versionadded:: 2.0
 
     Returns
     -------
@@ -2522,6 +2922,8 @@ def var(a, axis=None, dtype=None, out=None, ddof=0):
     0.20250000000000001
 
     """
+    if isinstance(axis, tuple) or keepdims:
+        return _var(a, axis, dtype, out, ddof, keepdims)
     try:
         var = a.var
     except AttributeError:
@@ -149,9 +149,22 @@ enum NPY_TYPECHAR { NPY_BOOLLTR = '?',
 typedef enum {
         NPY_QUICKSORT=0,
         NPY_HEAPSORT=1,
-        NPY_MERGESORT=2
+        NPY_MERGESORT=2,
+        NPY_RADIXSORT=3,
+        NPY_TIMSORT=4
 } NPY_SORTKIND;
+/*
+ * The number of sort kinds in the ArrFuncs tables.  The kinds after
+ * NPY_MERGESORT are registered with PyArray_RegisterSortFunc instead.
+ */
 #define NPY_NSORTS (NPY_MERGESORT + 1)
+#define NPY_NSORTKINDS (NPY_TIMSORT + 1)
+
+
+typedef enum {
+        NPY_INTROSELECT=0
+} NPY_SELECTKIND;
+#define NPY_NSELECTS (NPY_INTROSELECT + 1)
 
 
 typedef enum {
@@ -175,7 +188,8 @@ typedef enum {
 typedef enum {
         NPY_ANYORDER=-1,
         NPY_CORDER=0,
-        NPY_FORTRANORDER=1
+        NPY_FORTRANORDER=1,
+        NPY_KEEPORDER=2
 } NPY_ORDER;
 
 
@@ -368,6 +382,9 @@ typedef int (PyArray_FillFunc)(void *, npy_intp, void *);
 
 typedef int (PyArray_SortFunc)(void *, npy_intp, void *);
 typedef int (PyArray_ArgSortFunc)(void *, npy_intp *, npy_intp, void *);
+typedef int (PyArray_PartitionFunc)(void *, npy_intp, npy_intp, void *);
+typedef int (PyArray_ArgPartitionFunc)(void *, npy_intp *, npy_intp, npy_intp,
+                                       void *);
 
 typedef int (PyArray_FillWithScalarFunc)(void *, npy_intp, void *, void *);
 
@@ -1165,6 +1182,24 @@ PyArrayNeighborhoodIter_Next2D(PyArrayNeighborhoodIterObject* iter);
 #include "_neighborhood_iterator_imp.h"
 #undef _NPY_INCLUDE_NEIGHBORHOOD_IMP
 
+/*
+ * Multi-operand iterator.  The structure is opaque, use the NpyIter_*
+ * functions to create, advance and query it.
+ */
+typedef struct NpyIter_InternalOnly NpyIter;
+
+/* Global flags passed to NpyIter_New */
+#define NPY_ITER_BUFFERED          0x0001  /* buffer and cast in chunks */
+#define NPY_ITER_C_ORDER           0x0002  /* iterate in C order */
+#define NPY_ITER_F_ORDER           0x0004  /* iterate in Fortran order */
+
+/* Per-operand flags passed to NpyIter_New */
+#define NPY_ITER_READONLY          0x0001
+#define NPY_ITER_WRITEONLY         0x0002
+#define NPY_ITER_READWRITE         (NPY_ITER_READONLY | NPY_ITER_WRITEONLY)
+#define NPY_ITER_ALLOCATE          0x0004  /* allocate NULL operands */
+#define NPY_ITER_CONTIG            0x0008  /* inner stride is the itemsize */
+
 /* The default array type */
 #define NPY_DEFAULT_TYPE NPY_DOUBLE
 #define PyArray_DEFAULT NPY_DEFAULT_TYPE
@@ -140,6 +140,7 @@
 #define PyArray_ANYORDER     NPY_ANYORDER
 #define PyArray_CORDER       NPY_CORDER
 #define PyArray_FORTRANORDER NPY_FORTRANORDER
+#define PyArray_KEEPORDER    NPY_KEEPORDER
 #define PyArray_ORDER        NPY_ORDER
 
 #define PyDescr_ISBOOL      PyDataType_ISBOOL
@@ -145,6 +145,18 @@ typedef struct {
         npy_intp *core_dim_sizes;   /* stores sizes of core dimensions;
                                        contains 1 + core_num_dim_ix elements */
         npy_intp *core_strides;     /* strides of loop and core dimensions */
+
+        /* where= mask: the loop only runs on elements where it is True */
+        PyArrayObject *where;
+        PyArrayIterObject *maskit;  /* walks the mask unless ONE_UFUNCLOOP */
+        npy_intp maskstep;          /* stride of the mask in the inner loop */
+
+        /* order= layout: the loop axes from slowest to fastest varying */
+        NPY_ORDER order;
+        int perm[NPY_MAXDIMS];
+
+        /* Walks the operands of an ITER_UFUNCLOOP, buffering as needed */
+        NpyIter *iter;
 } PyUFuncLoopObject;
 
 /* Could make this more clever someday */
@@ -193,6 +205,8 @@ typedef struct {
         int obj;
         int retbase;
 
+        /* Reads the input of a buffered reduce or accumulate */
+        NpyIter *iter;
 } PyUFuncReduceObject;
 
 
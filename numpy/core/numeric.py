@@ -1,6 +1,6 @@
 __all__ = ['newaxis', 'ndarray', 'flatiter', 'ufunc',
-           'arange', 'array', 'zeros', 'empty', 'broadcast', 'dtype',
-           'fromstring', 'fromfile', 'frombuffer',
+           'arange', 'array', 'zeros', 'empty', 'broadcast', 'nditer',
+           'dtype', 'fromstring', 'fromfile', 'frombuffer',
            'int_asbuffer', 'where', 'argwhere',
            'concatenate', 'fastCopyAndTranspose', 'lexsort',
            'set_numeric_ops', 'can_cast',
@@ -16,6 +16,8 @@ __all__ = ['newaxis', 'ndarray', 'flatiter', 'ufunc',
            'load', 'loads', 'isscalar', 'binary_repr', 'base_repr',
            'ones', 'identity', 'allclose', 'compare_chararrays', 'putmask',
            'seterr', 'geterr', 'setbufsize', 'getbufsize',
+           'setnumthreads', 'getnumthreads', 'setthreadthreshold',
+           'getthreadthreshold',
            'seterrcall', 'geterrcall', 'errstate', 'flatnonzero',
            'Inf', 'inf', 'infty', 'Infinity',
            'nan', 'NaN', 'False_', 'True_', 'bitwise_not',
@@ -55,12 +57,13 @@ BUFSIZE = multiarray.BUFSIZE
 ndarray = multiarray.ndarray
 flatiter = multiarray.flatiter
 broadcast = multiarray.broadcast
+nditer = multiarray.nditer
 dtype = multiarray.dtype
 ufunc = type(sin)
 
 
 # originally from Fernando Perez's IPython
-def zeros_like(a):
+def zeros_like(a, order='K'):
     """
     Return an array of zeros with the same shape and type as a given array.
 
@@ -71,6 +74,13 @@ def zeros_like(a):
     a : array_like
         The shape and data-type of `a` define these same attributes of
         the returned array.
+    order : {'C', 'F', 'A', 'K'}, optional
+        Memory layout of the result.  'C' and 'F' select C or Fortran
+        order, 'A' selects Fortran order if `a` is Fortran contiguous and
+        C order otherwise, and 'K' (default) matches the layout of `a` as
+        closely as possible.
+
+        .. versionadded:: 2.0
 
     Returns
     -------
@@ -104,7 +114,7 @@ def zeros_like(a):
 
     """
     if isinstance(a, ndarray):
-        res = ndarray.__new__(type(a), a.shape, a.dtype, order=a.flags.fnc)
+        res = multiarray.empty_like(a, order=order)
         res.fill(0)
         return res
     try:
@@ -112,12 +122,12 @@ def zeros_like(a):
     except AttributeError:
         wrap = None
     a = asarray(a)
-    res = zeros(a.shape, a.dtype)
+    res = zeros(a.shape, a.dtype, order=(order == 'F' and 'F' or 'C'))
     if wrap:
         res = wrap(res)
     return res
 
-def empty_like(a):
+def empty_like(a, order='K'):
     """
     Return a new array with the same shape and type as a given array.
 
@@ -126,6 +136,13 @@ def empty_like(a):
     a : array_like
         The shape and data-type of `a` define these same attributes of the
         returned array.
+    order : {'C', 'F', 'A', 'K'}, optional
+        Memory layout of the result.  'C' and 'F' select C or Fortran
+        order, 'A' selects Fortran order if `a` is Fortran contiguous and
+        C order otherwise, and 'K' (default) matches the layout of `a` as
+        closely as possible.
+
+        .. versionadded:: 2.0
 
     Returns
     -------
@@ -159,14 +176,13 @@ def empty_like(a):
 
     """
     if isinstance(a, ndarray):
-        res = ndarray.__new__(type(a), a.shape, a.dtype, order=a.flags.fnc)
-        return res
+        return multiarray.empty_like(a, order=order)
     try:
         wrap = a.__array_wrap__
     except AttributeError:
         wrap = None
     a = asarray(a)
-    res = empty(a.shape, a.dtype)
+    res = multiarray.empty_like(a, order=order, subok=False)
     if wrap:
         res = wrap(res)
     return res
@@ -2252,6 +2268,97 @@ def getbufsize():
     """
     return umath.geterrobj()[0]
 
+def setnumthreads(nthreads):
+    """
+    Set the number of threads used to evaluate large ufuncs.
+
+    Elementwise ufunc calls and reductions over at least
+    `getthreadthreshold` elements are split into `nthreads` pieces that
+    run concurrently.  The default of 1 runs everything in the calling
+    thread.  The setting is shared by all threads of the process.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    nthreads : int
+        Number of threads, at least 1.
+
+    Returns
+    -------
+    old : int
+        The previous number of threads.
+
+    See Also
+    --------
+    getnumthreads, setthreadthreshold
+
+    Notes
+    -----
+    Only loops that work on the operands in place are split: object
+    arrays and operands that need casting or byte swapping through the
+    ufunc buffers are always handled by the calling thread, as are
+    outputs that partially overlap an input.  The pieces may finish in
+    any order, so floating point errors are reported once for the whole
+    call.  Threading is not available on platforms without POSIX
+    threads, where this setting has no effect.
+
+    A reduction is split between its output elements.  When there are
+    fewer of them than threads, as for ``x.sum()``, the values reduced
+    into each element are split instead if the ufunc is associative and
+    commutative and has an identity (add, multiply and the logical and
+    bitwise and/or).  The partial results are then combined in order, so
+    floating point sums may differ from serial ones by rounding.
+
+    Examples
+    --------
+    >>> old = np.setnumthreads(4)
+    >>> np.getnumthreads()
+    4
+    >>> np.setnumthreads(old)
+    4
+
+    """
+    old, threshold = umath.getthreads()
+    umath.setthreads(nthreads, threshold)
+    return old
+
+def getnumthreads():
+    """Return the number of threads used to evaluate large ufuncs.
+    """
+    return umath.getthreads()[0]
+
+def setthreadthreshold(size):
+    """
+    Set the number of elements from which ufuncs use several threads.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    size : int
+        Minimum number of elements a ufunc call or reduction must
+        process before it is split between threads.
+
+    Returns
+    -------
+    old : int
+        The previous threshold.
+
+    See Also
+    --------
+    setnumthreads, getthreadthreshold
+
+    """
+    nthreads, old = umath.getthreads()
+    umath.setthreads(nthreads, size)
+    return old
+
+def getthreadthreshold():
+    """Return the number of elements from which ufuncs use several threads.
+    """
+    return umath.getthreads()[1]
+
 def seterrcall(func):
     """
     Set the floating-point error callback function or log object.
@@ -16,7 +16,8 @@ from code_generators.generate_ufunc_api import \
      do_generate_api as nowrap_do_generate_ufunc_api
 from setup_common import check_api_version as _check_api_version
 from setup_common import \
-        LONG_DOUBLE_REPRESENTATION_SRC, pyod, long_double_representation
+        LONG_DOUBLE_REPRESENTATION_SRC, pyod, long_double_representation, \
+        AVX_TARGET_ATTRIBUTE_SRC
 
 from numscons.numdist import process_c_str as process_str
 
@@ -237,6 +238,12 @@ static %(inline)s int static_func (void)
         context.Result(0)
     return inline
 
+def CheckAttributeTargetAVX(context):
+    context.Message("Checking for AVX functions with run time detection ... ")
+    st = context.TryLink(AVX_TARGET_ATTRIBUTE_SRC, '.c')
+    context.Result(st)
+    return st == 1
+
 def CheckLongDoubleRepresentation(context):
     msg = {
         'INTEL_EXTENDED_12_BYTES_LE': "Intel extended, little endian",
@@ -410,6 +410,17 @@ def configuration(parent_package='',top_path=None):
             if is_npy_no_signal():
                 moredefs.append('__NPY_PRIVATE_NO_SIGNAL')
 
+            # Backtrace check, used to find who calls the number protocol
+            if config_cmd.check_header('execinfo.h') and \
+                    config_cmd.check_header('dlfcn.h') and \
+                    config_cmd.check_func('backtrace',
+                                          headers=['execinfo.h']):
+                moredefs.append(('HAVE_BACKTRACE', 1))
+
+            # AVX check, used to select the umath loops at run time
+            if config_cmd.try_link(AVX_TARGET_ATTRIBUTE_SRC):
+                moredefs.append(('HAVE_ATTRIBUTE_TARGET_AVX', 1))
+
             # Windows checks
             if sys.platform=='win32' or os.name=='nt':
                 win32_checks(moredefs)
@@ -734,6 +745,7 @@ def configuration(parent_package='',top_path=None):
         join('src', 'multiarray', 'flagsobject.c'),
         join('src', 'multiarray', 'descriptor.c'),
         join('src', 'multiarray', 'iterators.c'),
+        join('src', 'multiarray', 'nditer.c'),
         join('src', 'multiarray', 'mapping.c'),
         join('src', 'multiarray', 'number.c'),
         join('src', 'multiarray', 'getset.c'),
@@ -757,8 +769,10 @@ def configuration(parent_package='',top_path=None):
 
     umath_src = [join('src', 'umath', 'umathmodule.c.src'),
             join('src', 'umath', 'funcs.inc.src'),
+            join('src', 'umath', 'simd.inc.src'),
             join('src', 'umath', 'loops.c.src'),
-            join('src', 'umath', 'ufunc_object.c')]
+            join('src', 'umath', 'ufunc_object.c'),
+            join('src', 'umath', 'ufunc_threads.c')]
 
     umath_deps = [generate_umath_py,
             join(codegen_dir,'generate_ufunc_api.py')]
@@ -772,6 +786,7 @@ def configuration(parent_package='',top_path=None):
         umath_src = [join('src', 'umath', 'umathmodule_onefile.c')]
         umath_src.append(generate_umath_templated_sources)
         umath_src.append(join('src', 'umath', 'funcs.inc.src'))
+        umath_src.append(join('src', 'umath', 'simd.inc.src'))
 
     config.add_extension('multiarray',
                          sources = multiarray_src +
@@ -799,6 +814,7 @@ def configuration(parent_package='',top_path=None):
                                   generate_numpyconfig_h,
                                   generate_numpy_api,
                                   generate_ufunc_api],
+                         libraries=['npymath'],
                          )
 
     # Configure blasdot
@@ -824,7 +840,8 @@ def configuration(parent_package='',top_path=None):
                     sources = [join('src','umath', 'umath_tests.c.src')])
 
     config.add_extension('multiarray_tests',
-                    sources = [join('src', 'multiarray', 'multiarray_tests.c.src')])
+                    sources = [join('src', 'multiarray', 'multiarray_tests.c.src'),
+                               generate_config_h])
 
     config.add_data_dir('tests')
     config.add_data_dir('tests/data')
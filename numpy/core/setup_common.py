@@ -29,7 +29,7 @@ C_ABI_VERSION = 0x02000000
 # without breaking binary compatibility.  In this case, only the C_API_VERSION
 # (*not* C_ABI_VERSION) would be increased.  Whenever binary compatibility is
 # broken, both C_API_VERSION and C_ABI_VERSION should be increased.
-C_API_VERSION = 0x00000005
+C_API_VERSION = 0x00000006
 
 class MismatchCAPIWarning(Warning):
     pass
@@ -125,6 +125,30 @@ def type2def(symbol):
     define = symbol.replace(' ', '_')
     return define.upper()
 
+# Code which builds only if the compiler can generate AVX code for a single
+# function and detect at run time whether the processor supports it.  The
+# umath loops use it to pick their AVX versions when the module is imported.
+AVX_TARGET_ATTRIBUTE_SRC = r"""
+#include <immintrin.h>
+
+__attribute__((target("avx"))) static int
+f(void)
+{
+    __m256d a = _mm256_set1_pd(1.0);
+    return _mm256_movemask_pd(_mm256_cmp_pd(a, a, _CMP_EQ_OQ));
+}
+
+int
+main(void)
+{
+    __builtin_cpu_init();
+    if (__builtin_cpu_supports("avx")) {
+        return f() != 15;
+    }
+    return 0;
+}
+"""
+
 # Code to detect long double representation taken from MPFR m4 macro
 def check_long_double_representation(cmd):
     cmd._check_compiler()
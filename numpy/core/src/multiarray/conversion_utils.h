@@ -22,6 +22,9 @@ PyArray_ByteorderConverter(PyObject *obj, char *endian);
 NPY_NO_EXPORT int
 PyArray_SortkindConverter(PyObject *obj, NPY_SORTKIND *sortkind);
 
+NPY_NO_EXPORT int
+PyArray_SelectkindConverter(PyObject *obj, NPY_SELECTKIND *selectkind);
+
 NPY_NO_EXPORT int
 PyArray_SearchsideConverter(PyObject *obj, void *addr);
 
@@ -214,7 +214,7 @@ PyArray_ToString(PyArrayObject *self, NPY_ORDER order)
     PyObject *ret;
     PyArrayIterObject *it;
 
-    if (order == NPY_ANYORDER)
+    if (order == NPY_ANYORDER || order == NPY_KEEPORDER)
         order = PyArray_ISFORTRAN(self);
 
     /*        if (PyArray_TYPE(self) == PyArray_OBJECT) {
@@ -335,17 +335,8 @@ NPY_NO_EXPORT PyObject *
 PyArray_NewCopy(PyArrayObject *m1, NPY_ORDER fortran)
 {
     PyArrayObject *ret;
-    if (fortran == PyArray_ANYORDER)
-        fortran = PyArray_ISFORTRAN(m1);
 
-    Py_INCREF(m1->descr);
-    ret = (PyArrayObject *)PyArray_NewFromDescr(Py_TYPE(m1),
-                                                m1->descr,
-                                                m1->nd,
-                                                m1->dimensions,
-                                                NULL, NULL,
-                                                fortran,
-                                                (PyObject *)m1);
+    ret = (PyArrayObject *)PyArray_NewLikeArray(m1, fortran, NULL, 1);
     if (ret == NULL) {
         return NULL;
     }
@@ -183,6 +183,14 @@ _strided_buffered_cast(char *dptr, intp dstride, int delsize, int dswap,
     return;
 }
 
+/*
+ * Whether a cast from in to out can run without the GIL: the cast
+ * functions between numbers and datetimes only touch the data.
+ */
+#define _CAST_NOGIL(in, out)                                    \
+    ((PyArray_ISNUMBER(in) || PyArray_ISDATETIME(in)) &&        \
+     (PyArray_ISNUMBER(out) || PyArray_ISDATETIME(out)))
+
 static int
 _broadcast_cast(PyArrayObject *out, PyArrayObject *in,
                 PyArray_VectorUnaryFunc *castfunc, int iswap, int oswap)
@@ -246,7 +254,7 @@ _broadcast_cast(PyArrayObject *out, PyArrayObject *in,
     }
 
 #if NPY_ALLOW_THREADS
-    if (PyArray_ISNUMBER(in) && PyArray_ISNUMBER(out)) {
+    if (_CAST_NOGIL(in, out)) {
         NPY_BEGIN_THREADS;
     }
 #endif
@@ -263,7 +271,7 @@ _broadcast_cast(PyArrayObject *out, PyArrayObject *in,
         PyArray_MultiIter_NEXT(multi);
     }
 #if NPY_ALLOW_THREADS
-    if (PyArray_ISNUMBER(in) && PyArray_ISNUMBER(out)) {
+    if (_CAST_NOGIL(in, out)) {
         NPY_END_THREADS;
     }
 #endif
@@ -298,6 +306,63 @@ _broadcast_cast(PyArrayObject *out, PyArrayObject *in,
  * as the size of the casting buffer.
  */
 
+/*
+ * Casts between numeric arrays of the same shape with the multi-operand
+ * iterator: both are visited in memory order and only the chunks which
+ * are byte-swapped, misaligned or strided go through buffers.
+ */
+static int
+_nditer_cast(PyArrayObject *out, PyArrayObject *in,
+             PyArray_VectorUnaryFunc *castfunc)
+{
+    PyArrayObject *op[2];
+    PyArray_Descr *op_dtypes[2];
+    npy_uint32 op_flags[2];
+    NpyIter *iter;
+    char **dataptrs;
+    intp *countptr;
+    int i;
+    NPY_BEGIN_THREADS_DEF;
+
+    op[0] = in;
+    op[1] = out;
+    op_flags[0] = NPY_ITER_READONLY | NPY_ITER_CONTIG;
+    op_flags[1] = NPY_ITER_WRITEONLY | NPY_ITER_CONTIG;
+    for (i = 0; i < 2; i++) {
+        if (PyArray_ISNBO(op[i]->descr->byteorder)) {
+            op_dtypes[i] = op[i]->descr;
+            Py_INCREF(op_dtypes[i]);
+        }
+        else {
+            op_dtypes[i] = PyArray_DescrNewByteorder(op[i]->descr,
+                                                     NPY_NATIVE);
+            if (op_dtypes[i] == NULL) {
+                if (i == 1) {
+                    Py_DECREF(op_dtypes[0]);
+                }
+                return -1;
+            }
+        }
+    }
+    iter = NpyIter_New(2, op, NPY_ITER_BUFFERED, op_flags, op_dtypes, 0);
+    Py_DECREF(op_dtypes[0]);
+    Py_DECREF(op_dtypes[1]);
+    if (iter == NULL) {
+        return -1;
+    }
+
+    dataptrs = NpyIter_GetDataPtrArray(iter);
+    countptr = NpyIter_GetInnerLoopSizePtr(iter);
+    NPY_BEGIN_THREADS;
+    do {
+        castfunc(dataptrs[0], dataptrs[1], *countptr, in, out);
+    } while (NpyIter_Next(iter));
+    NPY_END_THREADS;
+
+    NpyIter_Deallocate(iter);
+    return 0;
+}
+
 /*NUMPY_API
  * Cast to an already created array.
  */
@@ -329,14 +394,14 @@ PyArray_CastTo(PyArrayObject *out, PyArrayObject *mp)
             (PyArray_ISFARRAY_RO(mp) && PyArray_ISFARRAY(out)));
     if (simple) {
 #if NPY_ALLOW_THREADS
-        if (PyArray_ISNUMBER(mp) && PyArray_ISNUMBER(out)) {
+        if (_CAST_NOGIL(mp, out)) {
             NPY_BEGIN_THREADS;
         }
 #endif
         castfunc(mp->data, out->data, mpsize, mp, out);
 
 #if NPY_ALLOW_THREADS
-        if (PyArray_ISNUMBER(mp) && PyArray_ISNUMBER(out)) {
+        if (_CAST_NOGIL(mp, out)) {
             NPY_END_THREADS;
         }
 #endif
@@ -346,6 +411,10 @@ PyArray_CastTo(PyArrayObject *out, PyArrayObject *mp)
         return 0;
     }
 
+    if (same && PyArray_ISNUMBER(mp) && PyArray_ISNUMBER(out)) {
+        return _nditer_cast(out, mp, castfunc);
+    }
+
     /*
      * If the input or output is OBJECT, STRING, UNICODE, or VOID
      *  then getitem and setitem are used for the cast
@@ -382,6 +451,7 @@ _bufferedcast(PyArrayObject *out, PyArrayObject *in,
     PyArray_CopySwapFunc *in_csn;
     PyArray_CopySwapFunc *out_csn;
     int retval = -1;
+    NPY_BEGIN_THREADS_DEF;
 
     in_csn = in->descr->f->copyswap;
     out_csn = out->descr->f->copyswap;
@@ -425,6 +495,11 @@ _bufferedcast(PyArrayObject *out, PyArrayObject *in,
     optr = (obuf) ? outbuffer: out->data;
     bptr = inbuffer;
     el = 0;
+#if NPY_ALLOW_THREADS
+    if (_CAST_NOGIL(in, out)) {
+        NPY_BEGIN_THREADS;
+    }
+#endif
     while (ncopies--) {
         index = it_in->size;
         PyArray_ITER_RESET(it_in);
@@ -455,6 +530,11 @@ _bufferedcast(PyArrayObject *out, PyArrayObject *in,
             }
         }
     }
+#if NPY_ALLOW_THREADS
+    if (_CAST_NOGIL(in, out)) {
+        NPY_END_THREADS;
+    }
+#endif
     retval = 0;
 
  exit:
@@ -477,6 +557,7 @@ PyArray_CastAnyTo(PyArrayObject *out, PyArrayObject *mp)
     int simple;
     PyArray_VectorUnaryFunc *castfunc = NULL;
     npy_intp mpsize = PyArray_SIZE(mp);
+    NPY_BEGIN_THREADS_DEF;
 
     if (mpsize == 0) {
         return 0;
@@ -500,7 +581,17 @@ PyArray_CastAnyTo(PyArrayObject *out, PyArrayObject *mp)
     simple = ((PyArray_ISCARRAY_RO(mp) && PyArray_ISCARRAY(out)) ||
               (PyArray_ISFARRAY_RO(mp) && PyArray_ISFARRAY(out)));
     if (simple) {
+#if NPY_ALLOW_THREADS
+        if (_CAST_NOGIL(mp, out)) {
+            NPY_BEGIN_THREADS;
+        }
+#endif
         castfunc(mp->data, out->data, mpsize, mp, out);
+#if NPY_ALLOW_THREADS
+        if (_CAST_NOGIL(mp, out)) {
+            NPY_END_THREADS;
+        }
+#endif
         return 0;
     }
     if (PyArray_SAMESHAPE(out, mp)) {
@@ -719,21 +719,21 @@ _copy_from_same_shape(PyArrayObject *dest, PyArrayObject *src,
                       void (*myfunc)(char *, intp, char *, intp, intp, int),
                       int swap)
 {
-    int maxaxis = -1, elsize;
-    intp maxdim;
-    PyArrayIterObject *dit, *sit;
+    PyArrayObject *op[2];
+    npy_uint32 op_flags[2];
+    NpyIter *iter;
+    char **dataptrs;
+    intp *strides, *countptr;
+    int elsize;
     NPY_BEGIN_THREADS_DEF;
 
-    dit = (PyArrayIterObject *)
-        PyArray_IterAllButAxis((PyObject *)dest, &maxaxis);
-    sit = (PyArrayIterObject *)
-        PyArray_IterAllButAxis((PyObject *)src, &maxaxis);
-
-    maxdim = dest->dimensions[maxaxis];
-
-    if ((dit == NULL) || (sit == NULL)) {
-        Py_XDECREF(dit);
-        Py_XDECREF(sit);
+    /* Visit the elements in the memory order of the arrays */
+    op[0] = dest;
+    op[1] = src;
+    op_flags[0] = NPY_ITER_WRITEONLY;
+    op_flags[1] = NPY_ITER_READONLY;
+    iter = NpyIter_New(2, op, 0, op_flags, NULL, 0);
+    if (iter == NULL) {
         return -1;
     }
     elsize = PyArray_ITEMSIZE(dest);
@@ -742,25 +742,24 @@ _copy_from_same_shape(PyArrayObject *dest, PyArrayObject *src,
     PyArray_INCREF(src);
     PyArray_XDECREF(dest);
 
-    NPY_BEGIN_THREADS;
-    while(dit->index < dit->size) {
-        /* strided copy of elsize bytes */
-        myfunc(dit->dataptr, dest->strides[maxaxis],
-                sit->dataptr, src->strides[maxaxis],
-                maxdim, elsize);
-        if (swap) {
-            _strided_byte_swap(dit->dataptr,
-                    dest->strides[maxaxis],
-                    dest->dimensions[maxaxis],
-                    elsize);
-        }
-        PyArray_ITER_NEXT(dit);
-        PyArray_ITER_NEXT(sit);
+    if (NpyIter_GetIterSize(iter) > 0) {
+        dataptrs = NpyIter_GetDataPtrArray(iter);
+        strides = NpyIter_GetInnerStrideArray(iter);
+        countptr = NpyIter_GetInnerLoopSizePtr(iter);
+
+        NPY_BEGIN_THREADS;
+        do {
+            /* strided copy of elsize bytes */
+            myfunc(dataptrs[0], strides[0], dataptrs[1], strides[1],
+                   *countptr, elsize);
+            if (swap) {
+                _strided_byte_swap(dataptrs[0], strides[0], *countptr, elsize);
+            }
+        } while (NpyIter_Next(iter));
+        NPY_END_THREADS;
     }
-    NPY_END_THREADS;
 
-    Py_DECREF(sit);
-    Py_DECREF(dit);
+    NpyIter_Deallocate(iter);
     return 0;
 }
 
@@ -1631,6 +1630,99 @@ PyArray_New(PyTypeObject *subtype, int nd, intp *dims, int type_num,
     return new;
 }
 
+/*
+ * Fills perm with the axes of ap ordered from the largest stride
+ * magnitude to the smallest, so that perm[nd-1] is the axis which
+ * varies fastest in memory.  Ties keep C order.
+ */
+static void
+_sorted_stride_perm(PyArrayObject *ap, int *perm)
+{
+    int i, j, ax;
+    intp s;
+
+    for (i = 0; i < ap->nd; i++) {
+        perm[i] = i;
+    }
+    for (i = 1; i < ap->nd; i++) {
+        ax = perm[i];
+        s = ap->strides[ax] < 0 ? -ap->strides[ax] : ap->strides[ax];
+        for (j = i; j > 0; j--) {
+            intp t = ap->strides[perm[j-1]];
+
+            if (t < 0) {
+                t = -t;
+            }
+            if (t >= s) {
+                break;
+            }
+            perm[j] = perm[j-1];
+        }
+        perm[j] = ax;
+    }
+}
+
+/*NUMPY_API
+ * Creates a new uninitialized array with the shape of prototype.
+ *
+ * order selects the memory layout: NPY_CORDER, NPY_FORTRANORDER,
+ * NPY_ANYORDER (Fortran if prototype is Fortran contiguous, C
+ * otherwise) or NPY_KEEPORDER (the axes laid out in the same order as
+ * in prototype).  descr overrides the data type when not NULL, and
+ * subok selects whether the array has the type of prototype.
+ *
+ * Steals a reference to descr.
+ */
+NPY_NO_EXPORT PyObject *
+PyArray_NewLikeArray(PyArrayObject *prototype, NPY_ORDER order,
+                     PyArray_Descr *descr, int subok)
+{
+    PyObject *ret;
+    PyTypeObject *subtype;
+    intp strides[NPY_MAXDIMS], stride;
+    int perm[NPY_MAXDIMS];
+    int i, nd = prototype->nd;
+
+    if (descr == NULL) {
+        descr = prototype->descr;
+        Py_INCREF(descr);
+    }
+    subtype = subok ? Py_TYPE(prototype) : &PyArray_Type;
+
+    if (order == NPY_ANYORDER) {
+        order = PyArray_ISFORTRAN(prototype) ? NPY_FORTRANORDER : NPY_CORDER;
+    }
+    else if (order == NPY_KEEPORDER) {
+        if (nd <= 1 || PyArray_ISCONTIGUOUS(prototype)) {
+            order = NPY_CORDER;
+        }
+        else if (PyArray_ISFORTRAN(prototype)) {
+            order = NPY_FORTRANORDER;
+        }
+    }
+    if (order != NPY_KEEPORDER) {
+        return PyArray_NewFromDescr(subtype, descr, nd, prototype->dimensions,
+                                    NULL, NULL, order == NPY_FORTRANORDER,
+                                    subok ? (PyObject *)prototype : NULL);
+    }
+
+    /* Lay the axes out from the fastest varying one in prototype */
+    _sorted_stride_perm(prototype, perm);
+    stride = descr->elsize;
+    for (i = nd - 1; i >= 0; i--) {
+        strides[perm[i]] = stride;
+        stride *= prototype->dimensions[perm[i]];
+    }
+    ret = PyArray_NewFromDescr(subtype, descr, nd, prototype->dimensions,
+                               strides, NULL, 0,
+                               subok ? (PyObject *)prototype : NULL);
+    if (ret == NULL) {
+        return NULL;
+    }
+    PyArray_UpdateFlags((PyArrayObject *)ret, UPDATE_ALL);
+    return ret;
+}
+
 
 NPY_NO_EXPORT int
 _array_from_buffer_3118(PyObject *obj, PyObject **out)
@@ -19,6 +19,23 @@
 #define PyAO PyArrayObject
 #define _check_axis PyArray_CheckAxis
 
+/*
+ * Whether the n indices are all valid for an axis of length max_item,
+ * counting negative indices from the end.  Does not use the Python API.
+ */
+static int
+_indices_in_range(const intp *indices, intp n, intp max_item)
+{
+    intp i;
+
+    for (i = 0; i < n; i++) {
+        if (indices[i] < -max_item || indices[i] >= max_item) {
+            return 0;
+        }
+    }
+    return 1;
+}
+
 /*NUMPY_API
  * Take
  */
@@ -32,7 +49,8 @@ PyArray_TakeFrom(PyArrayObject *self0, PyObject *indices0, int axis,
     intp shape[MAX_DIMS];
     char *src, *dest;
     int copyret = 0;
-    int err;
+    int err = 0;
+    NPY_BEGIN_THREADS_DEF;
 
     indices = NULL;
     self = (PyAO *)_check_axis(self0, &axis, CARRAY);
@@ -115,21 +133,23 @@ PyArray_TakeFrom(PyArrayObject *self0, PyObject *indices0, int axis,
     dest = ret->data;
 
     func = self->descr->f->fasttake;
+    NPY_BEGIN_THREADS_DESCR(self->descr);
+    if (clipmode == NPY_RAISE && n > 0 &&
+            !_indices_in_range((intp *)indices->data, m, max_item)) {
+        NPY_END_THREADS_DESCR(self->descr);
+        PyErr_SetString(PyExc_IndexError, "index out of range for array");
+        goto fail;
+    }
     if (func == NULL) {
         switch(clipmode) {
         case NPY_RAISE:
+            /* The indices were checked above */
             for (i = 0; i < n; i++) {
                 for (j = 0; j < m; j++) {
                     tmp = ((intp *)(indices->data))[j];
                     if (tmp < 0) {
                         tmp = tmp + max_item;
                     }
-                    if ((tmp < 0) || (tmp >= max_item)) {
-                        PyErr_SetString(PyExc_IndexError,
-                                "index out of range "\
-                                "for array");
-                        goto fail;
-                    }
                     memmove(dest, src + tmp*chunk, chunk);
                     dest += chunk;
                 }
@@ -177,9 +197,10 @@ PyArray_TakeFrom(PyArrayObject *self0, PyObject *indices0, int axis,
     else {
         err = func(dest, src, (intp *)(indices->data),
                     max_item, n, m, nelem, clipmode);
-        if (err) {
-            goto fail;
-        }
+    }
+    NPY_END_THREADS_DESCR(self->descr);
+    if (err) {
+        goto fail;
     }
 
     PyArray_INCREF(ret);
@@ -212,6 +233,7 @@ PyArray_PutTo(PyArrayObject *self, PyObject* values0, PyObject *indices0,
     intp i, chunk, ni, max_item, nv, tmp;
     char *src, *dest;
     int copied = 0;
+    NPY_BEGIN_THREADS_DEF;
 
     indices = NULL;
     values = NULL;
@@ -311,6 +333,7 @@ PyArray_PutTo(PyArrayObject *self, PyObject* values0, PyObject *indices0,
         }
     }
     else {
+        NPY_BEGIN_THREADS_DESCR(self->descr);
         switch(clipmode) {
         case NPY_RAISE:
             for (i = 0; i < ni; i++) {
@@ -320,6 +343,7 @@ PyArray_PutTo(PyArrayObject *self, PyObject* values0, PyObject *indices0,
                     tmp = tmp + max_item;
                 }
                 if ((tmp < 0) || (tmp >= max_item)) {
+                    NPY_END_THREADS_DESCR(self->descr);
                     PyErr_SetString(PyExc_IndexError,
                             "index out of " \
                             "range for array");
@@ -359,6 +383,7 @@ PyArray_PutTo(PyArrayObject *self, PyObject* values0, PyObject *indices0,
             }
             break;
         }
+        NPY_END_THREADS_DESCR(self->descr);
     }
 
  finish:
@@ -390,6 +415,7 @@ PyArray_PutMask(PyArrayObject *self, PyObject* values0, PyObject* mask0)
     intp i, chunk, ni, max_item, nv, tmp;
     char *src, *dest;
     int copied = 0;
+    NPY_BEGIN_THREADS_DEF;
 
     mask = NULL;
     values = NULL;
@@ -452,6 +478,7 @@ PyArray_PutMask(PyArrayObject *self, PyObject* values0, PyObject* mask0)
         }
     }
     else {
+        NPY_BEGIN_THREADS_DESCR(self->descr);
         func = self->descr->f->fastputmask;
         if (func == NULL) {
             for (i = 0; i < ni; i++) {
@@ -465,6 +492,7 @@ PyArray_PutMask(PyArrayObject *self, PyObject* values0, PyObject* mask0)
         else {
             func(dest, mask->data, ni, values->data, nv);
         }
+        NPY_END_THREADS_DESCR(self->descr);
     }
 
     Py_XDECREF(values);
@@ -498,6 +526,7 @@ PyArray_Repeat(PyArrayObject *aop, PyObject *op, int axis)
     PyObject *ap = NULL;
     PyArrayObject *ret = NULL;
     char *new_data, *old_data;
+    NPY_BEGIN_THREADS_DEF;
 
     repeats = (PyAO *)PyArray_ContiguousFromAny(op, PyArray_INTP, 0, 1);
     if (repeats == NULL) {
@@ -566,6 +595,7 @@ PyArray_Repeat(PyArrayObject *aop, PyObject *op, int axis)
     for (i = 0; i < axis; i++) {
         n_outer *= aop->dimensions[i];
     }
+    NPY_BEGIN_THREADS_DESCR(ret->descr);
     for (i = 0; i < n_outer; i++) {
         for (j = 0; j < n; j++) {
             tmp = nd ? counts[j] : counts[0];
@@ -576,6 +606,7 @@ PyArray_Repeat(PyArrayObject *aop, PyObject *op, int axis)
             old_data += chunk;
         }
     }
+    NPY_END_THREADS_DESCR(ret->descr);
 
     Py_DECREF(repeats);
     PyArray_INCREF(ret);
@@ -602,6 +633,8 @@ PyArray_Choose(PyArrayObject *ip, PyObject *op, PyArrayObject *ret,
     PyArrayMultiIterObject *multi = NULL;
     intp mi;
     int copyret = 0;
+    NPY_BEGIN_THREADS_DEF;
+
     ap = NULL;
 
     /*
@@ -671,11 +704,13 @@ PyArray_Choose(PyArrayObject *ip, PyObject *op, PyArrayObject *ret,
     elsize = ret->descr->elsize;
     ret_data = ret->data;
 
+    NPY_BEGIN_THREADS_DESCR(ret->descr);
     while (PyArray_MultiIter_NOTDONE(multi)) {
         mi = *((intp *)PyArray_MultiIter_DATA(multi, n));
         if (mi < 0 || mi >= n) {
             switch(clipmode) {
             case NPY_RAISE:
+                NPY_END_THREADS_DESCR(ret->descr);
                 PyErr_SetString(PyExc_ValueError,
                         "invalid entry in choice "\
                         "array");
@@ -706,6 +741,7 @@ PyArray_Choose(PyArrayObject *ip, PyObject *op, PyArrayObject *ret,
         ret_data += elsize;
         PyArray_MultiIter_NEXT(multi);
     }
+    NPY_END_THREADS_DESCR(ret->descr);
 
     PyArray_INCREF(ret);
     Py_DECREF(multi);
@@ -734,6 +770,57 @@ PyArray_Choose(PyArrayObject *ip, PyObject *op, PyArrayObject *ret,
     return NULL;
 }
 
+/*
+ * Sort kinds after NPY_MERGESORT, which do not fit in the ArrFuncs tables.
+ * The _sort module registers them for the builtin types when it is
+ * imported.
+ */
+static PyArray_SortFunc *sort_funcs[PyArray_NTYPES][NPY_NSORTKINDS - NPY_NSORTS];
+static PyArray_ArgSortFunc *argsort_funcs[PyArray_NTYPES][NPY_NSORTKINDS - NPY_NSORTS];
+
+/*NUMPY_API
+ * Register the functions of a builtin type for one of the sort kinds
+ * that are not in the ArrFuncs table (NPY_RADIXSORT and after)
+ */
+NPY_NO_EXPORT int
+PyArray_RegisterSortFunc(int type_num, NPY_SORTKIND which,
+                         PyArray_SortFunc *sort, PyArray_ArgSortFunc *argsort)
+{
+    if (type_num < 0 || type_num >= PyArray_NTYPES ||
+            which < NPY_NSORTS || which >= NPY_NSORTKINDS) {
+        PyErr_SetString(PyExc_ValueError,
+                        "invalid type or sort kind");
+        return -1;
+    }
+    sort_funcs[type_num][which - NPY_NSORTS] = sort;
+    argsort_funcs[type_num][which - NPY_NSORTS] = argsort;
+    return 0;
+}
+
+static PyArray_SortFunc *
+_get_sortfunc(PyArray_Descr *descr, NPY_SORTKIND which)
+{
+    if (which < NPY_NSORTS) {
+        return descr->f->sort[which];
+    }
+    if (descr->type_num < PyArray_NTYPES) {
+        return sort_funcs[descr->type_num][which - NPY_NSORTS];
+    }
+    return NULL;
+}
+
+static PyArray_ArgSortFunc *
+_get_argsortfunc(PyArray_Descr *descr, NPY_SORTKIND which)
+{
+    if (which < NPY_NSORTS) {
+        return descr->f->argsort[which];
+    }
+    if (descr->type_num < PyArray_NTYPES) {
+        return argsort_funcs[descr->type_num][which - NPY_NSORTS];
+    }
+    return NULL;
+}
+
 /*
  * These algorithms use special sorting.  They are not called unless the
  * underlying sort function for the type is available.  Note that axis is
@@ -760,7 +847,7 @@ _new_sort(PyArrayObject *op, int axis, NPY_SORTKIND which)
     }
 
     NPY_BEGIN_THREADS_DESCR(op->descr);
-    sort = op->descr->f->sort[which];
+    sort = _get_sortfunc(op->descr, which);
     size = it->size;
     N = op->dimensions[axis];
     elsize = op->descr->elsize;
@@ -770,6 +857,12 @@ _new_sort(PyArrayObject *op, int axis, NPY_SORTKIND which)
     if (needcopy) {
         char *buffer = PyDataMem_NEW(N*elsize);
 
+        if (buffer == NULL) {
+            NPY_END_THREADS_DESCR(op->descr);
+            Py_DECREF(it);
+            PyErr_NoMemory();
+            return -1;
+        }
         while (size--) {
             _unaligned_strided_byte_copy(buffer, (intp) elsize, it->dataptr,
                                          astride, N, elsize);
@@ -802,9 +895,9 @@ _new_sort(PyArrayObject *op, int axis, NPY_SORTKIND which)
     return 0;
 
  fail:
-    NPY_END_THREADS;
+    NPY_END_THREADS_DESCR(op->descr);
     Py_DECREF(it);
-    return 0;
+    return -1;
 }
 
 static PyObject*
@@ -835,7 +928,7 @@ _new_argsort(PyArrayObject *op, int axis, NPY_SORTKIND which)
     swap = !PyArray_ISNOTSWAPPED(op);
 
     NPY_BEGIN_THREADS_DESCR(op->descr);
-    argsort = op->descr->f->argsort[which];
+    argsort = _get_argsortfunc(op->descr, which);
     size = it->size;
     N = op->dimensions[axis];
     elsize = op->descr->elsize;
@@ -849,6 +942,13 @@ _new_argsort(PyArrayObject *op, int axis, NPY_SORTKIND which)
 
         valbuffer = PyDataMem_NEW(N*elsize);
         indbuffer = PyDataMem_NEW(N*sizeof(intp));
+        if (valbuffer == NULL || indbuffer == NULL) {
+            PyDataMem_FREE(valbuffer);
+            PyDataMem_FREE(indbuffer);
+            NPY_END_THREADS_DESCR(op->descr);
+            PyErr_NoMemory();
+            goto fail_nothreads;
+        }
         while (size--) {
             _unaligned_strided_byte_copy(valbuffer, (intp) elsize, it->dataptr,
                                          astride, N, elsize);
@@ -893,7 +993,8 @@ _new_argsort(PyArrayObject *op, int axis, NPY_SORTKIND which)
     return ret;
 
  fail:
-    NPY_END_THREADS;
+    NPY_END_THREADS_DESCR(op->descr);
+ fail_nothreads:
     Py_DECREF(ret);
     Py_XDECREF(it);
     Py_XDECREF(rit);
@@ -968,6 +1069,10 @@ PyArray_Sort(PyArrayObject *op, int axis, NPY_SORTKIND which)
     char *ip;
     int i, n, m, elsize, orign;
 
+    if ((which < 0) || (which >= NPY_NSORTKINDS)) {
+        PyErr_SetString(PyExc_ValueError, "not a valid sort kind");
+        return -1;
+    }
     n = op->nd;
     if ((n == 0) || (PyArray_SIZE(op) == 1)) {
         return 0;
@@ -986,7 +1091,7 @@ PyArray_Sort(PyArrayObject *op, int axis, NPY_SORTKIND which)
     }
 
     /* Determine if we should use type-specific algorithm or not */
-    if (op->descr->f->sort[which] != NULL) {
+    if (_get_sortfunc(op->descr, which) != NULL) {
         return _new_sort(op, axis, which);
     }
     if ((which != PyArray_QUICKSORT)
@@ -1060,6 +1165,10 @@ PyArray_ArgSort(PyArrayObject *op, int axis, NPY_SORTKIND which)
     int argsort_elsize;
     char *store_ptr;
 
+    if ((which < 0) || (which >= NPY_NSORTKINDS)) {
+        PyErr_SetString(PyExc_ValueError, "not a valid sort kind");
+        return NULL;
+    }
     n = op->nd;
     if ((n == 0) || (PyArray_SIZE(op) == 1)) {
         ret = (PyArrayObject *)PyArray_New(Py_TYPE(op), op->nd,
@@ -1079,7 +1188,7 @@ PyArray_ArgSort(PyArrayObject *op, int axis, NPY_SORTKIND which)
         return NULL;
     }
     /* Determine if we should use new algorithm or not */
-    if (op2->descr->f->argsort[which] != NULL) {
+    if (_get_argsortfunc(op2->descr, which) != NULL) {
         ret = (PyArrayObject *)_new_argsort(op2, axis, which);
         Py_DECREF(op2);
         return (PyObject *)ret;
@@ -1141,6 +1250,405 @@ PyArray_ArgSort(PyArrayObject *op, int axis, NPY_SORTKIND which)
 }
 
 
+/*
+ * Selection functions for the builtin types, registered by the _sort
+ * module when it is imported.
+ */
+static PyArray_PartitionFunc *partition_funcs[PyArray_NTYPES][NPY_NSELECTS];
+static PyArray_ArgPartitionFunc *argpartition_funcs[PyArray_NTYPES][NPY_NSELECTS];
+
+/*NUMPY_API
+ * Register the selection functions PyArray_Partition and
+ * PyArray_ArgPartition use for a builtin type
+ */
+NPY_NO_EXPORT int
+PyArray_RegisterPartitionFunc(int type_num, NPY_SELECTKIND which,
+                              PyArray_PartitionFunc *part,
+                              PyArray_ArgPartitionFunc *argpart)
+{
+    if (type_num < 0 || type_num >= PyArray_NTYPES ||
+            which < 0 || which >= NPY_NSELECTS) {
+        PyErr_SetString(PyExc_ValueError,
+                        "invalid type or selection kind");
+        return -1;
+    }
+    partition_funcs[type_num][which] = part;
+    argpartition_funcs[type_num][which] = argpart;
+    return 0;
+}
+
+/*
+ * Convert kth to a sorted 1-d array of indices into an axis of length n,
+ * counting negative indices from the end.
+ */
+static PyArrayObject *
+_partition_kth(PyObject *kth, intp n)
+{
+    PyArrayObject *arr, *ret;
+    intp *k, i, nkth;
+
+    arr = (PyArrayObject *)PyArray_FromAny(kth, NULL, 0, 1, DEFAULT, NULL);
+    if (arr == NULL) {
+        return NULL;
+    }
+    if (!PyArray_ISINTEGER(arr) && PyArray_SIZE(arr) > 0) {
+        PyErr_SetString(PyExc_TypeError,
+                        "partition index must be an integer");
+        Py_DECREF(arr);
+        return NULL;
+    }
+    ret = (PyArrayObject *)PyArray_FromArray(arr,
+                                        PyArray_DescrFromType(PyArray_INTP),
+                                        DEFAULT | ENSURECOPY | FORCECAST);
+    Py_DECREF(arr);
+    if (ret == NULL) {
+        return NULL;
+    }
+    if (ret->nd == 0) {
+        PyObject *new = PyArray_Ravel(ret, 0);
+
+        Py_DECREF(ret);
+        if (new == NULL) {
+            return NULL;
+        }
+        ret = (PyArrayObject *)new;
+    }
+    k = (intp *)ret->data;
+    nkth = PyArray_SIZE(ret);
+    for (i = 0; i < nkth; i++) {
+        if (k[i] < 0) {
+            k[i] += n;
+        }
+        if (k[i] < 0 || k[i] >= n) {
+            PyErr_Format(PyExc_ValueError,
+                         "kth(=%"INTP_FMT") out of bounds (%"INTP_FMT")",
+                         (k[i] < 0) ? k[i] - n : k[i], n);
+            Py_DECREF(ret);
+            return NULL;
+        }
+    }
+    if (PyArray_Sort(ret, 0, PyArray_QUICKSORT) < 0) {
+        Py_DECREF(ret);
+        return NULL;
+    }
+    return ret;
+}
+
+/*
+ * Select the elements kth[0] < kth[1] < ... of the N items in data.
+ * Each selection leaves everything before its index alone, so the next
+ * one only has to look at the items after it.
+ */
+static int
+_partition_slice(PyArray_PartitionFunc *part, char *data, intp N, int elsize,
+                 intp *kth, intp nkth, PyArrayObject *op)
+{
+    intp i, start = 0;
+
+    for (i = 0; i < nkth; i++) {
+        if (kth[i] < start) {
+            continue;
+        }
+        if (part(data + start*elsize, N - start, kth[i] - start, op) < 0) {
+            return -1;
+        }
+        start = kth[i] + 1;
+    }
+    return 0;
+}
+
+static int
+_argpartition_slice(PyArray_ArgPartitionFunc *argpart, char *data,
+                    intp *tosort, intp N, intp *kth, intp nkth,
+                    PyArrayObject *op)
+{
+    intp i, start = 0;
+
+    for (i = 0; i < nkth; i++) {
+        if (kth[i] < start) {
+            continue;
+        }
+        if (argpart(data, tosort + start, N - start, kth[i] - start,
+                    op) < 0) {
+            return -1;
+        }
+        start = kth[i] + 1;
+    }
+    return 0;
+}
+
+/* Like _new_sort, but selects the indices in kth */
+static int
+_new_partition(PyArrayObject *op, int axis, PyArray_PartitionFunc *part,
+               PyArrayObject *ktharray)
+{
+    PyArrayIterObject *it;
+    int needcopy = 0, swap;
+    intp N, size, nkth;
+    int elsize;
+    intp astride, *kth;
+    BEGIN_THREADS_DEF;
+
+    it = (PyArrayIterObject *)PyArray_IterAllButAxis((PyObject *)op, &axis);
+    swap = !PyArray_ISNOTSWAPPED(op);
+    if (it == NULL) {
+        return -1;
+    }
+
+    NPY_BEGIN_THREADS_DESCR(op->descr);
+    kth = (intp *)ktharray->data;
+    nkth = PyArray_SIZE(ktharray);
+    size = it->size;
+    N = op->dimensions[axis];
+    elsize = op->descr->elsize;
+    astride = op->strides[axis];
+
+    needcopy = !(op->flags & ALIGNED) || (astride != (intp) elsize) || swap;
+    if (needcopy) {
+        char *buffer = PyDataMem_NEW(N*elsize);
+
+        if (buffer == NULL) {
+            NPY_END_THREADS_DESCR(op->descr);
+            Py_DECREF(it);
+            PyErr_NoMemory();
+            return -1;
+        }
+        while (size--) {
+            _unaligned_strided_byte_copy(buffer, (intp) elsize, it->dataptr,
+                                         astride, N, elsize);
+            if (swap) {
+                _strided_byte_swap(buffer, (intp) elsize, N, elsize);
+            }
+            if (_partition_slice(part, buffer, N, elsize, kth, nkth,
+                                 op) < 0) {
+                PyDataMem_FREE(buffer);
+                goto fail;
+            }
+            if (swap) {
+                _strided_byte_swap(buffer, (intp) elsize, N, elsize);
+            }
+            _unaligned_strided_byte_copy(it->dataptr, astride, buffer,
+                                         (intp) elsize, N, elsize);
+            PyArray_ITER_NEXT(it);
+        }
+        PyDataMem_FREE(buffer);
+    }
+    else {
+        while (size--) {
+            if (_partition_slice(part, it->dataptr, N, elsize, kth, nkth,
+                                 op) < 0) {
+                goto fail;
+            }
+            PyArray_ITER_NEXT(it);
+        }
+    }
+    NPY_END_THREADS_DESCR(op->descr);
+    Py_DECREF(it);
+    return 0;
+
+ fail:
+    NPY_END_THREADS_DESCR(op->descr);
+    Py_DECREF(it);
+    return -1;
+}
+
+/* Like _new_argsort, but selects the indices in kth */
+static PyObject*
+_new_argpartition(PyArrayObject *op, int axis,
+                  PyArray_ArgPartitionFunc *argpart, PyArrayObject *ktharray)
+{
+
+    PyArrayIterObject *it = NULL;
+    PyArrayIterObject *rit = NULL;
+    PyObject *ret;
+    int needcopy = 0, i;
+    intp N, size, nkth;
+    int elsize, swap;
+    intp astride, rstride, *iptr, *kth;
+    BEGIN_THREADS_DEF;
+
+    ret = PyArray_New(Py_TYPE(op), op->nd,
+                          op->dimensions, PyArray_INTP,
+                          NULL, NULL, 0, 0, (PyObject *)op);
+    if (ret == NULL) {
+        return NULL;
+    }
+    it = (PyArrayIterObject *)PyArray_IterAllButAxis((PyObject *)op, &axis);
+    rit = (PyArrayIterObject *)PyArray_IterAllButAxis(ret, &axis);
+    if (rit == NULL || it == NULL) {
+        goto fail_nothreads;
+    }
+    swap = !PyArray_ISNOTSWAPPED(op);
+
+    NPY_BEGIN_THREADS_DESCR(op->descr);
+    kth = (intp *)ktharray->data;
+    nkth = PyArray_SIZE(ktharray);
+    size = it->size;
+    N = op->dimensions[axis];
+    elsize = op->descr->elsize;
+    astride = op->strides[axis];
+    rstride = PyArray_STRIDE(ret,axis);
+
+    needcopy = swap || !(op->flags & ALIGNED) || (astride != (intp) elsize) ||
+            (rstride != sizeof(intp));
+    if (needcopy) {
+        char *valbuffer, *indbuffer;
+
+        valbuffer = PyDataMem_NEW(N*elsize);
+        indbuffer = PyDataMem_NEW(N*sizeof(intp));
+        if (valbuffer == NULL || indbuffer == NULL) {
+            PyDataMem_FREE(valbuffer);
+            PyDataMem_FREE(indbuffer);
+            NPY_END_THREADS_DESCR(op->descr);
+            PyErr_NoMemory();
+            goto fail_nothreads;
+        }
+        while (size--) {
+            _unaligned_strided_byte_copy(valbuffer, (intp) elsize, it->dataptr,
+                                         astride, N, elsize);
+            if (swap) {
+                _strided_byte_swap(valbuffer, (intp) elsize, N, elsize);
+            }
+            iptr = (intp *)indbuffer;
+            for (i = 0; i < N; i++) {
+                *iptr++ = i;
+            }
+            if (_argpartition_slice(argpart, valbuffer, (intp *)indbuffer, N,
+                                    kth, nkth, op) < 0) {
+                PyDataMem_FREE(valbuffer);
+                PyDataMem_FREE(indbuffer);
+                goto fail;
+            }
+            _unaligned_strided_byte_copy(rit->dataptr, rstride, indbuffer,
+                                         sizeof(intp), N, sizeof(intp));
+            PyArray_ITER_NEXT(it);
+            PyArray_ITER_NEXT(rit);
+        }
+        PyDataMem_FREE(valbuffer);
+        PyDataMem_FREE(indbuffer);
+    }
+    else {
+        while (size--) {
+            iptr = (intp *)rit->dataptr;
+            for (i = 0; i < N; i++) {
+                *iptr++ = i;
+            }
+            if (_argpartition_slice(argpart, it->dataptr,
+                                    (intp *)rit->dataptr, N, kth, nkth,
+                                    op) < 0) {
+                goto fail;
+            }
+            PyArray_ITER_NEXT(it);
+            PyArray_ITER_NEXT(rit);
+        }
+    }
+
+    NPY_END_THREADS_DESCR(op->descr);
+
+    Py_DECREF(it);
+    Py_DECREF(rit);
+    return ret;
+
+ fail:
+    NPY_END_THREADS_DESCR(op->descr);
+ fail_nothreads:
+    Py_DECREF(ret);
+    Py_XDECREF(it);
+    Py_XDECREF(rit);
+    return NULL;
+}
+
+/*NUMPY_API
+ * Partition an array in-place, so that the element at each index in
+ * ktharray is the one a sort would put there, with no larger element
+ * before it and no smaller one after it along the axis.  Types without
+ * a selection function are sorted.
+ */
+NPY_NO_EXPORT int
+PyArray_Partition(PyArrayObject *op, PyArrayObject *ktharray, int axis,
+                  NPY_SELECTKIND which)
+{
+    PyArrayObject *kth;
+    PyArray_PartitionFunc *part = NULL;
+    int n, ret;
+
+    if ((which < 0) || (which >= NPY_NSELECTS)) {
+        PyErr_SetString(PyExc_ValueError, "not a valid partition kind");
+        return -1;
+    }
+    n = op->nd;
+    if (axis < 0) {
+        axis += n;
+    }
+    if ((axis < 0) || (axis >= n)) {
+        PyErr_Format(PyExc_ValueError, "axis(=%d) out of bounds", axis);
+        return -1;
+    }
+    if (!PyArray_ISWRITEABLE(op)) {
+        PyErr_SetString(PyExc_RuntimeError,
+                        "attempted partition on unwriteable array.");
+        return -1;
+    }
+    kth = _partition_kth((PyObject *)ktharray, op->dimensions[axis]);
+    if (kth == NULL) {
+        return -1;
+    }
+    if (op->descr->type_num < PyArray_NTYPES) {
+        part = partition_funcs[op->descr->type_num][which];
+    }
+    if (part == NULL) {
+        ret = PyArray_Sort(op, axis, PyArray_QUICKSORT);
+    }
+    else if (PyArray_SIZE(op) == 0) {
+        ret = 0;
+    }
+    else {
+        ret = _new_partition(op, axis, part, kth);
+    }
+    Py_DECREF(kth);
+    return ret;
+}
+
+/*NUMPY_API
+ * ArgPartition an array: the indices that would partition it, see
+ * PyArray_Partition
+ */
+NPY_NO_EXPORT PyObject *
+PyArray_ArgPartition(PyArrayObject *op, PyArrayObject *ktharray, int axis,
+                     NPY_SELECTKIND which)
+{
+    PyArrayObject *op2, *kth;
+    PyArray_ArgPartitionFunc *argpart = NULL;
+    PyObject *ret;
+
+    if ((which < 0) || (which >= NPY_NSELECTS)) {
+        PyErr_SetString(PyExc_ValueError, "not a valid partition kind");
+        return NULL;
+    }
+    /* Creates new reference op2 */
+    if ((op2 = (PyAO *)_check_axis(op, &axis, 0)) == NULL) {
+        return NULL;
+    }
+    kth = _partition_kth((PyObject *)ktharray, op2->dimensions[axis]);
+    if (kth == NULL) {
+        Py_DECREF(op2);
+        return NULL;
+    }
+    if (op2->descr->type_num < PyArray_NTYPES) {
+        argpart = argpartition_funcs[op2->descr->type_num][which];
+    }
+    if (argpart == NULL || PyArray_SIZE(op2) == 0) {
+        ret = PyArray_ArgSort(op2, axis, PyArray_QUICKSORT);
+    }
+    else {
+        ret = _new_argpartition(op2, axis, argpart, kth);
+    }
+    Py_DECREF(kth);
+    Py_DECREF(op2);
+    return ret;
+}
+
+
 /*NUMPY_API
  *LexSort an array providing indices that will sort a collection of arrays
  *lexicographically.  The first key is sorted on first, followed by the second key
@@ -1151,6 +1659,31 @@ PyArray_ArgSort(PyArrayObject *op, int axis, NPY_SORTKIND which)
  */
 NPY_NO_EXPORT PyObject *
 PyArray_LexSort(PyObject *sort_keys, int axis)
+{
+    return PyArray_LexSortKind(sort_keys, axis, PyArray_MERGESORT);
+}
+
+/*
+ * The stable argsort lexsort uses for a key: the requested kind if the
+ * type has it, else the merge sort.
+ */
+static PyArray_ArgSortFunc *
+_lexsort_argsortfunc(PyArray_Descr *descr, NPY_SORTKIND which)
+{
+    PyArray_ArgSortFunc *argsort = _get_argsortfunc(descr, which);
+
+    if (argsort == NULL) {
+        argsort = descr->f->argsort[PyArray_MERGESORT];
+    }
+    return argsort;
+}
+
+/*NUMPY_API
+ * LexSort with a given stable sort kind (mergesort, radix or timsort).
+ * Keys whose type does not have that kind use the merge sort.
+ */
+NPY_NO_EXPORT PyObject *
+PyArray_LexSortKind(PyObject *sort_keys, int axis, NPY_SORTKIND which)
 {
     PyArrayObject **mps;
     PyArrayIterObject **its;
@@ -1167,6 +1700,12 @@ PyArray_LexSort(PyObject *sort_keys, int axis)
     PyArray_ArgSortFunc *argsort;
     NPY_BEGIN_THREADS_DEF;
 
+    if ((which != PyArray_MERGESORT) && (which != NPY_RADIXSORT)
+            && (which != NPY_TIMSORT)) {
+        PyErr_SetString(PyExc_ValueError,
+                "lexsort needs a stable sort kind");
+        return NULL;
+    }
     if (!PySequence_Check(sort_keys)
            || ((n = PySequence_Size(sort_keys)) <= 0)) {
         PyErr_SetString(PyExc_TypeError,
@@ -1204,7 +1743,7 @@ PyArray_LexSort(PyObject *sort_keys, int axis)
                 goto fail;
             }
         }
-        if (!mps[i]->descr->f->argsort[PyArray_MERGESORT]) {
+        if (!_lexsort_argsortfunc(mps[i]->descr, which)) {
             PyErr_Format(PyExc_TypeError,
                          "merge sort not available for item %d", i);
             goto fail;
@@ -1292,7 +1831,7 @@ PyArray_LexSort(PyObject *sort_keys, int axis)
             for (j = 0; j < n; j++) {
                 elsize = mps[j]->descr->elsize;
                 astride = mps[j]->strides[axis];
-                argsort = mps[j]->descr->f->argsort[PyArray_MERGESORT];
+                argsort = _lexsort_argsortfunc(mps[j]->descr, which);
                 _unaligned_strided_byte_copy(valbuffer, (intp) elsize,
                                              its[j]->dataptr, astride, N, elsize);
                 if (swaps[j]) {
@@ -1321,7 +1860,7 @@ PyArray_LexSort(PyObject *sort_keys, int axis)
                 *iptr++ = i;
             }
             for (j = 0; j < n; j++) {
-                argsort = mps[j]->descr->f->argsort[PyArray_MERGESORT];
+                argsort = _lexsort_argsortfunc(mps[j]->descr, which);
                 if (argsort(its[j]->dataptr, (intp *)rit->dataptr,
                             N, mps[j]) < 0) {
                     goto fail;
@@ -1692,18 +2231,27 @@ PyArray_Nonzero(PyArrayObject *self)
     PyArrayIterObject *it = NULL;
     PyObject *ret = NULL, *item;
     intp *dptr[MAX_DIMS];
+    /* The nonzero functions of these types work on the data alone */
+    int nogil = PyArray_ISNUMBER(self) || PyArray_ISDATETIME(self);
+    NPY_BEGIN_THREADS_DEF;
 
     it = (PyArrayIterObject *)PyArray_IterNew((PyObject *)self);
     if (it == NULL) {
         return NULL;
     }
     size = it->size;
+    if (nogil) {
+        NPY_BEGIN_THREADS;
+    }
     for (i = 0; i < size; i++) {
         if (self->descr->f->nonzero(it->dataptr, self)) {
             count++;
         }
         PyArray_ITER_NEXT(it);
     }
+    if (nogil) {
+        NPY_END_THREADS;
+    }
 
     PyArray_ITER_RESET(it);
     ret = PyTuple_New(n);
@@ -1720,6 +2268,9 @@ PyArray_Nonzero(PyArrayObject *self)
         PyTuple_SET_ITEM(ret, j, item);
         dptr[j] = (intp *)PyArray_DATA(item);
     }
+    if (nogil) {
+        NPY_BEGIN_THREADS;
+    }
     if (n == 1) {
         for (i = 0; i < size; i++) {
             if (self->descr->f->nonzero(it->dataptr, self)) {
@@ -1740,6 +2291,9 @@ PyArray_Nonzero(PyArrayObject *self)
             PyArray_ITER_NEXT(it);
         }
     }
+    if (nogil) {
+        NPY_END_THREADS;
+    }
 
     Py_DECREF(it);
     return ret;
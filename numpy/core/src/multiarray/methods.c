@@ -229,6 +229,67 @@ array_argmin(PyArrayObject *self, PyObject *args, PyObject *kwds)
     return _ARET(PyArray_ArgMin(self, axis, out));
 }
 
+/*
+ * Whether a reduction method whose keepdims argument comes after nargs
+ * others was called with a tuple of axes or with keepdims.  Those calls
+ * are forwarded to the functions of numpy.core.fromnumeric.
+ */
+static int
+_reduce_forwarded(PyObject *args, PyObject *kwds, Py_ssize_t nargs)
+{
+    PyObject *axis = NULL;
+
+    if (PyTuple_GET_SIZE(args) > nargs) {
+        return 1;
+    }
+    if (PyTuple_GET_SIZE(args) > 0) {
+        axis = PyTuple_GET_ITEM(args, 0);
+    }
+    else if (kwds != NULL) {
+        axis = PyDict_GetItemString(kwds, "axis");
+    }
+    if (axis != NULL && PyTuple_Check(axis)) {
+        return 1;
+    }
+    return kwds != NULL && PyDict_GetItemString(kwds, "keepdims") != NULL;
+}
+
+/* Call numpy.core.fromnumeric.name(self, *args, **kwds) */
+static PyObject *
+_reduce_forward(const char *name, PyArrayObject *self,
+                PyObject *args, PyObject *kwds)
+{
+    PyObject *fromnumeric, *func, *newargs, *ret;
+    Py_ssize_t i, n = PyTuple_GET_SIZE(args);
+
+    fromnumeric = PyImport_ImportModule("numpy.core.fromnumeric");
+    if (fromnumeric == NULL) {
+        return NULL;
+    }
+    func = PyObject_GetAttrString(fromnumeric, name);
+    Py_DECREF(fromnumeric);
+    if (func == NULL) {
+        return NULL;
+    }
+    newargs = PyTuple_New(n + 1);
+    if (newargs == NULL) {
+        Py_DECREF(func);
+        return NULL;
+    }
+    Py_INCREF(self);
+    PyTuple_SET_ITEM(newargs, 0, (PyObject *)self);
+    for (i = 0; i < n; i++) {
+        PyObject *item = PyTuple_GET_ITEM(args, i);
+
+        Py_INCREF(item);
+        PyTuple_SET_ITEM(newargs, i + 1, item);
+    }
+    ret = PyObject_Call(func, newargs, kwds);
+    Py_DECREF(newargs);
+    Py_DECREF(func);
+    return ret;
+}
+
 static PyObject *
 array_max(PyArrayObject *self, PyObject *args, PyObject *kwds)
 {
@@ -236,6 +297,9 @@ array_max(PyArrayObject *self, PyObject *args, PyObject *kwds)
     PyArrayObject *out = NULL;
     static char *kwlist[] = {"axis", "out", NULL};
 
+    if (_reduce_forwarded(args, kwds, 2)) {
+        return _reduce_forward("amax", self, args, kwds);
+    }
     if (!PyArg_ParseTupleAndKeywords(args, kwds, "|O&O&", kwlist,
                                      PyArray_AxisConverter,
                                      &axis,
@@ -271,6 +335,9 @@ array_min(PyArrayObject *self, PyObject *args, PyObject *kwds)
     PyArrayObject *out = NULL;
     static char *kwlist[] = {"axis", "out", NULL};
 
+    if (_reduce_forwarded(args, kwds, 2)) {
+        return _reduce_forward("amin", self, args, kwds);
+    }
     if (!PyArg_ParseTupleAndKeywords(args, kwds, "|O&O&", kwlist,
                                      PyArray_AxisConverter,
                                      &axis,
@@ -918,11 +985,13 @@ array_getarray(PyArrayObject *self, PyObject *args)
 
 
 static PyObject *
-array_copy(PyArrayObject *self, PyObject *args)
+array_copy(PyArrayObject *self, PyObject *args, PyObject *kwds)
 {
     PyArray_ORDER fortran=PyArray_CORDER;
-    if (!PyArg_ParseTuple(args, "|O&", PyArray_OrderConverter,
-                          &fortran)) {
+    static char *kwlist[] = {"order", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|O&", kwlist,
+                                     PyArray_OrderConverter, &fortran)) {
         return NULL;
     }
 
@@ -1119,6 +1188,115 @@ array_argsort(PyArrayObject *self, PyObject *args, PyObject *kwds)
     return _ARET(res);
 }
 
+static PyObject *
+array_partition(PyArrayObject *self, PyObject *args, PyObject *kwds)
+{
+    int axis=-1;
+    int val;
+    NPY_SELECTKIND which = NPY_INTROSELECT;
+    PyObject *kthobj;
+    PyObject *order = NULL;
+    PyArray_Descr *saved = NULL;
+    PyArray_Descr *newd;
+    static char *kwlist[] = {"kth", "axis", "kind", "order", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|iO&O:partition", kwlist,
+                                     &kthobj, &axis,
+                                     PyArray_SelectkindConverter, &which,
+                                     &order)) {
+        return NULL;
+    }
+    if (order == Py_None) {
+        order = NULL;
+    }
+    if (order != NULL) {
+        PyObject *new_name;
+        PyObject *_numpy_internal;
+        saved = self->descr;
+        if (saved->names == NULL) {
+            PyErr_SetString(PyExc_ValueError, "Cannot specify " \
+                            "order when the array has no fields.");
+            return NULL;
+        }
+        _numpy_internal = PyImport_ImportModule("numpy.core._internal");
+        if (_numpy_internal == NULL) {
+            return NULL;
+        }
+        new_name = PyObject_CallMethod(_numpy_internal, "_newnames",
+                                       "OO", saved, order);
+        Py_DECREF(_numpy_internal);
+        if (new_name == NULL) {
+            return NULL;
+        }
+        newd = PyArray_DescrNew(saved);
+        newd->names = new_name;
+        self->descr = newd;
+    }
+
+    val = PyArray_Partition(self, (PyArrayObject *)kthobj, axis, which);
+    if (order != NULL) {
+        Py_XDECREF(self->descr);
+        self->descr = saved;
+    }
+    if (val < 0) {
+        return NULL;
+    }
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject *
+array_argpartition(PyArrayObject *self, PyObject *args, PyObject *kwds)
+{
+    int axis = -1;
+    NPY_SELECTKIND which = NPY_INTROSELECT;
+    PyObject *kthobj;
+    PyObject *order = NULL, *res;
+    PyArray_Descr *newd, *saved=NULL;
+    static char *kwlist[] = {"kth", "axis", "kind", "order", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|O&O&O:argpartition",
+                                     kwlist, &kthobj,
+                                     PyArray_AxisConverter, &axis,
+                                     PyArray_SelectkindConverter, &which,
+                                     &order)) {
+        return NULL;
+    }
+    if (order == Py_None) {
+        order = NULL;
+    }
+    if (order != NULL) {
+        PyObject *new_name;
+        PyObject *_numpy_internal;
+        saved = self->descr;
+        if (saved->names == NULL) {
+            PyErr_SetString(PyExc_ValueError, "Cannot specify " \
+                            "order when the array has no fields.");
+            return NULL;
+        }
+        _numpy_internal = PyImport_ImportModule("numpy.core._internal");
+        if (_numpy_internal == NULL) {
+            return NULL;
+        }
+        new_name = PyObject_CallMethod(_numpy_internal, "_newnames",
+                                       "OO", saved, order);
+        Py_DECREF(_numpy_internal);
+        if (new_name == NULL) {
+            return NULL;
+        }
+        newd = PyArray_DescrNew(saved);
+        newd->names = new_name;
+        self->descr = newd;
+    }
+
+    res = PyArray_ArgPartition(self, (PyArrayObject *)kthobj, axis, which);
+    if (order != NULL) {
+        Py_XDECREF(self->descr);
+        self->descr = saved;
+    }
+    return _ARET(res);
+}
+
 static PyObject *
 array_searchsorted(PyArrayObject *self, PyObject *args, PyObject *kwds)
 {
@@ -1678,6 +1856,9 @@ array_mean(PyArrayObject *self, PyObject *args, PyObject *kwds)
     int num;
     static char *kwlist[] = {"axis", "dtype", "out", NULL};
 
+    if (_reduce_forwarded(args, kwds, 3)) {
+        return _reduce_forward("mean", self, args, kwds);
+    }
     if (!PyArg_ParseTupleAndKeywords(args, kwds, "|O&O&O&", kwlist,
                                      PyArray_AxisConverter,
                                      &axis, PyArray_DescrConverter2,
@@ -1702,6 +1883,9 @@ array_sum(PyArrayObject *self, PyObject *args, PyObject *kwds)
     int rtype;
     static char *kwlist[] = {"axis", "dtype", "out", NULL};
 
+    if (_reduce_forwarded(args, kwds, 3)) {
+        return _reduce_forward("sum", self, args, kwds);
+    }
     if (!PyArg_ParseTupleAndKeywords(args, kwds, "|O&O&O&", kwlist,
                                      PyArray_AxisConverter,
                                      &axis, PyArray_DescrConverter2,
@@ -1751,6 +1935,9 @@ array_prod(PyArrayObject *self, PyObject *args, PyObject *kwds)
     int rtype;
     static char *kwlist[] = {"axis", "dtype", "out", NULL};
 
+    if (_reduce_forwarded(args, kwds, 3)) {
+        return _reduce_forward("prod", self, args, kwds);
+    }
     if (!PyArg_ParseTupleAndKeywords(args, kwds, "|O&O&O&", kwlist,
                                      PyArray_AxisConverter,
                                      &axis, PyArray_DescrConverter2,
@@ -1821,6 +2008,9 @@ array_any(PyArrayObject *self, PyObject *args, PyObject *kwds)
     PyArrayObject *out = NULL;
     static char *kwlist[] = {"axis", "out", NULL};
 
+    if (_reduce_forwarded(args, kwds, 2)) {
+        return _reduce_forward("any", self, args, kwds);
+    }
     if (!PyArg_ParseTupleAndKeywords(args, kwds, "|O&O&", kwlist,
                                      PyArray_AxisConverter,
                                      &axis,
@@ -1839,6 +2029,9 @@ array_all(PyArrayObject *self, PyObject *args, PyObject *kwds)
     PyArrayObject *out = NULL;
     static char *kwlist[] = {"axis", "out", NULL};
 
+    if (_reduce_forwarded(args, kwds, 2)) {
+        return _reduce_forward("all", self, args, kwds);
+    }
     if (!PyArg_ParseTupleAndKeywords(args, kwds, "|O&O&", kwlist,
                                      PyArray_AxisConverter,
                                      &axis,
@@ -1860,6 +2053,9 @@ array_stddev(PyArrayObject *self, PyObject *args, PyObject *kwds)
     int ddof = 0;
     static char *kwlist[] = {"axis", "dtype", "out", "ddof", NULL};
 
+    if (_reduce_forwarded(args, kwds, 4)) {
+        return _reduce_forward("std", self, args, kwds);
+    }
     if (!PyArg_ParseTupleAndKeywords(args, kwds, "|O&O&O&i", kwlist,
                                      PyArray_AxisConverter,
                                      &axis, PyArray_DescrConverter2,
@@ -1886,6 +2082,9 @@ array_variance(PyArrayObject *self, PyObject *args, PyObject *kwds)
     int ddof = 0;
     static char *kwlist[] = {"axis", "dtype", "out", "ddof", NULL};
 
+    if (_reduce_forwarded(args, kwds, 4)) {
+        return _reduce_forward("var", self, args, kwds);
+    }
     if (!PyArg_ParseTupleAndKeywords(args, kwds, "|O&O&O&i", kwlist,
                                      PyArray_AxisConverter,
                                      &axis, PyArray_DescrConverter2,
@@ -2181,6 +2380,9 @@ NPY_NO_EXPORT PyMethodDef array_methods[] = {
     {"argsort",
         (PyCFunction)array_argsort,
         METH_VARARGS | METH_KEYWORDS, NULL},
+    {"argpartition",
+        (PyCFunction)array_argpartition,
+        METH_VARARGS | METH_KEYWORDS, NULL},
     {"astype",
         (PyCFunction)array_cast,
         METH_VARARGS, NULL},
@@ -2204,7 +2406,7 @@ NPY_NO_EXPORT PyMethodDef array_methods[] = {
         METH_VARARGS, NULL},
     {"copy",
         (PyCFunction)array_copy,
-        METH_VARARGS, NULL},
+        METH_VARARGS | METH_KEYWORDS, NULL},
     {"cumprod",
         (PyCFunction)array_cumprod,
         METH_VARARGS | METH_KEYWORDS, NULL},
@@ -2247,6 +2449,9 @@ NPY_NO_EXPORT PyMethodDef array_methods[] = {
     {"nonzero",
         (PyCFunction)array_nonzero,
         METH_VARARGS, NULL},
+    {"partition",
+        (PyCFunction)array_partition,
+        METH_VARARGS | METH_KEYWORDS, NULL},
     {"prod",
         (PyCFunction)array_prod,
         METH_VARARGS | METH_KEYWORDS, NULL},
@@ -1192,7 +1192,7 @@ array_putmask(PyObject *NPY_UNUSED(module), PyObject *args, PyObject *kwds)
 }
 
 /*NUMPY_API
- * Convert an object to FORTRAN / C / ANY
+ * Convert an object to FORTRAN / C / ANY / KEEP
  */
 NPY_NO_EXPORT int
 PyArray_OrderConverter(PyObject *object, NPY_ORDER *val)
@@ -1232,6 +1232,9 @@ PyArray_OrderConverter(PyObject *object, NPY_ORDER *val)
         else if (str[0] == 'A' || str[0] == 'a') {
             *val = PyArray_ANYORDER;
         }
+        else if (str[0] == 'K' || str[0] == 'k') {
+            *val = PyArray_KEEPORDER;
+        }
         else {
             PyErr_SetString(PyExc_TypeError,
                             "order not understood");
@@ -1443,6 +1446,7 @@ _prepend_ones(PyArrayObject *arr, int nd, int ndmin)
 #define _ARET(x) PyArray_Return((PyArrayObject *)(x))
 
 #define STRIDING_OK(op, order) ((order) == PyArray_ANYORDER ||          \
+                                (order) == PyArray_KEEPORDER ||         \
                                 ((order) == PyArray_CORDER &&           \
                                  PyArray_ISCONTIGUOUS(op)) ||           \
                                 ((order) == PyArray_FORTRANORDER &&     \
@@ -1552,6 +1556,32 @@ clean_type:
     return NULL;
 }
 
+static PyObject *
+array_empty_like(PyObject *NPY_UNUSED(ignored), PyObject *args, PyObject *kwds)
+{
+
+    static char *kwlist[] = {"prototype","dtype","order","subok",NULL};
+    PyArrayObject *prototype = NULL;
+    PyArray_Descr *dtype = NULL;
+    NPY_ORDER order = PyArray_KEEPORDER;
+    int subok = 1;
+    PyObject *ret;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O&|O&O&i", kwlist,
+                PyArray_Converter, &prototype,
+                PyArray_DescrConverter2, &dtype,
+                PyArray_OrderConverter, &order,
+                &subok)) {
+        Py_XDECREF(prototype);
+        Py_XDECREF(dtype);
+        return NULL;
+    }
+    /* steals the reference to dtype */
+    ret = PyArray_NewLikeArray(prototype, order, dtype, subok);
+    Py_DECREF(prototype);
+    return ret;
+}
+
 static PyObject *
 array_empty(PyObject *NPY_UNUSED(ignored), PyObject *args, PyObject *kwds)
 {
@@ -2107,13 +2137,15 @@ static PyObject *
 array_lexsort(PyObject *NPY_UNUSED(ignored), PyObject *args, PyObject *kwds)
 {
     int axis = -1;
+    NPY_SORTKIND which = PyArray_MERGESORT;
     PyObject *obj;
-    static char *kwlist[] = {"keys", "axis", NULL};
+    static char *kwlist[] = {"keys", "axis", "kind", NULL};
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|i", kwlist, &obj, &axis)) {
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|iO&", kwlist, &obj, &axis,
+                                     PyArray_SortkindConverter, &which)) {
         return NULL;
     }
-    return _ARET(PyArray_LexSort(obj, axis));
+    return _ARET(PyArray_LexSortKind(obj, axis, which));
 }
 
 #undef _ARET
@@ -2702,6 +2734,9 @@ static struct PyMethodDef array_module_methods[] = {
     {"empty",
         (PyCFunction)array_empty,
         METH_VARARGS|METH_KEYWORDS, NULL},
+    {"empty_like",
+        (PyCFunction)array_empty_like,
+        METH_VARARGS|METH_KEYWORDS, NULL},
     {"scalar",
         (PyCFunction)array_scalar,
         METH_VARARGS|METH_KEYWORDS, NULL},
@@ -3042,6 +3077,10 @@ PyMODINIT_FUNC initmultiarray(void) {
     if (PyType_Ready(&PyArrayNeighborhoodIter_Type) < 0) {
         return RETVAL;
     }
+    NpyIter_Type.tp_iter = PyObject_SelfIter;
+    if (PyType_Ready(&NpyIter_Type) < 0) {
+        return RETVAL;
+    }
 
     PyArrayDescr_Type.tp_hash = PyArray_DescrHash;
     if (PyType_Ready(&PyArrayDescr_Type) < 0) {
@@ -3121,6 +3160,8 @@ PyMODINIT_FUNC initmultiarray(void) {
     Py_INCREF(&PyArrayMultiIter_Type);
     PyDict_SetItemString(d, "broadcast",
                          (PyObject *)&PyArrayMultiIter_Type);
+    Py_INCREF(&NpyIter_Type);
+    PyDict_SetItemString(d, "nditer", (PyObject *)&NpyIter_Type);
     Py_INCREF(&PyArrayDescr_Type);
     PyDict_SetItemString(d, "dtype", (PyObject *)&PyArrayDescr_Type);
 
@@ -20,6 +20,7 @@
 #include "flagsobject.c"
 #include "ctors.c"
 #include "iterators.c"
+#include "nditer.c"
 #include "mapping.c"
 #include "number.c"
 #include "getset.c"
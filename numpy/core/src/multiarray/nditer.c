@@ -0,0 +1,1311 @@
+/*
+ * NpyIter, a general purpose iterator over several operands at once.
+ *
+ * The operands are broadcast against each other, the axes are put in
+ * the order which best follows the memory layout of the operands, and
+ * neighbouring axes which can be traversed as a single one are
+ * coalesced.  The iterator then hands out one inner loop at a time: a
+ * data pointer and a stride for each operand plus a shared count.
+ *
+ * With NPY_ITER_BUFFERED, operands which have to be cast, are
+ * misaligned or byte-swapped, or which were requested contiguous are
+ * copied into buffers a chunk at a time, and the buffers of write
+ * operands are copied back when the iterator moves on.
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include "structmember.h"
+
+#define _MULTIARRAYMODULE
+#define NPY_NO_PREFIX
+#include "numpy/arrayobject.h"
+
+#include "npy_config.h"
+
+#include "numpy/npy_3kcompat.h"
+
+/* Internal per-operand flags */
+#define NPY_OP_ITFLAG_READ          0x0001
+#define NPY_OP_ITFLAG_WRITE         0x0002
+/* the operand has to be cast to and from its buffer */
+#define NPY_OP_ITFLAG_CAST          0x0004
+/* the operand has to be copied to and from its buffer */
+#define NPY_OP_ITFLAG_COPY          0x0008
+/* the current chunk of the operand lives in its buffer */
+#define NPY_OP_ITFLAG_USINGBUFFER   0x0010
+
+struct NpyIter_InternalOnly {
+    int buffered;
+    int ndim;
+    int nop;
+    intp itersize;
+    intp iterindex;
+    /* Axes in iteration order, the inner loop axis comes first */
+    intp shape[NPY_MAXDIMS];
+    intp coords[NPY_MAXDIMS];
+    intp strides[NPY_MAXDIMS][NPY_MAXARGS];
+    PyArrayObject *operands[NPY_MAXARGS];
+    PyArray_Descr *dtypes[NPY_MAXARGS];
+    npy_uint32 opitflags[NPY_MAXARGS];
+    /* Position of the current inner loop in each operand */
+    char *ptrs[NPY_MAXARGS];
+    /* The inner loop as seen by the caller */
+    char *dataptrs[NPY_MAXARGS];
+    intp innerstrides[NPY_MAXARGS];
+    intp innersize;
+    /* Buffering */
+    intp buffersize;
+    char *buffers[NPY_MAXARGS];
+    char *castbuffers[NPY_MAXARGS];
+    PyArray_VectorUnaryFunc *readcast[NPY_MAXARGS];
+    PyArray_VectorUnaryFunc *writecast[NPY_MAXARGS];
+};
+
+/*
+ * Returns 1 if axis ax should be iterated inside of axis other, judging
+ * by the first operand which has nonzero strides along both of them.
+ */
+static int
+npyiter_axis_is_inner(int nop, PyArrayObject **op,
+                      intp (*opstrides)[NPY_MAXDIMS], int ax, int other)
+{
+    int iop;
+    intp sa, sb;
+
+    for (iop = 0; iop < nop; iop++) {
+        if (op[iop] == NULL) {
+            continue;
+        }
+        sa = opstrides[iop][ax];
+        sb = opstrides[iop][other];
+        if (sa < 0) {
+            sa = -sa;
+        }
+        if (sb < 0) {
+            sb = -sb;
+        }
+        if (sa != 0 && sb != 0 && sa != sb) {
+            return sa < sb;
+        }
+    }
+    return 0;
+}
+
+/*
+ * Sorts the axes in perm (innermost first) by stride magnitude.  The
+ * insertion sort is stable, so ties keep C order.
+ */
+static void
+npyiter_sort_axes(int nop, PyArrayObject **op,
+                  intp (*opstrides)[NPY_MAXDIMS], int ndim, int *perm)
+{
+    int i, j, ax;
+
+    for (i = 1; i < ndim; i++) {
+        ax = perm[i];
+        for (j = i; j > 0 &&
+                npyiter_axis_is_inner(nop, op, opstrides, ax, perm[j-1]);
+                j--) {
+            perm[j] = perm[j-1];
+        }
+        perm[j] = ax;
+    }
+}
+
+/*
+ * Drops the axes of length one and merges each axis into the one
+ * inside of it when every operand can step over both with one stride.
+ */
+static void
+npyiter_coalesce_axes(NpyIter *iter)
+{
+    int idim, newdim, iop, nop = iter->nop;
+    int can;
+
+    newdim = 0;
+    for (idim = 0; idim < iter->ndim; idim++) {
+        if (iter->shape[idim] == 1) {
+            continue;
+        }
+        iter->shape[newdim] = iter->shape[idim];
+        for (iop = 0; iop < nop; iop++) {
+            iter->strides[newdim][iop] = iter->strides[idim][iop];
+        }
+        newdim++;
+    }
+    if (newdim == 0) {
+        iter->shape[0] = 1;
+        for (iop = 0; iop < nop; iop++) {
+            iter->strides[0][iop] = 0;
+        }
+        newdim = 1;
+    }
+    iter->ndim = newdim;
+
+    newdim = 0;
+    for (idim = 1; idim < iter->ndim; idim++) {
+        can = 1;
+        for (iop = 0; iop < nop; iop++) {
+            if (iter->strides[newdim][iop]*iter->shape[newdim] !=
+                    iter->strides[idim][iop]) {
+                can = 0;
+                break;
+            }
+        }
+        if (can) {
+            iter->shape[newdim] *= iter->shape[idim];
+        }
+        else {
+            newdim++;
+            iter->shape[newdim] = iter->shape[idim];
+            for (iop = 0; iop < nop; iop++) {
+                iter->strides[newdim][iop] = iter->strides[idim][iop];
+            }
+        }
+    }
+    iter->ndim = newdim + 1;
+}
+
+/*
+ * Copies n elements of operand iop, starting at the current position
+ * of the iterator, to (or with scatter set, from) the contiguous
+ * buffer.  The walk may cross into the following inner loops.
+ */
+static void
+npyiter_gather(NpyIter *iter, int iop, char *buffer, intp n,
+               int swap, int scatter)
+{
+    PyArrayObject *ao = iter->operands[iop];
+    PyArray_CopySwapNFunc *copyswapn = PyArray_DESCR(ao)->f->copyswapn;
+    intp elsize = PyArray_ITEMSIZE(ao);
+    intp stride = iter->strides[0][iop];
+    intp coords[NPY_MAXDIMS];
+    intp count;
+    char *ptr = iter->ptrs[iop];
+    int idim;
+
+    memcpy(coords, iter->coords, iter->ndim*sizeof(intp));
+    while (n > 0) {
+        count = iter->shape[0] - coords[0];
+        if (count > n) {
+            count = n;
+        }
+        if (scatter) {
+            copyswapn(ptr, stride, buffer, elsize, count, swap, ao);
+        }
+        else {
+            copyswapn(buffer, elsize, ptr, stride, count, swap, ao);
+        }
+        buffer += count*elsize;
+        n -= count;
+        ptr += count*stride;
+        coords[0] += count;
+        if (coords[0] == iter->shape[0]) {
+            ptr -= iter->shape[0]*stride;
+            coords[0] = 0;
+            for (idim = 1; idim < iter->ndim; idim++) {
+                ptr += iter->strides[idim][iop];
+                if (++coords[idim] < iter->shape[idim]) {
+                    break;
+                }
+                ptr -= iter->shape[idim]*iter->strides[idim][iop];
+                coords[idim] = 0;
+            }
+        }
+    }
+}
+
+/* Fills the buffer of operand iop with the next n elements */
+static void
+npyiter_copy_to_buffer(NpyIter *iter, int iop, intp n)
+{
+    PyArrayObject *ao = iter->operands[iop];
+    PyArray_Descr *dtype = iter->dtypes[iop];
+
+    if (iter->opitflags[iop] & NPY_OP_ITFLAG_CAST) {
+        npyiter_gather(iter, iop, iter->castbuffers[iop], n,
+                       PyArray_ISBYTESWAPPED(ao), 0);
+        iter->readcast[iop](iter->castbuffers[iop], iter->buffers[iop],
+                            n, ao, ao);
+        if (!PyArray_ISNBO(dtype->byteorder)) {
+            dtype->f->copyswapn(iter->buffers[iop], dtype->elsize,
+                                NULL, 0, n, 1, NULL);
+        }
+    }
+    else {
+        npyiter_gather(iter, iop, iter->buffers[iop], n, 0, 0);
+    }
+}
+
+/* Writes the first n elements of the buffer of operand iop back */
+static void
+npyiter_copy_from_buffer(NpyIter *iter, int iop, intp n)
+{
+    PyArrayObject *ao = iter->operands[iop];
+    PyArray_Descr *dtype = iter->dtypes[iop];
+
+    if (iter->opitflags[iop] & NPY_OP_ITFLAG_CAST) {
+        if (!PyArray_ISNBO(dtype->byteorder)) {
+            dtype->f->copyswapn(iter->buffers[iop], dtype->elsize,
+                                NULL, 0, n, 1, NULL);
+        }
+        iter->writecast[iop](iter->buffers[iop], iter->castbuffers[iop],
+                             n, ao, ao);
+        npyiter_gather(iter, iop, iter->castbuffers[iop], n,
+                       PyArray_ISBYTESWAPPED(ao), 1);
+    }
+    else {
+        npyiter_gather(iter, iop, iter->buffers[iop], n, 0, 1);
+    }
+}
+
+/*
+ * Sets up the inner loop at the current position, filling the buffers
+ * of the operands which need them.
+ */
+static void
+npyiter_prepare_inner_loop(NpyIter *iter)
+{
+    int iop, nop = iter->nop;
+    int gatherall = 0;
+    intp n, rowleft, left;
+
+    if (!iter->buffered) {
+        iter->innersize = iter->shape[0];
+        for (iop = 0; iop < nop; iop++) {
+            iter->dataptrs[iop] = iter->ptrs[iop];
+            iter->innerstrides[iop] = iter->strides[0][iop];
+        }
+        return;
+    }
+
+    rowleft = iter->shape[0] - iter->coords[0];
+    left = iter->itersize - iter->iterindex;
+    if (rowleft >= iter->buffersize || rowleft == left) {
+        /* The chunk lies within one inner loop */
+        n = (rowleft < iter->buffersize) ? rowleft : iter->buffersize;
+    }
+    else {
+        /*
+         * The chunk spans several inner loops, so no single stride
+         * describes an operand in place: buffer all of them.
+         */
+        n = (left < iter->buffersize) ? left : iter->buffersize;
+        gatherall = 1;
+    }
+    iter->innersize = n;
+    for (iop = 0; iop < nop; iop++) {
+        if (gatherall || (iter->opitflags[iop] &
+                          (NPY_OP_ITFLAG_CAST | NPY_OP_ITFLAG_COPY))) {
+            iter->opitflags[iop] |= NPY_OP_ITFLAG_USINGBUFFER;
+            iter->dataptrs[iop] = iter->buffers[iop];
+            iter->innerstrides[iop] = iter->dtypes[iop]->elsize;
+            if (iter->opitflags[iop] & NPY_OP_ITFLAG_READ) {
+                npyiter_copy_to_buffer(iter, iop, n);
+            }
+        }
+        else {
+            iter->opitflags[iop] &= ~NPY_OP_ITFLAG_USINGBUFFER;
+            iter->dataptrs[iop] = iter->ptrs[iop];
+            iter->innerstrides[iop] = iter->strides[0][iop];
+        }
+    }
+}
+
+/* Moves the position of the iterator count elements forward */
+static void
+npyiter_advance(NpyIter *iter, intp count)
+{
+    int idim, iop, nop = iter->nop;
+    intp step;
+
+    iter->iterindex += count;
+    while (count > 0) {
+        step = iter->shape[0] - iter->coords[0];
+        if (step > count) {
+            step = count;
+        }
+        count -= step;
+        iter->coords[0] += step;
+        for (iop = 0; iop < nop; iop++) {
+            iter->ptrs[iop] += step*iter->strides[0][iop];
+        }
+        if (iter->coords[0] < iter->shape[0]) {
+            continue;
+        }
+        iter->coords[0] = 0;
+        for (iop = 0; iop < nop; iop++) {
+            iter->ptrs[iop] -= iter->shape[0]*iter->strides[0][iop];
+        }
+        for (idim = 1; idim < iter->ndim; idim++) {
+            for (iop = 0; iop < nop; iop++) {
+                iter->ptrs[iop] += iter->strides[idim][iop];
+            }
+            if (++iter->coords[idim] < iter->shape[idim]) {
+                break;
+            }
+            iter->coords[idim] = 0;
+            for (iop = 0; iop < nop; iop++) {
+                iter->ptrs[iop] -=
+                    iter->shape[idim]*iter->strides[idim][iop];
+            }
+        }
+    }
+}
+
+/*
+ * Returns 1 if the data type can be copied into a buffer without
+ * having to care about references or the array it came from.
+ */
+static int
+npyiter_can_buffer(PyArray_Descr *dtype)
+{
+    return !(PyDataType_REFCHK(dtype) ||
+             PyTypeNum_ISFLEXIBLE(dtype->type_num));
+}
+
+/*NUMPY_API
+ * Creates an iterator over the nop arrays in op.
+ *
+ * flags holds the NPY_ITER_* global flags and op_flags (NULL for all
+ * read-only) the per-operand ones.  Operands flagged with
+ * NPY_ITER_ALLOCATE may be NULL, they are then created with the
+ * broadcast shape, laid out in iteration order.  op_dtypes (may be
+ * NULL, as may its entries) requests the data type each operand is
+ * seen with, which requires buffering when it differs from the one of
+ * the array.  buffersize is the number of elements per buffered chunk,
+ * 0 for the default.
+ *
+ * The iterator holds references to the operands and data types, the
+ * caller keeps its own.  Returns NULL with an exception set on error.
+ */
+NPY_NO_EXPORT NpyIter *
+NpyIter_New(int nop, PyArrayObject **op, npy_uint32 flags,
+            npy_uint32 *op_flags, PyArray_Descr **op_dtypes,
+            intp buffersize)
+{
+    NpyIter *iter;
+    PyArrayObject *ao;
+    PyArray_Descr *dtype;
+    npy_uint32 opf;
+    intp shape[NPY_MAXDIMS];
+    intp opstrides[NPY_MAXARGS][NPY_MAXDIMS];
+    intp outstrides[NPY_MAXDIMS];
+    intp dim, stride;
+    int perm[NPY_MAXDIMS];
+    int iop, idim, off, ndim = 0;
+    int needbuffer = 0;
+
+    if (nop < 1 || nop > NPY_MAXARGS) {
+        PyErr_Format(PyExc_ValueError,
+                     "the iterator needs between 1 and %d operands",
+                     NPY_MAXARGS);
+        return NULL;
+    }
+    if ((flags & NPY_ITER_C_ORDER) && (flags & NPY_ITER_F_ORDER)) {
+        PyErr_SetString(PyExc_ValueError,
+                        "only one iteration order can be requested");
+        return NULL;
+    }
+
+    iter = (NpyIter *)PyArray_malloc(sizeof(NpyIter));
+    if (iter == NULL) {
+        PyErr_NoMemory();
+        return NULL;
+    }
+    memset(iter, 0, sizeof(NpyIter));
+    iter->nop = nop;
+
+    /* Check the operands and find the number of dimensions */
+    for (iop = 0; iop < nop; iop++) {
+        opf = (op_flags == NULL) ? NPY_ITER_READONLY : op_flags[iop];
+        if (!(opf & NPY_ITER_READWRITE)) {
+            PyErr_Format(PyExc_ValueError,
+                         "operand %d must be flagged readonly, "
+                         "writeonly or readwrite", iop);
+            goto fail;
+        }
+        if (opf & NPY_ITER_READONLY) {
+            iter->opitflags[iop] |= NPY_OP_ITFLAG_READ;
+        }
+        if (opf & NPY_ITER_WRITEONLY) {
+            iter->opitflags[iop] |= NPY_OP_ITFLAG_WRITE;
+        }
+        ao = op[iop];
+        if (ao == NULL) {
+            if (!(opf & NPY_ITER_ALLOCATE) || (opf & NPY_ITER_READONLY)) {
+                PyErr_Format(PyExc_ValueError,
+                             "operand %d is NULL but not flagged "
+                             "writeonly and allocate", iop);
+                goto fail;
+            }
+            continue;
+        }
+        if ((opf & NPY_ITER_WRITEONLY) && !PyArray_ISWRITEABLE(ao)) {
+            PyErr_Format(PyExc_ValueError,
+                         "operand %d is not writeable", iop);
+            goto fail;
+        }
+        Py_INCREF(ao);
+        iter->operands[iop] = ao;
+        if (PyArray_NDIM(ao) > ndim) {
+            ndim = PyArray_NDIM(ao);
+        }
+    }
+
+    /* Broadcast the operands */
+    for (idim = 0; idim < ndim; idim++) {
+        shape[idim] = 1;
+    }
+    for (iop = 0; iop < nop; iop++) {
+        ao = iter->operands[iop];
+        if (ao == NULL) {
+            continue;
+        }
+        off = ndim - PyArray_NDIM(ao);
+        for (idim = 0; idim < PyArray_NDIM(ao); idim++) {
+            dim = PyArray_DIM(ao, idim);
+            if (dim == 1) {
+                continue;
+            }
+            if (shape[off + idim] == 1) {
+                shape[off + idim] = dim;
+            }
+            else if (shape[off + idim] != dim) {
+                PyErr_SetString(PyExc_ValueError,
+                                "operands could not be broadcast together");
+                goto fail;
+            }
+        }
+    }
+    for (iop = 0; iop < nop; iop++) {
+        ao = iter->operands[iop];
+        if (ao == NULL) {
+            continue;
+        }
+        off = ndim - PyArray_NDIM(ao);
+        for (idim = 0; idim < ndim; idim++) {
+            dim = (idim < off) ? 1 : PyArray_DIM(ao, idim - off);
+            if (dim == 1) {
+                opstrides[iop][idim] = 0;
+            }
+            else {
+                opstrides[iop][idim] = PyArray_STRIDE(ao, idim - off);
+            }
+            if (dim != shape[idim] &&
+                    (iter->opitflags[iop] & NPY_OP_ITFLAG_WRITE)) {
+                PyErr_Format(PyExc_ValueError,
+                             "write operand %d would need broadcasting",
+                             iop);
+                goto fail;
+            }
+        }
+    }
+
+    /* Data types, allocated operands default to the first operand's */
+    for (iop = 0; iop < nop; iop++) {
+        dtype = (op_dtypes == NULL) ? NULL : op_dtypes[iop];
+        if (dtype == NULL) {
+            if (iter->operands[iop] != NULL) {
+                dtype = PyArray_DESCR(iter->operands[iop]);
+            }
+            else if (iter->operands[0] != NULL) {
+                dtype = PyArray_DESCR(iter->operands[0]);
+            }
+            else {
+                PyErr_Format(PyExc_ValueError,
+                             "no data type given to allocate operand %d",
+                             iop);
+                goto fail;
+            }
+        }
+        Py_INCREF(dtype);
+        iter->dtypes[iop] = dtype;
+    }
+
+    /* The iteration order, perm[0] being the innermost axis */
+    for (idim = 0; idim < ndim; idim++) {
+        if (flags & NPY_ITER_F_ORDER) {
+            perm[idim] = idim;
+        }
+        else {
+            perm[idim] = ndim - 1 - idim;
+        }
+    }
+    if (!(flags & (NPY_ITER_C_ORDER | NPY_ITER_F_ORDER))) {
+        npyiter_sort_axes(nop, iter->operands, opstrides, ndim, perm);
+    }
+
+    /* Allocate the missing operands, laid out in iteration order */
+    for (iop = 0; iop < nop; iop++) {
+        if (iter->operands[iop] != NULL) {
+            continue;
+        }
+        dtype = iter->dtypes[iop];
+        stride = dtype->elsize;
+        for (idim = 0; idim < ndim; idim++) {
+            outstrides[perm[idim]] = stride;
+            stride *= shape[perm[idim]];
+        }
+        Py_INCREF(dtype);
+        ao = (PyArrayObject *)PyArray_NewFromDescr(&PyArray_Type, dtype,
+                                    ndim, shape, outstrides, NULL, 0, NULL);
+        if (ao == NULL) {
+            goto fail;
+        }
+        PyArray_UpdateFlags(ao, UPDATE_ALL);
+        iter->operands[iop] = ao;
+        for (idim = 0; idim < ndim; idim++) {
+            opstrides[iop][idim] = (shape[idim] == 1) ? 0 : outstrides[idim];
+        }
+    }
+
+    /* Lay out the axes in iteration order and coalesce them */
+    iter->itersize = 1;
+    for (idim = 0; idim < ndim; idim++) {
+        iter->shape[idim] = shape[perm[idim]];
+        iter->itersize *= iter->shape[idim];
+        for (iop = 0; iop < nop; iop++) {
+            iter->strides[idim][iop] = opstrides[iop][perm[idim]];
+        }
+    }
+    iter->ndim = ndim;
+    npyiter_coalesce_axes(iter);
+
+    /* Find the operands which need a buffer */
+    for (iop = 0; iop < nop; iop++) {
+        ao = iter->operands[iop];
+        dtype = iter->dtypes[iop];
+        opf = (op_flags == NULL) ? NPY_ITER_READONLY : op_flags[iop];
+        if (!PyArray_EquivTypes(PyArray_DESCR(ao), dtype)) {
+            iter->opitflags[iop] |= NPY_OP_ITFLAG_CAST;
+        }
+        else if ((flags & NPY_ITER_BUFFERED) && !PyArray_ISALIGNED(ao)) {
+            iter->opitflags[iop] |= NPY_OP_ITFLAG_COPY;
+        }
+        if ((opf & NPY_ITER_CONTIG) && iter->shape[0] > 1 &&
+                iter->strides[0][iop] != dtype->elsize) {
+            iter->opitflags[iop] |= NPY_OP_ITFLAG_COPY;
+        }
+        if (!(iter->opitflags[iop] &
+              (NPY_OP_ITFLAG_CAST | NPY_OP_ITFLAG_COPY))) {
+            continue;
+        }
+        if (!(flags & NPY_ITER_BUFFERED)) {
+            PyErr_Format(PyExc_TypeError,
+                         "operand %d needs buffering, which was not "
+                         "enabled", iop);
+            goto fail;
+        }
+        needbuffer = 1;
+        if (!(iter->opitflags[iop] & NPY_OP_ITFLAG_CAST)) {
+            continue;
+        }
+        if (!npyiter_can_buffer(PyArray_DESCR(ao)) ||
+                !npyiter_can_buffer(dtype)) {
+            PyErr_Format(PyExc_TypeError,
+                         "cannot cast operand %d in buffers, object "
+                         "and flexible data types are not supported",
+                         iop);
+            goto fail;
+        }
+        if (iter->opitflags[iop] & NPY_OP_ITFLAG_READ) {
+            iter->readcast[iop] = PyArray_GetCastFunc(PyArray_DESCR(ao),
+                                                      dtype->type_num);
+            if (iter->readcast[iop] == NULL) {
+                goto fail;
+            }
+        }
+        if (iter->opitflags[iop] & NPY_OP_ITFLAG_WRITE) {
+            iter->writecast[iop] = PyArray_GetCastFunc(dtype,
+                                            PyArray_DESCR(ao)->type_num);
+            if (iter->writecast[iop] == NULL) {
+                goto fail;
+            }
+        }
+    }
+
+    if (needbuffer) {
+        for (iop = 0; iop < nop; iop++) {
+            ao = iter->operands[iop];
+            if (!(iter->opitflags[iop] & NPY_OP_ITFLAG_CAST) &&
+                    !npyiter_can_buffer(PyArray_DESCR(ao))) {
+                /* Chunks spanning inner loops would copy this one */
+                PyErr_Format(PyExc_TypeError,
+                             "cannot buffer operand %d, object and "
+                             "flexible data types are not supported", iop);
+                goto fail;
+            }
+        }
+        iter->buffered = 1;
+        if (buffersize <= 0) {
+            buffersize = NPY_BUFSIZE;
+        }
+        if (buffersize > iter->itersize) {
+            buffersize = iter->itersize;
+        }
+        if (buffersize < 1) {
+            buffersize = 1;
+        }
+        iter->buffersize = buffersize;
+        for (iop = 0; iop < nop; iop++) {
+            iter->buffers[iop] = PyArray_malloc(buffersize *
+                                                iter->dtypes[iop]->elsize);
+            if (iter->buffers[iop] == NULL) {
+                PyErr_NoMemory();
+                goto fail;
+            }
+            if (iter->opitflags[iop] & NPY_OP_ITFLAG_CAST) {
+                iter->castbuffers[iop] = PyArray_malloc(buffersize *
+                                            PyArray_ITEMSIZE(iter->operands[iop]));
+                if (iter->castbuffers[iop] == NULL) {
+                    PyErr_NoMemory();
+                    goto fail;
+                }
+            }
+        }
+    }
+
+    for (iop = 0; iop < nop; iop++) {
+        iter->ptrs[iop] = PyArray_DATA(iter->operands[iop]);
+    }
+    if (iter->itersize > 0) {
+        npyiter_prepare_inner_loop(iter);
+    }
+    else {
+        iter->innersize = 0;
+        for (iop = 0; iop < nop; iop++) {
+            iter->dataptrs[iop] = iter->ptrs[iop];
+            iter->innerstrides[iop] = iter->strides[0][iop];
+        }
+    }
+    return iter;
+
+ fail:
+    NpyIter_Deallocate(iter);
+    return NULL;
+}
+
+/*NUMPY_API
+ * Releases the iterator with its references and buffers.  The buffers
+ * of write operands are not flushed, see NpyIter_Next.
+ */
+NPY_NO_EXPORT int
+NpyIter_Deallocate(NpyIter *iter)
+{
+    int iop;
+
+    for (iop = 0; iop < iter->nop; iop++) {
+        Py_XDECREF(iter->operands[iop]);
+        Py_XDECREF(iter->dtypes[iop]);
+        if (iter->buffers[iop] != NULL) {
+            PyArray_free(iter->buffers[iop]);
+        }
+        if (iter->castbuffers[iop] != NULL) {
+            PyArray_free(iter->castbuffers[iop]);
+        }
+    }
+    PyArray_free(iter);
+    return NPY_SUCCEED;
+}
+
+/*NUMPY_API
+ * Moves to the next inner loop.  Returns 1 when there is one, and 0
+ * once the iteration is done, after writing back the last buffers.
+ *
+ * Does not use the Python API, so the caller may release the GIL
+ * around the whole loop.
+ */
+NPY_NO_EXPORT int
+NpyIter_Next(NpyIter *iter)
+{
+    int iop;
+
+    if (iter->iterindex >= iter->itersize) {
+        return 0;
+    }
+    if (iter->buffered) {
+        for (iop = 0; iop < iter->nop; iop++) {
+            if ((iter->opitflags[iop] & NPY_OP_ITFLAG_USINGBUFFER) &&
+                    (iter->opitflags[iop] & NPY_OP_ITFLAG_WRITE)) {
+                npyiter_copy_from_buffer(iter, iop, iter->innersize);
+            }
+        }
+    }
+    npyiter_advance(iter, iter->innersize);
+    if (iter->iterindex >= iter->itersize) {
+        return 0;
+    }
+    npyiter_prepare_inner_loop(iter);
+    return 1;
+}
+
+/*NUMPY_API
+ * Returns the total number of elements the iterator visits.
+ */
+NPY_NO_EXPORT intp
+NpyIter_GetIterSize(NpyIter *iter)
+{
+    return iter->itersize;
+}
+
+/*NUMPY_API
+ * Returns the number of axes iterated over, after coalescing.
+ */
+NPY_NO_EXPORT int
+NpyIter_GetNDim(NpyIter *iter)
+{
+    return iter->ndim;
+}
+
+/*NUMPY_API
+ * Returns the number of operands.
+ */
+NPY_NO_EXPORT int
+NpyIter_GetNOp(NpyIter *iter)
+{
+    return iter->nop;
+}
+
+/*NUMPY_API
+ * Returns the array of data pointers of the inner loop.  The array is
+ * updated in place by NpyIter_Next.
+ */
+NPY_NO_EXPORT char **
+NpyIter_GetDataPtrArray(NpyIter *iter)
+{
+    return iter->dataptrs;
+}
+
+/*NUMPY_API
+ * Returns the array of strides of the inner loop.  The array is
+ * updated in place by NpyIter_Next.
+ */
+NPY_NO_EXPORT intp *
+NpyIter_GetInnerStrideArray(NpyIter *iter)
+{
+    return iter->innerstrides;
+}
+
+/*NUMPY_API
+ * Returns a pointer to the number of elements of the inner loop, which
+ * is updated in place by NpyIter_Next.
+ */
+NPY_NO_EXPORT intp *
+NpyIter_GetInnerLoopSizePtr(NpyIter *iter)
+{
+    return &iter->innersize;
+}
+
+/*NUMPY_API
+ * Returns the array of operands, including the allocated ones.  The
+ * references are borrowed.
+ */
+NPY_NO_EXPORT PyArrayObject **
+NpyIter_GetOperandArray(NpyIter *iter)
+{
+    return iter->operands;
+}
+
+/*NUMPY_API
+ * Returns the array of data types the operands are seen with in the
+ * inner loop.  The references are borrowed.
+ */
+NPY_NO_EXPORT PyArray_Descr **
+NpyIter_GetDescrArray(NpyIter *iter)
+{
+    return iter->dtypes;
+}
+
+/*========================= Python nditer object =========================*/
+
+typedef struct {
+    PyObject_HEAD
+    NpyIter *iter;
+    npy_uint32 op_flags[NPY_MAXARGS];
+    /* 0 before the first inner loop, 1 while iterating, 2 when done */
+    int state;
+} NpyIterObject;
+
+typedef struct {
+    char *name;
+    npy_uint32 value;
+} npyiter_flagname;
+
+static npyiter_flagname npyiter_global_flagnames[] = {
+    {"buffered", NPY_ITER_BUFFERED},
+    {NULL, 0}
+};
+
+static npyiter_flagname npyiter_op_flagnames[] = {
+    {"readonly", NPY_ITER_READONLY},
+    {"writeonly", NPY_ITER_WRITEONLY},
+    {"readwrite", NPY_ITER_READWRITE},
+    {"allocate", NPY_ITER_ALLOCATE},
+    {"contig", NPY_ITER_CONTIG},
+    {NULL, 0}
+};
+
+static int
+npyiter_is_string(PyObject *obj)
+{
+    return PyBytes_Check(obj) || PyUnicode_Check(obj);
+}
+
+/* ORs the flag named by obj into *flags */
+static int
+npyiter_convert_flag(PyObject *obj, npyiter_flagname *names,
+                     npy_uint32 *flags)
+{
+    PyObject *tmp = NULL;
+    char *str;
+
+    if (PyUnicode_Check(obj)) {
+        obj = tmp = PyUnicode_AsASCIIString(obj);
+        if (obj == NULL) {
+            return -1;
+        }
+    }
+    str = PyBytes_AsString(obj);
+    if (str == NULL) {
+        Py_XDECREF(tmp);
+        return -1;
+    }
+    for (; names->name != NULL; names++) {
+        if (strcmp(str, names->name) == 0) {
+            *flags |= names->value;
+            Py_XDECREF(tmp);
+            return 0;
+        }
+    }
+    PyErr_Format(PyExc_ValueError, "unrecognized iterator flag '%s'", str);
+    Py_XDECREF(tmp);
+    return -1;
+}
+
+/* Converts a flag name or a sequence of them */
+static int
+npyiter_convert_flags(PyObject *obj, npyiter_flagname *names,
+                      npy_uint32 *flags)
+{
+    PyObject *item;
+    Py_ssize_t i, n;
+
+    *flags = 0;
+    if (npyiter_is_string(obj)) {
+        return npyiter_convert_flag(obj, names, flags);
+    }
+    n = PySequence_Size(obj);
+    if (n < 0) {
+        return -1;
+    }
+    for (i = 0; i < n; i++) {
+        item = PySequence_GetItem(obj, i);
+        if (item == NULL) {
+            return -1;
+        }
+        if (npyiter_convert_flag(item, names, flags) < 0) {
+            Py_DECREF(item);
+            return -1;
+        }
+        Py_DECREF(item);
+    }
+    return 0;
+}
+
+static int
+npyiter_convert_op_flags(PyObject *obj, int nop, PyArrayObject **op,
+                         npy_uint32 *op_flags)
+{
+    PyObject *item;
+    int iop;
+
+    if (obj == NULL || obj == Py_None) {
+        for (iop = 0; iop < nop; iop++) {
+            if (op[iop] == NULL) {
+                op_flags[iop] = NPY_ITER_WRITEONLY | NPY_ITER_ALLOCATE;
+            }
+            else {
+                op_flags[iop] = NPY_ITER_READONLY;
+            }
+        }
+        return 0;
+    }
+    if (npyiter_is_string(obj)) {
+        goto same_for_all;
+    }
+    if (PySequence_Size(obj) < 0) {
+        return -1;
+    }
+    if (PySequence_Size(obj) > 0) {
+        item = PySequence_GetItem(obj, 0);
+        if (item == NULL) {
+            return -1;
+        }
+        if (npyiter_is_string(item)) {
+            Py_DECREF(item);
+            goto same_for_all;
+        }
+        Py_DECREF(item);
+    }
+    if (PySequence_Size(obj) != nop) {
+        PyErr_SetString(PyExc_ValueError,
+                        "op_flags must have one entry per operand");
+        return -1;
+    }
+    for (iop = 0; iop < nop; iop++) {
+        item = PySequence_GetItem(obj, iop);
+        if (item == NULL) {
+            return -1;
+        }
+        if (npyiter_convert_flags(item, npyiter_op_flagnames,
+                                  &op_flags[iop]) < 0) {
+            Py_DECREF(item);
+            return -1;
+        }
+        Py_DECREF(item);
+    }
+    return 0;
+
+ same_for_all:
+    if (npyiter_convert_flags(obj, npyiter_op_flagnames, &op_flags[0]) < 0) {
+        return -1;
+    }
+    for (iop = 1; iop < nop; iop++) {
+        op_flags[iop] = op_flags[0];
+    }
+    return 0;
+}
+
+static int
+npyiter_convert_op_dtypes(PyObject *obj, int nop, PyArray_Descr **op_dtypes)
+{
+    PyObject *item;
+    int iop;
+
+    if (obj == NULL || obj == Py_None) {
+        return 0;
+    }
+    if (nop == 1) {
+        return PyArray_DescrConverter2(obj, &op_dtypes[0]) ? 0 : -1;
+    }
+    if (!PyTuple_Check(obj) && !PyList_Check(obj)) {
+        PyErr_SetString(PyExc_ValueError,
+                        "op_dtypes must be a sequence with one data type "
+                        "per operand");
+        return -1;
+    }
+    if (PySequence_Size(obj) != nop) {
+        PyErr_SetString(PyExc_ValueError,
+                        "op_dtypes must have one entry per operand");
+        return -1;
+    }
+    for (iop = 0; iop < nop; iop++) {
+        item = PySequence_GetItem(obj, iop);
+        if (item == NULL) {
+            return -1;
+        }
+        if (!PyArray_DescrConverter2(item, &op_dtypes[iop])) {
+            Py_DECREF(item);
+            return -1;
+        }
+        Py_DECREF(item);
+    }
+    return 0;
+}
+
+static PyObject *
+nditer_new(PyTypeObject *subtype, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"op", "flags", "op_flags", "op_dtypes",
+                             "order", "buffersize", NULL};
+    PyObject *op_in, *flags_in = NULL, *op_flags_in = NULL;
+    PyObject *op_dtypes_in = NULL, *item;
+    char *order = "K";
+    Py_ssize_t buffersize = 0;
+    PyArrayObject *op[NPY_MAXARGS];
+    PyArray_Descr *op_dtypes[NPY_MAXARGS];
+    npy_uint32 op_flags[NPY_MAXARGS];
+    npy_uint32 flags = 0;
+    NpyIterObject *self = NULL;
+    NpyIter *iter;
+    int iop, nop = 0;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|OOOsn", kwlist,
+                                     &op_in, &flags_in, &op_flags_in,
+                                     &op_dtypes_in, &order, &buffersize)) {
+        return NULL;
+    }
+
+    for (iop = 0; iop < NPY_MAXARGS; iop++) {
+        op[iop] = NULL;
+        op_dtypes[iop] = NULL;
+    }
+    if (PyTuple_Check(op_in) || PyList_Check(op_in)) {
+        nop = PySequence_Size(op_in);
+        if (nop < 1 || nop > NPY_MAXARGS) {
+            PyErr_Format(PyExc_ValueError,
+                         "the iterator needs between 1 and %d operands",
+                         NPY_MAXARGS);
+            return NULL;
+        }
+        for (iop = 0; iop < nop; iop++) {
+            item = PySequence_GetItem(op_in, iop);
+            if (item == NULL) {
+                goto finish;
+            }
+            if (item != Py_None) {
+                op[iop] = (PyArrayObject *)PyArray_FromAny(item, NULL,
+                                                           0, 0, 0, NULL);
+                if (op[iop] == NULL) {
+                    Py_DECREF(item);
+                    goto finish;
+                }
+            }
+            Py_DECREF(item);
+        }
+    }
+    else {
+        nop = 1;
+        op[0] = (PyArrayObject *)PyArray_FromAny(op_in, NULL, 0, 0, 0, NULL);
+        if (op[0] == NULL) {
+            return NULL;
+        }
+    }
+
+    if (flags_in != NULL && flags_in != Py_None &&
+            npyiter_convert_flags(flags_in, npyiter_global_flagnames,
+                                  &flags) < 0) {
+        goto finish;
+    }
+    if (npyiter_convert_op_flags(op_flags_in, nop, op, op_flags) < 0) {
+        goto finish;
+    }
+    if (npyiter_convert_op_dtypes(op_dtypes_in, nop, op_dtypes) < 0) {
+        goto finish;
+    }
+    if (order[0] == 'C' || order[0] == 'c') {
+        flags |= NPY_ITER_C_ORDER;
+    }
+    else if (order[0] == 'F' || order[0] == 'f') {
+        flags |= NPY_ITER_F_ORDER;
+    }
+    else if (order[0] != 'K' && order[0] != 'k') {
+        PyErr_SetString(PyExc_ValueError,
+                        "order must be one of 'C', 'F' or 'K'");
+        goto finish;
+    }
+
+    iter = NpyIter_New(nop, op, flags, op_flags, op_dtypes, buffersize);
+    if (iter == NULL) {
+        goto finish;
+    }
+    self = (NpyIterObject *)subtype->tp_alloc(subtype, 0);
+    if (self == NULL) {
+        NpyIter_Deallocate(iter);
+        goto finish;
+    }
+    self->iter = iter;
+    memcpy(self->op_flags, op_flags, nop*sizeof(npy_uint32));
+    self->state = 0;
+
+ finish:
+    for (iop = 0; iop < nop; iop++) {
+        Py_XDECREF(op[iop]);
+        Py_XDECREF(op_dtypes[iop]);
+    }
+    return (PyObject *)self;
+}
+
+static void
+nditer_dealloc(NpyIterObject *self)
+{
+    if (self->iter != NULL) {
+        NpyIter_Deallocate(self->iter);
+    }
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+/* Returns 1-d views of the current inner loop, one per operand */
+static PyObject *
+nditer_value(NpyIterObject *self)
+{
+    NpyIter *iter = self->iter;
+    PyArrayObject *view;
+    PyObject *ret;
+    int iop, nop = iter->nop;
+
+    ret = PyTuple_New(nop);
+    if (ret == NULL) {
+        return NULL;
+    }
+    for (iop = 0; iop < nop; iop++) {
+        Py_INCREF(iter->dtypes[iop]);
+        view = (PyArrayObject *)PyArray_NewFromDescr(&PyArray_Type,
+                        iter->dtypes[iop], 1, &iter->innersize,
+                        &iter->innerstrides[iop], iter->dataptrs[iop],
+                        (self->op_flags[iop] & NPY_ITER_WRITEONLY) ?
+                                NPY_WRITEABLE : 0,
+                        NULL);
+        if (view == NULL) {
+            Py_DECREF(ret);
+            return NULL;
+        }
+        Py_INCREF(self);
+        view->base = (PyObject *)self;
+        PyArray_UpdateFlags(view, UPDATE_ALL);
+        PyTuple_SET_ITEM(ret, iop, (PyObject *)view);
+    }
+    if (nop == 1) {
+        view = (PyArrayObject *)PyTuple_GET_ITEM(ret, 0);
+        Py_INCREF(view);
+        Py_DECREF(ret);
+        return (PyObject *)view;
+    }
+    return ret;
+}
+
+static PyObject *
+nditer_next(NpyIterObject *self)
+{
+    if (self->iter == NULL || self->state == 2) {
+        return NULL;
+    }
+    if (self->state == 0) {
+        self->state = 1;
+        if (NpyIter_GetIterSize(self->iter) == 0) {
+            self->state = 2;
+            return NULL;
+        }
+    }
+    else if (!NpyIter_Next(self->iter)) {
+        self->state = 2;
+        return NULL;
+    }
+    return nditer_value(self);
+}
+
+static PyObject *
+nditer_operands_get(NpyIterObject *self)
+{
+    PyObject *ret;
+    PyArrayObject **operands = NpyIter_GetOperandArray(self->iter);
+    int iop, nop = NpyIter_GetNOp(self->iter);
+
+    ret = PyTuple_New(nop);
+    if (ret == NULL) {
+        return NULL;
+    }
+    for (iop = 0; iop < nop; iop++) {
+        Py_INCREF(operands[iop]);
+        PyTuple_SET_ITEM(ret, iop, (PyObject *)operands[iop]);
+    }
+    return ret;
+}
+
+static PyObject *
+nditer_itersize_get(NpyIterObject *self)
+{
+    intp size = NpyIter_GetIterSize(self->iter);
+
+#if SIZEOF_INTP <= SIZEOF_LONG
+    return PyInt_FromLong((long) size);
+#else
+    if (size < MAX_LONG) {
+        return PyInt_FromLong((long) size);
+    }
+    else {
+        return PyLong_FromLongLong((longlong) size);
+    }
+#endif
+}
+
+static PyObject *
+nditer_ndim_get(NpyIterObject *self)
+{
+    return PyInt_FromLong(NpyIter_GetNDim(self->iter));
+}
+
+static PyObject *
+nditer_nop_get(NpyIterObject *self)
+{
+    return PyInt_FromLong(NpyIter_GetNOp(self->iter));
+}
+
+static PyGetSetDef nditer_getsetlist[] = {
+    {"operands",
+        (getter)nditer_operands_get,
+        NULL, NULL, NULL},
+    {"itersize",
+        (getter)nditer_itersize_get,
+        NULL, NULL, NULL},
+    {"ndim",
+        (getter)nditer_ndim_get,
+        NULL, NULL, NULL},
+    {"nop",
+        (getter)nditer_nop_get,
+        NULL, NULL, NULL},
+    {NULL, NULL, NULL, NULL, NULL},
+};
+
+NPY_NO_EXPORT PyTypeObject NpyIter_Type = {
+#if defined(NPY_PY3K)
+    PyVarObject_HEAD_INIT(NULL, 0)
+#else
+    PyObject_HEAD_INIT(NULL)
+    0,                                          /* ob_size */
+#endif
+    "numpy.nditer",                             /* tp_name */
+    sizeof(NpyIterObject),                      /* tp_basicsize */
+    0,                                          /* tp_itemsize */
+    /* methods */
+    (destructor)nditer_dealloc,                 /* tp_dealloc */
+    0,                                          /* tp_print */
+    0,                                          /* tp_getattr */
+    0,                                          /* tp_setattr */
+#if defined(NPY_PY3K)
+    0,                                          /* tp_reserved */
+#else
+    0,                                          /* tp_compare */
+#endif
+    0,                                          /* tp_repr */
+    0,                                          /* tp_as_number */
+    0,                                          /* tp_as_sequence */
+    0,                                          /* tp_as_mapping */
+    0,                                          /* tp_hash */
+    0,                                          /* tp_call */
+    0,                                          /* tp_str */
+    0,                                          /* tp_getattro */
+    0,                                          /* tp_setattro */
+    0,                                          /* tp_as_buffer */
+    Py_TPFLAGS_DEFAULT,                         /* tp_flags */
+    0,                                          /* tp_doc */
+    0,                                          /* tp_traverse */
+    0,                                          /* tp_clear */
+    0,                                          /* tp_richcompare */
+    0,                                          /* tp_weaklistoffset */
+    0,                                          /* tp_iter */
+    (iternextfunc)nditer_next,                  /* tp_iternext */
+    0,                                          /* tp_methods */
+    0,                                          /* tp_members */
+    nditer_getsetlist,                          /* tp_getset */
+    0,                                          /* tp_base */
+    0,                                          /* tp_dict */
+    0,                                          /* tp_descr_get */
+    0,                                          /* tp_descr_set */
+    0,                                          /* tp_dictoffset */
+    (initproc)0,                                /* tp_init */
+    0,                                          /* tp_alloc */
+    nditer_new,                                 /* tp_new */
+    0,                                          /* tp_free */
+    0,                                          /* tp_is_gc */
+    0,                                          /* tp_bases */
+    0,                                          /* tp_mro */
+    0,                                          /* tp_cache */
+    0,                                          /* tp_subclasses */
+    0,                                          /* tp_weaklist */
+    0,                                          /* tp_del */
+#if PY_VERSION_HEX >= 0x02060000
+    0,                                          /* tp_version_tag */
+#endif
+};
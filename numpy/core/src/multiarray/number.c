@@ -13,6 +13,12 @@
 
 #include "number.h"
 
+#ifdef HAVE_BACKTRACE
+#include <execinfo.h>
+#include <dlfcn.h>
+#define NPY_ELIDE_TEMPS
+#endif
+
 /*************************************************************************
  ****************   Implement Number Protocol ****************************
  *************************************************************************/
@@ -243,34 +249,251 @@ PyArray_GenericInplaceUnaryFunction(PyArrayObject *m1, PyObject *op)
     return PyObject_CallFunction(op, "OO", m1, m1);
 }
 
+/*
+ * Temporary elision
+ *
+ * In a + b + c the interpreter hands the result of a + b, which nobody
+ * else can see, to the second addition.  The binary operations below
+ * then put their result into that temporary instead of a new array,
+ * saving the allocation and the page faults of touching new memory.
+ *
+ * A temporary is an array with a reference count of one.  That is only
+ * conclusive when the number protocol was called by the interpreter: C
+ * code may hold the only reference to an array it keeps using.  So the
+ * call stack is checked with backtrace(), which takes a few
+ * microseconds, and only large arrays are considered.
+ */
+#ifdef NPY_ELIDE_TEMPS
+
+/* Smaller temporaries are not worth checking the stack for */
+#define NPY_MIN_ELIDE_BYTES (256 * 1024)
+#define NPY_ELIDE_STACKSIZE 10
+
+#if PY_VERSION_HEX >= 0x03060000
+#define NPY_FRAME_EVAL "_PyEval_EvalFrameDefault"
+#else
+#define NPY_FRAME_EVAL "PyEval_EvalFrameEx"
+#endif
+
+static int
+_in_table(void **table, int n, void *addr)
+{
+    int i;
+
+    for (i = 0; i < n; i++) {
+        if (table[i] == addr) {
+            return 1;
+        }
+    }
+    return 0;
+}
+
+/*
+ * Whether the current call came straight from the interpreter: beyond
+ * the frames of this module the stack holds only functions of the
+ * Python library up to the frame evaluation function.
+ */
+static int
+_called_from_interpreter(void)
+{
+    /* -1 if the stack cannot be checked here */
+    static int init = 0;
+    static void *python_base, *multiarray_base;
+    /* Return addresses looked up before */
+    static void *eval_addr[16], *python_addr[64], *multiarray_addr[64];
+    static int n_eval = 0, n_python = 0, n_multiarray = 0;
+    void *stack[NPY_ELIDE_STACKSIZE];
+    Dl_info info;
+    int i, n, in_python = 0;
+
+    if (init < 0) {
+        return 0;
+    }
+    if (init == 0) {
+        init = -1;
+        if (!dladdr((void *)&PyNumber_Or, &info)) {
+            return 0;
+        }
+        python_base = info.dli_fbase;
+        if (!dladdr((void *)&_called_from_interpreter, &info)) {
+            return 0;
+        }
+        multiarray_base = info.dli_fbase;
+        if (python_base == multiarray_base) {
+            return 0;
+        }
+        init = 1;
+    }
+
+    n = backtrace(stack, NPY_ELIDE_STACKSIZE);
+    for (i = 0; i < n; i++) {
+        if (_in_table(eval_addr, n_eval, stack[i])) {
+            return 1;
+        }
+        if (_in_table(python_addr, n_python, stack[i])) {
+            in_python = 1;
+            continue;
+        }
+        if (_in_table(multiarray_addr, n_multiarray, stack[i])) {
+            if (in_python) {
+                return 0;
+            }
+            continue;
+        }
+        if (!dladdr(stack[i], &info)) {
+            return 0;
+        }
+        if (info.dli_fbase == multiarray_base && !in_python) {
+            if (n_multiarray < 64) {
+                multiarray_addr[n_multiarray++] = stack[i];
+            }
+            continue;
+        }
+        if (info.dli_fbase != python_base) {
+            return 0;
+        }
+        in_python = 1;
+        if (info.dli_sname != NULL &&
+                strcmp(info.dli_sname, NPY_FRAME_EVAL) == 0) {
+            if (n_eval < 16) {
+                eval_addr[n_eval++] = stack[i];
+            }
+            return 1;
+        }
+        if (n_python < 64) {
+            python_addr[n_python++] = stack[i];
+        }
+    }
+    return 0;
+}
+
+/*
+ * Whether op(temp, other) can be computed in place in temp: temp is a
+ * large temporary array and the result has its shape and type.  The
+ * type is found by running op on an empty array, so that it follows the
+ * ufunc rules exactly, also for scalars.
+ */
+static int
+_can_elide_temp(PyObject *temp, PyObject *other, PyObject *op)
+{
+    PyArrayObject *a = (PyArrayObject *)temp;
+    PyObject *probe, *probe_other, *res;
+    intp zero = 0;
+    int i, ok;
+
+    if (op == NULL || Py_REFCNT(temp) != 1 || !PyArray_CheckExact(temp) ||
+            !PyArray_ISNUMBER(a) || !PyArray_CHKFLAGS(a, NPY_OWNDATA) ||
+            !PyArray_ISWRITEABLE(a) || PyArray_CHKFLAGS(a, NPY_UPDATEIFCOPY) ||
+            PyArray_NBYTES(a) < NPY_MIN_ELIDE_BYTES) {
+        return 0;
+    }
+    if (PyArray_CheckExact(other)) {
+        PyArrayObject *b = (PyArrayObject *)other;
+
+        /* other must broadcast to temp */
+        if (b->nd > a->nd) {
+            return 0;
+        }
+        for (i = 1; i <= b->nd; i++) {
+            if (b->dimensions[b->nd - i] != 1 &&
+                    b->dimensions[b->nd - i] != a->dimensions[a->nd - i]) {
+                return 0;
+            }
+        }
+        if (b->nd == 0) {
+            Py_INCREF(other);
+            probe_other = other;
+        }
+        else {
+            Py_INCREF(b->descr);
+            probe_other = PyArray_NewFromDescr(&PyArray_Type, b->descr,
+                                               1, &zero, NULL, NULL, 0, NULL);
+            if (probe_other == NULL) {
+                PyErr_Clear();
+                return 0;
+            }
+        }
+    }
+    else if (PyArray_IsAnyScalar(other)) {
+        Py_INCREF(other);
+        probe_other = other;
+    }
+    else {
+        return 0;
+    }
+
+    Py_INCREF(a->descr);
+    probe = PyArray_NewFromDescr(&PyArray_Type, a->descr,
+                                 1, &zero, NULL, NULL, 0, NULL);
+    if (probe == NULL) {
+        PyErr_Clear();
+        Py_DECREF(probe_other);
+        return 0;
+    }
+    res = PyObject_CallFunctionObjArgs(op, probe, probe_other, NULL);
+    Py_DECREF(probe);
+    Py_DECREF(probe_other);
+    if (res == NULL) {
+        PyErr_Clear();
+        return 0;
+    }
+    ok = PyArray_Check(res) &&
+        PyArray_EquivTypes(((PyArrayObject *)res)->descr, a->descr);
+    Py_DECREF(res);
+
+    return ok && _called_from_interpreter();
+}
+
+#endif
+
+/*
+ * m1 op m2, in place in m1 if it is a temporary, or in m2 if op is
+ * commutative.
+ */
+static PyObject *
+_binary_elide(PyObject *m1, PyObject *m2, PyObject *op, int commutative)
+{
+#ifdef NPY_ELIDE_TEMPS
+    if (_can_elide_temp(m1, m2, op)) {
+        return PyArray_GenericInplaceBinaryFunction((PyArrayObject *)m1,
+                                                    m2, op);
+    }
+    if (commutative && _can_elide_temp(m2, m1, op)) {
+        return PyArray_GenericInplaceBinaryFunction((PyArrayObject *)m2,
+                                                    m1, op);
+    }
+#endif
+    return PyArray_GenericBinaryFunction((PyArrayObject *)m1, m2, op);
+}
+
 static PyObject *
 array_add(PyArrayObject *m1, PyObject *m2)
 {
-    return PyArray_GenericBinaryFunction(m1, m2, n_ops.add);
+    return _binary_elide((PyObject *)m1, m2, n_ops.add, 1);
 }
 
 static PyObject *
 array_subtract(PyArrayObject *m1, PyObject *m2)
 {
-    return PyArray_GenericBinaryFunction(m1, m2, n_ops.subtract);
+    return _binary_elide((PyObject *)m1, m2, n_ops.subtract, 0);
 }
 
 static PyObject *
 array_multiply(PyArrayObject *m1, PyObject *m2)
 {
-    return PyArray_GenericBinaryFunction(m1, m2, n_ops.multiply);
+    return _binary_elide((PyObject *)m1, m2, n_ops.multiply, 1);
 }
 
 static PyObject *
 array_divide(PyArrayObject *m1, PyObject *m2)
 {
-    return PyArray_GenericBinaryFunction(m1, m2, n_ops.divide);
+    return _binary_elide((PyObject *)m1, m2, n_ops.divide, 0);
 }
 
 static PyObject *
 array_remainder(PyArrayObject *m1, PyObject *m2)
 {
-    return PyArray_GenericBinaryFunction(m1, m2, n_ops.remainder);
+    return _binary_elide((PyObject *)m1, m2, n_ops.remainder, 0);
 }
 
 static int
@@ -414,31 +637,31 @@ array_invert(PyArrayObject *m1)
 static PyObject *
 array_left_shift(PyArrayObject *m1, PyObject *m2)
 {
-    return PyArray_GenericBinaryFunction(m1, m2, n_ops.left_shift);
+    return _binary_elide((PyObject *)m1, m2, n_ops.left_shift, 0);
 }
 
 static PyObject *
 array_right_shift(PyArrayObject *m1, PyObject *m2)
 {
-    return PyArray_GenericBinaryFunction(m1, m2, n_ops.right_shift);
+    return _binary_elide((PyObject *)m1, m2, n_ops.right_shift, 0);
 }
 
 static PyObject *
 array_bitwise_and(PyArrayObject *m1, PyObject *m2)
 {
-    return PyArray_GenericBinaryFunction(m1, m2, n_ops.bitwise_and);
+    return _binary_elide((PyObject *)m1, m2, n_ops.bitwise_and, 1);
 }
 
 static PyObject *
 array_bitwise_or(PyArrayObject *m1, PyObject *m2)
 {
-    return PyArray_GenericBinaryFunction(m1, m2, n_ops.bitwise_or);
+    return _binary_elide((PyObject *)m1, m2, n_ops.bitwise_or, 1);
 }
 
 static PyObject *
 array_bitwise_xor(PyArrayObject *m1, PyObject *m2)
 {
-    return PyArray_GenericBinaryFunction(m1, m2, n_ops.bitwise_xor);
+    return _binary_elide((PyObject *)m1, m2, n_ops.bitwise_xor, 1);
 }
 
 static PyObject *
@@ -516,13 +739,13 @@ array_inplace_bitwise_xor(PyArrayObject *m1, PyObject *m2)
 static PyObject *
 array_floor_divide(PyArrayObject *m1, PyObject *m2)
 {
-    return PyArray_GenericBinaryFunction(m1, m2, n_ops.floor_divide);
+    return _binary_elide((PyObject *)m1, m2, n_ops.floor_divide, 0);
 }
 
 static PyObject *
 array_true_divide(PyArrayObject *m1, PyObject *m2)
 {
-    return PyArray_GenericBinaryFunction(m1, m2, n_ops.true_divide);
+    return _binary_elide((PyObject *)m1, m2, n_ops.true_divide, 0);
 }
 
 static PyObject *
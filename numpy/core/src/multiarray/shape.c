@@ -185,7 +185,7 @@ PyArray_Newshape(PyArrayObject *self, PyArray_Dims *newdims,
     intp newstrides[MAX_DIMS];
     int flags;
 
-    if (fortran == PyArray_ANYORDER) {
+    if (fortran == PyArray_ANYORDER || fortran == PyArray_KEEPORDER) {
         fortran = PyArray_ISFORTRAN(self);
     }
     /*  Quick check to make sure anything actually needs to be done */
@@ -770,7 +770,7 @@ PyArray_Ravel(PyArrayObject *a, NPY_ORDER fortran)
     PyArray_Dims newdim = {NULL,1};
     intp val[1] = {-1};
 
-    if (fortran == PyArray_ANYORDER) {
+    if (fortran == PyArray_ANYORDER || fortran == PyArray_KEEPORDER) {
         fortran = PyArray_ISFORTRAN(a);
     }
     newdim.ptr = val;
@@ -794,7 +794,7 @@ PyArray_Flatten(PyArrayObject *a, NPY_ORDER order)
     PyObject *ret;
     intp size;
 
-    if (order == PyArray_ANYORDER) {
+    if (order == PyArray_ANYORDER || order == PyArray_KEEPORDER) {
         order = PyArray_ISFORTRAN(a);
     }
     size = PyArray_SIZE(a);
@@ -39,6 +39,7 @@
 #include "numpy/ufuncobject.h"
 
 #include "ufunc_object.h"
+#include "ufunc_threads.h"
 
 #define USE_USE_DEFAULTS 1
 
@@ -204,6 +205,7 @@ PyUFunc_clearfperr()
 #define BUFFER_UFUNCLOOP    3
 #define BUFFER_REDUCELOOP   3
 #define SIGNATURE_NOBUFFER_UFUNCLOOP 4
+#define ITER_UFUNCLOOP      5
 
 
 static char
@@ -795,8 +797,8 @@ PyUFunc_GetPyValues(char *name, int *bufsize, int *errmask, PyObject **errobj)
 
 /*
  * Create copies for any arrays that are less than loop->bufsize
- * in total size (or core_enabled) and are mis-behaved or in need
- * of casting.
+ * in total size (or core_enabled, or masked by where=) and are
+ * mis-behaved or in need of casting.
  */
 static int
 _create_copies(PyUFuncLoopObject *loop, int *arg_types, PyArrayObject **mps)
@@ -822,7 +824,8 @@ _create_copies(PyUFuncLoopObject *loop, int *arg_types, PyArrayObject **mps)
             }
             Py_DECREF(atype);
         }
-        if (size < loop->bufsize || loop->ufunc->core_enabled) {
+        if (size < loop->bufsize || loop->ufunc->core_enabled
+                || loop->where != NULL) {
             if (!(PyArray_ISBEHAVED_RO(mps[i]))
                 || PyArray_TYPE(mps[i]) != arg_types[i]) {
                 ntype = PyArray_DescrFromType(arg_types[i]);
@@ -1157,6 +1160,246 @@ _trunc_coredim(PyArrayObject *ap, int core_nd)
     return ret;
 }
 
+static int
+_is_identity_perm(const int *perm, int nd)
+{
+    int i;
+
+    for (i = 0; i < nd; i++) {
+        if (perm[i] != i) {
+            return 0;
+        }
+    }
+    return 1;
+}
+
+/*
+ * Return 1 if axis "a" should vary more slowly than axis "b": the first
+ * operand with distinct non-zero strides along both axes decides, the
+ * larger stride varying more slowly.
+ */
+static int
+_axis_is_slower(intp **strides, int nop, int a, int b)
+{
+    intp sa, sb;
+    int i;
+
+    for (i = 0; i < nop; i++) {
+        sa = strides[i][a] < 0 ? -strides[i][a] : strides[i][a];
+        sb = strides[i][b] < 0 ? -strides[i][b] : strides[i][b];
+        if (sa != 0 && sb != 0 && sa != sb) {
+            return sa > sb;
+        }
+    }
+    return 0;
+}
+
+/*
+ * Choose the order in which the loop walks its axes from the order=
+ * keyword and the layout of the operands, and store it in loop->perm
+ * as the axes from slowest to fastest varying.  The default 'K' follows
+ * the strides of the inputs (broadcast to the loop shape) and of any
+ * outputs that were passed in, so that transposed or Fortran-ordered
+ * operands are walked in memory order.
+ */
+static void
+_compute_loop_perm(PyUFuncLoopObject *loop, PyArrayObject **mps,
+                   Py_ssize_t nargs)
+{
+    PyUFuncObject *self = loop->ufunc;
+    NPY_ORDER order = loop->order;
+    intp *strides[NPY_MAXARGS];
+    int nd = loop->nd;
+    int i, j, ax, nop = 0;
+
+    for (i = 0; i < nd; i++) {
+        loop->perm[i] = i;
+    }
+    if (nd <= 1 || self->core_enabled || loop->size == 0) {
+        return;
+    }
+    if (order == NPY_ANYORDER) {
+        order = NPY_CORDER;
+        for (i = 0; i < self->nin; i++) {
+            if (mps[i]->nd <= 1) {
+                continue;
+            }
+            if (!PyArray_ISFORTRAN(mps[i]) || PyArray_ISCONTIGUOUS(mps[i])) {
+                order = NPY_CORDER;
+                break;
+            }
+            order = NPY_FORTRANORDER;
+        }
+    }
+    if (order == NPY_FORTRANORDER) {
+        for (i = 0; i < nd; i++) {
+            loop->perm[i] = nd - 1 - i;
+        }
+        return;
+    }
+    if (order != NPY_KEEPORDER) {
+        return;
+    }
+
+    for (i = 0; i < self->nin; i++) {
+        strides[nop++] = loop->iters[i]->strides;
+    }
+    for (i = self->nin; i < nargs; i++) {
+        if (mps[i] != NULL) {
+            strides[nop++] = mps[i]->strides;
+        }
+    }
+    /* Stable insertion sort; axes of length one carry no information */
+    for (i = 1; i < nd; i++) {
+        ax = loop->perm[i];
+        for (j = i; j > 0; j--) {
+            if (loop->dimensions[ax] == 1
+                    || loop->dimensions[loop->perm[j - 1]] == 1
+                    || !_axis_is_slower(strides, nop, ax, loop->perm[j - 1])) {
+                break;
+            }
+            loop->perm[j] = loop->perm[j - 1];
+        }
+        loop->perm[j] = ax;
+    }
+}
+
+/*
+ * Allocate an output of the loop shape with its axes laid out in memory
+ * in the loop order.
+ */
+static PyArrayObject *
+_new_loop_output(PyUFuncLoopObject *loop, PyTypeObject *subtype,
+                 int nd, intp *dims, int type_num)
+{
+    PyArray_Descr *descr;
+    PyArrayObject *ret;
+    intp strides[NPY_MAXDIMS], stride;
+    int i;
+
+    if (nd != loop->nd || _is_identity_perm(loop->perm, nd)) {
+        return (PyArrayObject *)PyArray_New(subtype, nd, dims, type_num,
+                                            NULL, NULL, 0, 0, NULL);
+    }
+    descr = PyArray_DescrFromType(type_num);
+    if (descr == NULL) {
+        return NULL;
+    }
+    stride = descr->elsize;
+    for (i = nd - 1; i >= 0; i--) {
+        strides[loop->perm[i]] = stride;
+        stride *= dims[loop->perm[i]];
+    }
+    ret = (PyArrayObject *)PyArray_NewFromDescr(subtype, descr, nd, dims,
+                                                strides, NULL, 0, NULL);
+    if (ret == NULL) {
+        return NULL;
+    }
+    PyArray_UpdateFlags(ret, UPDATE_ALL);
+    return ret;
+}
+
+/*
+ * Return 1 if the operand can be walked in the loop order as a single
+ * run of elements: either it holds one element, or it has the loop shape
+ * and is contiguous in that order.
+ */
+static int
+_is_loop_contiguous(PyUFuncLoopObject *loop, PyArrayObject *ap)
+{
+    intp stride;
+    int i, ax;
+
+    if (PyArray_SIZE(ap) == 1) {
+        return 1;
+    }
+    if (ap->nd != loop->nd
+            || !PyArray_CompareLists(ap->dimensions, loop->dimensions,
+                                     loop->nd)) {
+        return 0;
+    }
+    stride = ap->descr->elsize;
+    for (i = loop->nd - 1; i >= 0; i--) {
+        ax = loop->perm[i];
+        if (ap->dimensions[ax] != 1 && ap->strides[ax] != stride) {
+            return 0;
+        }
+        stride *= ap->dimensions[ax];
+    }
+    return 1;
+}
+
+/*
+ * Reorder the axes of an iterator over the loop shape to follow "perm",
+ * so that PyArray_ITER_NEXT walks them from slowest to fastest varying.
+ */
+static void
+_permute_iter_axes(PyArrayIterObject *it, const int *perm)
+{
+    intp dims_m1[NPY_MAXDIMS], strides[NPY_MAXDIMS];
+    intp backstrides[NPY_MAXDIMS];
+    int i, nd = it->nd_m1 + 1;
+
+    memcpy(dims_m1, it->dims_m1, nd*sizeof(intp));
+    memcpy(strides, it->strides, nd*sizeof(intp));
+    memcpy(backstrides, it->backstrides, nd*sizeof(intp));
+    for (i = 0; i < nd; i++) {
+        it->dims_m1[i] = dims_m1[perm[i]];
+        it->strides[i] = strides[perm[i]];
+        it->backstrides[i] = backstrides[perm[i]];
+    }
+    it->factors[nd - 1] = 1;
+    for (i = nd - 2; i >= 0; i--) {
+        it->factors[i] = it->factors[i + 1]*(it->dims_m1[i + 1] + 1);
+    }
+}
+
+/*
+ * Return 1 if NpyIter can buffer all the arrays: their items must not
+ * hold references or have a flexible size.
+ */
+static int
+_can_iter_buffer(PyArrayObject **mps, int n)
+{
+    int i;
+
+    for (i = 0; i < n; i++) {
+        if (PyDataType_REFCHK(mps[i]->descr) || PyArray_ISFLEXIBLE(mps[i])) {
+            return 0;
+        }
+    }
+    return 1;
+}
+
+/*
+ * Create the iterator of an ITER_UFUNCLOOP.  It broadcasts the operands,
+ * walks them in memory order and casts, aligns or byte-swaps those which
+ * need it in buffers of loop->bufsize elements.
+ */
+static int
+_construct_iter(PyUFuncLoopObject *loop, PyArrayObject **mps, int *arg_types)
+{
+    PyArray_Descr *dtypes[NPY_MAXARGS];
+    npy_uint32 op_flags[NPY_MAXARGS];
+    int i, nargs = loop->ufunc->nargs;
+
+    for (i = 0; i < nargs; i++) {
+        dtypes[i] = PyArray_DescrFromType(arg_types[i]);
+        if (i < loop->ufunc->nin) {
+            op_flags[i] = NPY_ITER_READONLY;
+        }
+        else {
+            op_flags[i] = NPY_ITER_WRITEONLY;
+        }
+    }
+    loop->iter = NpyIter_New(nargs, mps, NPY_ITER_BUFFERED, op_flags, dtypes,
+                             loop->bufsize);
+    for (i = 0; i < nargs; i++) {
+        Py_DECREF(dtypes[i]);
+    }
+    return (loop->iter == NULL) ? -1 : 0;
+}
+
 static Py_ssize_t
 construct_arrays(PyUFuncLoopObject *loop, PyObject *args, PyArrayObject **mps,
                  PyObject *typetup)
@@ -1178,6 +1421,7 @@ construct_arrays(PyUFuncLoopObject *loop, PyObject *args, PyArrayObject **mps,
     npy_intp *out_dims;
     int out_nd;
     PyObject *wraparr[NPY_MAXARGS];
+    int permcontig = 0;
 
     /* Check number of arguments */
     nargs = PyTuple_Size(args);
@@ -1377,6 +1621,8 @@ construct_arrays(PyUFuncLoopObject *loop, PyObject *args, PyArrayObject **mps,
         }
     }
 
+    _compute_loop_perm(loop, mps, nargs);
+
     /* construct any missing return arrays and make output iterators */
     for(i = self->nin; i < self->nargs; i++) {
         PyArray_Descr *ntype;
@@ -1386,12 +1632,8 @@ construct_arrays(PyUFuncLoopObject *loop, PyObject *args, PyArrayObject **mps,
             if (!out_dims) {
                 return -1;
             }
-            mps[i] = (PyArrayObject *)PyArray_New(subtype,
-                                                  out_nd,
-                                                  out_dims,
-                                                  arg_types[i],
-                                                  NULL, NULL,
-                                                  0, 0, NULL);
+            mps[i] = _new_loop_output(loop, subtype, out_nd, out_dims,
+                                      arg_types[i]);
             if (mps[i] == NULL) {
                 return -1;
             }
@@ -1415,7 +1657,8 @@ construct_arrays(PyUFuncLoopObject *loop, PyObject *args, PyArrayObject **mps,
             /* still not the same -- or will we have to use buffers?*/
             if (mps[i]->descr->type_num != arg_types[i]
                 || !PyArray_ISBEHAVED_RO(mps[i])) {
-                if (loop->size < loop->bufsize || self->core_enabled) {
+                if (loop->size < loop->bufsize || self->core_enabled
+                        || loop->where != NULL) {
                     PyObject *new;
                     /*
                      * Copy the array to a temporary copy
@@ -1555,6 +1798,10 @@ construct_arrays(PyUFuncLoopObject *loop, PyObject *args, PyArrayObject **mps,
                         "Object type not allowed in ufunc with signature");
         return -1;
     }
+    if (loop->meth == BUFFER_UFUNCLOOP && !(loop->obj & UFUNC_OBJ_ISOBJECT)
+            && _can_iter_buffer(mps, self->nargs)) {
+        loop->meth = ITER_UFUNCLOOP;
+    }
     if (loop->meth == NO_UFUNCLOOP) {
         loop->meth = ONE_UFUNCLOOP;
 
@@ -1573,6 +1820,22 @@ construct_arrays(PyUFuncLoopObject *loop, PyObject *args, PyArrayObject **mps,
                 }
             }
         }
+        /*
+         * Operands all laid out contiguously in a non-C loop order
+         * (e.g. all Fortran ordered) can still be walked in one run
+         */
+        if (loop->meth == NOBUFFER_UFUNCLOOP && loop->where == NULL
+                && !_is_identity_perm(loop->perm, loop->nd)) {
+            for (i = 0; i < self->nargs; i++) {
+                if (!_is_loop_contiguous(loop, mps[i])) {
+                    break;
+                }
+            }
+            if (i == self->nargs) {
+                loop->meth = ONE_UFUNCLOOP;
+                permcontig = 1;
+            }
+        }
         if (loop->meth == ONE_UFUNCLOOP) {
             for (i = 0; i < self->nargs; i++) {
                 loop->bufptr[i] = mps[i]->data;
@@ -1586,6 +1849,11 @@ construct_arrays(PyUFuncLoopObject *loop, PyObject *args, PyArrayObject **mps,
     if (loop->meth == SIGNATURE_NOBUFFER_UFUNCLOOP && loop->nd == 0) {
         /* Use default core_strides */
     }
+    else if (loop->meth == ITER_UFUNCLOOP) {
+        if (_construct_iter(loop, mps, arg_types) < 0) {
+            return -1;
+        }
+    }
     else if (loop->meth != ONE_UFUNCLOOP) {
         int ldim;
         intp minsum;
@@ -1652,6 +1920,18 @@ construct_arrays(PyUFuncLoopObject *loop, PyObject *args, PyArrayObject **mps,
             loop->steps[i] = it->strides[ldim];
         }
 
+        /* Walk the outer axes in the loop order */
+        if (!_is_identity_perm(loop->perm, loop->nd)) {
+            for (i = 0; i < loop->numiter; i++) {
+                _permute_iter_axes(loop->iters[i], loop->perm);
+            }
+            for (i = 0; i < loop->nd; i++) {
+                if (loop->perm[i] == ldim) {
+                    loop->lastdim = i;
+                }
+            }
+        }
+
         /*
          * Set looping part of core_dim_sizes and core_strides.
          */
@@ -1684,6 +1964,9 @@ construct_arrays(PyUFuncLoopObject *loop, PyObject *args, PyArrayObject **mps,
             if (PyArray_SIZE(mps[i]) == 1) {
                 loop->steps[i] = 0;
             }
+            else if (permcontig) {
+                loop->steps[i] = mps[i]->descr->elsize;
+            }
             else {
                 loop->steps[i] = mps[i]->strides[mps[i]->nd - 1];
             }
@@ -1814,6 +2097,9 @@ ufuncreduce_dealloc(PyUFuncReduceObject *self)
         Py_XDECREF(self->ret);
         Py_XDECREF(self->errobj);
         Py_XDECREF(self->decref);
+        if (self->iter) {
+            NpyIter_Deallocate(self->iter);
+        }
         if (self->buffer) {
             PyDataMem_FREE(self->buffer);
         }
@@ -1837,15 +2123,299 @@ ufuncloop_dealloc(PyUFuncLoopObject *self)
         for (i = 0; i < self->ufunc->nargs; i++) {
             Py_XDECREF(self->iters[i]);
         }
+        if (self->iter) {
+            NpyIter_Deallocate(self->iter);
+        }
         if (self->buffer[0]) {
             PyDataMem_FREE(self->buffer[0]);
         }
+        Py_XDECREF(self->where);
+        Py_XDECREF(self->maskit);
         Py_XDECREF(self->errobj);
         Py_DECREF(self->ufunc);
     }
     _pya_free(self);
 }
 
+/*
+ * Set up loop->maskit and loop->maskstep to walk the where= mask
+ * broadcast against the loop, in step with the operands.  Masked loops
+ * never use buffers: operands in need of casting or copying have already
+ * been copied by construct_arrays.
+ */
+static int
+_setup_mask(PyUFuncLoopObject *loop)
+{
+    PyArrayObject *new;
+    PyArrayIterObject *it;
+    int ldim;
+
+    if (loop->notimplemented || loop->meth == NO_UFUNCLOOP) {
+        return 0;
+    }
+    if (loop->meth == BUFFER_UFUNCLOOP || loop->meth == ITER_UFUNCLOOP) {
+        PyErr_SetString(PyExc_RuntimeError,
+                        "never reached; copy should have been made");
+        return -1;
+    }
+    if (loop->nd == 0) {
+        if (loop->where->nd != 0) {
+            PyErr_SetString(PyExc_ValueError,
+                            "where= mask has more dimensions than the result");
+            return -1;
+        }
+        loop->maskstep = 0;
+        return 0;
+    }
+    it = (PyArrayIterObject *)PyArray_BroadcastToShape(
+            (PyObject *)loop->where, loop->dimensions, loop->nd);
+    if (it == NULL) {
+        return -1;
+    }
+    if (loop->meth == ONE_UFUNCLOOP) {
+        /* The operands are walked as one run in C order */
+        if (it->contiguous) {
+            loop->maskstep = sizeof(Bool);
+        }
+        else if (loop->nd == 1) {
+            loop->maskstep = it->strides[0];
+        }
+        else {
+            new = (PyArrayObject *)PyArray_New(&PyArray_Type, loop->nd,
+                    loop->dimensions, PyArray_BOOL, NULL, NULL, 0, 0, NULL);
+            if (new == NULL || PyArray_CopyInto(new, loop->where) < 0) {
+                Py_XDECREF(new);
+                Py_DECREF(it);
+                return -1;
+            }
+            Py_DECREF(loop->where);
+            loop->where = new;
+            loop->maskstep = sizeof(Bool);
+        }
+        Py_DECREF(it);
+        return 0;
+    }
+
+    /*
+     * Fix the iterator to skip the inner loop dimension and to walk the
+     * others in the loop order, as for the operands
+     */
+    ldim = loop->perm[loop->lastdim];
+    it->contiguous = 0;
+    it->size /= (it->dims_m1[ldim] + 1);
+    it->dims_m1[ldim] = 0;
+    it->backstrides[ldim] = 0;
+    loop->maskstep = it->strides[ldim];
+    if (!_is_identity_perm(loop->perm, loop->nd)) {
+        _permute_iter_axes(it, loop->perm);
+    }
+    loop->maskit = it;
+    return 0;
+}
+
+/*
+ * Call the inner loop function on the dims[0] elements at args, skipping
+ * the elements not selected by the mask at maskptr: each run of selected
+ * elements is passed to the function in a single call.
+ */
+static void
+_masked_inner_loop(PyUFuncGenericFunction function, void *funcdata,
+                   int nargs, char **args, intp *dims, intp *steps,
+                   char *maskptr, intp maskstep)
+{
+    char *ptrs[NPY_MAXARGS];
+    intp n = dims[0], start = 0, end;
+    int i;
+
+    while (start < n) {
+        while (start < n && !maskptr[start*maskstep]) {
+            start++;
+        }
+        end = start;
+        while (end < n && maskptr[end*maskstep]) {
+            end++;
+        }
+        if (end > start) {
+            for (i = 0; i < nargs; i++) {
+                ptrs[i] = args[i] + start*steps[i];
+            }
+            dims[0] = end - start;
+            function(ptrs, dims, steps, funcdata);
+        }
+        start = end;
+    }
+    dims[0] = n;
+}
+
+/*
+ * Handle the floating point status of a loop that ran on the thread pool:
+ * the flags raised by the workers together with those of this thread.
+ */
+static int
+_check_threads_fperr(int errormask, PyObject *errobj, int fpstatus,
+                     int *first)
+{
+    if (!errormask) {
+        return 0;
+    }
+    return PyUFunc_handlefperr(errormask, errobj,
+            fpstatus | PyUFunc_getfperr(), first);
+}
+
+/* The range of memory spanned by the elements of ap */
+static void
+_array_extent(PyArrayObject *ap, char **low, char **high)
+{
+    intp extent;
+    int i;
+
+    *low = *high = ap->data;
+    for (i = 0; i < ap->nd; i++) {
+        extent = (ap->dimensions[i] - 1)*ap->strides[i];
+        if (extent < 0) {
+            *low += extent;
+        }
+        else {
+            *high += extent;
+        }
+    }
+    *high += ap->descr->elsize;
+}
+
+/*
+ * Whether the outputs can be written piece by piece in any order: every
+ * output either is another operand element for element or shares no
+ * memory with it.
+ */
+static int
+_outputs_independent(PyUFuncObject *self, PyArrayObject **mps)
+{
+    char *olow, *ohigh, *low, *high;
+    int i, j;
+
+    for (i = self->nin; i < self->nargs; i++) {
+        _array_extent(mps[i], &olow, &ohigh);
+        for (j = 0; j < self->nargs; j++) {
+            if (j == i) {
+                continue;
+            }
+            if (mps[j]->data == mps[i]->data && mps[j]->nd == mps[i]->nd &&
+                    PyArray_CompareLists(mps[j]->strides, mps[i]->strides,
+                                         mps[i]->nd)) {
+                continue;
+            }
+            _array_extent(mps[j], &low, &high);
+            if (low < ohigh && olow < high) {
+                return 0;
+            }
+        }
+    }
+    return 1;
+}
+
+/*
+ * Number of threads to run an elementwise loop over n outer items doing
+ * work elements in total with.
+ */
+static int
+_loop_threads(PyUFuncLoopObject *loop, PyArrayObject **mps, intp n,
+              intp work)
+{
+    int nthreads = ufunc_threads_for_size(n, work);
+
+    if (nthreads > 1 && ((loop->obj & UFUNC_OBJ_NEEDS_API) ||
+                loop->funcdata == (void *)mps ||
+                !_outputs_independent(loop->ufunc, mps))) {
+        return 1;
+    }
+    return nthreads;
+}
+
+/* Run elements [start, stop) of a ONE_UFUNCLOOP */
+static void
+_one_loop_piece(void *data, intp start, intp stop)
+{
+    PyUFuncLoopObject *loop = (PyUFuncLoopObject *)data;
+    char *ptrs[NPY_MAXARGS];
+    intp n = stop - start;
+    int i, nargs = loop->ufunc->nargs;
+
+    for (i = 0; i < nargs; i++) {
+        ptrs[i] = loop->bufptr[i] + start*loop->steps[i];
+    }
+    if (loop->where != NULL) {
+        _masked_inner_loop(loop->function, loop->funcdata, nargs, ptrs, &n,
+                loop->steps, loop->where->data + start*loop->maskstep,
+                loop->maskstep);
+    }
+    else {
+        loop->function(ptrs, &n, loop->steps, loop->funcdata);
+    }
+}
+
+/*
+ * Run the inner loops [start, stop) of a NOBUFFER_UFUNCLOOP.  The
+ * iterators are only read: the piece walks its own copy of their
+ * position, as PyArray_ITER_NEXT would.
+ */
+static void
+_nobuffer_loop_piece(void *data, intp start, intp stop)
+{
+    PyUFuncLoopObject *loop = (PyUFuncLoopObject *)data;
+    PyArrayIterObject *it = loop->iters[0], *maskit = loop->maskit;
+    char *ptrs[NPY_MAXARGS], *mptr = NULL;
+    intp coord[NPY_MAXDIMS], count = loop->bufcnt, index = start;
+    int i, k, nargs = loop->ufunc->nargs, nd = it->nd_m1 + 1;
+
+    for (k = nd - 1; k >= 0; k--) {
+        coord[k] = index % (it->dims_m1[k] + 1);
+        index /= it->dims_m1[k] + 1;
+    }
+    for (i = 0; i < nargs; i++) {
+        ptrs[i] = loop->iters[i]->dataptr;
+        for (k = 0; k < nd; k++) {
+            ptrs[i] += coord[k]*loop->iters[i]->strides[k];
+        }
+    }
+    if (maskit != NULL) {
+        mptr = maskit->dataptr;
+        for (k = 0; k < nd; k++) {
+            mptr += coord[k]*maskit->strides[k];
+        }
+    }
+
+    for (index = start; index < stop; index++) {
+        if (index > start) {
+            for (k = nd - 1; k >= 0; k--) {
+                if (coord[k] < it->dims_m1[k]) {
+                    coord[k]++;
+                    for (i = 0; i < nargs; i++) {
+                        ptrs[i] += loop->iters[i]->strides[k];
+                    }
+                    if (maskit != NULL) {
+                        mptr += maskit->strides[k];
+                    }
+                    break;
+                }
+                coord[k] = 0;
+                for (i = 0; i < nargs; i++) {
+                    ptrs[i] -= loop->iters[i]->backstrides[k];
+                }
+                if (maskit != NULL) {
+                    mptr -= maskit->backstrides[k];
+                }
+            }
+        }
+        if (maskit != NULL) {
+            _masked_inner_loop(loop->function, loop->funcdata, nargs, ptrs,
+                    &count, loop->steps, mptr, loop->maskstep);
+        }
+        else {
+            loop->function(ptrs, &count, loop->steps, loop->funcdata);
+        }
+    }
+}
+
 static PyUFuncLoopObject *
 construct_loop(PyUFuncObject *self, PyObject *args, PyObject *kwds, PyArrayObject **mps)
 {
@@ -1853,6 +2423,7 @@ construct_loop(PyUFuncObject *self, PyObject *args, PyObject *kwds, PyArrayObjec
     int i;
     PyObject *typetup = NULL;
     PyObject *extobj = NULL;
+    PyObject *where = NULL;
     char *name;
 
     if (self == NULL) {
@@ -1877,6 +2448,10 @@ construct_loop(PyUFuncObject *self, PyObject *args, PyObject *kwds, PyArrayObjec
     loop->first = 1;
     loop->core_dim_sizes = NULL;
     loop->core_strides = NULL;
+    loop->where = NULL;
+    loop->maskit = NULL;
+    loop->order = NPY_KEEPORDER;
+    loop->iter = NULL;
 
     if (self->core_enabled) {
         int num_dim_ix = 1 + self->core_num_dim_ix;
@@ -1896,7 +2471,7 @@ construct_loop(PyUFuncObject *self, PyObject *args, PyObject *kwds, PyArrayObjec
     name = self->name ? self->name : "";
 
     /*
-     * Extract sig= keyword and extobj= keyword if present.
+     * Extract sig=, extobj=, where= and order= keywords if present.
      * Raise an error if anything else is present in the
      * keyword dictionary
      */
@@ -1917,6 +2492,14 @@ construct_loop(PyUFuncObject *self, PyObject *args, PyObject *kwds, PyArrayObjec
             else if (strncmp(keystring,"sig",3) == 0) {
                 typetup = value;
             }
+            else if (strncmp(keystring,"where",5) == 0) {
+                where = value;
+            }
+            else if (strncmp(keystring,"order",5) == 0) {
+                if (!PyArray_OrderConverter(value, &(loop->order))) {
+                    goto fail;
+                }
+            }
             else {
                 char *format = "'%s' is an invalid keyword to %s";
                 PyErr_Format(PyExc_TypeError,format,keystring, name);
@@ -1940,10 +2523,21 @@ construct_loop(PyUFuncObject *self, PyObject *args, PyObject *kwds, PyArrayObjec
         }
     }
 
+    if (where != NULL) {
+        loop->where = (PyArrayObject *)PyArray_FromAny(where,
+                PyArray_DescrFromType(PyArray_BOOL), 0, 0, 0, NULL);
+        if (loop->where == NULL) {
+            goto fail;
+        }
+    }
+
     /* Setup the arrays */
     if (construct_arrays(loop, args, mps, typetup) < 0) {
         goto fail;
     }
+    if (loop->where != NULL && _setup_mask(loop) < 0) {
+        goto fail;
+    }
     PyUFunc_clearfperr();
     return loop;
 
@@ -2027,7 +2621,7 @@ PyUFunc_GenericFunction(PyUFuncObject *self, PyObject *args, PyObject *kwds,
                         PyArrayObject **mps)
 {
     PyUFuncLoopObject *loop;
-    int i;
+    int i, nthreads, fpstatus;
     NPY_BEGIN_THREADS_DEF;
 
     if (!(loop = construct_loop(self, args, kwds, mps))) {
@@ -2053,8 +2647,25 @@ PyUFunc_GenericFunction(PyUFuncObject *self, PyObject *args, PyObject *kwds,
          * increment moves through the entire array.
          */
         /*fprintf(stderr, "ONE...%d\n", loop->size);*/
-        loop->function((char **)loop->bufptr, &(loop->size),
-                loop->steps, loop->funcdata);
+        nthreads = _loop_threads(loop, mps, loop->size, loop->size);
+        if (nthreads > 1) {
+            fpstatus = ufunc_threads_run(_one_loop_piece, loop, loop->size,
+                    nthreads);
+            if (_check_threads_fperr(loop->errormask, loop->errobj,
+                        fpstatus, &loop->first) < 0) {
+                goto fail;
+            }
+            break;
+        }
+        if (loop->where != NULL) {
+            _masked_inner_loop(loop->function, loop->funcdata, self->nargs,
+                    (char **)loop->bufptr, &(loop->size), loop->steps,
+                    loop->where->data, loop->maskstep);
+        }
+        else {
+            loop->function((char **)loop->bufptr, &(loop->size),
+                    loop->steps, loop->funcdata);
+        }
         UFUNC_CHECK_ERROR(loop);
         break;
     case NOBUFFER_UFUNCLOOP:
@@ -2063,12 +2674,31 @@ PyUFunc_GenericFunction(PyUFuncObject *self, PyObject *args, PyObject *kwds,
          * right type but not contiguous. -- Almost as fast.
          */
         /*fprintf(stderr, "NOBUFFER...%d\n", loop->size);*/
+        nthreads = _loop_threads(loop, mps, loop->size,
+                loop->size*loop->bufcnt);
+        if (nthreads > 1) {
+            fpstatus = ufunc_threads_run(_nobuffer_loop_piece, loop,
+                    loop->size, nthreads);
+            if (_check_threads_fperr(loop->errormask, loop->errobj,
+                        fpstatus, &loop->first) < 0) {
+                goto fail;
+            }
+            break;
+        }
         while (loop->index < loop->size) {
             for (i = 0; i < self->nargs; i++) {
                 loop->bufptr[i] = loop->iters[i]->dataptr;
             }
-            loop->function((char **)loop->bufptr, &(loop->bufcnt),
-                    loop->steps, loop->funcdata);
+            if (loop->maskit != NULL) {
+                _masked_inner_loop(loop->function, loop->funcdata,
+                        self->nargs, (char **)loop->bufptr, &(loop->bufcnt),
+                        loop->steps, loop->maskit->dataptr, loop->maskstep);
+                PyArray_ITER_NEXT(loop->maskit);
+            }
+            else {
+                loop->function((char **)loop->bufptr, &(loop->bufcnt),
+                        loop->steps, loop->funcdata);
+            }
             UFUNC_CHECK_ERROR(loop);
 
             /* Adjust loop pointers */
@@ -2083,8 +2713,21 @@ PyUFunc_GenericFunction(PyUFuncObject *self, PyObject *args, PyObject *kwds,
             for (i = 0; i < self->nargs; i++) {
                 loop->bufptr[i] = loop->iters[i]->dataptr;
             }
-            loop->function((char **)loop->bufptr, loop->core_dim_sizes,
-                    loop->core_strides, loop->funcdata);
+            if (loop->where != NULL) {
+                _masked_inner_loop(loop->function, loop->funcdata,
+                        self->nargs, (char **)loop->bufptr,
+                        loop->core_dim_sizes, loop->core_strides,
+                        (loop->maskit != NULL) ? loop->maskit->dataptr
+                                               : loop->where->data,
+                        loop->maskstep);
+                if (loop->maskit != NULL) {
+                    PyArray_ITER_NEXT(loop->maskit);
+                }
+            }
+            else {
+                loop->function((char **)loop->bufptr, loop->core_dim_sizes,
+                        loop->core_strides, loop->funcdata);
+            }
             UFUNC_CHECK_ERROR(loop);
 
             /* Adjust loop pointers */
@@ -2094,8 +2737,28 @@ PyUFunc_GenericFunction(PyUFuncObject *self, PyObject *args, PyObject *kwds,
             loop->index++;
         }
         break;
+    case ITER_UFUNCLOOP: {
+        /*
+         * Some operands are misbehaved or of another type: the iterator
+         * hands out chunks of at most bufsize elements, with those
+         * operands in its buffers.
+         */
+        char **dataptrs = NpyIter_GetDataPtrArray(loop->iter);
+        intp *innerstrides = NpyIter_GetInnerStrideArray(loop->iter);
+        intp *innersize = NpyIter_GetInnerLoopSizePtr(loop->iter);
+
+        do {
+            loop->function(dataptrs, innersize, innerstrides,
+                    loop->funcdata);
+            UFUNC_CHECK_ERROR(loop);
+        } while (NpyIter_Next(loop->iter));
+        break;
+    }
     case BUFFER_UFUNCLOOP: {
-        /* This should be a function */
+        /*
+         * Object arrays in need of buffers: the references the buffers
+         * hold are taken care of here.
+         */
         PyArray_CopySwapNFunc *copyswapn[NPY_MAXARGS];
         PyArrayIterObject **iters=loop->iters;
         int *swap=loop->swap;
@@ -2374,7 +3037,8 @@ _getidentity(PyUFuncObject *self, int otype, char *str)
 }
 
 static int
-_create_reduce_copy(PyUFuncReduceObject *loop, PyArrayObject **arr, int rtype)
+_create_reduce_copy(PyUFuncReduceObject *loop, PyArrayObject **arr, int rtype,
+                    int masked)
 {
     intp maxsize;
     PyObject *new;
@@ -2382,7 +3046,7 @@ _create_reduce_copy(PyUFuncReduceObject *loop, PyArrayObject **arr, int rtype)
 
     maxsize = PyArray_SIZE(*arr);
 
-    if (maxsize < loop->bufsize) {
+    if (maxsize < loop->bufsize || masked) {
         if (!(PyArray_ISBEHAVED_RO(*arr))
             || PyArray_TYPE(*arr) != rtype) {
             ntype = PyArray_DescrFromType(rtype);
@@ -2392,30 +3056,137 @@ _create_reduce_copy(PyUFuncReduceObject *loop, PyArrayObject **arr, int rtype)
             if (new == NULL) {
                 return -1;
             }
-            *arr = (PyArrayObject *)new;
-            loop->decref = new;
+            *arr = (PyArrayObject *)new;
+            loop->decref = new;
+        }
+    }
+
+    /*
+     * Don't decref *arr before re-assigning
+     * because it was not going to be DECREF'd anyway.
+     *
+     * If a copy is made, then the copy will be removed
+     * on deallocation of the loop structure by setting
+     * loop->decref.
+     */
+    return 0;
+}
+
+/*
+ * Create the iterator of a buffered reduce or accumulate.  It reads arr
+ * cast to otype in C order after moving the reduced axes to the end, axis
+ * last, so that the values going into each output element come one after
+ * the other, in the order of the unbuffered loop.
+ */
+static NpyIter *
+_construct_reduce_iter(PyArrayObject *arr, int axis, const npy_bool *axes,
+                       int otype, int bufsize)
+{
+    intp perm[NPY_MAXDIMS];
+    PyArray_Dims permute;
+    PyArrayObject *view;
+    PyArray_Descr *dtype;
+    NpyIter *iter;
+    int i;
+
+    permute.ptr = perm;
+    permute.len = 0;
+    for (i = 0; i < arr->nd; i++) {
+        if (i != axis && (axes == NULL || !axes[i])) {
+            perm[permute.len++] = i;
+        }
+    }
+    for (i = 0; i < arr->nd; i++) {
+        if (i != axis && axes != NULL && axes[i]) {
+            perm[permute.len++] = i;
+        }
+    }
+    perm[permute.len++] = axis;
+    view = (PyArrayObject *)PyArray_Transpose(arr, &permute);
+    if (view == NULL) {
+        return NULL;
+    }
+    dtype = PyArray_DescrFromType(otype);
+    iter = NpyIter_New(1, &view, NPY_ITER_BUFFERED | NPY_ITER_C_ORDER, NULL,
+                       &dtype, bufsize);
+    Py_DECREF(dtype);
+    Py_DECREF(view);
+    return iter;
+}
+
+/*
+ * Run an ITER_UFUNCLOOP reduce or accumulate: every nreduce values the
+ * iterator hands out go into one output element, the first one copied
+ * and the others folded in by the inner loop.  An accumulate (loop->rit
+ * set) steps through the output row along with them.
+ */
+static int
+_reduce_iter_loop(PyUFuncReduceObject *loop, intp nreduce)
+{
+    char **dataptrs = NpyIter_GetDataPtrArray(loop->iter);
+    intp *innerstrides = NpyIter_GetInnerStrideArray(loop->iter);
+    intp *innersize = NpyIter_GetInnerLoopSizePtr(loop->iter);
+    char *dptr, *out = loop->bufptr[0];
+    intp n, count, pos = 0;
+
+    loop->steps[1] = innerstrides[0];
+    do {
+        dptr = dataptrs[0];
+        n = *innersize;
+        while (n > 0) {
+            if (pos == 0) {
+                memmove(out, dptr, loop->outsize);
+                dptr += innerstrides[0];
+                n--;
+                pos = 1;
+            }
+            count = (nreduce - pos < n) ? nreduce - pos : n;
+            if (count > 0) {
+                loop->bufptr[0] = out + (pos - 1)*loop->steps[0];
+                loop->bufptr[1] = dptr;
+                loop->bufptr[2] = loop->bufptr[0] + loop->steps[2];
+                loop->function((char **)loop->bufptr, &count, loop->steps,
+                        loop->funcdata);
+                UFUNC_CHECK_ERROR(loop);
+                dptr += count*innerstrides[0];
+                n -= count;
+                pos += count;
+            }
+            if (pos == nreduce) {
+                if (loop->rit != NULL) {
+                    PyArray_ITER_NEXT(loop->rit);
+                    out = loop->rit->dataptr;
+                }
+                else {
+                    out += loop->outsize;
+                }
+                pos = 0;
+            }
         }
-    }
-
-    /*
-     * Don't decref *arr before re-assigning
-     * because it was not going to be DECREF'd anyway.
-     *
-     * If a copy is made, then the copy will be removed
-     * on deallocation of the loop structure by setting
-     * loop->decref.
-     */
+    } while (NpyIter_Next(loop->iter));
     return 0;
+
+ fail:
+    return -1;
 }
 
+/*
+ * For a reduce over several axes, axes flags every reduced axis and axis is
+ * the last of them: the loop reduces rows along axis and the caller walks
+ * the other flagged axes.  axes is NULL when only axis is reduced.
+ *
+ * A reduce masked by where= starts every output element from the identity
+ * and never uses buffers, so the array is copied if it needs casting.
+ */
 static PyUFuncReduceObject *
 construct_reduce(PyUFuncObject *self, PyArrayObject **arr, PyArrayObject *out,
-                 int axis, int otype, int operation, intp ind_size, char *str)
+                 int axis, const npy_bool *axes, int masked, int otype,
+                 int operation, intp ind_size, char *str)
 {
     PyUFuncReduceObject *loop;
     PyArrayObject *idarr;
     PyArrayObject *aar;
-    intp loop_i[MAX_DIMS], outsize = 0;
+    intp loop_i[MAX_DIMS], outsize = 0, nreduce;
     int arg_types[3];
     PyArray_SCALARKIND scalars[3] = {PyArray_NOSCALAR, PyArray_NOSCALAR,
                                      PyArray_NOSCALAR};
@@ -2450,6 +3221,7 @@ construct_reduce(PyUFuncObject *self, PyArrayObject **arr, PyArrayObject *out,
     loop->errobj = NULL;
     loop->first = 1;
     loop->decref = NULL;
+    loop->iter = NULL;
     loop->N = (*arr)->dimensions[axis];
     loop->instrides = (*arr)->strides[axis];
     if (select_types(loop->ufunc, arg_types, &(loop->function),
@@ -2477,16 +3249,25 @@ construct_reduce(PyUFuncObject *self, PyArrayObject **arr, PyArrayObject *out,
         goto fail;
     }
     /* Make copy if misbehaved or not otype for small arrays */
-    if (_create_reduce_copy(loop, arr, otype) < 0) {
+    if (_create_reduce_copy(loop, arr, otype, masked) < 0) {
         goto fail;
     }
     aar = *arr;
 
-    if (loop->N == 0) {
+    /* Number of elements reduced into each output element */
+    nreduce = loop->N;
+    if (axes != NULL) {
+        for (i = 0; i < nd; i++) {
+            if (axes[i] && i != axis) {
+                nreduce *= aar->dimensions[i];
+            }
+        }
+    }
+    if (nreduce == 0) {
         loop->meth = ZERO_EL_REDUCELOOP;
     }
     else if (PyArray_ISBEHAVED_RO(aar) && (otype == (aar)->descr->type_num)) {
-        if (loop->N == 1) {
+        if (nreduce == 1 && !masked) {
             loop->meth = ONE_EL_REDUCELOOP;
         }
         else {
@@ -2514,7 +3295,16 @@ construct_reduce(PyUFuncObject *self, PyArrayObject **arr, PyArrayObject *out,
     else {
         loop->obj = 0;
     }
-    if ((loop->meth == ZERO_EL_REDUCELOOP)
+    /*
+     * The input is read through NpyIter, unless its buffers would hold
+     * object references or flexible items.  reduceat jumps around the
+     * rows and keeps its own buffer.
+     */
+    if (loop->meth == BUFFER_UFUNCLOOP && operation != UFUNC_REDUCEAT
+            && !(loop->obj & UFUNC_OBJ_ISOBJECT) && _can_iter_buffer(arr, 1)) {
+        loop->meth = ITER_UFUNCLOOP;
+    }
+    if ((loop->meth == ZERO_EL_REDUCELOOP) || masked
             || ((operation == UFUNC_REDUCEAT)
                 && (loop->meth == BUFFER_UFUNCLOOP))) {
         idarr = _getidentity(self, otype, str);
@@ -2538,18 +3328,18 @@ construct_reduce(PyUFuncObject *self, PyArrayObject **arr, PyArrayObject *out,
     switch(operation) {
     case UFUNC_REDUCE:
         for (j = 0, i = 0; i < nd; i++) {
-            if (i != axis) {
+            if (i != axis && (axes == NULL || !axes[i])) {
                 loop_i[j++] = (aar)->dimensions[i];
             }
         }
         if (out == NULL) {
             loop->ret = (PyArrayObject *)
-                PyArray_New(Py_TYPE(aar), aar->nd-1, loop_i,
+                PyArray_New(Py_TYPE(aar), j, loop_i,
                             otype, NULL, NULL, 0, 0,
                             (PyObject *)aar);
         }
         else {
-            outsize = PyArray_MultiplyList(loop_i, aar->nd - 1);
+            outsize = PyArray_MultiplyList(loop_i, j);
         }
         break;
     case UFUNC_ACCUMULATE:
@@ -2618,12 +3408,16 @@ construct_reduce(PyUFuncObject *self, PyArrayObject **arr, PyArrayObject *out,
 
     /*
      * Fix iterator to loop over correct dimension
-     * Set size in axis dimension to 1
+     * Set size in every reduced dimension to 1
      */
     loop->it->contiguous = 0;
-    loop->it->size /= (loop->it->dims_m1[axis]+1);
-    loop->it->dims_m1[axis] = 0;
-    loop->it->backstrides[axis] = 0;
+    for (i = 0; i < nd; i++) {
+        if (i == axis || (axes != NULL && axes[i])) {
+            loop->it->size /= (loop->it->dims_m1[i]+1);
+            loop->it->dims_m1[i] = 0;
+            loop->it->backstrides[i] = 0;
+        }
+    }
     loop->size = loop->it->size;
     if (operation == UFUNC_REDUCE) {
         loop->steps[0] = 0;
@@ -2652,6 +3446,13 @@ construct_reduce(PyUFuncObject *self, PyArrayObject **arr, PyArrayObject *out,
     }
     loop->steps[2] = loop->steps[0];
     loop->bufptr[2] = loop->bufptr[0] + loop->steps[2];
+    if (loop->meth == ITER_UFUNCLOOP) {
+        loop->iter = _construct_reduce_iter(aar, axis, axes, otype,
+                                            loop->bufsize);
+        if (loop->iter == NULL) {
+            goto fail;
+        }
+    }
     if (loop->meth == BUFFER_UFUNCLOOP) {
         int _size;
 
@@ -2693,29 +3494,243 @@ construct_reduce(PyUFuncObject *self, PyArrayObject **arr, PyArrayObject *out,
 }
 
 
+/*
+ * Return the offset of the next row of a multi-axis reduce, stepping the
+ * index coord through the other reduced axes in C order.
+ */
+static intp
+_next_reduce_row(int nouter, intp *coord, const intp *dims,
+                 const intp *strides, intp offset)
+{
+    int k;
+
+    for (k = nouter - 1; k >= 0; k--) {
+        if (++coord[k] < dims[k]) {
+            return offset + strides[k];
+        }
+        coord[k] = 0;
+        offset -= strides[k]*(dims[k] - 1);
+    }
+    return offset;
+}
+
+/* What a piece of an unmasked NOBUFFER reduce needs besides the loop */
+typedef struct {
+    PyUFuncReduceObject *loop;
+    char *out;
+    int nouter;
+    intp nrows;
+    intp *outer_dims;
+    intp *outer_strides;
+} _reduce_piece_data;
+
+/*
+ * Compute the output elements [start, stop) of an unmasked NOBUFFER
+ * reduce, walking a private copy of the position of loop->it.
+ */
+static void
+_reduce_piece(void *data, intp start, intp stop)
+{
+    _reduce_piece_data *rd = (_reduce_piece_data *)data;
+    PyUFuncReduceObject *loop = rd->loop;
+    PyArrayIterObject *it = loop->it;
+    char *ptrs[3], *inptr = it->dataptr;
+    intp coord[NPY_MAXDIMS], rcoord[NPY_MAXDIMS];
+    intp index = start, offset, row, N = loop->N, n = loop->N + 1;
+    int k, nd = it->nd_m1 + 1;
+
+    for (k = nd - 1; k >= 0; k--) {
+        coord[k] = index % (it->dims_m1[k] + 1);
+        index /= it->dims_m1[k] + 1;
+        inptr += coord[k]*it->strides[k];
+    }
+    ptrs[0] = rd->out + start*loop->outsize;
+    for (index = start; index < stop; index++) {
+        if (index > start) {
+            for (k = nd - 1; k >= 0; k--) {
+                if (coord[k] < it->dims_m1[k]) {
+                    coord[k]++;
+                    inptr += it->strides[k];
+                    break;
+                }
+                coord[k] = 0;
+                inptr -= it->backstrides[k];
+            }
+        }
+        memmove(ptrs[0], inptr, loop->outsize);
+        ptrs[1] = inptr + loop->steps[1];
+        ptrs[2] = ptrs[0];
+        loop->function(ptrs, &N, loop->steps, loop->funcdata);
+        offset = 0;
+        memset(rcoord, 0, rd->nouter*sizeof(intp));
+        for (row = 1; row < rd->nrows; row++) {
+            offset = _next_reduce_row(rd->nouter, rcoord, rd->outer_dims,
+                    rd->outer_strides, offset);
+            ptrs[1] = inptr + offset;
+            loop->function(ptrs, &n, loop->steps, loop->funcdata);
+        }
+        ptrs[0] += loop->outsize;
+    }
+}
+
+/*
+ * Whether the order in which the values are combined by reduce does not
+ * change the result, up to rounding: the ufunc is associative and
+ * commutative.
+ */
+static int
+_is_reorderable(PyUFuncObject *self)
+{
+    static const char *names[] = {"add", "multiply", "logical_and",
+                                  "logical_or", "logical_xor", "bitwise_and",
+                                  "bitwise_or", "bitwise_xor", "maximum",
+                                  "minimum", "fmax", "fmin", NULL};
+    int i;
+
+    if (self->name == NULL) {
+        return 0;
+    }
+    for (i = 0; names[i] != NULL; i++) {
+        if (strcmp(self->name, names[i]) == 0) {
+            return 1;
+        }
+    }
+    return 0;
+}
+
+/*
+ * What a piece of an unmasked NOBUFFER reduce split along the reduced
+ * values needs besides the loop.  The nrows*(N + 1) values reduced into
+ * each output element are cut into npieces ranges; piece k reduces its
+ * range of every output element into partial + (k*nout + i)*outsize.
+ */
+typedef struct {
+    PyUFuncReduceObject *loop;
+    char **bases;
+    intp nout;
+    char *partial;
+    int npieces;
+    int nouter;
+    intp nrows;
+    intp *outer_dims;
+    intp *outer_strides;
+} _reduce_split_data;
+
+static void
+_reduce_split_piece(void *data, intp start, intp stop)
+{
+    _reduce_split_data *rd = (_reduce_split_data *)data;
+    PyUFuncReduceObject *loop = rd->loop;
+    char *ptrs[3];
+    intp coord[NPY_MAXDIMS], rcoord[NPY_MAXDIMS];
+    intp m = loop->N + 1, total = rd->nrows*m;
+    intp piece, i, lo, hi, r, c, n, offset, roffset;
+    int k;
+
+    for (piece = start; piece < stop; piece++) {
+        lo = piece*total/rd->npieces;
+        hi = (piece + 1)*total/rd->npieces;
+        /* Position of the row holding value lo */
+        r = lo / m;
+        offset = 0;
+        for (k = rd->nouter - 1; k >= 0; k--) {
+            coord[k] = r % rd->outer_dims[k];
+            r /= rd->outer_dims[k];
+            offset += coord[k]*rd->outer_strides[k];
+        }
+        for (i = 0; i < rd->nout; i++) {
+            ptrs[0] = rd->partial + (piece*rd->nout + i)*loop->outsize;
+            ptrs[2] = ptrs[0];
+            memcpy(rcoord, coord, rd->nouter*sizeof(intp));
+            roffset = offset;
+            c = lo % m;
+            memmove(ptrs[0], rd->bases[i] + roffset + c*loop->steps[1],
+                    loop->outsize);
+            c++;
+            for (n = lo + 1; n < hi; n += r) {
+                if (c == m) {
+                    roffset = _next_reduce_row(rd->nouter, rcoord,
+                            rd->outer_dims, rd->outer_strides, roffset);
+                    c = 0;
+                }
+                ptrs[1] = rd->bases[i] + roffset + c*loop->steps[1];
+                r = (hi - n < m - c) ? hi - n : m - c;
+                loop->function(ptrs, &r, loop->steps, loop->funcdata);
+                c += r;
+            }
+        }
+    }
+}
+
 /*
  * We have two basic kinds of loops. One is used when arr is not-swapped
  * and aligned and output type is the same as input type.  The other uses
- * buffers when one of these is not satisfied.
+ * buffers when one of these is not satisfied: NpyIter fills them, except
+ * for object arrays.
  *
  *  Zero-length and one-length axes-to-be-reduced are handled separately.
+ *
+ * When axes flags more than one axis, every output element is reduced in
+ * a single pass: rows along axis (the last flagged axis) are folded into
+ * the output one after the other, in the C order of the reduced axes.
+ *
+ * With a where= mask, only the selected elements are folded into the
+ * identity; the mask is walked along with the rows.
  */
 static PyObject *
 PyUFunc_Reduce(PyUFuncObject *self, PyArrayObject *arr, PyArrayObject *out,
-        int axis, int otype)
+        int axis, const npy_bool *axes, PyArrayObject *where, int otype)
 {
     PyArrayObject *ret = NULL;
     PyUFuncReduceObject *loop;
+    PyArrayIterObject *maskit = NULL;
     intp i, n;
     char *dptr;
+    intp outer_dims[MAX_DIMS], outer_strides[MAX_DIMS], coord[MAX_DIMS];
+    intp outer_mstrides[MAX_DIMS], mcoord[MAX_DIMS];
+    intp nrows = 1, row, offset, moffset, maskstep = 0;
+    int k, nouter = 0, nthreads, nsplit, fpstatus;
+    char *low, *high, *olow, *ohigh;
+    _reduce_piece_data rdata;
+    _reduce_split_data sdata;
     NPY_BEGIN_THREADS_DEF;
 
     /* Construct loop object */
-    loop = construct_reduce(self, &arr, out, axis, otype, UFUNC_REDUCE, 0,
-            "reduce");
+    loop = construct_reduce(self, &arr, out, axis, axes, where != NULL,
+            otype, UFUNC_REDUCE, 0, "reduce");
     if (!loop) {
         return NULL;
     }
+    if (where != NULL) {
+        maskit = (PyArrayIterObject *)PyArray_BroadcastToShape(
+                (PyObject *)where, arr->dimensions, arr->nd);
+        if (maskit == NULL) {
+            goto fail;
+        }
+        /* Walk the mask like loop->it: set every reduced dimension to 1 */
+        maskit->contiguous = 0;
+        maskstep = maskit->strides[axis];
+        for (k = 0; k < arr->nd; k++) {
+            if (k == axis || (axes != NULL && axes[k])) {
+                maskit->size /= (maskit->dims_m1[k] + 1);
+                maskit->dims_m1[k] = 0;
+                maskit->backstrides[k] = 0;
+            }
+        }
+    }
+    if (axes != NULL) {
+        for (k = 0; k < arr->nd; k++) {
+            if (axes[k] && k != axis) {
+                outer_dims[nouter] = arr->dimensions[k];
+                outer_strides[nouter] = arr->strides[k];
+                if (maskit != NULL) {
+                    outer_mstrides[nouter] = maskit->strides[k];
+                }
+                nrows *= arr->dimensions[k];
+                nouter++;
+            }
+        }
+    }
 
     NPY_LOOP_BEGIN_THREADS;
     switch(loop->meth) {
@@ -2743,6 +3758,118 @@ PyUFunc_Reduce(PyUFuncObject *self, PyArrayObject *arr, PyArrayObject *out,
         break;
     case NOBUFFER_UFUNCLOOP:
         /*fprintf(stderr, "NOBUFFER..%d\n", loop->size); */
+        while (maskit != NULL && loop->index < loop->size) {
+            /* Start from the identity and fold in the selected elements */
+            if (loop->obj & UFUNC_OBJ_ISOBJECT) {
+                Py_INCREF(*((PyObject **)loop->idptr));
+            }
+            memmove(loop->bufptr[0], loop->idptr, loop->outsize);
+            offset = moffset = 0;
+            memset(coord, 0, nouter*sizeof(intp));
+            memset(mcoord, 0, nouter*sizeof(intp));
+            n = loop->N + 1;
+            for (row = 0; row < nrows; row++) {
+                if (row > 0) {
+                    offset = _next_reduce_row(nouter, coord, outer_dims,
+                            outer_strides, offset);
+                    moffset = _next_reduce_row(nouter, mcoord, outer_dims,
+                            outer_mstrides, moffset);
+                }
+                loop->bufptr[1] = loop->it->dataptr + offset;
+                _masked_inner_loop(loop->function, loop->funcdata, 3,
+                        (char **)loop->bufptr, &n, loop->steps,
+                        maskit->dataptr + moffset, maskstep);
+                UFUNC_CHECK_ERROR(loop);
+            }
+            PyArray_ITER_NEXT(maskit);
+            PyArray_ITER_NEXT(loop->it);
+            loop->bufptr[0] += loop->outsize;
+            loop->bufptr[2] = loop->bufptr[0];
+            loop->index++;
+        }
+        nthreads = nsplit = 1;
+        if (maskit == NULL && !(loop->obj & UFUNC_OBJ_NEEDS_API)) {
+            n = loop->size*(loop->N + 1)*nrows;
+            nthreads = ufunc_threads_for_size(loop->size, n);
+            /* The pieces start from the identity */
+            if (_is_reorderable(self) && self->identity != PyUFunc_None) {
+                nsplit = ufunc_threads_for_size((loop->N + 1)*nrows, n);
+            }
+        }
+        if (nsplit > nthreads) {
+            /*
+             * Too few output elements to keep the threads busy: split the
+             * values reduced into each of them instead, then combine the
+             * partial results of the pieces in order.  Without memory for
+             * the partial results, the reduce is not split that way.
+             */
+            sdata.partial = PyDataMem_NEW(nsplit*loop->size*loop->outsize);
+            sdata.bases = (char **)PyDataMem_NEW(loop->size*sizeof(char *));
+            if (sdata.partial == NULL || sdata.bases == NULL) {
+                PyDataMem_FREE(sdata.partial);
+                PyDataMem_FREE(sdata.bases);
+                nsplit = 1;
+            }
+        }
+        if (nsplit > nthreads) {
+            for (i = 0; i < loop->size; i++) {
+                sdata.bases[i] = loop->it->dataptr;
+                PyArray_ITER_NEXT(loop->it);
+            }
+            sdata.loop = loop;
+            sdata.nout = loop->size;
+            sdata.npieces = nsplit;
+            sdata.nouter = nouter;
+            sdata.nrows = nrows;
+            sdata.outer_dims = outer_dims;
+            sdata.outer_strides = outer_strides;
+            fpstatus = ufunc_threads_run(_reduce_split_piece, &sdata,
+                    nsplit, nsplit);
+            n = 1;
+            for (i = 0; i < loop->size; i++) {
+                dptr = loop->bufptr[0] + i*loop->outsize;
+                memmove(dptr, sdata.partial + i*loop->outsize,
+                        loop->outsize);
+                for (k = 1; k < nsplit; k++) {
+                    char *ptrs[3];
+
+                    ptrs[0] = ptrs[2] = dptr;
+                    ptrs[1] = sdata.partial +
+                        (k*loop->size + i)*loop->outsize;
+                    loop->function(ptrs, &n, loop->steps, loop->funcdata);
+                }
+            }
+            PyDataMem_FREE(sdata.partial);
+            PyDataMem_FREE(sdata.bases);
+            if (_check_threads_fperr(loop->errormask, loop->errobj,
+                        fpstatus, &loop->first) < 0) {
+                goto fail;
+            }
+            break;
+        }
+        if (nthreads > 1) {
+            /* Rows must not be read after another piece wrote over them */
+            _array_extent(arr, &low, &high);
+            _array_extent(loop->ret, &olow, &ohigh);
+            if (low < ohigh && olow < high) {
+                nthreads = 1;
+            }
+        }
+        if (nthreads > 1) {
+            rdata.loop = loop;
+            rdata.out = loop->bufptr[0];
+            rdata.nouter = nouter;
+            rdata.nrows = nrows;
+            rdata.outer_dims = outer_dims;
+            rdata.outer_strides = outer_strides;
+            fpstatus = ufunc_threads_run(_reduce_piece, &rdata, loop->size,
+                    nthreads);
+            if (_check_threads_fperr(loop->errormask, loop->errobj,
+                        fpstatus, &loop->first) < 0) {
+                goto fail;
+            }
+            break;
+        }
         while (loop->index < loop->size) {
             /* Copy first element to output */
             if (loop->obj & UFUNC_OBJ_ISOBJECT) {
@@ -2754,23 +3881,41 @@ PyUFunc_Reduce(PyUFuncObject *self, PyArrayObject *arr, PyArrayObject *out,
             loop->function((char **)loop->bufptr, &(loop->N),
                     loop->steps, loop->funcdata);
             UFUNC_CHECK_ERROR(loop);
+            /* Fold in the remaining rows in full */
+            offset = 0;
+            memset(coord, 0, nouter*sizeof(intp));
+            n = loop->N + 1;
+            for (row = 1; row < nrows; row++) {
+                offset = _next_reduce_row(nouter, coord, outer_dims,
+                        outer_strides, offset);
+                loop->bufptr[1] = loop->it->dataptr + offset;
+                loop->function((char **)loop->bufptr, &n,
+                        loop->steps, loop->funcdata);
+                UFUNC_CHECK_ERROR(loop);
+            }
             PyArray_ITER_NEXT(loop->it);
             loop->bufptr[0] += loop->outsize;
             loop->bufptr[2] = loop->bufptr[0];
             loop->index++;
         }
         break;
+    case ITER_UFUNCLOOP:
+        if (_reduce_iter_loop(loop, loop->N*nrows) < 0) {
+            goto fail;
+        }
+        break;
     case BUFFER_UFUNCLOOP:
         /*
-         * use buffer for arr
+         * use buffer for arr (object arrays)
          *
-         * For each row to reduce
+         * For each output element
          * 1. copy first item over to output (casting if necessary)
          * 2. Fill inner buffer
          * 3. When buffer is filled or end of row
          * a. Cast input buffers if needed
          * b. Call inner function.
          * 4. Repeat 2 until row is done.
+         * 5. Repeat 2 for each further row of a multi-axis reduce.
          */
         /* fprintf(stderr, "BUFFERED..%d %d\n", loop->size, loop->swap); */
         while(loop->index < loop->size) {
@@ -2793,26 +3938,37 @@ PyUFunc_Reduce(PyUFuncObject *self, PyArrayObject *arr, PyArrayObject *out,
             }
             loop->inptr += loop->instrides;
             n = 1;
-            while(n < loop->N) {
-                /* Copy up to loop->bufsize elements to buffer */
-                dptr = loop->buffer;
-                for (i = 0; i < loop->bufsize; i++, n++) {
-                    if (n == loop->N) {
-                        break;
-                    }
-                    arr->descr->f->copyswap(dptr, loop->inptr,
-                            loop->swap, NULL);
-                    loop->inptr += loop->instrides;
-                    dptr += loop->insize;
+            offset = 0;
+            memset(coord, 0, nouter*sizeof(intp));
+            for (row = 0; row < nrows; row++) {
+                if (row > 0) {
+                    offset = _next_reduce_row(nouter, coord, outer_dims,
+                            outer_strides, offset);
+                    loop->inptr = loop->it->dataptr + offset;
+                    n = 0;
                 }
-                if (loop->cast) {
-                    loop->cast(loop->buffer, loop->castbuf, i, NULL, NULL);
+                while(n < loop->N) {
+                    /* Copy up to loop->bufsize elements to buffer */
+                    dptr = loop->buffer;
+                    for (i = 0; i < loop->bufsize; i++, n++) {
+                        if (n == loop->N) {
+                            break;
+                        }
+                        arr->descr->f->copyswap(dptr, loop->inptr,
+                                loop->swap, NULL);
+                        loop->inptr += loop->instrides;
+                        dptr += loop->insize;
+                    }
+                    if (loop->cast) {
+                        loop->cast(loop->buffer, loop->castbuf, i,
+                                NULL, NULL);
+                    }
+                    loop->function((char **)loop->bufptr, &i,
+                            loop->steps, loop->funcdata);
+                    loop->bufptr[0] += loop->steps[0]*i;
+                    loop->bufptr[2] += loop->steps[2]*i;
+                    UFUNC_CHECK_ERROR(loop);
                 }
-                loop->function((char **)loop->bufptr, &i,
-                        loop->steps, loop->funcdata);
-                loop->bufptr[0] += loop->steps[0]*i;
-                loop->bufptr[2] += loop->steps[2]*i;
-                UFUNC_CHECK_ERROR(loop);
             }
             PyArray_ITER_NEXT(loop->it);
             loop->bufptr[0] += loop->outsize;
@@ -2847,11 +4003,13 @@ PyUFunc_Reduce(PyUFuncObject *self, PyArrayObject *arr, PyArrayObject *out,
         ret = loop->ret;
     }
     Py_INCREF(ret);
+    Py_XDECREF(maskit);
     ufuncreduce_dealloc(loop);
     return (PyObject *)ret;
 
 fail:
     NPY_LOOP_END_THREADS;
+    Py_XDECREF(maskit);
     if (loop) {
         ufuncreduce_dealloc(loop);
     }
@@ -2870,7 +4028,7 @@ PyUFunc_Accumulate(PyUFuncObject *self, PyArrayObject *arr, PyArrayObject *out,
     NPY_BEGIN_THREADS_DEF;
 
     /* Construct loop object */
-    loop = construct_reduce(self, &arr, out, axis, otype,
+    loop = construct_reduce(self, &arr, out, axis, NULL, 0, otype,
             UFUNC_ACCUMULATE, 0, "accumulate");
     if (!loop) {
         return NULL;
@@ -2923,10 +4081,16 @@ PyUFunc_Accumulate(PyUFuncObject *self, PyArrayObject *arr, PyArrayObject *out,
             loop->index++;
         }
         break;
+    case ITER_UFUNCLOOP:
+        /* Accumulate */
+        if (_reduce_iter_loop(loop, loop->N) < 0) {
+            goto fail;
+        }
+        break;
     case BUFFER_UFUNCLOOP:
         /* Accumulate
          *
-         * use buffer for arr
+         * use buffer for arr (object arrays)
          *
          * For each row to reduce
          * 1. copy identity over to output (casting if necessary)
@@ -3068,7 +4232,7 @@ PyUFunc_Reduceat(PyUFuncObject *self, PyArrayObject *arr, PyArrayObject *ind,
 
     ptr = (intp *)ind->data;
     /* Construct loop object */
-    loop = construct_reduce(self, &arr, out, axis, otype,
+    loop = construct_reduce(self, &arr, out, axis, NULL, 0, otype,
             UFUNC_REDUCEAT, nn, "reduceat");
     if (!loop) {
         return NULL;
@@ -3201,6 +4365,140 @@ fail:
 }
 
 
+/*
+ * Convert the axis argument of reduce -- an integer, a tuple of integers,
+ * or None for all axes -- into flags marking the reduced axes of an nd
+ * dimensional array.  Returns the number of reduced axes and sets *axis to
+ * the last of them, or returns -1 on error.
+ */
+static int
+_get_reduce_axes(PyObject *obj, int nd, npy_bool *axes, int *axis)
+{
+    int i, n, ax, naxes = 0;
+    PyObject *item;
+
+    memset(axes, 0, nd*sizeof(npy_bool));
+    *axis = -1;
+    if (obj == NULL) {
+        axes[0] = 1;
+        *axis = 0;
+        return 1;
+    }
+    if (obj == Py_None) {
+        memset(axes, 1, nd*sizeof(npy_bool));
+        *axis = nd - 1;
+        return nd;
+    }
+    n = PyTuple_Check(obj) ? PyTuple_GET_SIZE(obj) : 1;
+    for (i = 0; i < n; i++) {
+        item = PyTuple_Check(obj) ? PyTuple_GET_ITEM(obj, i) : obj;
+        ax = PyArray_PyIntAsInt(item);
+        if (ax == -1 && PyErr_Occurred()) {
+            return -1;
+        }
+        if (ax < 0) {
+            ax += nd;
+        }
+        if (ax < 0 || ax >= nd) {
+            PyErr_SetString(PyExc_ValueError, "axis not in array");
+            return -1;
+        }
+        if (axes[ax]) {
+            PyErr_SetString(PyExc_ValueError, "duplicate value in 'axis'");
+            return -1;
+        }
+        axes[ax] = 1;
+        naxes++;
+        if (ax > *axis) {
+            *axis = ax;
+        }
+    }
+    return naxes;
+}
+
+/*
+ * Reduce over an empty tuple of axes: a copy of mp cast to otype, or mp
+ * cast into out.
+ */
+static PyArrayObject *
+_reduce_no_axes(PyArrayObject *mp, PyArrayObject *out, PyArray_Descr *otype)
+{
+    if (out != NULL) {
+        if (PyArray_CopyInto(out, mp) < 0) {
+            return NULL;
+        }
+        Py_INCREF(out);
+        return out;
+    }
+    Py_INCREF(otype);
+    return (PyArrayObject *)PyArray_CastToType(mp, otype, 0);
+}
+
+/*
+ * Reshape the result of reducing mp over axes so that the reduced axes
+ * are kept with length one.  Steals the reference to ret.
+ */
+static PyArrayObject *
+_reduce_keepdims(PyArrayObject *ret, PyArrayObject *mp, const npy_bool *axes)
+{
+    intp dims[MAX_DIMS];
+    PyArray_Dims newshape;
+    PyObject *new;
+    int i;
+
+    for (i = 0; i < mp->nd; i++) {
+        dims[i] = axes[i] ? 1 : mp->dimensions[i];
+    }
+    newshape.ptr = dims;
+    newshape.len = mp->nd;
+    new = PyArray_Newshape(ret, &newshape, PyArray_CORDER);
+    Py_DECREF(ret);
+    return (PyArrayObject *)new;
+}
+
+/*
+ * For a reduction of mp over axes with keepdims, check that out has the
+ * shape of the result with the reduced axes kept with length one, and
+ * return a view of out without them into which the reduction can write.
+ */
+static PyArrayObject *
+_reduce_keepdims_out(PyArrayObject *out, PyArrayObject *mp,
+                     const npy_bool *axes)
+{
+    intp dims[MAX_DIMS], strides[MAX_DIMS];
+    PyArrayObject *view;
+    int i, nd = 0;
+
+    if (out->nd != mp->nd) {
+        PyErr_SetString(PyExc_ValueError, "wrong shape for output");
+        return NULL;
+    }
+    for (i = 0; i < mp->nd; i++) {
+        if (out->dimensions[i] != (axes[i] ? 1 : mp->dimensions[i])) {
+            PyErr_SetString(PyExc_ValueError, "wrong shape for output");
+            return NULL;
+        }
+        if (!axes[i]) {
+            dims[nd] = out->dimensions[i];
+            strides[nd] = out->strides[i];
+            nd++;
+        }
+    }
+    /* NewFromDescr will steal this reference */
+    Py_INCREF(out->descr);
+    view = (PyArrayObject *)
+        PyArray_NewFromDescr(&PyArray_Type, out->descr, nd, dims, strides,
+                             out->data, out->flags, NULL);
+    if (view == NULL) {
+        return NULL;
+    }
+    /* point at true owner of memory: */
+    view->base = (PyObject *)out;
+    Py_INCREF(out);
+    PyArray_UpdateFlags(view, CONTIGUOUS | FORTRAN);
+    return view;
+}
+
 /*
  * This code handles reduce, reduceat, and accumulate
  * (accumulate and reduce are special cases of the more general reduceat
@@ -3210,13 +4508,17 @@ static PyObject *
 PyUFunc_GenericReduction(PyUFuncObject *self, PyObject *args,
                          PyObject *kwds, int operation)
 {
-    int axis=0;
+    int axis=0, naxes=1, keepdims=0;
+    npy_bool axes[MAX_DIMS];
     PyArrayObject *mp, *ret = NULL;
     PyObject *op, *res = NULL;
-    PyObject *obj_ind, *context;
+    PyObject *obj_ind, *context, *axis_obj = NULL, *where_obj = NULL;
     PyArrayObject *indices = NULL;
+    PyArrayObject *where = NULL;
     PyArray_Descr *otype = NULL;
-    PyArrayObject *out = NULL;
+    PyArrayObject *out = NULL, *keepout = NULL;
+    static char *kwlist0[] = {"array", "axis", "dtype", "out", "keepdims",
+                              "where", NULL};
     static char *kwlist1[] = {"array", "axis", "dtype", "out", NULL};
     static char *kwlist2[] = {"array", "indices", "axis", "dtype", "out", NULL};
     static char *_reduce_type[] = {"reduce", "accumulate", "reduceat", NULL};
@@ -3263,6 +4565,17 @@ PyUFunc_GenericReduction(PyUFuncObject *self, PyObject *args,
             return NULL;
         }
     }
+    else if (operation == UFUNC_REDUCE) {
+        if(!PyArg_ParseTupleAndKeywords(args, kwds, "O|OO&O&iO", kwlist0,
+                                        &op, &axis_obj,
+                                        PyArray_DescrConverter2,
+                                        &otype,
+                                        PyArray_OutputConverter,
+                                        &out, &keepdims, &where_obj)) {
+            Py_XDECREF(otype);
+            return NULL;
+        }
+    }
     else {
         if(!PyArg_ParseTupleAndKeywords(args, kwds, "O|iO&O&", kwlist1,
                                         &op, &axis,
@@ -3305,14 +4618,50 @@ PyUFunc_GenericReduction(PyUFuncObject *self, PyObject *args,
         return NULL;
     }
 
-    if (axis < 0) {
-        axis += mp->nd;
+    if (operation == UFUNC_REDUCE) {
+        naxes = _get_reduce_axes(axis_obj, mp->nd, axes, &axis);
+        if (naxes < 0) {
+            Py_XDECREF(otype);
+            Py_DECREF(mp);
+            return NULL;
+        }
+        if (naxes > 1 && !_is_reorderable(self)) {
+            PyErr_Format(PyExc_ValueError,
+                         "reduction over several axes is not allowed for "
+                         "%s, whose result depends on the order of the "
+                         "values", self->name ? self->name : "?");
+            Py_XDECREF(otype);
+            Py_DECREF(mp);
+            return NULL;
+        }
+        if (where_obj != NULL) {
+            if (self->identity == PyUFunc_None || naxes == 0) {
+                PyErr_Format(PyExc_ValueError,
+                             "where= needs a reduction over at least one "
+                             "axis with a ufunc that has an identity");
+                Py_XDECREF(otype);
+                Py_DECREF(mp);
+                return NULL;
+            }
+            where = (PyArrayObject *)PyArray_FromAny(where_obj,
+                    PyArray_DescrFromType(PyArray_BOOL), 0, 0, 0, NULL);
+            if (where == NULL) {
+                Py_XDECREF(otype);
+                Py_DECREF(mp);
+                return NULL;
+            }
+        }
     }
-    if (axis < 0 || axis >= mp->nd) {
-        PyErr_SetString(PyExc_ValueError, "axis not in array");
-        Py_XDECREF(otype);
-        Py_DECREF(mp);
-        return NULL;
+    else {
+        if (axis < 0) {
+            axis += mp->nd;
+        }
+        if (axis < 0 || axis >= mp->nd) {
+            PyErr_SetString(PyExc_ValueError, "axis not in array");
+            Py_XDECREF(otype);
+            Py_DECREF(mp);
+            return NULL;
+        }
     }
      /*
       * If out is specified it determines otype
@@ -3349,8 +4698,34 @@ PyUFunc_GenericReduction(PyUFuncObject *self, PyObject *args,
 
     switch(operation) {
     case UFUNC_REDUCE:
-        ret = (PyArrayObject *)PyUFunc_Reduce(self, mp, out, axis,
-                                              otype->type_num);
+        if (keepdims && out != NULL) {
+            /* out has the kept axes, the reduction writes into a view */
+            keepout = out;
+            out = _reduce_keepdims_out(keepout, mp, axes);
+            if (out == NULL) {
+                Py_XDECREF(where);
+                break;
+            }
+        }
+        if (naxes == 0) {
+            ret = _reduce_no_axes(mp, out, otype);
+        }
+        else {
+            ret = (PyArrayObject *)PyUFunc_Reduce(self, mp, out, axis,
+                    (naxes > 1) ? axes : NULL, where, otype->type_num);
+        }
+        Py_XDECREF(where);
+        if (keepout != NULL) {
+            Py_DECREF(out);
+            if (ret != NULL) {
+                Py_DECREF(ret);
+                ret = keepout;
+                Py_INCREF(ret);
+            }
+        }
+        else if (ret != NULL && keepdims) {
+            ret = _reduce_keepdims(ret, mp, axes);
+        }
         break;
     case UFUNC_ACCUMULATE:
         ret = (PyArrayObject *)PyUFunc_Accumulate(self, mp, out, axis,
@@ -0,0 +1,264 @@
+/*
+ * A small pool of worker threads used to split large ufunc loops.
+ *
+ * The pool is process wide.  It is idle until the number of threads is
+ * raised above one with setthreads (numpy.setnumthreads); after that a
+ * loop whose total number of elements reaches the threshold is cut into
+ * one piece per thread along its outer range.  The calling thread runs
+ * one of the pieces itself and waits for the others.
+ *
+ * Workers are started lazily, never exit and only ever run inner loops
+ * that do not need the Python C-API, so they never touch the GIL.  The
+ * floating point status flags are per thread: each worker reads and
+ * clears its own after every piece and the caller gets the union.
+ *
+ * Only one loop at a time uses the pool.  A loop started while another
+ * one holds the pool (from a different Python thread that released the
+ * GIL) simply runs serially.
+ */
+#define _UMATHMODULE
+
+#include "Python.h"
+
+#include "npy_config.h"
+#ifdef ENABLE_SEPARATE_COMPILATION
+#define PY_ARRAY_UNIQUE_SYMBOL _npy_umathmodule_ARRAY_API
+#define NO_IMPORT_ARRAY
+#endif
+
+#include "numpy/npy_3kcompat.h"
+
+#include "numpy/noprefix.h"
+#include "numpy/ufuncobject.h"
+
+#include "ufunc_threads.h"
+
+#if defined(WITH_THREAD) && defined(HAVE_PTHREAD_H) && NPY_ALLOW_THREADS
+#define NPY_UFUNC_THREADS
+#include <pthread.h>
+#endif
+
+static int ufunc_nthreads = 1;
+static intp ufunc_thread_threshold = UFUNC_THREAD_THRESHOLD_DEFAULT;
+
+/*
+ * Number of pieces a loop over n outer items doing `work` elements of
+ * work in total should be cut into.  1 means run it serially.
+ */
+NPY_NO_EXPORT int
+ufunc_threads_for_size(intp n, intp work)
+{
+#ifdef NPY_UFUNC_THREADS
+    int nthreads = ufunc_nthreads;
+
+    if (nthreads <= 1 || n < 2 || work < ufunc_thread_threshold) {
+        return 1;
+    }
+    return (n < nthreads) ? (int)n : nthreads;
+#else
+    return 1;
+#endif
+}
+
+/* Run piece k of n items cut into nthreads pieces */
+static void
+_run_piece(ufunc_thread_func *func, void *data, intp n, int nthreads, int k)
+{
+    intp chunk = n / nthreads, rest = n % nthreads;
+    intp start = k*chunk + (k < rest ? k : rest);
+    intp stop = start + chunk + (k < rest ? 1 : 0);
+
+    func(data, start, stop);
+}
+
+#ifdef NPY_UFUNC_THREADS
+
+/* Held by the loop that currently owns the pool */
+static pthread_mutex_t pool_owner = PTHREAD_MUTEX_INITIALIZER;
+/* Protects everything below */
+static pthread_mutex_t pool_mutex = PTHREAD_MUTEX_INITIALIZER;
+static pthread_cond_t pool_work = PTHREAD_COND_INITIALIZER;
+static pthread_cond_t pool_done = PTHREAD_COND_INITIALIZER;
+static int pool_size = 0;
+static int pool_atfork = 0;
+
+static ufunc_thread_func *job_func = NULL;
+static void *job_data = NULL;
+static intp job_n = 0;
+static int job_pieces = 0;
+static int job_next = 0;
+static int job_pending = 0;
+static int job_fpstatus = 0;
+
+static void *
+_pool_worker(void *NPY_UNUSED(arg))
+{
+    ufunc_thread_func *func;
+    void *data;
+    intp n;
+    int pieces, k, status;
+
+    pthread_mutex_lock(&pool_mutex);
+    for (;;) {
+        while (job_next >= job_pieces) {
+            pthread_cond_wait(&pool_work, &pool_mutex);
+        }
+        k = job_next++;
+        func = job_func;
+        data = job_data;
+        n = job_n;
+        pieces = job_pieces;
+        pthread_mutex_unlock(&pool_mutex);
+
+        _run_piece(func, data, n, pieces, k);
+        UFUNC_CHECK_STATUS(status);
+
+        pthread_mutex_lock(&pool_mutex);
+        job_fpstatus |= status;
+        if (--job_pending == 0) {
+            pthread_cond_signal(&pool_done);
+        }
+    }
+    return NULL;
+}
+
+/*
+ * The workers do not survive a fork; start over with an empty pool in
+ * the child.
+ */
+static void
+_pool_atfork_child(void)
+{
+    pthread_mutex_init(&pool_owner, NULL);
+    pthread_mutex_init(&pool_mutex, NULL);
+    pthread_cond_init(&pool_work, NULL);
+    pthread_cond_init(&pool_done, NULL);
+    pool_size = 0;
+    job_pieces = job_next = job_pending = 0;
+}
+
+/* Make sure nworkers threads are running; returns how many are */
+static int
+_pool_grow(int nworkers)
+{
+    pthread_attr_t attr;
+    pthread_t thread;
+
+    if (!pool_atfork) {
+        pthread_atfork(NULL, NULL, _pool_atfork_child);
+        pool_atfork = 1;
+    }
+    if (pool_size >= nworkers) {
+        return pool_size;
+    }
+    pthread_attr_init(&attr);
+    pthread_attr_setdetachstate(&attr, PTHREAD_CREATE_DETACHED);
+    while (pool_size < nworkers) {
+        if (pthread_create(&thread, &attr, _pool_worker, NULL) != 0) {
+            break;
+        }
+        pool_size++;
+    }
+    pthread_attr_destroy(&attr);
+    return pool_size;
+}
+
+#endif
+
+/*
+ * Call func over the items [0, n), cut into nthreads contiguous pieces
+ * that run concurrently.  Does not return before all pieces are done.
+ * Returns the floating point status (UFUNC_FPE_*) raised by the worker
+ * threads; the status of the calling thread is left in its flags.
+ *
+ * Must be called without the GIL unless nthreads is 1.
+ */
+NPY_NO_EXPORT int
+ufunc_threads_run(ufunc_thread_func *func, void *data, intp n, int nthreads)
+{
+#ifdef NPY_UFUNC_THREADS
+    int k, fpstatus;
+
+    if (nthreads > 1 && pthread_mutex_trylock(&pool_owner) == 0) {
+        nthreads = _pool_grow(nthreads - 1) + 1;
+        if (nthreads > 1) {
+            pthread_mutex_lock(&pool_mutex);
+            job_func = func;
+            job_data = data;
+            job_n = n;
+            job_pieces = nthreads;
+            job_next = 1;
+            job_pending = nthreads;
+            job_fpstatus = 0;
+            pthread_cond_broadcast(&pool_work);
+
+            /* Run the first piece, then help with whatever is left */
+            k = 0;
+            while (k < nthreads) {
+                pthread_mutex_unlock(&pool_mutex);
+                _run_piece(func, data, n, nthreads, k);
+                pthread_mutex_lock(&pool_mutex);
+                job_pending--;
+                k = (job_next < job_pieces) ? job_next++ : nthreads;
+            }
+            while (job_pending > 0) {
+                pthread_cond_wait(&pool_done, &pool_mutex);
+            }
+            fpstatus = job_fpstatus;
+            pthread_mutex_unlock(&pool_mutex);
+            pthread_mutex_unlock(&pool_owner);
+            return fpstatus;
+        }
+        pthread_mutex_unlock(&pool_owner);
+    }
+#endif
+    _run_piece(func, data, n, 1, 0);
+    return 0;
+}
+
+/*
+ * setthreads(nthreads, threshold)
+ *
+ * Set the number of threads and the minimum number of elements for
+ * which ufunc loops are split between threads.
+ */
+NPY_NO_EXPORT PyObject *
+ufunc_setthreads(PyObject *NPY_UNUSED(dummy), PyObject *args)
+{
+    int nthreads;
+    Py_ssize_t threshold;
+
+    if (!PyArg_ParseTuple(args, "in", &nthreads, &threshold)) {
+        return NULL;
+    }
+    if (nthreads < 1 || nthreads > UFUNC_MAXTHREADS) {
+        PyErr_Format(PyExc_ValueError,
+                "number of threads must be between 1 and %d",
+                UFUNC_MAXTHREADS);
+        return NULL;
+    }
+    if (threshold < 0) {
+        PyErr_SetString(PyExc_ValueError,
+                "thread threshold must not be negative");
+        return NULL;
+    }
+    ufunc_nthreads = nthreads;
+    ufunc_thread_threshold = (intp)threshold;
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+/*
+ * getthreads()
+ *
+ * Return the tuple (nthreads, threshold).
+ */
+NPY_NO_EXPORT PyObject *
+ufunc_getthreads(PyObject *NPY_UNUSED(dummy), PyObject *args)
+{
+    if (!PyArg_ParseTuple(args, "")) {
+        return NULL;
+    }
+    return Py_BuildValue("(in)", ufunc_nthreads,
+            (Py_ssize_t)ufunc_thread_threshold);
+}
@@ -0,0 +1,28 @@
+#ifndef _NPY_UMATH_UFUNC_THREADS_H_
+#define _NPY_UMATH_UFUNC_THREADS_H_
+
+/* Upper limit accepted by setthreads */
+#define UFUNC_MAXTHREADS 256
+
+/* Default number of elements below which loops are never split */
+#define UFUNC_THREAD_THRESHOLD_DEFAULT 100000
+
+/*
+ * A piece of a split loop: process items [start, stop) of the loop
+ * described by data.
+ */
+typedef void (ufunc_thread_func)(void *data, intp start, intp stop);
+
+NPY_NO_EXPORT int
+ufunc_threads_for_size(intp n, intp work);
+
+NPY_NO_EXPORT int
+ufunc_threads_run(ufunc_thread_func *func, void *data, intp n, int nthreads);
+
+NPY_NO_EXPORT PyObject *
+ufunc_setthreads(PyObject *NPY_UNUSED(dummy), PyObject *args);
+
+NPY_NO_EXPORT PyObject *
+ufunc_getthreads(PyObject *NPY_UNUSED(dummy), PyObject *args);
+
+#endif
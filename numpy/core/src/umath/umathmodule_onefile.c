@@ -1,4 +1,5 @@
 #include "loops.c"
 
 #include "ufunc_object.c"
+#include "ufunc_threads.c"
 #include "umathmodule.c"
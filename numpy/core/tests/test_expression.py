@@ -0,0 +1,120 @@
+import numpy as np
+from numpy.testing import *
+
+
+class TestEvaluate(TestCase):
+    def setUp(self):
+        self.a = np.arange(1000.)
+        self.b = np.linspace(-1, 1, 1000)
+        self.c = np.arange(1000, dtype=np.int32)
+
+    def test_arithmetic(self):
+        a, b, c = self.a, self.b, self.c
+        for ex in ["a*b + c*2 - a", "a/b", "a//3 % 5", "-a**2",
+                   "abs(b)", "c << 2", "(c & 7) | 8", "~c ^ 3"]:
+            assert_array_equal(np.evaluate(ex), eval(ex), err_msg=ex)
+
+    def test_comparison(self):
+        a, b = self.a, self.b
+        assert_array_equal(np.evaluate("(a > 500) & (b < 0.5)"),
+                           (a > 500) & (b < 0.5))
+        assert_array_equal(np.evaluate("2 < b"), 2 < b)
+        assert_array_equal(np.evaluate("a == 3"), a == 3)
+
+    def test_ufuncs(self):
+        a, b = self.a, self.b
+        assert_array_equal(np.evaluate("np.sin(a) + cos(b)"),
+                           np.sin(a) + np.cos(b))
+        assert_array_equal(np.evaluate("arctan2(a, b)"), np.arctan2(a, b))
+        d = {'a': a, 'b': b, 'np': np}
+        assert_raises(ValueError, np.evaluate, "modf(a)", d)
+        assert_raises(TypeError, np.evaluate, "sin(a, b)", d)
+        assert_raises(TypeError, np.evaluate, "np.sum(a)", d)
+
+    def test_attributes(self):
+        d = {'a': self.a, 'np': np}
+        for ex in ["a.__class__", "a.shape", "np.__name__", "np._module",
+                   "np.sin(a).dtype", "(a + 1).T", "sin.nin"]:
+            assert_raises(ValueError, np.evaluate, ex, d)
+
+    def test_dicts(self):
+        x = np.arange(5)
+        assert_array_equal(np.evaluate("x + y", {'x': x, 'y': 1}), x + 1)
+        assert_array_equal(np.evaluate("x + y", {'x': x}, {'y': 2}), x + 2)
+        assert_raises(NameError, np.evaluate, "x + undefined_name", {'x': x})
+
+    def test_types(self):
+        f = np.ones(10, dtype=np.float32)
+        d = np.float64(3)
+        c = self.c[:10]
+        for ex in ["f*2.0 + 1", "f*2 + 1j", "f + d", "f > 0", "f*c"]:
+            assert_equal(np.evaluate(ex).dtype, eval(ex).dtype, err_msg=ex)
+
+    def test_scalars(self):
+        assert_equal(np.evaluate("2*3 + 1"), 7)
+        assert_equal(np.evaluate("x", {'x': 1.5}), 1.5)
+        x = np.arange(3)
+        y = np.evaluate("x", {'x': x})
+        assert_array_equal(y, x)
+        y[0] = 5
+        assert_equal(x[0], 0)
+
+    def test_broadcast(self):
+        row = np.arange(4.)
+        col = np.arange(3.)[:, None]
+        for blocksize in [1, 2, 5, 12, 100]:
+            assert_array_equal(np.evaluate("row*col + row", blocksize=blocksize),
+                               row*col + row)
+        assert_raises(ValueError, np.evaluate, "row + a", {'row': row,
+                                                           'a': self.a})
+
+    def test_blocks(self):
+        x = np.random.rand(7, 11, 13)
+        expected = x*x - 2*x + 1
+        for blocksize in [1, 3, 13, 50, 143, 144, 1000, 10000]:
+            assert_array_almost_equal(
+                np.evaluate("x*x - 2*x + 1", blocksize=blocksize), expected)
+        assert_array_almost_equal(
+            np.evaluate("x*x - 2*x + 1", {'x': x[:, ::2, ::-3]}, blocksize=7),
+            expected[:, ::2, ::-3])
+        assert_raises(ValueError, np.evaluate, "x + 1", {'x': x}, blocksize=0)
+
+    def test_fortran(self):
+        x = np.asfortranarray(np.random.rand(30, 40))
+        y = np.evaluate("x*2 + 1", blocksize=16)
+        assert_(y.flags.f_contiguous)
+        assert_array_equal(y, x*2 + 1)
+
+    def test_out(self):
+        a = self.a
+        out = np.empty_like(a)
+        assert_(np.evaluate("a*2 + 1", out=out) is out)
+        assert_array_equal(out, a*2 + 1)
+        out = np.arange(10.)
+        np.evaluate("out*2 + 1", out=out, blocksize=3)
+        assert_array_equal(out, np.arange(10.)*2 + 1)
+        # Overlapping inputs see the values before the evaluation
+        out = np.arange(10.)
+        np.evaluate("x + 1", {'x': out[:-1]}, out=out[1:], blocksize=3)
+        assert_array_equal(out, np.arange(10.))
+        assert_raises(ValueError, np.evaluate, "a + 1", {'a': a},
+                      out=np.empty(3))
+
+    def test_empty(self):
+        x = np.zeros((3, 0))
+        assert_equal(np.evaluate("x + 1").shape, (3, 0))
+
+    def test_subclass(self):
+        m = np.matrix([[1., 2], [3, 4]])
+        r = np.evaluate("m*m + 1")
+        assert_(isinstance(r, np.matrix))
+        assert_array_equal(r, m*m + 1)
+
+    def test_truth_value(self):
+        d = {'a': self.a}
+        assert_raises(TypeError, np.evaluate, "a > 1 and a < 3", d)
+        assert_raises(TypeError, np.evaluate, "1 < a < 3", d)
+
+
+if __name__ == "__main__":
+    run_module_suite()
@@ -1,10 +1,12 @@
 import tempfile
 import sys
 import os
+import threading
 import numpy as np
 from numpy.testing import *
 from numpy.core import *
-from numpy.core.multiarray_tests import test_neighborhood_iterator, test_neighborhood_iterator_oob
+from numpy.core.multiarray_tests import test_neighborhood_iterator, test_neighborhood_iterator_oob, \
+        test_number_add_owned, test_elide_temps_enabled
 
 from numpy.compat import asbytes, getexception, strchar
 
@@ -275,6 +277,18 @@ class TestMethods(TestCase):
         assert_equal(array([12.2,15.5]).round(-1), [10,20])
         assert_equal(array([12.15,15.51]).round(1), [12.2,15.5])
 
+    def test_copy_order(self):
+        a = arange(24.).reshape(2,3,4)
+        for x, strides in [(a, (96, 32, 8)), (a.T, (8, 32, 96)),
+                           (a.transpose(1,0,2), (32, 96, 8)),
+                           (a[:,::-1], (96, 32, 8))]:
+            c = x.copy(order='K')
+            assert_equal(c, x)
+            assert_equal(c.strides, strides)
+        assert_(a.T.copy().flags.c_contiguous)
+        assert_(a.T.copy('A').flags.f_contiguous)
+        assert_(a.copy(order='F').flags.f_contiguous)
+
     def test_transpose(self):
         a = array([[1,2],[3,4]])
         assert_equal(a.transpose(), [[1,3],[2,4]])
@@ -308,7 +322,7 @@ class TestMethods(TestCase):
         # sort for small arrays.
         a = np.arange(100)
         b = a[::-1].copy()
-        for kind in ['q','m','h'] :
+        for kind in ['q','m','h','t','r'] :
             msg = "scalar sort, kind=%s" % kind
             c = a.copy();
             c.sort(kind=kind)
@@ -321,7 +335,7 @@ class TestMethods(TestCase):
         # but the compare fuction differs.
         ai = a*1j + 1
         bi = b*1j + 1
-        for kind in ['q','m','h'] :
+        for kind in ['q','m','h','t'] :
             msg = "complex sort, real part == 1, kind=%s" % kind
             c = ai.copy();
             c.sort(kind=kind)
@@ -331,7 +345,7 @@ class TestMethods(TestCase):
             assert_equal(c, ai, msg)
         ai = a + 1j
         bi = b + 1j
-        for kind in ['q','m','h'] :
+        for kind in ['q','m','h','t'] :
             msg = "complex sort, imag part == 1, kind=%s" % kind
             c = ai.copy();
             c.sort(kind=kind)
@@ -388,6 +402,52 @@ class TestMethods(TestCase):
         #assert_equal(d, c, "test sort with axis=None")
 
 
+    def test_sort_stable_kinds(self):
+        # radix and timsort are stable and must agree with mergesort
+        np.random.seed(2)
+        n = 1000
+        data = [np.random.randint(-1000, 1000, n),
+                np.random.randint(0, 3, n),
+                np.arange(n),
+                np.arange(n)[::-1],
+                np.concatenate([np.sort(np.random.randint(0, 99, 250))
+                                for i in range(4)])]
+        for a in data:
+            for dt in [np.bool_, np.int8, np.uint8, np.int16, np.uint16,
+                       np.int32, np.uint32, np.int64, np.uint64, np.float32,
+                       np.float64, np.longdouble, np.complex64]:
+                b = a.astype(dt)
+                kinds = ['timsort']
+                if issubclass(dt, (np.integer, np.bool_)):
+                    kinds.append('radix')
+                expected = b.argsort(kind='mergesort')
+                for kind in kinds:
+                    msg = "dtype=%s, kind=%s" % (dt, kind)
+                    assert_equal(b.argsort(kind=kind), expected, msg)
+                    assert_equal(np.sort(b, kind=kind), b[expected], msg)
+
+        # byteswapped and strided data, nans
+        a = np.arange(300, dtype='>i4').reshape(3, 100)[:, ::-1] % 7
+        assert_equal(np.sort(a, kind='radix'), np.sort(a))
+        assert_equal(np.sort(a, axis=0, kind='radix'), np.sort(a, axis=0))
+        a = np.random.rand(100)
+        a[::7] = np.nan
+        assert_equal(np.sort(a, kind='timsort'), np.sort(a))
+
+        assert_raises(TypeError, np.sort, np.arange(10.), kind='radix')
+        assert_raises(TypeError, np.sort, np.array(['b', 'a']),
+                      kind='timsort')
+
+    def test_lexsort_kind(self):
+        np.random.seed(3)
+        a = np.random.randint(0, 5, 500)
+        b = np.random.rand(500)
+        c = np.random.randint(0, 50, 500).astype(np.int16)
+        expected = np.lexsort((b, c, a))
+        for kind in ['mergesort', 'timsort', 'radix']:
+            assert_equal(np.lexsort((b, c, a), kind=kind), expected, kind)
+        assert_raises(ValueError, np.lexsort, (b, a), kind='quicksort')
+
     def test_sort_order(self):
         # Test sorting an array with fields
         x1=np.array([21,32,14])
@@ -430,7 +490,7 @@ class TestMethods(TestCase):
         # sort for small arrays.
         a = np.arange(100)
         b = a[::-1].copy()
-        for kind in ['q','m','h'] :
+        for kind in ['q','m','h','t','r'] :
             msg = "scalar argsort, kind=%s" % kind
             assert_equal(a.copy().argsort(kind=kind), a, msg)
             assert_equal(b.copy().argsort(kind=kind), b, msg)
@@ -439,13 +499,13 @@ class TestMethods(TestCase):
         # but the compare fuction differs.
         ai = a*1j + 1
         bi = b*1j + 1
-        for kind in ['q','m','h'] :
+        for kind in ['q','m','h','t'] :
             msg = "complex argsort, kind=%s" % kind
             assert_equal(ai.copy().argsort(kind=kind), a, msg)
             assert_equal(bi.copy().argsort(kind=kind), b, msg)
         ai = a + 1j
         bi = b + 1j
-        for kind in ['q','m','h'] :
+        for kind in ['q','m','h','t'] :
             msg = "complex argsort, kind=%s" % kind
             assert_equal(ai.copy().argsort(kind=kind), a, msg)
             assert_equal(bi.copy().argsort(kind=kind), b, msg)
@@ -527,6 +587,102 @@ class TestMethods(TestCase):
         b = a.searchsorted(a, side='r')
         assert_equal(b, np.arange(1,10), msg)
 
+    def assert_partitioned(self, p, kth, msg=''):
+        s = np.sort(p)
+        for k in np.atleast_1d(kth):
+            assert_equal(p[k], s[k], msg)
+            assert_((p[:k] <= p[k]).all(), msg)
+            assert_((p[k + 1:] >= p[k]).all(), msg)
+
+    def test_partition(self):
+        np.random.seed(1)
+        # sizes below and above the insertion sort cutoff
+        for n in [1, 2, 5, 16, 17, 100, 1001]:
+            for dt in [np.bool_, np.int8, np.uint32, np.float32,
+                       np.float64, np.complex128]:
+                a = (np.random.rand(n)*10).astype(dt)
+                for kth in [0, n - 1, n // 2, [0, n // 3, n - 1]]:
+                    msg = "n=%d, dtype=%s, kth=%s" % (n, dt, kth)
+                    p = a.copy()
+                    p.partition(kth)
+                    self.assert_partitioned(p, kth, msg)
+                    assert_equal(np.sort(p), np.sort(a), msg)
+                    self.assert_partitioned(np.partition(a, kth), kth, msg)
+
+        # sorted, reversed and constant input
+        for a in [np.arange(1000.), np.arange(1000.)[::-1], np.ones(1000),
+                  np.tile([1., 0.], 500)]:
+            p = np.partition(a, 500)
+            self.assert_partitioned(p, 500)
+
+        # nans go last, as in sort
+        a = np.array([3., np.nan, 1, 2, np.nan, 0]*5)
+        p = np.partition(a, [0, 19, 20])
+        assert_equal(p[0], 0)
+        assert_equal(p[19], 3)
+        assert_(np.isnan(p[20:]).all())
+
+    def test_partition_axis(self):
+        a = np.random.rand(5, 40)
+        for axis in [0, 1, -1]:
+            p = np.partition(a, 3, axis=axis)
+            assert_equal(p.take([3], axis=axis),
+                         np.sort(a, axis=axis).take([3], axis=axis))
+        p = np.partition(a, [-1, 2], axis=None)
+        assert_equal(p.shape, (200,))
+        self.assert_partitioned(p, [2, 199])
+
+        # strided, unaligned and byteswapped data go through a buffer
+        b = a.T
+        b.partition(7, axis=0)
+        assert_equal(b[7], np.sort(a.T, axis=0)[7])
+        c = np.arange(100.).byteswap().newbyteorder()[::-1]
+        c.partition(30)
+        assert_equal(c[30], 30)
+
+    def test_partition_types(self):
+        # types without a selection function are sorted
+        o = np.array([3, 1, 2, 5, 4], dtype=object)
+        assert_equal(np.partition(o, 2), [1, 2, 3, 4, 5])
+        s = np.array(['c', 'a', 'b'])
+        assert_equal(np.partition(s, 1), ['a', 'b', 'c'])
+        r = np.array([(2, 1), (1, 2)], dtype=[('x', int), ('y', int)])
+        assert_equal(np.partition(r, 0, order='x')['x'], [1, 2])
+        assert_equal(np.partition(r, 0, order='y')['y'], [1, 2])
+
+    def test_partition_errors(self):
+        a = np.arange(10)
+        assert_raises(ValueError, a.partition, 10)
+        assert_raises(ValueError, a.partition, -11)
+        assert_raises(ValueError, a.partition, [1, 10])
+        assert_raises(ValueError, a.partition, 1, kind='quicksort')
+        assert_raises(ValueError, a.partition, 1, axis=1)
+        assert_raises(TypeError, a.partition, 1.5)
+        assert_raises(ValueError, np.array(1).partition, 0)
+        a.flags.writeable = False
+        assert_raises(RuntimeError, a.partition, 1)
+
+    def test_argpartition(self):
+        np.random.seed(1)
+        for n in [1, 2, 17, 1001]:
+            for dt in [np.int16, np.float64, np.complex64, object]:
+                a = (np.random.rand(n)*10).astype(dt)
+                for kth in [0, n - 1, n // 2, [0, n // 3, n - 1]]:
+                    msg = "n=%d, dtype=%s, kth=%s" % (n, dt, kth)
+                    i = a.argpartition(kth)
+                    assert_equal(np.sort(i), np.arange(n), msg)
+                    self.assert_partitioned(a[i], kth, msg)
+
+        a = np.random.rand(4, 30)
+        i = np.argpartition(a, 1, axis=0)
+        assert_equal(a[i[1], np.arange(30)], np.sort(a, axis=0)[1])
+        i = np.argpartition(a, [1, -2], axis=None)
+        self.assert_partitioned(a.ravel()[i], [1, 118])
+        i = np.argpartition(a.T, 10, axis=0)
+        assert_equal(a.T[i[10], np.arange(4)], np.sort(a.T, axis=0)[10])
+        assert_equal(np.array(3.).argpartition(0), [0])
+        assert_raises(ValueError, np.arange(3).argpartition, 3)
+
     def test_flatten(self):
         x0 = np.array([[1,2,3],[4,5,6]], np.int32)
         x1 = np.array([[[1,2],[3,4]],[[5,6],[7,8]]], np.int32)
@@ -1225,6 +1381,149 @@ class TestChoose(TestCase):
         A = np.choose(self.ind, (self.x, self.y2))
         assert_equal(A, [[2,2,3],[2,2,3]])
 
+    def test_raise(self):
+        self.assertRaises(ValueError, np.choose, [0,2,1], (self.x, self.y))
+        self.assertRaises(ValueError, np.choose, [0,-1,1], (self.x, self.y))
+        A = np.choose([0,2,-1], (self.x, self.y), mode='clip')
+        assert_equal(A, [2,3,2])
+
+
+class TestTemporaryElision(TestCase):
+    """Large temporaries are reused as the output of binary operations."""
+    def setUp(self):
+        self.a = np.arange(100000.)
+
+    def test_values(self):
+        a = self.a
+        assert_equal(a*2 + a - 1, 3*a - 1)
+        assert_equal(1 - (a*2), 1 - 2*a)
+        assert_equal(2/(a + 1), 2/(a + 1.))
+        b = (a + 1)*(a + 2)
+        assert_equal(b, (a + 1.)*(a + 2.))
+        assert_equal((a*1)[::2] + 1, a[::2] + 1)
+
+    def test_types(self):
+        a = self.a
+        i = np.arange(100000, dtype=np.int32)
+        u = np.ones(100000, dtype=np.uint8)
+        assert_equal((u*1 + (-1)).dtype, (u + (-1)).dtype)
+        assert_equal((u*1 + 1).dtype, np.uint8)
+        assert_equal(((a*1).astype(np.float32) + a).dtype, np.float64)
+        assert_equal(((i*1) + 0.5).dtype, np.float64)
+        assert_equal(np.true_divide(i*1, 2).dtype, np.float64)
+        assert_equal(((i*2) // 2), i)
+        assert_equal(((i*1) & 3) | 8, (i & 3) | 8)
+
+    def test_broadcast(self):
+        a = self.a.reshape(1000, 100)
+        row = np.arange(100.)
+        assert_equal((a*1) + row, a + row)
+        col = np.arange(1000.)[:, None]
+        assert_equal((col*1) + a, col + a)
+        assert_equal((a[:, :1]*1) - a, a[:, :1] - a)
+
+    def _temp(self, ptrs):
+        # a*2, whose only reference is the one on the interpreter stack
+        t = self.a*2
+        ptrs.append(t.__array_interface__['data'][0])
+        return t
+
+    @dec.skipif(not test_elide_temps_enabled(),
+                "temporaries are not reused in this build")
+    def test_reuse(self):
+        a = self.a
+        ptrs = []
+        r = self._temp(ptrs) + 1
+        assert_equal(r.__array_interface__['data'][0], ptrs[-1])
+        assert_equal(r, 2*a + 1)
+        r = a * self._temp(ptrs)
+        assert_equal(r.__array_interface__['data'][0], ptrs[-1])
+        assert_equal(r, 2*a*a)
+        r = (self._temp(ptrs) - a) / (a + 1)
+        assert_equal(r.__array_interface__['data'][0], ptrs[-1])
+
+    def test_no_reuse(self):
+        a = self.a
+        ptrs = []
+        # the right operand of a subtraction
+        r = 1 - self._temp(ptrs)
+        assert_(r.__array_interface__['data'][0] != ptrs[-1])
+        # an operand with a name
+        b = a*2
+        r = b + 1
+        assert_equal(b, 2*a)
+        # a view, which does not own its data
+        r = a.reshape(1000, 100).T + 1
+        assert_equal(a, np.arange(100000.))
+        # a result of another type
+        r = self._temp(ptrs) + 1j
+        assert_(r.__array_interface__['data'][0] != ptrs[-1])
+
+    def test_c_api(self):
+        # A C caller may hold the only reference to an operand it uses
+        a, s = test_number_add_owned(self.a, self.a)
+        assert_equal(a, self.a)
+        assert_equal(s, 2*self.a)
+
+
+class TestThreads(TestCase):
+    """The GIL is released around these, check they work from threads."""
+    def run_threads(self, func, nthreads=4):
+        errors = []
+        def run():
+            try:
+                func()
+            except Exception, e:
+                errors.append(e)
+        threads = [threading.Thread(target=run) for i in range(nthreads)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        if errors:
+            raise errors[0]
+
+    def test_sort(self):
+        a = np.random.random(10000)
+        expected = a.copy()
+        expected.sort()
+        def func():
+            for kind in ['quicksort', 'mergesort', 'heapsort']:
+                assert_equal(np.sort(a, kind=kind), expected)
+                assert_equal(a[np.argsort(a, kind=kind)], expected)
+        self.run_threads(func)
+
+    def test_take_put(self):
+        a = np.arange(10000.)
+        ind = np.arange(10000)[::-1]
+        def func():
+            b = a.take(ind)
+            assert_equal(b, a[::-1])
+            c = np.zeros_like(a)
+            c.put(ind, a)
+            assert_equal(c, b)
+            self.assertRaises(IndexError, a.take, [0, 10000])
+            self.assertRaises(IndexError, c.put, [0, -10001], 1)
+        self.run_threads(func)
+
+    def test_cast(self):
+        a = np.arange(10000, dtype='>i4')
+        dt = np.arange(10000).astype('M8[D]')
+        def func():
+            assert_equal(a.astype(np.float64), np.arange(10000.))
+            assert_equal(a[::2].astype(np.int16), np.arange(0, 10000, 2))
+            assert_equal(dt.astype(np.int64), np.arange(10000))
+            assert_equal(np.nonzero(dt)[0], np.arange(1, 10000))
+        self.run_threads(func)
+
+    def test_object(self):
+        a = np.array(range(100), dtype=object)
+        def func():
+            assert_equal(a.take(range(100)[::-1]), a[::-1])
+            assert_equal(np.sort(a[::-1]), a)
+            assert_equal(a.repeat(2)[::2], a)
+        self.run_threads(func)
+
 def can_use_decimal():
     try:
         from decimal import Decimal
@@ -1503,6 +1802,122 @@ class TestStackedNeighborhoodIter(TestCase):
                 [-1, 2], NEIGH_MODE['circular'])
         assert_array_equal(l, r)
 
+class TestNditer(TestCase):
+    def test_coalescing(self):
+        a = np.arange(24.).reshape(2, 3, 4)
+        it = np.nditer(a)
+        assert_equal(it.ndim, 1)
+        assert_equal(it.itersize, 24)
+        assert_equal([x.copy() for x in it], [a.ravel()])
+        # A strided view can't be coalesced entirely
+        it = np.nditer(a[:, :, :2])
+        assert_equal(it.ndim, 2)
+        assert_equal([x.copy() for x in it], list(a[:, :, :2].reshape(6, 2)))
+
+    def test_memory_order(self):
+        # Transposed arrays are visited in memory order
+        t = np.arange(24.).reshape(2, 3, 4).transpose(2, 0, 1)
+        assert_equal(np.nditer(t).ndim, 1)
+        assert_equal([x.copy() for x in np.nditer(t)], [np.arange(24.)])
+        # unless an order is forced
+        it = np.nditer(t, order='C')
+        assert_equal(np.concatenate([x.copy() for x in it]), t.ravel())
+        f = np.asfortranarray(np.arange(6).reshape(2, 3))
+        assert_equal([x.copy() for x in np.nditer(f)], [[0, 3, 1, 4, 2, 5]])
+        it = np.nditer(f, order='C')
+        assert_equal(np.concatenate([x.copy() for x in it]), np.arange(6))
+        assert_raises(ValueError, np.nditer, f, order='X')
+
+    def test_allocate(self):
+        a = np.arange(6).reshape(2, 3)
+        b = np.arange(3)
+        it = np.nditer([a, b, None])
+        for x, y, z in it:
+            z[...] = x + y
+        assert_equal(it.operands[2], a + b)
+        # The output follows the memory layout of the inputs
+        t = np.arange(24.).reshape(2, 3, 4).transpose(2, 0, 1)
+        it = np.nditer([t, None], op_dtypes=[None, np.float32])
+        for x, y in it:
+            y[...] = x
+        out = it.operands[1]
+        assert_equal(out.dtype, np.float32)
+        assert_equal(out.strides, (4, 48, 16))
+        assert_equal(out, t)
+
+    def test_operand_errors(self):
+        assert_raises(ValueError, np.nditer, [np.zeros(2), np.zeros(3)])
+        # Write operands can't be broadcast
+        assert_raises(ValueError, np.nditer, [np.zeros(3), np.zeros((2, 3))],
+                      op_flags=[['writeonly'], ['readonly']])
+        a = np.arange(3)
+        a.flags.writeable = False
+        assert_raises(ValueError, np.nditer, a, op_flags='readwrite')
+
+    def test_readonly_views(self):
+        a = np.arange(3)
+        for x in np.nditer(a):
+            assert_(not x.flags.writeable)
+        for x in np.nditer(a, op_flags=['readwrite']):
+            x *= 2
+        assert_equal(a, [0, 2, 4])
+
+    def test_empty_and_zero_rank(self):
+        assert_equal(list(np.nditer(np.zeros((0, 3)))), [])
+        assert_equal(np.nditer(np.zeros((0, 3))).itersize, 0)
+        assert_equal([x.copy() for x in np.nditer(np.array(5))], [[5]])
+
+    def test_buffered_cast(self):
+        a = np.arange(10, dtype='>i4')
+        # A cast needs buffering
+        assert_raises(TypeError, np.nditer, a, op_dtypes='f8')
+        it = np.nditer(a, flags=['buffered'], op_dtypes='f8', buffersize=4)
+        chunks = [x.copy() for x in it]
+        assert_equal([len(x) for x in chunks], [4, 4, 2])
+        assert_equal(chunks[0].dtype, np.float64)
+        assert_equal(np.concatenate(chunks), a)
+
+    def test_buffered_write(self):
+        out = np.zeros(10, dtype='>i2')[::2]
+        it = np.nditer([np.arange(5.), out], flags='buffered',
+                       op_flags=[['readonly'], ['writeonly']],
+                       op_dtypes=[None, 'f4'], buffersize=3)
+        for x, y in it:
+            y[...] = 3*x
+        assert_equal(out, [0, 3, 6, 9, 12])
+
+    def test_buffered_across_rows(self):
+        a = np.arange(12).reshape(3, 4)[:, :3]
+        out = np.ones((3, 3), dtype='>f8')
+        it = np.nditer([a, out], flags=['buffered'],
+                       op_flags=[['readonly'], ['readwrite']],
+                       op_dtypes=['f8', 'f8'], buffersize=5)
+        sizes = []
+        for x, y in it:
+            sizes.append(len(x))
+            y += x
+        assert_equal(sizes, [5, 4])
+        assert_equal(out, a + 1)
+
+    def test_contig(self):
+        a = np.arange(10.)[::2]
+        it = np.nditer(a, flags=['buffered'], op_flags=['readonly', 'contig'])
+        for x in it:
+            assert_equal(x.strides, (8,))
+            assert_equal(x, a)
+
+    def test_copy_and_cast(self):
+        # Copies and casts visit the elements through nditer
+        t = np.arange(24.).reshape(2, 3, 4).transpose(2, 0, 1)
+        x = np.empty((4, 2, 3))
+        x[...] = t
+        assert_equal(x, t)
+        assert_equal(t.astype(np.int16), t)
+        f = np.asfortranarray(np.arange(12.).reshape(3, 4))[:, ::2]
+        assert_equal(f.astype('>i4'), [[0, 2], [4, 6], [8, 10]])
+        s = np.arange(6, dtype='>f8').reshape(2, 3).T
+        assert_equal(s.astype('<i8'), [[0, 3], [1, 4], [2, 5]])
+
 class TestWarnings(object):
     def test_complex_warning(self):
         import warnings
@@ -882,6 +882,81 @@ class TestStdVarComplex(TestCase):
         assert_almost_equal(std(A)**2,real_var)
 
 
+class TestReduceAxes(TestCase):
+    def setUp(self):
+        self.A = arange(60.).reshape(3,4,5)
+
+    def test_tuple_axis(self):
+        A = self.A
+        B = A.transpose(1,0,2).reshape(4,-1)
+        assert_almost_equal(sum(A, axis=(0,2)), B.sum(1))
+        assert_almost_equal(prod(A/10 + 1, axis=(2,0)), (B/10 + 1).prod(1))
+        assert_equal(amax(A, axis=(0,2)), B.max(1))
+        assert_equal(amin(A, axis=(0,2)), B.min(1))
+        assert_equal(any(A > 58, axis=(0,2)), (B > 58).any(1))
+        assert_equal(all(A > 0, axis=(0,2)), (B > 0).all(1))
+        assert_almost_equal(mean(A, axis=(0,2)), B.mean(1))
+        assert_almost_equal(var(A, axis=(0,2), ddof=1), B.var(1, ddof=1))
+        assert_almost_equal(std(A, axis=(0,2)), B.std(1))
+        C = A + 1j*A[::-1]
+        assert_almost_equal(var(C, axis=(0,1)), C.reshape(-1,5).var(0))
+
+    def test_keepdims(self):
+        A = self.A
+        for func in [sum, prod, amax, amin, any, all, mean, std, var]:
+            assert_equal(func(A, keepdims=True).shape, (1,1,1))
+            assert_equal(func(A, axis=1, keepdims=True).shape, (3,1,5))
+            assert_almost_equal(func(A, axis=(0,1), keepdims=True).ravel(),
+                                func(A.reshape(-1,5), axis=0))
+        assert_almost_equal(A - mean(A, axis=(1,2), keepdims=True),
+                            A - A.reshape(3,-1).mean(1)[:,None,None])
+
+    def test_methods(self):
+        A = self.A
+        for name in ['sum', 'prod', 'max', 'min', 'any', 'all', 'mean',
+                     'std', 'var']:
+            method = getattr(A, name)
+            B = A.transpose(1,0,2).reshape(4,-1)
+            assert_almost_equal(method(axis=(0,2)), getattr(B, name)(1))
+            assert_almost_equal(method((2,0)), getattr(B, name)(1))
+            assert_equal(method(keepdims=True).shape, (1,1,1))
+            assert_equal(method(axis=1, keepdims=False).shape, (3,5))
+            assert_almost_equal(method(axis=(0,1), keepdims=True).ravel(),
+                                getattr(A.reshape(-1,5), name)(axis=0))
+        out = np.zeros((1,4,1))
+        assert_(A.sum((0,2), None, out, True) is out)
+        assert_almost_equal(out.ravel(), sum(A, axis=(0,2)))
+        assert_almost_equal(A.var(1, None, None, 1, True),
+                            var(A, axis=1, ddof=1, keepdims=True))
+        assert_raises(ValueError, A.sum, axis=(0,0))
+        # subclasses without methods of their own
+        class S(np.ndarray):
+            pass
+        s = A.view(S)
+        assert_almost_equal(s.sum(axis=(0,2)), A.sum(axis=(0,2)))
+        assert_equal(s.mean(keepdims=True).shape, (1,1,1))
+        assert_(isinstance(s.max(axis=(0,1), keepdims=True), S))
+
+    def test_subclasses(self):
+        # masked arrays and matrices are reduced with their own methods
+        m = np.ma.array([[1, 100], [3, 2]], mask=[[0, 1], [0, 0]])
+        assert_equal(mean(m, axis=(0,1)), 2.)
+        assert_equal(sum(m, axis=(0,)), [4, 2])
+        assert_equal(amax(m, axis=(0,1)), 3)
+        assert_equal(amin(m, keepdims=True), [[1]])
+        assert_almost_equal(var(m, axis=(1,0)), var([1, 3, 2]))
+        assert_almost_equal(std(m, axis=(1,), keepdims=True), [[0], [0.5]])
+        B = np.ma.array(self.A, mask=self.A > 50)
+        assert_equal(sum(B, axis=(0,2)), [B[:,i].sum() for i in range(4)])
+        assert_almost_equal(mean(B, axis=(0,2), keepdims=True).ravel(),
+                            [B[:,i].mean() for i in range(4)])
+        M = np.matrix([[1, 2], [3, 4]])
+        assert_equal(sum(M, axis=(0,1)), 10)
+        assert_(not isinstance(sum(M, axis=(0,1)), np.ndarray))
+        assert_equal(sum(M, axis=(1,)), [[3], [7]])
+        assert_(isinstance(sum(M, keepdims=True), np.matrix))
+
+
 class TestLikeFuncs(TestCase):
     '''Test zeros_like and empty_like'''
 
@@ -903,6 +978,21 @@ class TestLikeFuncs(TestCase):
             assert dz.shape == dshape
             assert dz.dtype.type == dtype
 
+    def test_like_order(self):
+        a = arange(24.).reshape(2,3,4)
+        for func in [zeros_like, empty_like]:
+            assert_(func(a).flags.c_contiguous)
+            assert_(func(a.T).flags.f_contiguous)
+            assert_equal(func(a.transpose(1,0,2)).strides, (32, 96, 8))
+            assert_(func(a.T, order='C').flags.c_contiguous)
+            assert_(func(a, order='F').flags.f_contiguous)
+            assert_(func(a.T, order='A').flags.f_contiguous)
+            assert_(func(a.tolist(), order='F').flags.f_contiguous)
+        assert_equal(zeros_like(a.transpose(1,0,2)), zeros((3,2,4)))
+        m = np.matrix([[1, 2], [3, 4]]).T
+        assert_(isinstance(empty_like(m), np.matrix))
+        assert_(isinstance(zeros_like(m), np.matrix))
+
 class _TestCorrelate(TestCase):
     def _setup(self, dt):
         self.x = np.array([1, 2, 3, 4, 5], dtype=dt)
@@ -353,6 +353,145 @@ class TestUfunc(TestCase):
         umt.inner1d(a,b,c[...,0])
         assert_array_equal(c[...,0], np.sum(a*b,axis=-1), err_msg=msg)
 
+    def test_reduce_axes(self):
+        a = np.arange(120.).reshape(2,3,4,5)
+        for axis in [(0,2), (3,1), (0,1,2,3), (2,)]:
+            tgt = a
+            for ax in sorted(axis)[::-1]:
+                tgt = tgt.sum(ax)
+            assert_almost_equal(np.add.reduce(a, axis), tgt)
+            # the buffered loop: byteswapped, strided input
+            b = a.astype('>f8')[:,::2]
+            tgt = b
+            for ax in sorted(axis)[::-1]:
+                tgt = tgt.sum(ax)
+            assert_almost_equal(np.add.reduce(b, axis), tgt)
+        assert_equal(np.add.reduce(a, None), a.sum())
+        assert_equal(np.add.reduce(a, ()), a)
+        assert_equal(np.add.reduce(np.zeros((0,3,2)), (0,2)), np.zeros(3))
+        # only ufuncs whose result does not depend on the order of the
+        # values reduce over several axes
+        b = np.arange(6).reshape(2,3)
+        assert_raises(ValueError, np.subtract.reduce, b, (0,1))
+        assert_raises(ValueError, np.subtract.reduce, b, None)
+        assert_equal(np.subtract.reduce(b, (1,)), [-3, -6])
+        assert_equal(np.maximum.reduce(b, None), 5)
+        assert_equal(np.logical_xor.reduce(b, (0,1)), True)
+        o = np.arange(24).reshape(2,3,4).astype(object)
+        assert_equal(np.add.reduce(o, (0,2)), [60, 92, 124])
+        out = np.zeros(3)
+        assert_(np.add.reduce(a, (0,2,3), out=out) is out)
+        assert_almost_equal(out, a.sum(3).sum(2).sum(0))
+        assert_raises(ValueError, np.add.reduce, a, (0,0))
+        assert_raises(ValueError, np.add.reduce, a, (1,4))
+
+    def test_reduce_keepdims(self):
+        a = np.arange(24).reshape(2,3,4)
+        res = np.add.reduce(a, (0,2), keepdims=True)
+        assert_equal(res.shape, (1,3,1))
+        assert_equal(res.ravel(), np.add.reduce(a, (0,2)))
+        assert_equal(np.add.reduce(a, 1, keepdims=True), a.sum(1)[:,None])
+        assert_equal(np.add.reduce(a, None, keepdims=True).shape, (1,1,1))
+        out = np.zeros((1,3,1))
+        assert_(np.add.reduce(a, (0,2), out=out, keepdims=True) is out)
+        assert_equal(out.ravel(), np.add.reduce(a, (0,2)))
+        out = np.zeros((2,1,4), dtype=int)
+        assert_(np.add.reduce(a, 1, out=out, keepdims=True) is out)
+        assert_equal(out, a.sum(1)[:,None])
+        assert_raises(ValueError, np.add.reduce, a, (0,2),
+                      out=np.zeros(3), keepdims=True)
+        assert_raises(ValueError, np.add.reduce, a, 1,
+                      out=np.zeros((2,3,4)), keepdims=True)
+
+    def test_where(self):
+        a = np.arange(10.)
+        mask = a % 3 == 0
+        res = a.copy()
+        np.add(res, 1, res, where=mask)
+        assert_equal(res, np.where(mask, a + 1, a))
+        # non-contiguous operands, a broadcast mask and casting outputs
+        x = np.arange(12.).reshape(3,4)
+        out = np.zeros((4,3)).T
+        np.multiply(x, 2, out, where=[True, False, True, False])
+        assert_equal(out, np.where([True, False, True, False], 2*x, 0))
+        out = np.zeros((3,4), dtype=np.int32)
+        np.add(x, 0.5, out, where=x > 4)
+        assert_equal(out, np.where(x > 4, x, 0))
+        out = np.arange(5, dtype='>f8')
+        np.sqrt(out, out, where=[False, True, False, True, False])
+        assert_almost_equal(out, [0, 1, 2, np.sqrt(3), 4])
+        out = np.array([1, 2, 3], dtype=object)
+        np.add(out, 10, out, where=[True, False, True])
+        assert_equal(out, [11, 2, 13])
+        assert_raises(ValueError, np.add, a, 1, where=np.ones(3, bool))
+
+    def test_reduce_where(self):
+        x = np.arange(12.).reshape(3,4)
+        assert_equal(np.add.reduce(x, where=x > 3), [12, 14, 16, 18])
+        assert_equal(np.add.reduce(x, 1, where=x % 2 == 0), [2, 10, 18])
+        assert_equal(np.add.reduce(x, (0,1), where=x > 5), 51)
+        assert_equal(np.add.reduce(x.astype('>i2'), 0,
+                                   where=[[True], [False], [True]]),
+                     [8, 10, 12, 14])
+        assert_equal(np.multiply.reduce(x + 1, None,
+                                        where=[True, False, False, True]),
+                     17280)
+        assert_raises(ValueError, np.maximum.reduce, x, where=x > 1)
+
+    def test_order(self):
+        a = np.arange(24.).reshape(2,3,4)
+        for x in [a, a.T, a.transpose(1,0,2), a[:,::-1], a[::2,:,::3]]:
+            for order in ['C', 'F', 'A', 'K']:
+                assert_equal(np.add(x, 1, order=order),
+                             np.add(np.ascontiguousarray(x), 1))
+        # outputs follow the layout of the inputs by default
+        assert_(np.add(a.T, a.T).flags.f_contiguous)
+        assert_equal(np.add(a.T, 1).strides, a.T.strides)
+        assert_equal(np.sqrt(a.transpose(1,0,2)).strides, (32, 96, 8))
+        assert_(np.add(a.T, a.T, order='C').flags.c_contiguous)
+        assert_(np.add(a, a, order='F').flags.f_contiguous)
+        assert_(np.add(a.T, 1, order='A').flags.f_contiguous)
+        # buffered and masked loops walk the permuted axes too
+        x = a.astype('>f8').transpose(2,0,1)
+        assert_equal(np.add(x, 1), a.transpose(2,0,1) + 1)
+        mask = (a % 3 == 0).T
+        out = np.zeros((4,3,2)).T
+        np.add(a, 1, out, where=mask.T)
+        assert_equal(out, np.where(mask.T, a + 1, 0))
+        assert_raises(TypeError, np.add, a, 1, order='Q')
+
+    def test_buffered(self):
+        # small buffers, so that the chunks end inside rows or span several
+        oldsize = np.setbufsize(16)
+        try:
+            for shape in [(100,), (7, 9), (3, 50), (4, 3, 5)]:
+                a = np.arange(np.prod(shape)).reshape(shape) % 11 - 5
+                for x in [a.astype('>f8'), a.astype(np.int8).T,
+                          a.astype('>i4')[..., ::-1]]:
+                    y = x.astype(np.float64)
+                    assert_equal(np.add(x, 0.5), y + 0.5)
+                    assert_equal(np.multiply(x, y), y*y)
+                    out = np.zeros(x.shape, np.float32)
+                    np.subtract(x, y[..., :1], out)
+                    assert_equal(out, y - y[..., :1])
+                    for axis in range(x.ndim):
+                        assert_equal(np.add.reduce(x, axis, np.float64),
+                                     np.add.reduce(y, axis))
+                        assert_equal(np.subtract.reduce(x, axis, np.float64),
+                                     np.subtract.reduce(y, axis))
+                        assert_equal(np.subtract.accumulate(x, axis,
+                                                            np.float64),
+                                     np.subtract.accumulate(y, axis))
+                    if x.ndim > 1:
+                        assert_equal(np.add.reduce(x, (0, -1), np.float64),
+                                     np.add.reduce(y, (0, -1)))
+            # object arrays keep their own buffered loop
+            x = np.arange(40, dtype=np.int8)
+            assert_equal(np.add(x, x.astype(object)), 2*x)
+            assert_equal(np.add.reduce(x, dtype=object), 780)
+        finally:
+            np.setbufsize(oldsize)
+
     def test_innerwt(self):
         a = np.arange(6).reshape((2,3))
         b = np.arange(10,16).reshape((2,3))
@@ -421,5 +560,96 @@ class TestUfunc(TestCase):
 
         assert_equal(ref, True, err_msg="reference check")
 
+class TestThreads(TestCase):
+    """Loops split between threads must give the serial results"""
+
+    def setUp(self):
+        self.oldthreads = np.setnumthreads(4)
+        self.oldthreshold = np.setthreadthreshold(0)
+
+    def tearDown(self):
+        np.setnumthreads(self.oldthreads)
+        np.setthreadthreshold(self.oldthreshold)
+
+    def _serial(self, func, *args, **kwds):
+        np.setnumthreads(1)
+        try:
+            return func(*args, **kwds)
+        finally:
+            np.setnumthreads(4)
+
+    def test_settings(self):
+        assert_equal(np.getnumthreads(), 4)
+        assert_equal(np.getthreadthreshold(), 0)
+        assert_equal(np.setthreadthreshold(100), 0)
+        assert_equal(np.getthreadthreshold(), 100)
+        assert_raises(ValueError, np.setnumthreads, 0)
+        assert_raises(ValueError, np.setthreadthreshold, -1)
+        assert_equal(np.getnumthreads(), 4)
+
+    def test_elementwise(self):
+        a = np.random.rand(37, 53)
+        b = np.random.rand(53)
+        for x, y in [(a, a), (a, b), (a.T, a.T[::-1]), (a[::2, ::3], 2.5)]:
+            assert_array_equal(np.sin(x), self._serial(np.sin, x))
+            assert_array_equal(np.add(x, y), self._serial(np.add, x, y))
+            assert_array_equal(np.arctan2(x, y),
+                               self._serial(np.arctan2, x, y))
+        m = a > 0.5
+        out = np.zeros_like(a)
+        ref = np.zeros_like(a)
+        np.exp(a, out, where=m)
+        self._serial(np.exp, a, ref, where=m)
+        assert_array_equal(out, ref)
+
+    def test_reduce(self):
+        a = np.random.rand(11, 13, 17)
+        for axis in [0, 1, 2, (0, 2), (1, 2)]:
+            assert_array_equal(np.add.reduce(a, axis=axis),
+                               self._serial(np.add.reduce, a, axis=axis))
+            assert_array_equal(np.maximum.reduce(a.T, axis=axis),
+                               self._serial(np.maximum.reduce, a.T,
+                                            axis=axis))
+
+    def test_reduce_split(self):
+        # too few output elements: the reduced values are split instead
+        a = np.random.randint(0, 1000, (3, 41, 27))
+        for axis in [None, 0, (1, 2), (0, 2), (0, 1, 2)]:
+            assert_array_equal(np.add.reduce(a, axis=axis),
+                               self._serial(np.add.reduce, a, axis=axis))
+            assert_array_equal(np.bitwise_or.reduce(a, axis=axis),
+                               self._serial(np.bitwise_or.reduce, a,
+                                            axis=axis))
+        x = np.random.rand(1001)
+        assert_almost_equal(x.sum(), self._serial(x.sum))
+        y = np.ones(1001) + 1e-3
+        assert_almost_equal(np.prod(y), self._serial(np.prod, y))
+        assert_almost_equal(x[::3].sum(), self._serial(x[::3].sum))
+        assert_equal(np.logical_and.reduce(x > 0.001),
+                     self._serial(np.logical_and.reduce, x > 0.001))
+        # not reorderable: still in order
+        assert_equal(np.subtract.reduce(np.arange(100.)), -4950)
+        assert_equal(np.maximum.reduce(x), x.max())
+
+    def test_overlap(self):
+        x = np.zeros(100)
+        np.add(x[:-1], 1, x[1:])
+        assert_equal(x, np.arange(100))
+        x = np.arange(100.)
+        np.multiply(x, x, x)
+        assert_equal(x, np.arange(100.)**2)
+
+    def test_fpe(self):
+        a = np.zeros(1000)
+        a[-1] = -1
+        olderr = np.seterr(all='raise')
+        try:
+            assert_raises(FloatingPointError, np.sqrt, a)
+            assert_raises(FloatingPointError, np.log, a[::-1].reshape(10, 100))
+            np.seterr(invalid='ignore')
+            np.sqrt(a)
+        finally:
+            np.seterr(**olderr)
+
 if __name__ == "__main__":
     run_module_suite()
@@ -41,6 +41,90 @@ class TestDivision(TestCase):
         assert_equal(y, [1.e+110, 0], err_msg=msg)
 
 
+class TestAddReduce(TestCase):
+    def test_sum(self):
+        for dt in (np.float32, np.float64, np.longdouble,
+                   np.complex64, np.complex128, np.clongdouble):
+            for n in [1, 7, 8, 9, 127, 128, 129, 1000, 1001]:
+                v = np.arange(1, n + 1, dtype=dt)
+                tgt = dt(n*(n + 1)/2)
+                assert_equal(v.sum(), tgt)
+                assert_equal(v[::-2].sum(), v[::-1][::2].sum())
+                assert_equal(np.add.reduce(v.reshape(1, n), 1), [tgt])
+                if v.dtype.kind == 'c':
+                    assert_equal((v + 1j*v).sum(), tgt + 1j*tgt)
+
+    def test_sum_accuracy(self):
+        # a serial float32 sum of 2**25 ones stalls at 2**24
+        a = np.ones(2**25, dtype=np.float32)
+        assert_equal(a.sum(), 2**25)
+        assert_equal(a.mean(), 1)
+        assert_equal(a.view(np.complex64).sum(), 2**24 + 2**24*1j)
+        assert_equal(np.array([-0.0]).sum(), -0.0)
+        assert_(np.signbit(np.add.reduce(np.array([-0.0, -0.0]))))
+
+class TestContiguousLoops(TestCase):
+    """The contiguous float loops must agree with the strided ones"""
+
+    values = [0., -0., 1., -1., 2.5, -3.5, 1e-40, 7., np.inf, -np.inf, np.nan]
+
+    def _strided(self, x):
+        y = np.empty(2*len(x), x.dtype)[::2]
+        y[...] = x
+        return y
+
+    def _check(self, got, ref):
+        assert_equal(got.dtype, ref.dtype)
+        assert_array_equal(np.isnan(got), np.isnan(ref))
+        # compare bitwise so that the sign of zeros is checked too
+        mask = ~np.isnan(ref)
+        assert_array_equal(got[mask].view(np.uint8), ref[mask].view(np.uint8))
+
+    def test_binary(self):
+        olderr = np.seterr(all='ignore')
+        try:
+            for dt in [np.float32, np.float64]:
+                # long enough for whole AVX vectors after the peel
+                for n in [1, 3, 8, 17, 40]:
+                    for off in [0, 1, 3, 5]:
+                        rnd = np.random.RandomState(n + off)
+                        a = np.array(self.values, dt)[
+                                rnd.randint(0, 11, n + off)][off:]
+                        b = np.array(self.values, dt)[
+                                rnd.randint(0, 11, n + off)][off:]
+                        sa, sb = self._strided(a), self._strided(b)
+                        for f in [np.add, np.subtract, np.multiply,
+                                  np.divide, np.maximum, np.minimum,
+                                  np.equal, np.not_equal, np.less,
+                                  np.less_equal, np.greater,
+                                  np.greater_equal]:
+                            self._check(f(a, b), f(sa, sb))
+                            self._check(f(a[0], b), f(a[0], sb))
+                            self._check(f(a, b[-1]), f(sa, b[-1]))
+                        for f in [np.sqrt, np.absolute, np.negative]:
+                            self._check(f(a), f(sa))
+        finally:
+            np.seterr(**olderr)
+
+    def test_overlap(self):
+        x = np.zeros(10)
+        np.add(x[:-1], 1, x[1:])
+        assert_equal(x, np.arange(10))
+        x = np.arange(10.)
+        np.multiply(x, x, x)
+        assert_equal(x, np.arange(10.)**2)
+
+    def test_fpe(self):
+        olderr = np.seterr(all='raise')
+        try:
+            assert_raises(FloatingPointError, np.divide, np.ones(9),
+                          np.zeros(9))
+            assert_raises(FloatingPointError, np.sqrt, -np.ones(9, np.float32))
+            # the lanes past the end must not raise spurious errors
+            np.divide(np.ones(7), np.ones(7))
+        finally:
+            np.seterr(**olderr)
+
 class TestPower(TestCase):
     def test_power_float(self):
         x = np.array([1., 2., 3.])
@@ -7,6 +7,7 @@ import numpy.core.numeric as nx
 from __builtin__ import bool, int, long, float, complex, object, unicode, str
 
 from numpy.compat import asbytes, bytes, asbytes_nested
+from numpy.lib._compiled_base import _loadtxt_parse
 
 if sys.version_info[0] >= 3:
     def _bytes_to_complex(s):
@@ -420,6 +421,41 @@ def str2bool(value):
         raise ValueError("Invalid boolean")
 
 
+def _int_from_float(value):
+    """Transform a string representing a number to an integer, truncating it."""
+    return int(float(value))
+
+
+# Translation table used to check the characters of integers in bulk
+_alltable = asbytes(''.join([chr(i) for i in range(256)]))
+_intchars = asbytes('0123456789+- \t\n\r\f\v')
+
+
+def _parse_numbers(values, integer=False):
+    """
+    Convert a sequence of strings to a float64 array with the compiled
+    tokenizer, in a single call.
+
+    Returns None if any of the strings is not accepted by `float` (or by
+    `int` if `integer` is True, but this check is conservative).
+
+    """
+    newline = asbytes('\n')
+    text = newline.join(values)
+    if text.count(newline) != len(values) - 1:
+        return None
+    if integer and text.translate(_alltable, _intchars):
+        return None
+    out = np.empty((len(values), 1), dtype=np.float64)
+    try:
+        (row, offset) = _loadtxt_parse(text, 0, out, 0, asbytes(''), newline)
+    except ValueError:
+        return None
+    if (row != len(values)) or (offset != len(text)):
+        return None
+    return out[:, 0]
+
+
 class ConverterError(Exception):
     """
     Exception raised when an error occurs in a converter for string values.
@@ -602,7 +638,7 @@ class StringConverter:
                 self.func = func
             # If the status is 1 (int), change the function to smthg more robust
             if self.func == self._mapper[1][1]:
-                self.func = lambda x : int(float(x))
+                self.func = _int_from_float
         # Store the list of strings corresponding to missing values.
         if missing_values is None:
             self.missing_values = set([asbytes('')])
@@ -680,13 +716,46 @@ class StringConverter:
                 self.default = default
             self.upgrade(value)
 
+    def _iterstrict(self, values):
+        """
+        Check that all the strings `values` can be converted.
+
+        This is equivalent to ``map(self._strict_call, values)``, but when
+        `func` is one of the standard numerical conversion functions, all
+        the values are first tried at once with the compiled tokenizer.
+
+        """
+        func = self.func
+        if (func is bytes) or (len(values) == 0):
+            return
+        if (func is float) or (func is _int_from_float):
+            if _parse_numbers(values) is not None:
+                return
+        elif func is int:
+            if _parse_numbers(values, integer=True) is not None:
+                return
+        map(self._strict_call, values)
+
     def iterupgrade(self, value):
+        """
+        Find the best converter for a sequence of strings.
+
+        The converters are tried in the order given by the `_status`
+        attribute, until one that can convert all the strings is found.
+        Numbers are validated in bulk when possible.
+
+        Parameters
+        ----------
+        value : str or sequence of str
+            The string(s) to convert.
+
+        """
         self._checked = True
         if not hasattr(value, '__iter__'):
             value = (value,)
-        _strict_call = self._strict_call
+        value = list(value)
         try:
-            map(_strict_call, value)
+            self._iterstrict(value)
         except ValueError:
             # Raise an exception if we locked the converter...
             if self._locked:
@@ -707,6 +776,46 @@ class StringConverter:
             self._status = _status
             self.iterupgrade(value)
 
+    def iterconvert(self, values, loose=True):
+        """
+        Convert a sequence of strings, returning a list.
+
+        This is equivalent to ``map(self, values)`` (or to mapping
+        `_loose_call` if `loose` is True), but floats and integers are
+        converted in a single call to the compiled tokenizer when none of
+        the strings is missing or invalid.
+
+        Parameters
+        ----------
+        values : sequence of str
+            The strings to convert.
+        loose : bool, optional
+            Whether strings that cannot be converted are replaced by the
+            default value (True, default) or raise a ValueError (False)
+            unless they are flagged as missing.
+
+        Returns
+        -------
+        out : list
+            The converted values.
+
+        """
+        values = list(values)
+        func = self.func
+        if func is bytes:
+            return values
+        if (func is float) or (func is int) or (func is _int_from_float):
+            parsed = _parse_numbers(values, integer=(func is int))
+            if parsed is not None:
+                if func is float:
+                    return parsed.tolist()
+                # Only trust the exact range of the integers
+                if np.all(np.abs(parsed) < 2.**53):
+                    return parsed.astype(int).tolist()
+        if loose:
+            return map(self._loose_call, values)
+        return map(self._strict_call, values)
+
     def update(self, func, default=None, missing_values=asbytes(''),
                locked=False):
         """
@@ -0,0 +1,546 @@
+"""
+Accumulators of statistics over data that comes in chunks.
+
+The classes of this module compute statistics in one pass over data that
+does not fit in memory, one chunk at a time, for instance the blocks of an
+`Arrayterator` or the rows of a memory map read a few at a time.  Each of
+them has an ``update(chunk)`` method adding the values of a chunk, and a
+``merge(other)`` method adding the values seen by another accumulator of
+the same kind, so that partial results computed by separate processes can
+be combined.  Accumulators can be pickled.
+
+The results do not depend on how the data is cut into chunks, up to
+rounding errors and, for `QuantileSketch`, its error bound.
+
+"""
+from __future__ import division
+
+__all__ = ['RunningMoments', 'RunningCovariance', 'RunningMinMax',
+           'RunningHistogram', 'QuantileSketch']
+
+import numpy as np
+from numpy.lib.function_base import iterable, histogram
+
+def _as_rows(chunk, axis):
+    """
+    Return chunk as an array whose rows are the values to reduce, that is
+    with `axis` first, or flattened if `axis` is None.
+    """
+    chunk = np.asarray(chunk)
+    if axis is None:
+        return chunk.ravel()
+    return np.rollaxis(chunk, axis)
+
+def _float_type(dtype):
+    """The type in which to sum values of type dtype."""
+    return np.find_common_type([dtype, np.float64], [])
+
+def _abs2(x):
+    """The squared absolute value of x."""
+    if np.iscomplexobj(x):
+        return x.real**2 + x.imag**2
+    return x*x
+
+def _check_merge(acc, other, *attrs):
+    """Check that other can be merged into the accumulator acc."""
+    if not isinstance(other, acc.__class__):
+        raise TypeError("cannot merge a %s into a %s" %
+                        (other.__class__.__name__, acc.__class__.__name__))
+    for attr in attrs:
+        if np.any(getattr(acc, attr) != getattr(other, attr)):
+            raise ValueError("cannot merge accumulators with different %s"
+                             % attr)
+
+def _check_shape(old, new):
+    """Check that the results of a chunk fit the ones accumulated so far."""
+    if old is not None and np.shape(old) != np.shape(new):
+        raise ValueError("chunk of shape %s does not fit the shape %s of the "
+                         "accumulated values" % (np.shape(new), np.shape(old)))
+
+
+class RunningMoments(object):
+    """
+    Accumulate the mean and variance of data given in chunks.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    axis : int, optional
+        Axis of the chunks along which the statistics are computed.  The
+        chunks must have the same shape apart from this axis.  The default
+        is to compute them over all the values.
+
+    Attributes
+    ----------
+    count : int
+        The number of values accumulated, along `axis` if it is given.
+
+    See Also
+    --------
+    mean, var, std, RunningCovariance
+
+    Notes
+    -----
+    The chunks are combined with the pairwise update of Chan, Golub and
+    LeVeque: the mean and the sum of squared deviations from the mean of
+    each chunk are computed separately and then merged, which is as
+    accurate as computing the variance of all the values at once.  The
+    sums are computed in double precision, or in the precision of the data
+    if it is higher.  As for `var`, the variance of complex values is the
+    mean of the squared absolute deviations.
+
+    Examples
+    --------
+    >>> a = np.arange(12.).reshape(6, 2)
+    >>> acc = np.lib.RunningMoments(axis=0)
+    >>> for chunk in np.lib.Arrayterator(a, 4):
+    ...     acc.update(chunk)
+    ...
+    >>> acc.count
+    6
+    >>> acc.mean()
+    array([ 5.,  6.])
+    >>> acc.var()
+    array([ 11.66666667,  11.66666667])
+    >>> a.var(axis=0)
+    array([ 11.66666667,  11.66666667])
+
+    """
+
+    def __init__(self, axis=None):
+        self.axis = axis
+        self.count = 0
+        self._mean = None
+        self._m2 = None
+
+    def update(self, chunk):
+        """Add the values of an array to the statistics."""
+        x = _as_rows(chunk, self.axis)
+        n = x.shape[0]
+        if n > 0:
+            mean = x.mean(axis=0, dtype=_float_type(x.dtype))
+            self._combine(n, mean, _abs2(x - mean).sum(axis=0))
+
+    def merge(self, other):
+        """Add the values accumulated by another `RunningMoments`."""
+        _check_merge(self, other, 'axis')
+        if other.count > 0:
+            self._combine(other.count, other._mean, other._m2)
+
+    def _combine(self, n, mean, m2):
+        if self.count == 0:
+            self.count, self._mean, self._m2 = n, mean, m2
+            return
+        _check_shape(self._mean, mean)
+        total = self.count + n
+        delta = mean - self._mean
+        self._mean = self._mean + delta*(n/total)
+        self._m2 = self._m2 + m2 + _abs2(delta)*(self.count*n/total)
+        self.count = total
+
+    def _check_count(self, ddof=0):
+        if self.count - ddof <= 0:
+            raise ValueError("not enough values were accumulated")
+
+    def mean(self):
+        """The mean of the values."""
+        self._check_count()
+        return self._mean
+
+    def var(self, ddof=0):
+        """
+        The variance of the values.
+
+        The sum of the squared deviations from the mean is divided by
+        ``count - ddof``, see `var`.
+        """
+        self._check_count(ddof)
+        return self._m2/(self.count - ddof)
+
+    def std(self, ddof=0):
+        """The standard deviation of the values, see `var`."""
+        return np.sqrt(self.var(ddof))
+
+
+class RunningCovariance(object):
+    """
+    Accumulate the covariance matrix of observations given in chunks.
+
+    Each chunk is a 2-D array holding one observation of all the variables
+    in each row, as in ``np.cov(chunk, rowvar=0)``, or a 1-D array of
+    observations of a single variable.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    ----------
+    count : int
+        The number of observations accumulated.
+
+    See Also
+    --------
+    cov, corrcoef, RunningMoments
+
+    Notes
+    -----
+    The mean and the matrix of the sums of the products of the deviations
+    from the mean of each chunk are merged with the pairwise update of
+    Chan, Golub and LeVeque.
+
+    Examples
+    --------
+    >>> x = np.array([[0, 2], [1, 1], [2, 0]])
+    >>> acc = np.lib.RunningCovariance()
+    >>> acc.update(x[:2])
+    >>> acc.update(x[2:])
+    >>> acc.cov()
+    array([[ 1., -1.],
+           [-1.,  1.]])
+
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._mean = None
+        self._comoment = None
+
+    def update(self, chunk):
+        """Add the observations in the rows of an array."""
+        x = np.asarray(chunk)
+        if x.ndim == 1:
+            x = x[:, np.newaxis]
+        elif x.ndim != 2:
+            raise ValueError("chunks must be 1-D or 2-D arrays")
+        n = x.shape[0]
+        if n > 0:
+            mean = x.mean(axis=0, dtype=_float_type(x.dtype))
+            d = x - mean
+            self._combine(n, mean, np.dot(d.T, d.conj()))
+
+    def merge(self, other):
+        """Add the observations accumulated by another `RunningCovariance`."""
+        _check_merge(self, other)
+        if other.count > 0:
+            self._combine(other.count, other._mean, other._comoment)
+
+    def _combine(self, n, mean, comoment):
+        if self.count == 0:
+            self.count, self._mean, self._comoment = n, mean, comoment
+            return
+        _check_shape(self._mean, mean)
+        total = self.count + n
+        delta = mean - self._mean
+        self._mean = self._mean + delta*(n/total)
+        self._comoment = self._comoment + comoment + \
+                np.outer(delta, delta.conj())*(self.count*n/total)
+        self.count = total
+
+    def mean(self):
+        """The mean of each variable."""
+        if self.count == 0:
+            raise ValueError("not enough values were accumulated")
+        return self._mean
+
+    def cov(self, ddof=1):
+        """
+        The covariance matrix of the variables.
+
+        The sums of the products of the deviations from the mean are
+        divided by ``count - ddof``.  The default is the unbiased estimate
+        also returned by `cov`.
+        """
+        if self.count - ddof <= 0:
+            raise ValueError("not enough values were accumulated")
+        return self._comoment/(self.count - ddof)
+
+    def corrcoef(self):
+        """The correlation coefficients of the variables, see `corrcoef`."""
+        c = self.cov()
+        d = np.diag(c)
+        return c/np.sqrt(np.multiply.outer(d, d))
+
+
+class RunningMinMax(object):
+    """
+    Accumulate the minimum and maximum of data given in chunks.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    axis : int, optional
+        Axis of the chunks along which the extrema are found.  The chunks
+        must have the same shape apart from this axis.  The default is to
+        find them over all the values.
+
+    Attributes
+    ----------
+    count : int
+        The number of values accumulated, along `axis` if it is given.
+
+    See Also
+    --------
+    amin, amax
+
+    Notes
+    -----
+    As with `amin` and `amax`, the result is NaN once a NaN was seen.
+
+    Examples
+    --------
+    >>> acc = np.lib.RunningMinMax()
+    >>> acc.update([3, 1, 4])
+    >>> acc.update([1, 5, 9, 2])
+    >>> acc.min(), acc.max()
+    (1, 9)
+
+    """
+
+    def __init__(self, axis=None):
+        self.axis = axis
+        self.count = 0
+        self._min = None
+        self._max = None
+
+    def update(self, chunk):
+        """Add the values of an array."""
+        x = _as_rows(chunk, self.axis)
+        if x.shape[0] > 0:
+            self._combine(x.shape[0], x.min(axis=0), x.max(axis=0))
+
+    def merge(self, other):
+        """Add the values accumulated by another `RunningMinMax`."""
+        _check_merge(self, other, 'axis')
+        if other.count > 0:
+            self._combine(other.count, other._min, other._max)
+
+    def _combine(self, n, mn, mx):
+        if self.count == 0:
+            self.count, self._min, self._max = n, mn, mx
+            return
+        _check_shape(self._min, mn)
+        self._min = np.minimum(self._min, mn)
+        self._max = np.maximum(self._max, mx)
+        self.count += n
+
+    def min(self):
+        """The minimum of the values."""
+        if self.count == 0:
+            raise ValueError("not enough values were accumulated")
+        return self._min
+
+    def max(self):
+        """The maximum of the values."""
+        if self.count == 0:
+            raise ValueError("not enough values were accumulated")
+        return self._max
+
+
+class RunningHistogram(object):
+    """
+    Accumulate the histogram of data given in chunks.
+
+    The bins must be known before the first chunk, so unlike for
+    `histogram` the range of the data cannot be used to define them.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    bins : int or sequence of scalars, optional
+        If `bins` is an int, it defines the number of equal-width bins in
+        `range` (10, by default).  If `bins` is a sequence, it defines the
+        bin edges, including the rightmost edge.
+    range : (float, float)
+        The lower and upper range of the bins, required unless `bins` is a
+        sequence.  Values outside the range are ignored.
+
+    Attributes
+    ----------
+    counts : ndarray
+        The number of values in each bin, or the sum of their weights.
+    edges : ndarray
+        The edges of the bins.
+    count : int
+        The number of values accumulated, in range or not.
+
+    See Also
+    --------
+    histogram
+
+    Examples
+    --------
+    >>> acc = np.lib.RunningHistogram(4, range=(0, 4))
+    >>> acc.update([0, 1, 1, 9])
+    >>> acc.update([3.5, 1.5])
+    >>> acc.histogram()
+    (array([1, 3, 0, 1]), array([ 0.,  1.,  2.,  3.,  4.]))
+
+    """
+
+    def __init__(self, bins=10, range=None):
+        if not iterable(bins):
+            if range is None:
+                raise ValueError("the range of the bins must be given")
+            mn, mx = [mi + 0.0 for mi in range]
+            if mn > mx:
+                raise ValueError("max must be larger than min in range")
+            if mn == mx:
+                mn -= 0.5
+                mx += 0.5
+            self.edges = np.linspace(mn, mx, bins + 1)
+        else:
+            self.edges = np.asarray(bins)
+            if (np.diff(self.edges) < 0).any():
+                raise ValueError("bins must increase monotonically")
+        self.counts = np.zeros(len(self.edges) - 1, int)
+        self.count = 0
+
+    def update(self, chunk, weights=None):
+        """Add the values of an array, with their weights if given."""
+        chunk = np.asarray(chunk)
+        self.counts = self.counts + histogram(chunk, self.edges,
+                                              weights=weights)[0]
+        self.count += chunk.size
+
+    def merge(self, other):
+        """
+        Add the values accumulated by another `RunningHistogram` with the
+        same bins.
+        """
+        _check_merge(self, other)
+        if self.edges.shape != other.edges.shape or \
+                (self.edges != other.edges).any():
+            raise ValueError("cannot merge histograms with different bins")
+        self.counts = self.counts + other.counts
+        self.count += other.count
+
+    def histogram(self, normed=False):
+        """
+        Return the histogram and the bin edges, as returned by `histogram`.
+        """
+        if normed:
+            db = np.array(np.diff(self.edges), float)
+            return self.counts/(self.counts*db).sum(), self.edges
+        return self.counts, self.edges
+
+
+class QuantileSketch(object):
+    """
+    Approximate the quantiles of data given in chunks in bounded memory.
+
+    The sketch keeps a sample of at most about ``size*log2(count/size)``
+    values: it is exact as long as it has seen at most `size` values, and
+    beyond that the rank of the value it returns for a percentile is off
+    by at most about ``count*log2(count/size)/size``, and usually much
+    less.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    size : int, optional
+        The number of values kept at each level of the sketch (1024 by
+        default).  The error decreases as the size grows.
+
+    Attributes
+    ----------
+    count : int
+        The number of values accumulated.
+
+    See Also
+    --------
+    percentile, median
+
+    Notes
+    -----
+    The sketch is a multi-level compactor: the values at level ``h`` stand
+    for ``2**h`` values each.  When a level holds more than `size` values,
+    they are sorted and every other one moves to the next level, starting
+    alternately with the first and the second one so that the errors
+    tend to cancel.  Merging two sketches merges their levels.  NaNs are
+    ignored.
+
+    Examples
+    --------
+    >>> acc = np.lib.QuantileSketch()
+    >>> for i in range(10):
+    ...     acc.update(np.arange(i*10, i*10 + 10))
+    ...
+    >>> acc.percentile([0, 50, 100])
+    array([  0. ,  49.5,  99. ])
+
+    """
+
+    def __init__(self, size=1024):
+        if size < 2:
+            raise ValueError("size must be at least 2")
+        self.size = size
+        self.count = 0
+        self._levels = []
+        self._parity = 0
+
+    def update(self, chunk):
+        """Add the values of an array."""
+        x = np.asarray(chunk)
+        if x.dtype.kind not in 'biuf':
+            raise TypeError("cannot compute the quantiles of %s values"
+                            % x.dtype)
+        x = x.astype(float).ravel()
+        x = x[~np.isnan(x)]
+        self.count += x.size
+        self._add(0, x)
+        self._compact()
+
+    def merge(self, other):
+        """Add the values accumulated by another `QuantileSketch`."""
+        _check_merge(self, other)
+        for h, values in enumerate(other._levels):
+            self._add(h, values)
+        self.count += other.count
+        self._compact()
+
+    def _add(self, h, values):
+        while len(self._levels) <= h:
+            self._levels.append(np.empty(0))
+        self._levels[h] = np.concatenate((self._levels[h], values))
+
+    def _compact(self):
+        h = 0
+        while h < len(self._levels):
+            values = self._levels[h]
+            if len(values) > self.size:
+                values = np.sort(values)
+                # An odd value out stays at this level
+                n = len(values) - len(values) % 2
+                self._add(h + 1, values[self._parity:n:2])
+                self._levels[h] = values[n:]
+                self._parity = 1 - self._parity
+            h += 1
+
+    def percentile(self, q):
+        """
+        Return the approximate `q`-th percentiles of the values.
+
+        As in `percentile`, the percentiles are interpolated linearly
+        between the values.
+        """
+        if self.count == 0:
+            raise ValueError("not enough values were accumulated")
+        q = np.asarray(q, float)
+        if (q < 0).any() or (q > 100).any():
+            raise ValueError("percentiles must be in the range [0, 100]")
+        values = np.concatenate(self._levels)
+        weights = np.concatenate([np.repeat(2.0**h, len(v))
+                                  for h, v in enumerate(self._levels)])
+        order = values.argsort(kind='mergesort')
+        values = values[order]
+        weights = weights[order]
+        # The rank each value stands at, the middle of the ranks it covers
+        ranks = weights.cumsum() - (weights + 1)/2
+        return np.interp(q/100*(self.count - 1), ranks, values)
+
+    def median(self):
+        """Return the approximate median of the values."""
+        return self.percentile(50)
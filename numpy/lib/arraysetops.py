@@ -1,5 +1,5 @@
 """
-Set operations for 1D numeric arrays based on sorting.
+Set operations for 1D numeric arrays based on sorting or hashing.
 
 :Contains:
   ediff1d,
@@ -20,9 +20,10 @@ Set operations for 1D numeric arrays based on sorting.
 For floating point arrays, inaccurate results may appear due to usual round-off
 and floating point comparison issues.
 
-Speed could be gained in some operations by an implementation of
-sort(), that can provide directly the permutation vectors, avoiding
-thus calls to argsort().
+`unique` and `in1d`, and through them the other set operations, can
+either sort their inputs or use a compiled hash table.  Hashing takes
+linear time and is used by default for boolean, integer, float and double
+arrays.
 
 To do: Optionally return indices analogously to unique for all functions.
 
@@ -33,6 +34,35 @@ __all__ = ['ediff1d', 'unique1d', 'intersect1d', 'intersect1d_nu', 'setxor1d',
 
 import numpy as np
 from numpy.lib.utils import deprecate
+from numpy.lib._compiled_base import _unique_hash, _in1d_hash
+
+def _hashable(dtype):
+    """Whether arrays of dtype can go to the compiled hash tables."""
+    return ((dtype.kind in 'biu' and dtype.itemsize in (1, 2, 4, 8)) or
+            dtype.char in 'fd') and dtype.isnative
+
+def _choose_kind(kind, dtype, subclass=False):
+    """
+    Check the kind of a set operation on arrays of dtype, choosing one if
+    it is None.  Subclasses of ndarray are sorted unless asked otherwise.
+    """
+    if kind is None:
+        if subclass or not _hashable(dtype):
+            return 'sort'
+        return 'hash'
+    if kind == 'hash':
+        if not _hashable(dtype):
+            raise TypeError("kind='hash' needs boolean, integer, float "
+                            "or double arrays, not %s" % dtype)
+    elif kind != 'sort':
+        raise ValueError("kind must be 'sort' or 'hash', not %r" % (kind,))
+    return kind
+
+def _permute(perm, inverse):
+    """Map unique element numbers after reordering the unique elements."""
+    rank = np.empty_like(perm)
+    rank[perm] = np.arange(perm.size)
+    return rank[inverse]
 
 def ediff1d(ary, to_end=None, to_begin=None):
     """
@@ -92,14 +122,16 @@ def ediff1d(ary, to_end=None, to_begin=None):
 
     return ed
 
-def unique(ar, return_index=False, return_inverse=False):
+def unique(ar, return_index=False, return_inverse=False,
+           return_counts=False, keep_order=False, kind=None):
     """
     Find the unique elements of an array.
 
-    Returns the sorted unique elements of an array. There are two optional
+    Returns the sorted unique elements of an array. There are three optional
     outputs in addition to the unique elements: the indices of the input array
-    that give the unique values, and the indices of the unique array that
-    reconstruct the input array.
+    that give the unique values, the indices of the unique array that
+    reconstruct the input array and the number of times each unique value
+    occurs in the input array.
 
     Parameters
     ----------
@@ -111,23 +143,48 @@ def unique(ar, return_index=False, return_inverse=False):
     return_inverse : bool, optional
         If True, also return the indices of the unique array that can be used
         to reconstruct `ar`.
+    return_counts : bool, optional
+        If True, also return the number of times each unique value comes up
+        in `ar`.
+
+        .. versionadded:: 2.0
+    keep_order : bool, optional
+        If True, return the unique values in the order of their first
+        occurrence in `ar` instead of sorted.
+
+        .. versionadded:: 2.0
+    kind : {None, 'sort', 'hash'}, optional
+        Whether to sort `ar` or to use a hash table to find its unique
+        values.  Hashing takes linear time and is only available for
+        boolean, integer, float and double arrays.  The default, None,
+        hashes these and sorts the others.
+
+        .. versionadded:: 2.0
 
     Returns
     -------
     unique : ndarray
         The sorted unique values.
     unique_indices : ndarray, optional
-        The indices of the unique values in the (flattened) original array.
-        Only provided if `return_index` is True.
+        The indices of the first occurrences of the unique values in the
+        (flattened) original array. Only provided if `return_index` is True.
     unique_inverse : ndarray, optional
         The indices to reconstruct the (flattened) original array from the
         unique array. Only provided if `return_inverse` is True.
+    unique_counts : ndarray, optional
+        The number of times each of the unique values comes up in the
+        original array. Only provided if `return_counts` is True.
 
     See Also
     --------
     numpy.lib.arraysetops : Module with a number of other functions for
                             performing set operations on arrays.
 
+    Notes
+    -----
+    Every NaN is a unique value of its own, as NaN compares unequal to
+    itself.
+
     Examples
     --------
     >>> np.unique([1, 1, 2, 2, 3, 3])
@@ -160,43 +217,74 @@ def unique(ar, return_index=False, return_inverse=False):
     >>> u[indices]
     array([1, 2, 6, 4, 2, 3, 2])
 
+    Count the values, in the order they first appear:
+
+    >>> np.unique(a, return_counts=True, keep_order=True)
+    (array([1, 2, 6, 4, 3]), array([1, 3, 1, 1, 1]))
+
     """
+    extra = return_index or return_inverse or return_counts or keep_order
     try:
         ar = ar.flatten()
     except AttributeError:
-        if not return_inverse and not return_index:
+        if not extra and kind is None:
             items = sorted(set(ar))
             return np.asarray(items)
         else:
             ar = np.asanyarray(ar).flatten()
+    kind = _choose_kind(kind, ar.dtype, type(ar) is not np.ndarray)
 
     if ar.size == 0:
-        if return_inverse and return_index:
-            return ar, np.empty(0, np.bool), np.empty(0, np.bool)
-        elif return_inverse or return_index:
-            return ar, np.empty(0, np.bool)
-        else:
-            return ar
-
-    if return_inverse or return_index:
-        perm = ar.argsort()
+        first = inverse = counts = np.empty(0, np.intp)
+    elif kind == 'hash':
+        first, inverse, counts = _unique_hash(ar, return_inverse,
+                                              return_counts)
+        ar = ar[first]
+        if not keep_order:
+            # A stable sort keeps the NaNs in the order they appear
+            perm = ar.argsort(kind='mergesort')
+            ar = ar[perm]
+            first = first[perm]
+            if return_inverse:
+                inverse = _permute(perm, inverse)
+            if return_counts:
+                counts = counts[perm]
+    elif extra:
+        # A stable sort puts the first occurrence of each value first
+        perm = ar.argsort(kind='mergesort')
         aux = ar[perm]
         flag = np.concatenate(([True], aux[1:] != aux[:-1]))
+        first = perm[flag]
+        ar = aux[flag]
         if return_inverse:
-            iflag = np.cumsum(flag) - 1
-            iperm = perm.argsort()
-            if return_index:
-                return aux[flag], perm[flag], iflag[iperm]
-            else:
-                return aux[flag], iflag[iperm]
-        else:
-            return aux[flag], perm[flag]
-
+            inverse = np.empty(perm.shape, np.intp)
+            inverse[perm] = np.cumsum(flag) - 1
+        if return_counts:
+            counts = np.diff(np.concatenate((flag.nonzero()[0], [flag.size])))
+        if keep_order:
+            perm = first.argsort()
+            ar = ar[perm]
+            first = first[perm]
+            if return_inverse:
+                inverse = _permute(perm, inverse)
+            if return_counts:
+                counts = counts[perm]
     else:
         ar.sort()
         flag = np.concatenate(([True], ar[1:] != ar[:-1]))
         return ar[flag]
 
+    ret = (ar,)
+    if return_index:
+        ret += (first,)
+    if return_inverse:
+        ret += (inverse,)
+    if return_counts:
+        ret += (counts,)
+    if len(ret) == 1:
+        return ret[0]
+    return ret
+
 
 def intersect1d(ar1, ar2, assume_unique=False):
     """
@@ -228,13 +316,11 @@ def intersect1d(ar1, ar2, assume_unique=False):
     array([1, 3])
 
     """
-    if not assume_unique:
-        # Might be faster than unique( intersect1d( ar1, ar2 ) )?
+    if assume_unique:
+        ar1 = np.sort(ar1)
+    else:
         ar1 = unique(ar1)
-        ar2 = unique(ar2)
-    aux = np.concatenate( (ar1, ar2) )
-    aux.sort()
-    return aux[aux[1:] == aux[:-1]]
+    return ar1[in1d(ar1, ar2, assume_unique=assume_unique)]
 
 def setxor1d(ar1, ar2, assume_unique=False):
     """
@@ -280,7 +366,7 @@ def setxor1d(ar1, ar2, assume_unique=False):
     flag2 = flag[1:] == flag[:-1]
     return aux[flag2]
 
-def in1d(ar1, ar2, assume_unique=False):
+def in1d(ar1, ar2, assume_unique=False, kind=None):
     """
     Test whether each element of a 1D array is also present in a second array.
 
@@ -296,6 +382,15 @@ def in1d(ar1, ar2, assume_unique=False):
     assume_unique : bool, optional
         If True, the input arrays are both assumed to be unique, which
         can speed up the calculation.  Default is False.
+    kind : {None, 'sort', 'hash'}, optional
+        Whether to sort the values of both arrays together or to look the
+        values of `ar1` up in a hash table of the values of `ar2`.  Hashing
+        takes linear time and is only available for boolean, integer,
+        float and double arrays.  The default, None, hashes these and sorts
+        the others.  When sorting, `ar1` is instead compared with each
+        value of `ar2` if `ar2` is much smaller than `ar1`.
+
+        .. versionadded:: 2.0
 
     Returns
     -------
@@ -326,9 +421,24 @@ def in1d(ar1, ar2, assume_unique=False):
     array([0, 2, 0])
 
     """
+    ar1 = np.asarray(ar1).ravel()
+    ar2 = np.asarray(ar2).ravel()
+    dtype = np.find_common_type([ar1.dtype, ar2.dtype], [])
+
+    kind = _choose_kind(kind, dtype)
+    if kind == 'hash':
+        return _in1d_hash(ar1.astype(dtype), ar2.astype(dtype))
+
+    if dtype.kind in 'biufc' and len(ar2) < 10 * len(ar1) ** 0.145:
+        # A few comparisons with each value of ar2 beat sorting
+        mask = np.zeros(len(ar1), dtype=np.bool)
+        for a in ar2:
+            mask |= (ar1 == a)
+        return mask
+
     if not assume_unique:
-        ar1, rev_idx = np.unique(ar1, return_inverse=True)
-        ar2 = np.unique(ar2)
+        ar1, rev_idx = np.unique(ar1, return_inverse=True, kind='sort')
+        ar2 = np.unique(ar2, kind='sort')
 
     ar = np.concatenate( (ar1, ar2) )
     # We need this to be a stable sort, so always use 'mergesort'
@@ -337,13 +447,14 @@ def in1d(ar1, ar2, assume_unique=False):
     order = ar.argsort(kind='mergesort')
     sar = ar[order]
     equal_adj = (sar[1:] == sar[:-1])
-    flag = np.concatenate( (equal_adj, [False] ) )
-    indx = order.argsort(kind='mergesort')[:len( ar1 )]
+    # Put the flags back in the order of ar rather than sorting order
+    flag = np.empty(ar.shape, dtype=np.bool)
+    flag[order] = np.concatenate( (equal_adj, [False] ) )
 
     if assume_unique:
-        return flag[indx]
+        return flag[:len(ar1)]
     else:
-        return flag[indx][rev_idx]
+        return flag[:len(ar1)][rev_idx]
 
 def union1d(ar1, ar2):
     """
@@ -411,8 +522,7 @@ def setdiff1d(ar1, ar2, assume_unique=False):
     """
     if not assume_unique:
         ar1 = unique(ar1)
-        ar2 = unique(ar2)
-    aux = in1d(ar1, ar2, assume_unique=True)
+    aux = in1d(ar1, ar2, assume_unique=assume_unique)
     if aux.size == 0:
         return aux
     else:
@@ -61,5 +61,31 @@ def bench_unique1d( plot_results = False ):
         plotMe( 2, pylab.plot, nItems, dt1s, dt2s )
         pylab.show()
 
+def bench_kinds( nItem = 10 ** 7 ):
+    """Compare the sort and hash kinds of unique and in1d."""
+    def best( fun ):
+        dts = []
+        for ii in range( 3 ):
+            tt = time.time()
+            fun()
+            dts.append( time.time() - tt )
+        return min( dts )
+
+    print 'unique of %d items:' % nItem
+    for nUnique in [10, 10 ** 3, 10 ** 5, nItem]:
+        a = np.random.randint( 0, nUnique, nItem )
+        for kind in ['sort', 'hash']:
+            print '  %8d values, %s: %.3f s' % \
+                  (nUnique, kind, best( lambda: unique( a, kind = kind ) ))
+
+    print 'in1d of %d items:' % nItem
+    a = np.random.randint( 0, 10 * nItem, nItem )
+    for nSet in [10, 10 ** 3, 10 ** 6]:
+        b = np.random.randint( 0, 10 * nItem, nSet )
+        for kind in ['sort', 'hash']:
+            print '  %8d values, %s: %.3f s' % \
+                  (nSet, kind, best( lambda: in1d( a, b, kind = kind ) ))
+
 if __name__ == '__main__':
+    bench_kinds()
     bench_unique1d( plot_results = True )
@@ -128,6 +128,45 @@ Consumers can figure out the number of bytes by multiplying the number
 of elements given by the shape (noting that ``shape=()`` means there is
 1 element) by ``dtype.itemsize``.
 
+Format Version 1.1
+------------------
+
+Version 1.1 stores the array data in chunks, each optionally compressed,
+so that a slice of the array can be read without reading (and
+decompressing) all of the data.  It is identical to version 1.0 except
+for the following.
+
+The header dictionary contains two more keys:
+
+    "chunksize" : int
+      The number of items of the array stored in each chunk.
+    "compression" : None or str
+      The compression applied to each chunk, either None or ``'zlib'``.
+
+The header is followed by the chunk index: ``nchunks + 1`` little-endian
+unsigned 8-byte ints, where ``nchunks`` is the number of items of the
+array divided by ``chunksize`` and rounded up.  Index entry ``i`` is the
+offset of chunk ``i`` relative to the end of the index, so that the last
+entry is the total length of the chunks.
+
+Following the index come the chunks.  Chunk ``i`` holds the items
+``i*chunksize`` to ``(i+1)*chunksize`` of the contiguous (either C- or
+Fortran-, depending on ``fortran_order``) data of the array, compressed
+with ``zlib.compress`` if ``compression`` is ``'zlib'``.  Arrays whose
+dtype contains Python objects cannot be stored in this version.
+
+Format Version 2.0
+------------------
+
+Version 2.0 is identical to version 1.0, except that the length of the
+header data HEADER_LEN is a little-endian unsigned 4-byte int instead of a
+2-byte short, so that the header of arrays with very large structured
+dtypes fits in it.  The header is padded to make the total length of
+``magic string + 6 + HEADER_LEN`` evenly divisible by 16.
+
+`write_array` only writes this version, with a warning, when the header
+does not fit in version 1.0.
+
 Notes
 -----
 The ``.npy`` format, including reasons for creating it and a comparison of
@@ -138,13 +177,30 @@ alternatives, is described fully in the "npy-format" NEP.
 import cPickle
 
 import numpy
+import re
 import sys
 from numpy.lib.utils import safe_eval
-from numpy.compat import asbytes, isfileobj
+from numpy.compat import asbytes, asstr, isfileobj
 
 MAGIC_PREFIX = asbytes('\x93NUMPY')
 MAGIC_LEN = len(MAGIC_PREFIX) + 2
 
+# The compressions of the chunks of format version 1.1
+_chunk_compressions = (None, 'zlib')
+# The default size of the chunks, in bytes
+_chunk_bytes = 2**20
+# The size of the blocks in which the data is read from or written to the
+# file-like objects which are not real files, in bytes
+_buffer_size = 2**18
+
+# The layout of the headers written by write_array_header_1_0 for the
+# dtypes without fields: "'key': value, " items, whose values are strings,
+# True, False, None, ints or tuples of ints, between braces.
+_header_item = re.compile(r"'(\w+)': ('[^'\\]*'|True|False|None|\d+L?|"
+                          r"\((?:\d+L?(?:, \d+L?)*,?)?\)), ")
+_header_dict = re.compile(r"\{(?:%s)*\}\s*$" % _header_item.pattern)
+_header_constants = {'True': True, 'False': False, 'None': None}
+
 def magic(major, minor):
     """ Return the magic string for the given file format version.
 
@@ -265,6 +321,33 @@ def write_array_header_1_0(fp, d):
         This has the appropriate entries for writing its string representation
         to the header of the file.
     """
+    _write_array_header(fp, d, (1, 0))
+
+def write_array_header_2_0(fp, d):
+    """ Write the header for an array using the 2.0 format.
+
+    The 2.0 format allows storing very large structured arrays.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    fp : filelike object
+    d : dict
+        This has the appropriate entries for writing its string representation
+        to the header of the file.
+    """
+    _write_array_header(fp, d, (2, 0))
+
+def _header_length_format(version):
+    """ Return the struct format of the header length of `version`. """
+    if version[0] == 1:
+        return '<H'
+    else:
+        return '<I'
+
+def _padded_header(d, version):
+    """ Return the header of the dictionary `d` for the given version. """
     import struct
     header = ["{"]
     for key, value in sorted(d.items()):
@@ -276,15 +359,36 @@ def write_array_header_1_0(fp, d):
     # string, the header-length short and the header are aligned on a 16-byte
     # boundary.  Hopefully, some system, possibly memory-mapping, can take
     # advantage of our premature optimization.
-    current_header_len = MAGIC_LEN + 2 + len(header) + 1  # 1 for the newline
+    hlength_len = struct.calcsize(_header_length_format(version))
+    current_header_len = MAGIC_LEN + hlength_len + len(header) + 1  # 1 for the newline
     topad = 16 - (current_header_len % 16)
-    header = asbytes(header + ' '*topad + '\n')
-    if len(header) >= (256*256):
-        raise ValueError("header does not fit inside %s bytes" % (256*256))
-    header_len_str = struct.pack('<H', len(header))
+    return asbytes(header + ' '*topad + '\n')
+
+def _write_array_header(fp, d, version):
+    """ Write the header for an array using the given format version. """
+    import struct
+    header = _padded_header(d, version)
+    hlength_format = _header_length_format(version)
+    max_len = 256 ** struct.calcsize(hlength_format)
+    if len(header) >= max_len:
+        raise ValueError("header does not fit inside %s bytes" % max_len)
+    header_len_str = struct.pack(hlength_format, len(header))
     fp.write(header_len_str)
     fp.write(header)
 
+def _header_version(d):
+    """
+    Return the first format version among 1.0 and 2.0 able to hold the
+    header dictionary `d`, warning if it is 2.0.
+
+    """
+    if len(_padded_header(d, (1, 0))) < 256*256:
+        return (1, 0)
+    import warnings
+    warnings.warn("Stored array in format 2.0. It can only be read by "
+                  "NumPy >= 2.0", UserWarning)
+    return (2, 0)
+
 def read_array_header_1_0(fp):
     """
     Read an array header from a filelike object using the 1.0 file format
@@ -314,14 +418,182 @@ def read_array_header_1_0(fp):
         If the data is invalid.
 
     """
-    # Read an unsigned, little-endian short int which has the length of the
-    # header.
+    d = _read_array_header(fp, (1, 0))
+    return d['shape'], d['fortran_order'], d['descr']
+
+def read_array_header_2_0(fp):
+    """
+    Read an array header from a filelike object using the 2.0 file format
+    version.
+
+    This will leave the file object located just after the header.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    fp : filelike object
+        A file object or something with a `.read()` method like a file.
+
+    Returns
+    -------
+    shape : tuple of int
+        The shape of the array.
+    fortran_order : bool
+        The array data will be written out directly if it is either C-contiguous
+        or Fortran-contiguous. Otherwise, it will be made contiguous before
+        writing it out.
+    dtype : dtype
+        The dtype of the file's data.
+
+    Raises
+    ------
+    ValueError :
+        If the data is invalid.
+
+    """
+    d = _read_array_header(fp, (2, 0))
+    return d['shape'], d['fortran_order'], d['descr']
+
+def read_array_header_1_1(fp):
+    """
+    Read an array header from a filelike object using the 1.1 file format
+    version.
+
+    This will leave the file object located just after the header, that is
+    at the start of the chunk index.
+
+    Parameters
+    ----------
+    fp : filelike object
+        A file object or something with a `.read()` method like a file.
+
+    Returns
+    -------
+    shape : tuple of int
+        The shape of the array.
+    fortran_order : bool
+        Whether the array data is stored in Fortran order.
+    dtype : dtype
+        The dtype of the file's data.
+    chunksize : int
+        The number of items stored in each chunk.
+    compression : None or str
+        The compression of the chunks.
+
+    Raises
+    ------
+    ValueError :
+        If the data is invalid.
+
+    """
+    d = _read_array_header(fp, (1, 1))
+    return (d['shape'], d['fortran_order'], d['descr'], d['chunksize'],
+            d['compression'])
+
+def read_array_info(fp):
+    """
+    Read the metadata of an array from a filelike object located at the
+    start of a .npy file, without reading the array data.
+
+    This will leave the file object located just after the header.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    fp : filelike object
+        A file object or something with a `.read()` method like a file.
+
+    Returns
+    -------
+    info : dict
+        The metadata of the array:
+
+        "version" : (int, int)
+          The version of the file format.
+        "shape" : tuple of int
+          The shape of the array.
+        "fortran_order" : bool
+          Whether the array data is stored in Fortran order.
+        "dtype" : dtype
+          The dtype of the array.
+        "offset" : int or None
+          The position of the array data (of the chunk index for version
+          1.1) in `fp`, as given by ``fp.tell()``, or None if `fp` cannot
+          tell.
+
+        and, for version 1.1, "chunksize" and "compression" (see
+        `read_array_header_1_1`).
+
+    Raises
+    ------
+    ValueError
+        If the file is not a valid .npy file.
+
+    """
+    version = read_magic(fp)
+    _check_version(version)
+    d = _read_array_header(fp, version)
+    info = {'version': version,
+            'shape': d.pop('shape'),
+            'fortran_order': d.pop('fortran_order'),
+            'dtype': d.pop('descr')}
+    info.update(d)
+    try:
+        info['offset'] = fp.tell()
+    except (AttributeError, IOError):
+        info['offset'] = None
+    return info
+
+def _check_version(version):
+    """ Check that the file format `version` is supported. """
+    if version not in [(1, 0), (1, 1), (2, 0)]:
+        msg = "only support versions (1,0), (1,1) and (2,0) of file " \
+              "format, not %r"
+        raise ValueError(msg % (version,))
+
+def _parse_header(header):
+    """
+    Parse the header dictionary of a .npy file.
+
+    The headers laid out as `write_array_header_1_0` writes them for the
+    dtypes without fields are parsed directly; the others are evaluated by
+    `safe_eval`.
+
+    """
+    text = asstr(header)
+    if not _header_dict.match(text):
+        return safe_eval(header)
+    d = {}
+    for key, value in _header_item.findall(text):
+        if value in _header_constants:
+            d[key] = _header_constants[value]
+        elif value.startswith("'"):
+            d[key] = value[1:-1]
+        elif value.startswith('('):
+            d[key] = tuple([int(x.rstrip('L ')) for x in value[1:-1].split(',')
+                            if x.strip()])
+        else:
+            d[key] = int(value.rstrip('L'))
+    return d
+
+def _read_array_header(fp, version):
+    """
+    Read and check the header of the given format version, and return it as
+    a dictionary whose "descr" entry is converted to a dtype.
+
+    """
+    # Read an unsigned, little-endian short int (int for version 2.0) which
+    # has the length of the header.
     import struct
-    hlength_str = fp.read(2)
-    if len(hlength_str) != 2:
+    hlength_format = _header_length_format(version)
+    hlength_len = struct.calcsize(hlength_format)
+    hlength_str = fp.read(hlength_len)
+    if len(hlength_str) != hlength_len:
         msg = "EOF at %s before reading array header length"
         raise ValueError(msg % fp.tell())
-    header_length = struct.unpack('<H', hlength_str)[0]
+    header_length = struct.unpack(hlength_format, hlength_str)[0]
     header = fp.read(header_length)
     if len(header) != header_length:
         raise ValueError("EOF at %s before reading array header" % fp.tell())
@@ -332,8 +604,11 @@ def read_array_header_1_0(fp):
     #   "shape" : tuple of int
     #   "fortran_order" : bool
     #   "descr" : dtype.descr
+    # and, for version 1.1,
+    #   "chunksize" : int
+    #   "compression" : None or str
     try:
-        d = safe_eval(header)
+        d = _parse_header(header)
     except SyntaxError, e:
         msg = "Cannot parse header: %r\nException: %r"
         raise ValueError(msg % (header, e))
@@ -342,7 +617,10 @@ def read_array_header_1_0(fp):
         raise ValueError(msg % d)
     keys = d.keys()
     keys.sort()
-    if keys != ['descr', 'fortran_order', 'shape']:
+    expected = ['descr', 'fortran_order', 'shape']
+    if version == (1, 1):
+        expected = ['chunksize', 'compression'] + expected
+    if keys != expected:
         msg = "Header does not contain the correct keys: %r"
         raise ValueError(msg % (keys,))
 
@@ -355,14 +633,113 @@ def read_array_header_1_0(fp):
         msg = "fortran_order is not a valid bool: %r"
         raise ValueError(msg % (d['fortran_order'],))
     try:
-        dtype = numpy.dtype(d['descr'])
+        d['descr'] = numpy.dtype(d['descr'])
     except TypeError, e:
         msg = "descr is not a valid dtype descriptor: %r"
         raise ValueError(msg % (d['descr'],))
+    if version == (1, 1):
+        if (not isinstance(d['chunksize'], (int, long)) or
+            d['chunksize'] <= 0):
+            msg = "chunksize is not a valid chunk size: %r"
+            raise ValueError(msg % (d['chunksize'],))
+        if d['compression'] not in _chunk_compressions:
+            msg = "compression is not a supported compression: %r"
+            raise ValueError(msg % (d['compression'],))
+
+    return d
 
-    return d['shape'], d['fortran_order'], dtype
+def _check_chunks(dtype, chunksize, compression):
+    """
+    Check the chunking parameters of an array of the given dtype and return
+    its chunk size, defaulting to about 1 MB worth of items.
 
-def write_array(fp, array, version=(1,0)):
+    """
+    if dtype.hasobject:
+        msg = "Array can't be stored in chunks: Python objects in dtype."
+        raise ValueError(msg)
+    if compression not in _chunk_compressions:
+        msg = "compression must be one of %r, not %r"
+        raise ValueError(msg % (_chunk_compressions, compression))
+    if chunksize is None:
+        chunksize = max(_chunk_bytes // max(dtype.itemsize, 1), 1)
+    elif int(chunksize) != chunksize or chunksize <= 0:
+        raise ValueError("chunksize must be a positive integer")
+    return int(chunksize)
+
+def _count_chunks(count, chunksize):
+    """ Return the number of chunks holding `count` items. """
+    return (count + chunksize - 1) // chunksize
+
+def _read_chunk_index(fp, nchunks):
+    """ Read the index of `nchunks` chunks as a list of offsets. """
+    data = fp.read(8 * (nchunks + 1))
+    if len(data) != 8 * (nchunks + 1):
+        raise ValueError("EOF at %s before reading the chunk index" % fp.tell())
+    offsets = numpy.fromstring(data, dtype='<u8').tolist()
+    for i in range(nchunks):
+        if offsets[i] > offsets[i + 1]:
+            raise ValueError("the chunk index is not valid")
+    return offsets
+
+def _decode_chunk(data, dtype, count, compression):
+    """ Return the array of `count` items stored in the chunk `data`. """
+    if compression == 'zlib':
+        import zlib
+        try:
+            data = zlib.decompress(data)
+        except zlib.error, e:
+            raise ValueError("Cannot decompress chunk: %s" % e)
+    if len(data) != count * dtype.itemsize:
+        raise ValueError("chunk holds %d bytes instead of %d" %
+                         (len(data), count * dtype.itemsize))
+    return numpy.fromstring(data, dtype=dtype, count=count)
+
+def _write_chunks(fp, array, chunksize, compression):
+    """
+    Write the chunk index and the chunks of `array`.
+
+    The index is written first as a placeholder and then rewritten once
+    the size of each chunk is known.  If `fp` cannot seek, the chunks are
+    encoded in memory before being written.
+
+    """
+    if array.flags.f_contiguous and not array.flags.c_contiguous:
+        flat = array.T.ravel()
+    else:
+        flat = array.ravel()
+    nchunks = _count_chunks(flat.size, chunksize)
+
+    def chunks():
+        if compression == 'zlib':
+            import zlib
+        for i in range(nchunks):
+            data = flat[i*chunksize:(i+1)*chunksize].tostring()
+            if compression == 'zlib':
+                data = zlib.compress(data)
+            yield data
+
+    offsets = numpy.zeros(nchunks + 1, dtype='<u8')
+    try:
+        index_pos = fp.tell()
+    except (AttributeError, IOError):
+        index_pos = None
+    if index_pos is None:
+        data = list(chunks())
+        offsets[1:] = numpy.cumsum([len(chunk) for chunk in data])
+        fp.write(offsets.tostring())
+        for chunk in data:
+            fp.write(chunk)
+    else:
+        fp.write(offsets.tostring())
+        for (i, chunk) in enumerate(chunks()):
+            fp.write(chunk)
+            offsets[i + 1] = offsets[i] + len(chunk)
+        end = fp.tell()
+        fp.seek(index_pos)
+        fp.write(offsets.tostring())
+        fp.seek(end)
+
+def write_array(fp, array, version=None, chunksize=None, compression=None):
     """
     Write an array to an NPY file, including a header.
 
@@ -378,7 +755,17 @@ def write_array(fp, array, version=(1,0)):
     array : ndarray
         The array to write to disk.
     version : (int, int), optional
-        The version number of the format.  Default: (1, 0)
+        The version number of the format.  Default: (1, 0), or (2, 0) if
+        the header of the array does not fit in the version 1.0.
+    chunksize : int, optional
+        The number of items per chunk of the chunked format version 1.1.
+        Default: about 1 MB worth of items.
+
+        .. versionadded:: 2.0
+    compression : {None, 'zlib'}, optional
+        The compression of the chunks of the chunked format version 1.1.
+
+        .. versionadded:: 2.0
 
     Raises
     ------
@@ -389,28 +776,72 @@ def write_array(fp, array, version=(1,0)):
         process of pickling them may raise various errors if the objects
         are not picklable.
 
+    Notes
+    -----
+    Giving `chunksize` or `compression` selects the format version 1.1.
+
     """
-    if version != (1, 0):
-        msg = "we only support format version (1,0), not %s"
+    chunked = chunksize is not None or compression is not None
+    if version in [None, (1, 0)] and chunked:
+        version = (1, 1)
+    elif version is None:
+        version = _header_version(header_data_from_array_1_0(array))
+    if version not in [(1, 0), (1, 1), (2, 0)]:
+        msg = "we only support format versions (1,0), (1,1) and (2,0), not %s"
         raise ValueError(msg % (version,))
+    if version == (1, 1):
+        chunksize = _check_chunks(array.dtype, chunksize, compression)
+        d = header_data_from_array_1_0(array)
+        d['chunksize'] = chunksize
+        d['compression'] = compression
+        fp.write(magic(*version))
+        write_array_header_1_0(fp, d)
+        _write_chunks(fp, array, chunksize, compression)
+        return
     fp.write(magic(*version))
-    write_array_header_1_0(fp, header_data_from_array_1_0(array))
+    _write_array_header(fp, header_data_from_array_1_0(array), version)
     if array.dtype.hasobject:
         # We contain Python objects so we cannot write out the data directly.
         # Instead, we will pickle it out with version 2 of the pickle protocol.
         cPickle.dump(array, fp, protocol=2)
-    elif array.flags.f_contiguous and not array.flags.c_contiguous:
-        if isfileobj(fp):
-            array.T.tofile(fp)
-        else:
-            fp.write(array.T.tostring('C'))
     else:
+        if array.flags.f_contiguous and not array.flags.c_contiguous:
+            array = array.T
         if isfileobj(fp):
             array.tofile(fp)
         else:
-            # XXX: We could probably chunk this using something like
-            # arrayterator.
-            fp.write(array.tostring('C'))
+            _write_blocks(fp, array)
+
+def _write_blocks(fp, array):
+    """
+    Write the data of `array` in C order to `fp` in blocks of about
+    `_buffer_size` bytes, to bound the memory used by the copies.
+
+    """
+    if array.ndim == 0 or array.size == 0:
+        fp.write(array.tostring('C'))
+        return
+    # Slices along the first axis hold consecutive data in C order.
+    rowsize = max(array.nbytes // len(array), 1)
+    nrows = max(_buffer_size // rowsize, 1)
+    for i in range(0, len(array), nrows):
+        fp.write(array[i:i + nrows].tostring('C'))
+
+def _read_blocks(fp, array):
+    """
+    Fill the contiguous `array` with the data read from `fp` in blocks of
+    about `_buffer_size` bytes, to bound the memory used by the copies.
+
+    """
+    data = array.view(numpy.uint8).reshape(-1)
+    pos = 0
+    while pos < len(data):
+        block = fp.read(min(_buffer_size, len(data) - pos))
+        if not block:
+            raise ValueError("EOF at %s before reading array data" %
+                             fp.tell())
+        data[pos:pos + len(block)] = numpy.frombuffer(block, dtype=numpy.uint8)
+        pos += len(block)
 
 def read_array(fp):
     """
@@ -434,17 +865,39 @@ def read_array(fp):
 
     """
     version = read_magic(fp)
-    if version != (1, 0):
-        msg = "only support version (1,0) of file format, not %r"
-        raise ValueError(msg % (version,))
-    shape, fortran_order, dtype = read_array_header_1_0(fp)
+    _check_version(version)
+    if version == (1, 1):
+        shape, fortran_order, dtype, chunksize, compression = \
+                read_array_header_1_1(fp)
+    elif version == (2, 0):
+        shape, fortran_order, dtype = read_array_header_2_0(fp)
+    else:
+        shape, fortran_order, dtype = read_array_header_1_0(fp)
     if len(shape) == 0:
         count = 1
     else:
         count = numpy.multiply.reduce(shape)
 
     # Now read the actual data.
-    if dtype.hasobject:
+    if version == (1, 1):
+        nchunks = _count_chunks(count, chunksize)
+        offsets = _read_chunk_index(fp, nchunks)
+        array = numpy.empty(count, dtype=dtype)
+        for i in range(nchunks):
+            n = offsets[i + 1] - offsets[i]
+            data = fp.read(n)
+            if len(data) != n:
+                raise ValueError("EOF at %s before reading chunk %d" %
+                                 (fp.tell(), i))
+            chunk = array[i*chunksize:(i+1)*chunksize]
+            chunk[...] = _decode_chunk(data, dtype, len(chunk), compression)
+
+        if fortran_order:
+            array.shape = shape[::-1]
+            array = array.transpose()
+        else:
+            array.shape = shape
+    elif dtype.hasobject:
         # The array contained Python objects. We need to unpickle the data.
         array = cPickle.load(fp)
     else:
@@ -452,11 +905,10 @@ def read_array(fp):
             # We can use the fast fromfile() function.
             array = numpy.fromfile(fp, dtype=dtype, count=count)
         else:
-            # This is not a real file. We have to read it the memory-intensive
-            # way.
-            # XXX: we can probably chunk this to avoid the memory hit.
-            data = fp.read(int(count * dtype.itemsize))
-            array = numpy.fromstring(data, dtype=dtype, count=count)
+            # This is not a real file. We read it in blocks straight into
+            # the array.
+            array = numpy.empty(count, dtype=dtype)
+            _read_blocks(fp, array)
 
         if fortran_order:
             array.shape = shape[::-1]
@@ -468,7 +920,7 @@ def read_array(fp):
 
 
 def open_memmap(filename, mode='r+', dtype=None, shape=None,
-                fortran_order=False, version=(1,0)):
+                fortran_order=False, version=None):
     """
     Open a .npy file as a memory-mapped array.
 
@@ -497,7 +949,8 @@ def open_memmap(filename, mode='r+', dtype=None, shape=None,
         in "write" mode.
     version : tuple of int (major, minor)
         If the mode is a "write" mode, then this is the version of the file
-        format used to create the file.  Default: (1,0)
+        format used to create the file, (1,0) or (2,0).  Default: (1,0), or
+        (2,0) if the header of the array does not fit in the version 1.0.
 
     Returns
     -------
@@ -523,8 +976,9 @@ def open_memmap(filename, mode='r+', dtype=None, shape=None,
     if 'w' in mode:
         # We are creating the file, not reading it.
         # Check if we ought to create the file.
-        if version != (1, 0):
-            msg = "only support version (1,0) of file format, not %r"
+        if version not in [None, (1, 0), (2, 0)]:
+            msg = "only support versions (1,0) and (2,0) of file format, " \
+                  "not %r"
             raise ValueError(msg % (version,))
         # Ensure that the given dtype is an authentic dtype object rather than
         # just something that can be interpreted as a dtype object.
@@ -537,11 +991,13 @@ def open_memmap(filename, mode='r+', dtype=None, shape=None,
             fortran_order=fortran_order,
             shape=shape,
         )
+        if version is None:
+            version = _header_version(d)
         # If we got here, then it should be safe to create the file.
         fp = open(filename, mode+'b')
         try:
             fp.write(magic(*version))
-            write_array_header_1_0(fp, d)
+            _write_array_header(fp, d, version)
             offset = fp.tell()
         finally:
             fp.close()
@@ -550,10 +1006,17 @@ def open_memmap(filename, mode='r+', dtype=None, shape=None,
         fp = open(filename, 'rb')
         try:
             version = read_magic(fp)
-            if version != (1, 0):
-                msg = "only support version (1,0) of file format, not %r"
+            if version == (1, 1):
+                msg = "Array can't be memory-mapped: data stored in chunks."
+                raise ValueError(msg)
+            if version == (2, 0):
+                shape, fortran_order, dtype = read_array_header_2_0(fp)
+            elif version == (1, 0):
+                shape, fortran_order, dtype = read_array_header_1_0(fp)
+            else:
+                msg = "only support versions (1,0) and (2,0) of file " \
+                      "format, not %r"
                 raise ValueError(msg % (version,))
-            shape, fortran_order, dtype = read_array_header_1_0(fp)
             if dtype.hasobject:
                 msg = "Array can't be memory-mapped: Python objects in dtype."
                 raise ValueError(msg)
@@ -575,3 +1038,169 @@ def open_memmap(filename, mode='r+', dtype=None, shape=None,
         mode=mode, offset=offset)
 
     return marray
+
+
+class ChunkedArray(object):
+    """
+    ChunkedArray(fp)
+
+    A read-only, lazily loaded array stored in the chunked format version
+    1.1, as returned by `open_chunked`.
+
+    Indexing a `ChunkedArray` returns an ndarray.  When the first index of
+    an array stored in C order is an integer or a slice, only the chunks
+    holding the selected rows are read and decompressed; other indexes
+    read the whole array.
+
+    Parameters
+    ----------
+    fp : file_like object
+        An open file object, or a similar object with ``.read()``,
+        ``.seek()`` and ``.tell()`` methods, located at the start of the
+        file.  It is closed by `close`.
+
+    Attributes
+    ----------
+    shape : tuple of int
+        The shape of the array.
+    dtype : dtype
+        The dtype of the array.
+    fortran_order : bool
+        Whether the array is stored in Fortran order.
+    chunksize : int
+        The number of items per chunk.
+    compression : None or str
+        The compression of the chunks.
+
+    """
+    def __init__(self, fp):
+        version = read_magic(fp)
+        if version != (1, 1):
+            msg = "only version (1,1) of file format is chunked, not %r"
+            raise ValueError(msg % (version,))
+        (self.shape, self.fortran_order, self.dtype, self.chunksize,
+         self.compression) = read_array_header_1_1(fp)
+        self.size = int(numpy.multiply.reduce(self.shape))
+        self.ndim = len(self.shape)
+        nchunks = _count_chunks(self.size, self.chunksize)
+        self._offsets = _read_chunk_index(fp, nchunks)
+        self._start = fp.tell()
+        self._fp = fp
+
+    def __len__(self):
+        if self.ndim == 0:
+            raise TypeError("len() of unsized object")
+        return self.shape[0]
+
+    def __array__(self, dtype=None):
+        array = self._read_all()
+        if dtype is not None:
+            array = array.astype(dtype)
+        return array
+
+    def __getitem__(self, index):
+        if not isinstance(index, tuple):
+            index = (index,)
+        if self.ndim == 0 or self.fortran_order or not index or \
+           not isinstance(index[0], (int, long, slice)):
+            return self._read_all()[index]
+
+        # Only read the rows from the first to the last selected one.
+        first = index[0]
+        nrows = self.shape[0]
+        if isinstance(first, slice):
+            rows = range(*first.indices(nrows))
+            if not rows:
+                return self._read_rows(0, 0)[index]
+            lo = min(rows[0], rows[-1])
+            hi = max(rows[0], rows[-1]) + 1
+            first = slice(rows[0] - lo, None, first.step)
+        else:
+            if first < -nrows or first >= nrows:
+                raise IndexError("index out of bounds")
+            lo = first % nrows
+            hi = lo + 1
+            first = 0
+        return self._read_rows(lo, hi)[(first,) + index[1:]]
+
+    def _read_all(self):
+        """ Read the whole array. """
+        array = self._read_items(0, self.size)
+        if self.fortran_order:
+            array.shape = self.shape[::-1]
+            array = array.transpose()
+        else:
+            array.shape = self.shape
+        return array
+
+    def _read_rows(self, lo, hi):
+        """ Read the rows `lo` to `hi` of an array stored in C order. """
+        rowsize = int(numpy.multiply.reduce(self.shape[1:]))
+        array = self._read_items(lo * rowsize, hi * rowsize)
+        array.shape = (hi - lo,) + self.shape[1:]
+        return array
+
+    def _read_items(self, start, stop):
+        """ Read the items `start` to `stop` of the stored data. """
+        array = numpy.empty(stop - start, dtype=self.dtype)
+        chunksize = self.chunksize
+        for i in range(start // chunksize, _count_chunks(stop, chunksize)):
+            n = self._offsets[i + 1] - self._offsets[i]
+            self._fp.seek(self._start + self._offsets[i])
+            data = self._fp.read(n)
+            if len(data) != n:
+                raise ValueError("EOF before reading chunk %d" % i)
+            count = min(chunksize, self.size - i*chunksize)
+            chunk = _decode_chunk(data, self.dtype, count, self.compression)
+            lo = max(start, i*chunksize)
+            hi = min(stop, (i+1)*chunksize)
+            array[lo-start:hi-start] = chunk[lo-i*chunksize:hi-i*chunksize]
+        return array
+
+    def close(self):
+        """
+        Close the file.
+
+        """
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+
+
+def open_chunked(filename):
+    """
+    Open a .npy file of the chunked format version 1.1 for lazy reading.
+
+    Parameters
+    ----------
+    filename : str or file_like object
+        The name of the file on disk, or an open file object located at the
+        start of the file.
+
+    Returns
+    -------
+    carray : ChunkedArray
+        The lazily loaded array.
+
+    Raises
+    ------
+    ValueError
+        If the file is not of format version 1.1, or its data is invalid.
+    IOError
+        If the file is not found or cannot be opened correctly.
+
+    See Also
+    --------
+    open_memmap
+
+    """
+    if isinstance(filename, basestring):
+        fp = open(filename, 'rb')
+    else:
+        fp = filename
+    try:
+        return ChunkedArray(fp)
+    except:
+        if fp is not filename:
+            fp.close()
+        raise
@@ -19,12 +19,14 @@ from numpy.core.numeric import ScalarType, dot, where, newaxis, intp, \
         integer, isscalar
 from numpy.core.umath import pi, multiply, add, arctan2,  \
         frompyfunc, isnan, cos, less_equal, sqrt, sin, mod, exp, log10
-from numpy.core.fromnumeric import ravel, nonzero, choose, sort, mean
+from numpy.core.fromnumeric import ravel, nonzero, choose, sort, mean, \
+        partition
 from numpy.core.numerictypes import typecodes, number
 from numpy.core import atleast_1d, atleast_2d
 from numpy.lib.twodim_base import diag
 from _compiled_base import _insert, add_docstring
 from _compiled_base import digitize, bincount, interp as compiled_interp
+from _compiled_base import _histogram, _bin_index
 from arraysetops import setdiff1d
 from utils import deprecate
 import numpy as np
@@ -58,6 +60,10 @@ def iterable(y):
     except: return 0
     return 1
 
+def _histogram_fast(dtype):
+    """Whether the compiled histogram counts arrays of dtype exactly."""
+    return dtype.kind in 'biu' or (dtype.kind == 'f' and dtype.itemsize <= 8)
+
 def histogram(a, bins=10, range=None, normed=False, weights=None):
     """
     Compute the histogram of a set of data.
@@ -112,6 +118,11 @@ def histogram(a, bins=10, range=None, normed=False, weights=None):
     second ``[2, 3)``.  The last bin, however, is ``[3, 4]``, which *includes*
     4.
 
+    Boolean, integer and floating point data are counted in a single pass,
+    computing the bin of each value from its position in the range when
+    the bins have equal widths, and in several threads for large inputs
+    when `setnumthreads` allows it.
+
     Examples
     --------
     >>> np.histogram([1, 2, 1], bins=[0, 1, 2, 3])
@@ -166,8 +177,20 @@ def histogram(a, bins=10, range=None, normed=False, weights=None):
         ntype = int
     else:
         ntype = weights.dtype
-    n = np.zeros(bins.shape, ntype)
 
+    if _histogram_fast(a.dtype) and \
+            (weights is None or _histogram_fast(weights.dtype)):
+        # Count in one pass, finding the bins arithmetically
+        n = _histogram(a, bins, weights)
+        if weights is not None:
+            n = n.astype(ntype)
+        if normed:
+            db = array(np.diff(bins), float)
+            return n/(n*db).sum(), bins
+        else:
+            return n, bins
+
+    n = np.zeros(bins.shape, ntype)
     block = 65536
     if weights is None:
         for i in arange(0, len(a), block):
@@ -300,21 +323,21 @@ def histogramdd(sample, bins=10, range=None, normed=False, weights=None):
 
     nbin =  asarray(nbin)
 
-    # Compute the bin number each sample falls into.
+    # Compute the bin number each sample falls into, 0 and nbin-1 being
+    # the outlier bins. Values equal to the rightmost edge are counted in
+    # the last bin.
     Ncount = {}
     for i in arange(D):
-        Ncount[i] = digitize(sample[:,i], edges[i])
+        Ncount[i] = _bin_index(sample[:,i], edges[i])
 
-    # Using digitize, values that fall on an edge are put in the right bin.
-    # For the rightmost bin, we want values equal to the right
-    # edge to be counted in the last bin, and not as an outlier.
-    outliers = zeros(N, int)
+    # So are the values above the rightmost edge only by rounding errors.
     for i in arange(D):
         # Rounding precision
         decimal = int(-log10(dedges[i].min())) +6
-        # Find which points are on the rightmost edge.
-        on_edge = where(around(sample[:,i], decimal) == around(edges[i][-1],
-                                                               decimal))[0]
+        # Find which outliers are on the rightmost edge.
+        on_edge = where((Ncount[i] == nbin[i] - 1) &
+                        (around(sample[:,i], decimal) ==
+                         around(edges[i][-1], decimal)))[0]
         # Shift these points one bin to the left.
         Ncount[i][on_edge] -= 1
 
@@ -2849,6 +2872,9 @@ def median(a, axis=None, out=None, overwrite_input=False):
     odd.  When N is even, it is the average of the two middle values of
     ``V_sorted``.
 
+    The middle values are found with `partition`, which takes a time
+    linear in N instead of the N*log(N) of a full sort.
+
     Examples
     --------
     >>> a = np.array([[10, 7, 4], [3, 2, 1]])
@@ -2879,25 +2905,39 @@ def median(a, axis=None, out=None, overwrite_input=False):
     """
     if overwrite_input:
         if axis is None:
-            sorted = a.ravel()
-            sorted.sort()
+            part = a.ravel()
         else:
-            a.sort(axis=axis)
-            sorted = a
+            part = a
+    elif axis is None:
+        part = asanyarray(a).flatten()
     else:
-        sorted = sort(a, axis=axis)
+        part = asanyarray(a).copy()
     if axis is None:
         axis = 0
-    indexer = [slice(None)] * sorted.ndim
-    index = int(sorted.shape[axis]/2)
-    if sorted.shape[axis] % 2 == 1:
+    # Only the middle values need to be in their sorted place
+    n = part.shape[axis]
+    if n == 0:
+        kth = []
+    elif n % 2 == 1:
+        kth = [n // 2]
+    else:
+        kth = [n // 2 - 1, n // 2]
+    if type(part) is np.ndarray:
+        part.partition(kth, axis=axis)
+    else:
+        # subclasses order their values with their own sort, masked
+        # arrays for instance put the masked values last
+        part.sort(axis=axis)
+    indexer = [slice(None)] * part.ndim
+    index = int(part.shape[axis]/2)
+    if part.shape[axis] % 2 == 1:
         # index with slice to allow mean (below) to work
         indexer[axis] = slice(index, index+1)
     else:
         indexer[axis] = slice(index-1, index+1)
     # Use mean in odd and even case to coerce data type
     # and check, use out array.
-    return mean(sorted[indexer], axis=axis, out=out)
+    return mean(part[indexer], axis=axis, out=out)
 
 def percentile(a, q, axis=None, out=None, overwrite_input=False):
     """
@@ -2910,7 +2950,9 @@ def percentile(a, q, axis=None, out=None, overwrite_input=False):
     a : array_like
         Input array or object that can be converted to an array.
     q : float in range of [0,100] (or sequence of floats)
-        percentile to compute which must be between 0 and 100 inclusive
+        percentile to compute which must be between 0 and 100 inclusive.
+        All the percentiles of a sequence are computed from a single
+        partition of the data.
     axis : {None, int}, optional
         Axis along which the percentiles are computed. The default (axis=None)
         is to compute the median along a flattened version of the array.
@@ -2931,10 +2973,11 @@ def percentile(a, q, axis=None, out=None, overwrite_input=False):
     -------
     pcntile : ndarray
         A new array holding the result (unless `out` is specified, in
-        which case that array is returned instead).  If the input contains
-        integers, or floats of smaller precision than 64, then the output
-        data-type is float64.  Otherwise, the output data-type is the same
-        as that of the input.
+        which case that array is returned instead).  If `q` is a sequence,
+        the percentiles are along the first axis of the result.  If the
+        input contains integers, or floats of smaller precision than 64,
+        then the output data-type is float64.  Otherwise, the output
+        data-type is the same as that of the input.
 
     See Also
     --------
@@ -2945,8 +2988,14 @@ def percentile(a, q, axis=None, out=None, overwrite_input=False):
     Given a vector V of length N, the qth percentile of V is the qth ranked
     value in a sorted copy of V.  A weighted average of the two nearest neighbors
     is used if the normalized ranking does not match q exactly.
-    The same as the median if q is 0.5; the same as the min if q is 0;
-    and the same as the max if q is 1
+    The same as the median if q is 50; the same as the min if q is 0;
+    and the same as the max if q is 100.
+
+    The ranked values are found with `partition`, which takes a time
+    linear in N instead of the N*log(N) of a full sort.
+
+    .. versionchanged:: 2.0
+       A sequence of q gives an array instead of a list.
 
     Examples
     --------
@@ -2954,57 +3003,66 @@ def percentile(a, q, axis=None, out=None, overwrite_input=False):
     >>> a
     array([[10,  7,  4],
            [ 3,  2,  1]])
-    >>> np.percentile(a, 0.5)
+    >>> np.percentile(a, 50)
     3.5
-    >>> np.percentile(a, 0.5, axis=0)
+    >>> np.percentile(a, 50, axis=0)
     array([ 6.5,  4.5,  2.5])
-    >>> np.percentile(a, 0.5, axis=1)
+    >>> np.percentile(a, 50, axis=1)
     array([ 7.,  2.])
-    >>> m = np.percentile(a, 0.5, axis=0)
+    >>> m = np.percentile(a, 50, axis=0)
     >>> out = np.zeros_like(m)
-    >>> np.percentile(a, 0.5, axis=0, out=m)
+    >>> np.percentile(a, 50, axis=0, out=m)
     array([ 6.5,  4.5,  2.5])
     >>> m
     array([ 6.5,  4.5,  2.5])
     >>> b = a.copy()
-    >>> np.percentile(b, 0.5, axis=1, overwrite_input=True)
+    >>> np.percentile(b, 50, axis=1, overwrite_input=True)
     array([ 7.,  2.])
     >>> assert not np.all(a==b)
     >>> b = a.copy()
-    >>> np.percentile(b, 0.5, axis=None, overwrite_input=True)
+    >>> np.percentile(b, 50, axis=None, overwrite_input=True)
     3.5
     >>> assert not np.all(a==b)
 
     """
     a = np.asarray(a)
+    qs = array(q, dtype=float).ravel()
+    if isnan(qs).any() or not ((qs >= 0) & (qs <= 100)).all():
+        raise ValueError("percentile must be in the range [0,100]")
 
-    if q == 0:
-        return a.min(axis=axis, out=out)
-    elif q == 100:
-        return a.max(axis=axis, out=out)
-
+    if axis is None:
+        n = a.size
+    else:
+        n = a.shape[axis]
+    # Only the two values around each q need to be in their sorted place
+    if n == 0:
+        kth = []
+    else:
+        index = (qs/100.0*(n - 1)).astype(intp)
+        kth = concatenate((index, (index + 1).clip(0, n - 1)))
     if overwrite_input:
         if axis is None:
-            sorted = a.ravel()
-            sorted.sort()
+            part = a.ravel()
+            part.partition(kth)
         else:
-            a.sort(axis=axis)
-            sorted = a
+            a.partition(kth, axis=axis)
+            part = a
     else:
-        sorted = sort(a, axis=axis)
+        part = partition(a, kth, axis=axis)
     if axis is None:
         axis = 0
 
-    return _compute_qth_percentile(sorted, q, axis, out)
+    return _compute_qth_percentile(part, q, axis, out)
 
-# handle sequence of q's without calling sort multiple times
+# handle sequence of q's without calling partition multiple times
 def _compute_qth_percentile(sorted, q, axis, out):
     if not isscalar(q):
-        p = [_compute_qth_percentile(sorted, qi, axis, None)
-             for qi in q]
+        p = array([_compute_qth_percentile(sorted, qi, axis, None)
+                   for qi in q])
 
         if out is not None:
             out.flat = p
+            return out
 
         return p
 
@@ -1,6 +1,7 @@
 __all__ = ['savetxt', 'loadtxt', 'genfromtxt', 'ndfromtxt', 'mafromtxt',
-        'recfromtxt', 'recfromcsv', 'load', 'loads', 'save', 'savez',
-        'packbits', 'unpackbits', 'fromregex', 'DataSource']
+        'recfromtxt', 'recfromcsv', 'load', 'load_info', 'loads', 'save',
+        'savez', 'savez_compressed', 'NpzWriter', 'packbits', 'unpackbits',
+        'fromregex', 'DataSource']
 
 import numpy as np
 import format
@@ -8,12 +9,13 @@ import sys
 import os
 import sys
 import itertools
+import re
 import warnings
 from operator import itemgetter
 
 from cPickle import load as _cload, loads
 from _datasource import DataSource
-from _compiled_base import packbits, unpackbits
+from _compiled_base import packbits, unpackbits, _loadtxt_parse, _format_rows
 
 from _iotools import LineSplitter, NameValidator, StringConverter, \
                      ConverterError, ConverterLockError, ConversionWarning, \
@@ -112,7 +114,7 @@ class BagObj(object):
 
 class NpzFile(object):
     """
-    NpzFile(fid)
+    NpzFile(fid, mmap_mode=None)
 
     A dictionary-like object with lazy-loading of files in the zipped
     archive provided on construction.
@@ -123,9 +125,10 @@ class NpzFile(object):
 
     The arrays and file strings are lazily loaded on either
     getitem access using ``obj['key']`` or attribute lookup using
-    ``obj.f.key``. A list of all files (without ".npy" extensions) can
-    be obtained with ``obj.files`` and the ZipFile object itself using
-    ``obj.zip``.
+    ``obj.f.key``.  Each access reads a new array, except for the
+    memory-mapped arrays, which are mapped only once.
+    A list of all files (without ".npy" extensions) can be obtained with
+    ``obj.files`` and the ZipFile object itself using ``obj.zip``.
 
     Attributes
     ----------
@@ -142,6 +145,15 @@ class NpzFile(object):
     fid : file or str
         The zipped archive to open. This is either a file-like object
         or a string containing the path to the archive.
+    mmap_mode : {None, 'r+', 'r', 'c'}, optional
+        If not None, then the arrays stored uncompressed in an archive on
+        disk are memory-mapped with the given mode (see `numpy.memmap`)
+        instead of being read.  The other arrays are read as usual.
+        With 'r+', changes to the arrays are written to the archive but
+        the CRC of their members is not updated, so that tools checking
+        the archive will report them as corrupted.
+
+        .. versionadded:: 2.0
 
     Examples
     --------
@@ -163,10 +175,13 @@ class NpzFile(object):
     array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9])
 
     """
-    def __init__(self, fid):
+    def __init__(self, fid, mmap_mode=None):
         # Import is postponed to here since zipfile depends on gzip, an optional
         # component of the so-called standard library.
         import zipfile
+        if mmap_mode not in (None, 'r+', 'r', 'c'):
+            raise ValueError("mmap_mode must be one of None, 'r+', 'r' "
+                             "or 'c', not %r" % (mmap_mode,))
         _zip = zipfile.ZipFile(fid)
         self._files = _zip.namelist()
         self.files = []
@@ -177,6 +192,48 @@ class NpzFile(object):
                 self.files.append(x)
         self.zip = _zip
         self.f = BagObj(self)
+        self.mmap_mode = mmap_mode
+        self._cache = {}
+
+    def close(self):
+        """
+        Close the archive and forget the memory-mapped files.
+
+        """
+        if self.zip is not None:
+            self.zip.close()
+            self.zip = None
+        self._cache = {}
+
+    def _memmap(self, name):
+        """
+        Memory-map the array stored in the member `name` of the archive, or
+        return None if it cannot be memory-mapped.
+
+        """
+        filename = self.zip.filename
+        if not isinstance(filename, basestring) or \
+           not os.path.isfile(filename):
+            return None
+        offset = _zip_member_offset(self.zip, self.zip.getinfo(name))
+        if offset is None:
+            return None
+        fp = self.zip.fp
+        fp.seek(offset)
+        if fp.read(len(format.MAGIC_PREFIX)) != format.MAGIC_PREFIX:
+            return None
+        fp.seek(offset)
+        info = format.read_array_info(fp)
+        if info['version'] not in [(1, 0), (2, 0)] or \
+           info['dtype'].hasobject or not np.multiply.reduce(info['shape']):
+            return None
+        if info['fortran_order']:
+            order = 'F'
+        else:
+            order = 'C'
+        return np.memmap(filename, dtype=info['dtype'], shape=info['shape'],
+                         order=order, mode=self.mmap_mode,
+                         offset=info['offset'])
 
     def __getitem__(self, key):
         # FIXME: This seems like it will copy strings around
@@ -194,10 +251,18 @@ class NpzFile(object):
             member = 1
             key += '.npy'
         if member:
+            if key in self._cache:
+                return self._cache[key]
+            if self.mmap_mode is not None:
+                value = self._memmap(key)
+                if value is not None:
+                    # A copy-on-write map is private to its user
+                    if self.mmap_mode != 'c':
+                        self._cache[key] = value
+                    return value
             bytes = self.zip.read(key)
             if bytes.startswith(format.MAGIC_PREFIX):
-                value = BytesIO(bytes)
-                return format.read_array(value)
+                return format.read_array(BytesIO(bytes))
             else:
                 return bytes
         else:
@@ -231,6 +296,298 @@ class NpzFile(object):
         return self.files.__contains__(key)
 
 
+def _zip_member_offset(zip, info):
+    """
+    Return the position of the data of the member `info` in the file of
+    the ZipFile `zip`, or None if the member is compressed.
+
+    """
+    import zipfile
+    import struct
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+    # The data of the member follows its local header, whose extra field
+    # may differ from the one of the central directory.
+    fp = zip.fp
+    fp.seek(info.header_offset)
+    header = fp.read(30)
+    if len(header) != 30 or header[:4] != asbytes('PK\x03\x04'):
+        return None
+    (name_length, extra_length) = struct.unpack('<HH', header[26:])
+    return info.header_offset + 30 + name_length + extra_length
+
+
+class _NpzMember(object):
+    """
+    _NpzMember(writer, compress)
+
+    A write-only file-like object streaming the data of a member into the
+    archive of the `NpzWriter` `writer`, compressing it with deflate if
+    `compress` is true.  The CRC and the sizes of the member are computed
+    as the data goes through.
+
+    """
+    def __init__(self, writer, compress):
+        import zlib
+        self._writer = writer
+        self._crc32 = zlib.crc32
+        self.crc = 0
+        self.file_size = 0
+        self.compress_size = 0
+        if compress:
+            self._compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION,
+                                                zlib.DEFLATED, -15)
+        else:
+            self._compressor = None
+
+    def _write_data(self, data):
+        self.compress_size += len(data)
+        self._writer._write(data)
+
+    def write(self, data):
+        self.file_size += len(data)
+        self.crc = self._crc32(data, self.crc)
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+        self._write_data(data)
+
+    def close(self):
+        if self._compressor is not None:
+            self._write_data(self._compressor.flush())
+            self._compressor = None
+        self.crc &= 0xffffffff
+
+
+class NpzWriter(object):
+    """
+    NpzWriter(file, compress=False, mode='w')
+
+    Write arrays one at a time to a ``.npz`` archive.
+
+    Each array is streamed straight into its member of the archive, whose
+    CRC and sizes follow the data, so that an archive of many large arrays
+    can be built without holding them in memory or in temporary files.
+    `NpzWriter` can be used as a context manager, which closes the archive
+    on exit.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    file : str or file
+        Either the file name (string) or an open file (file-like object)
+        of the archive.  If file is a string, the ``.npz`` extension will
+        be appended to the file name if it is not already there.  With
+        mode 'w', the file object does not need to be seekable.
+    compress : bool, optional
+        Whether to compress the arrays with deflate.  Default: False.
+    mode : {'w', 'a'}, optional
+        Whether to write a new archive or to append to an existing one.
+        Default: 'w'.
+
+    See Also
+    --------
+    savez, savez_compressed, NpzFile
+
+    Notes
+    -----
+    The members are written with data descriptors and the ZIP64
+    extensions, which the `zipfile` module and the usual zip tools read.
+
+    Examples
+    --------
+    >>> from tempfile import TemporaryFile
+    >>> outfile = TemporaryFile()
+    >>> npz = np.NpzWriter(outfile, compress=True)
+    >>> for i in range(3):
+    ...     npz['x%d' % i] = np.arange(i)
+    >>> npz.close()
+    >>> outfile.seek(0)
+    >>> sorted(np.load(outfile).files)
+    ['x0', 'x1', 'x2']
+
+    """
+    def __init__(self, file, compress=False, mode='w'):
+        if mode not in ('w', 'a'):
+            raise ValueError("mode must be 'w' or 'a', not %r" % (mode,))
+        if compress:
+            try:
+                import zlib
+            except ImportError:
+                raise RuntimeError("Compression requires the (missing) zlib "
+                                   "module")
+        self.compress = compress
+        self.mode = mode
+        self._names = set()
+        self._directory = []
+        self._count = 0
+        self._pos = 0
+        self._own_fid = isinstance(file, basestring)
+        if self._own_fid:
+            if not file.endswith('.npz'):
+                file = file + '.npz'
+            if mode == 'w':
+                file = open(file, 'wb')
+            else:
+                file = open(file, 'r+b')
+        self.fid = file
+        if mode == 'a':
+            try:
+                self._read_directory()
+            except:
+                if self._own_fid:
+                    file.close()
+                raise
+        else:
+            try:
+                self._pos = file.tell()
+            except (AttributeError, IOError):
+                pass
+
+    def _read_directory(self):
+        """
+        Find the central directory of the archive to append to, keep it and
+        move before it, where the new members go.
+
+        """
+        # Import is postponed to here since zipfile depends on gzip, an optional
+        # component of the so-called standard library.
+        import zipfile
+        import struct
+
+        fid = self.fid
+        fid.seek(0)
+        self._names.update(zipfile.ZipFile(fid).namelist())
+        # The end of central directory record is followed by a comment of
+        # at most 65535 bytes.
+        fid.seek(0, 2)
+        end = fid.tell()
+        start = max(end - 22 - 65535, 0)
+        fid.seek(start)
+        tail = fid.read()
+        end = start + tail.rfind(asbytes('PK\x05\x06'))
+        fid.seek(end)
+        (count, size) = struct.unpack('<10xHL6x', fid.read(22))
+        locator = None
+        if end >= 20:
+            fid.seek(end - 20)
+            locator = struct.unpack('<4sLQL', fid.read(20))
+        if locator is not None and locator[0] == asbytes('PK\x06\x07'):
+            # ZIP64 end of central directory record
+            end = locator[2]
+            fid.seek(end)
+            (count, size) = struct.unpack('<32xQQ8x', fid.read(56))
+        self._pos = end - size
+        fid.seek(self._pos)
+        self._directory.append(fid.read(size))
+        self._count = count
+        fid.seek(self._pos)
+
+    def _write(self, data):
+        self.fid.write(data)
+        self._pos += len(data)
+
+    def write(self, key, arr):
+        """
+        Write the array `arr` to the member ``key + '.npy'`` of the archive.
+
+        """
+        import time
+        import struct
+
+        if self.fid is None:
+            raise ValueError("I/O operation on closed archive")
+        name = key + '.npy'
+        if name in self._names:
+            raise ValueError("%s is already in the archive" % (name,))
+        arr = np.asanyarray(arr)
+        fname = name
+        # Data descriptor
+        flags = 0x08
+        if not isinstance(fname, bytes):
+            fname = fname.encode('utf-8')
+            flags |= 0x800
+        if self.compress:
+            method = 8
+        else:
+            method = 0
+        t = time.localtime(time.time())
+        dostime = t[3] << 11 | t[4] << 5 | t[5] // 2
+        dosdate = (t[0] - 1980) << 9 | t[1] << 5 | t[2]
+        offset = self._pos
+
+        # The sizes are not known yet: they are given as ZIP64 sizes in the
+        # data descriptor which follows the data.
+        extra = struct.pack('<HHQQ', 1, 16, 0, 0)
+        self._write(struct.pack('<4sHHHHHLLLHH', asbytes('PK\x03\x04'), 45,
+                                flags, method, dostime, dosdate, 0,
+                                0xffffffff, 0xffffffff, len(fname),
+                                len(extra)) + fname + extra)
+        member = _NpzMember(self, self.compress)
+        format.write_array(member, arr)
+        member.close()
+        self._write(struct.pack('<4sLQQ', asbytes('PK\x07\x08'), member.crc,
+                                member.compress_size, member.file_size))
+
+        # The entry of the member in the central directory
+        sizes = [member.file_size, member.compress_size, offset]
+        large = [x for x in sizes if x >= 0xffffffff]
+        if large:
+            extra = struct.pack('<HH%dQ' % len(large), 1, 8 * len(large),
+                                *large)
+        else:
+            extra = asbytes('')
+        sizes = [min(x, 0xffffffff) for x in sizes]
+        self._directory.append(struct.pack('<4sBBBBHHHHLLLHHHHHLL',
+                asbytes('PK\x01\x02'), 45, 3, 45, 0, flags, method, dostime,
+                dosdate, member.crc, sizes[1], sizes[0], len(fname),
+                len(extra), 0, 0, 0, 0600 << 16, sizes[2]) + fname + extra)
+        self._count += 1
+        self._names.add(name)
+
+    def __setitem__(self, key, arr):
+        self.write(key, arr)
+
+    def close(self):
+        """
+        Write the central directory and close the archive.
+
+        """
+        import struct
+
+        fid = self.fid
+        if fid is None:
+            return
+        self.fid = None
+        try:
+            directory = asbytes('').join(self._directory)
+            start = self._pos
+            fid.write(directory)
+            count, size = self._count, len(directory)
+            if count >= 0xffff or size >= 0xffffffff or start >= 0xffffffff:
+                fid.write(struct.pack('<4sQHHLLQQQQ', asbytes('PK\x06\x06'),
+                                      44, 45, 45, 0, 0, count, count, size,
+                                      start))
+                fid.write(struct.pack('<4sLQL', asbytes('PK\x06\x07'), 0,
+                                      start + size, 1))
+            fid.write(struct.pack('<4sHHHHLLH', asbytes('PK\x05\x06'), 0, 0,
+                                  min(count, 0xffff), min(count, 0xffff),
+                                  min(size, 0xffffffff),
+                                  min(start, 0xffffffff), 0))
+            if self.mode == 'a':
+                # The old central directory may have been longer
+                fid.truncate()
+        finally:
+            if self._own_fid:
+                fid.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
 def load(file, mmap_mode=None):
     """
     Load a pickled, ``.npy``, or ``.npz`` binary file.
@@ -242,13 +599,20 @@ def load(file, mmap_mode=None):
         If the filename extension is ``.gz``, the file is first decompressed.
     mmap_mode: {None, 'r+', 'r', 'w+', 'c'}, optional
         If not None, then memory-map the file, using the given mode
-        (see `numpy.memmap`).  The mode has no effect for pickled or
-        zipped files.
+        (see `numpy.memmap`).  The mode has no effect for pickled files.
+        For ``.npz`` files, the arrays stored uncompressed are
+        memory-mapped when accessed, and 'w+' is not allowed.  With
+        'r+', changes to these arrays are written to the archive without
+        updating the CRC of their members.
         A memory-mapped array is stored on disk, and not directly loaded
         into memory.  However, it can be accessed and sliced like any
         ndarray.  Memory mapping is especially useful for accessing
         small fragments of large files without reading the entire file
         into memory.
+        A ``.npy`` file whose data is stored in chunks cannot be
+        memory-mapped; with mode 'r', a read-only `format.ChunkedArray`
+        which only reads the chunks needed by each slice is returned
+        instead.
 
     Returns
     -------
@@ -269,7 +633,9 @@ def load(file, mmap_mode=None):
     -----
     - If the file contains pickle data, then whatever is stored in the
       pickle is returned.
-    - If the file is a ``.npy`` file, then an array is returned.
+    - If the file is a ``.npy`` file, then an array is returned, or a
+      lazily loaded `format.ChunkedArray` if `mmap_mode` is given and the
+      data is stored in chunks.
     - If the file is a ``.npz`` file, then a dictionary-like object is
       returned, containing ``{filename: array}`` key-value pairs, one for
       each file in the archive.
@@ -306,9 +672,16 @@ def load(file, mmap_mode=None):
     magic = fid.read(N)
     fid.seek(-N, 1) # back-up
     if magic.startswith(_ZIP_PREFIX):  # zip-file (assume .npz)
-        return NpzFile(fid)
+        return NpzFile(fid, mmap_mode=mmap_mode)
     elif magic == format.MAGIC_PREFIX: # .npy file
         if mmap_mode:
+            version = format.read_magic(fid)
+            fid.seek(-format.MAGIC_LEN, 1)
+            if version == (1, 1):
+                if mmap_mode != 'r':
+                    msg = "chunked arrays can only be opened with mode 'r'"
+                    raise ValueError(msg)
+                return format.open_chunked(fid)
             return format.open_memmap(file, mode=mmap_mode)
         else:
             return format.read_array(fid)
@@ -319,7 +692,89 @@ def load(file, mmap_mode=None):
             raise IOError, \
                 "Failed to interpret file %s as a pickle" % repr(file)
 
-def save(file, arr):
+def load_info(file):
+    """
+    Read the metadata of the arrays of a ``.npy`` or ``.npz`` file, without
+    reading their data.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    file : file-like object or string
+        The file to read.  It must support ``seek()`` and ``read()`` methods.
+
+    Returns
+    -------
+    info : dict
+        For a ``.npy`` file, the metadata of the array as returned by
+        `format.read_array_info`: its "shape", "dtype", "fortran_order",
+        the "offset" of its data in the file, and the "version" of the
+        file format.  For a ``.npz`` file, a dictionary mapping the name of
+        each array of the archive to its metadata, in which "offset" is the
+        position of the data in the archive for the uncompressed arrays,
+        and None for the compressed ones.
+
+    Raises
+    ------
+    IOError
+        If the input file does not exist or cannot be read.
+    ValueError
+        If the file is not a ``.npy`` or ``.npz`` file.
+
+    See Also
+    --------
+    load
+
+    Examples
+    --------
+    >>> np.save('/tmp/123', np.array([[1, 2, 3], [4, 5, 6]]))
+    >>> info = np.load_info('/tmp/123.npy')
+    >>> info['shape'], info['fortran_order'], info['offset']
+    ((2, 3), False, 80)
+
+    """
+    if isinstance(file, basestring):
+        fid = open(file, "rb")
+    else:
+        fid = file
+
+    try:
+        _ZIP_PREFIX = asbytes('PK\x03\x04')
+        N = len(format.MAGIC_PREFIX)
+        magic = fid.read(N)
+        fid.seek(-N, 1) # back-up
+        if magic == format.MAGIC_PREFIX:
+            return format.read_array_info(fid)
+        elif not magic.startswith(_ZIP_PREFIX):
+            raise ValueError("%r is not a .npy or .npz file" % (file,))
+
+        import zipfile
+        zip = zipfile.ZipFile(fid)
+        infos = {}
+        for zinfo in zip.infolist():
+            if not zinfo.filename.endswith('.npy'):
+                continue
+            offset = _zip_member_offset(zip, zinfo)
+            if offset is None:
+                member = zip.open(zinfo)
+            else:
+                member = zip.fp
+                member.seek(offset)
+            try:
+                info = format.read_array_info(member)
+            finally:
+                if offset is None:
+                    member.close()
+            if offset is None:
+                info['offset'] = None
+            infos[zinfo.filename[:-4]] = info
+        return infos
+    finally:
+        if fid is not file:
+            fid.close()
+
+def save(file, arr, chunksize=None, compression=None):
     """
     Save an array to a binary file in NumPy ``.npy`` format.
 
@@ -332,6 +787,17 @@ def save(file, arr):
         have one.
     arr : array_like
         Array data to be saved.
+    chunksize : int, optional
+        If given, store the data in chunks of `chunksize` items, so that
+        slices of the array can be loaded without reading the whole file
+        (see `load`).  Default: about 1 MB per chunk if `compression` is
+        given, else the data is not chunked.
+
+        .. versionadded:: 2.0
+    compression : {None, 'zlib'}, optional
+        If given, compress each chunk of the data with this compression.
+
+        .. versionadded:: 2.0
 
     See Also
     --------
@@ -363,7 +829,7 @@ def save(file, arr):
         fid = file
 
     arr = np.asanyarray(arr)
-    format.write_array(fid, arr)
+    format.write_array(fid, arr, chunksize=chunksize, compression=compression)
 
 def savez(file, *args, **kwds):
     """
@@ -397,6 +863,8 @@ def savez(file, *args, **kwds):
     --------
     save : Save a single array to a binary file in NumPy format.
     savetxt : Save an array to a file as plain text.
+    savez_compressed : Save several arrays into a compressed ``.npz`` archive.
+    NpzWriter : Write arrays one at a time to a ``.npz`` archive.
 
     Notes
     -----
@@ -440,16 +908,53 @@ def savez(file, *args, **kwds):
 
     """
 
-    # Import is postponed to here since zipfile depends on gzip, an optional
-    # component of the so-called standard library.
-    import zipfile
-    # Import deferred for startup time improvement
-    import tempfile
+    _savez(file, args, kwds, False)
 
-    if isinstance(file, basestring):
-        if not file.endswith('.npz'):
-            file = file + '.npz'
+def savez_compressed(file, *args, **kwds):
+    """
+    Save several arrays into a single, compressed archive file in ``.npz``
+    format.
 
+    This is like `savez`, except that the arrays are compressed with
+    deflate in the archive.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ----------
+    file : str or file
+        Either the file name (string) or an open file (file-like object)
+        where the data will be saved. If file is a string, the ``.npz``
+        extension will be appended to the file name if it is not already there.
+    \\*args : Arguments, optional
+        Arrays to save to the file, with the names "arr_0", "arr_1", and so
+        on.
+    \\*\\*kwds : Keyword arguments, optional
+        Arrays to save to the file with the keyword names.
+
+    Returns
+    -------
+    None
+
+    See Also
+    --------
+    savez : Save several arrays into an uncompressed ``.npz`` archive.
+    NpzWriter : Write arrays one at a time to a ``.npz`` archive.
+
+    Examples
+    --------
+    >>> from tempfile import TemporaryFile
+    >>> outfile = TemporaryFile()
+    >>> x = np.zeros(1000)
+    >>> np.savez_compressed(outfile, x=x)
+    >>> outfile.seek(0)
+    >>> np.load(outfile)['x'].shape
+    (1000,)
+
+    """
+    _savez(file, args, kwds, True)
+
+def _savez(file, args, kwds, compress):
     namedict = kwds
     for i, val in enumerate(args):
         key = 'arr_%d' % i
@@ -457,27 +962,12 @@ def savez(file, *args, **kwds):
             raise ValueError, "Cannot use un-named variables and keyword %s" % key
         namedict[key] = val
 
-    zip = zipfile.ZipFile(file, mode="w")
-
-    # Stage arrays in a temporary file on disk, before writing to zip.
-    fd, tmpfile = tempfile.mkstemp(suffix='-numpy.npy')
-    os.close(fd)
+    npz = NpzWriter(file, compress=compress)
     try:
         for key, val in namedict.iteritems():
-            fname = key + '.npy'
-            fid = open(tmpfile, 'wb')
-            try:
-                format.write_array(fid, np.asanyarray(val))
-                fid.close()
-                fid = None
-                zip.write(tmpfile, arcname=fname)
-            finally:
-                if fid:
-                    fid.close()
+            npz.write(key, val)
     finally:
-        os.remove(tmpfile)
-
-    zip.close()
+        npz.close()
 
 # Adapted from matplotlib
 
@@ -497,9 +987,171 @@ def _getconv(dtype):
         return str
 
 
+def _floats_to_ints(x, dtype):
+    """Convert the floats parsed by the compiled tokenizer for an integer
+    field of data-type `dtype`, as the converter of `_getconv` and the
+    array constructor do: the values are truncated, must be finite and fit
+    in an int64 (or a uint64 for uint64 fields), and wrap around if they
+    do not fit in `dtype`."""
+    if not np.isfinite(x).all():
+        if np.isnan(x).any():
+            raise ValueError("cannot convert float NaN to integer")
+        raise OverflowError("cannot convert float infinity to integer")
+    if dtype.kind == 'u' and dtype.itemsize == 8:
+        top = 2.0**64
+    else:
+        top = 2.0**63
+    if (x < -2.0**63).any() or (x >= top).any():
+        raise ValueError("integer value out of range")
+    big = x >= 2.0**63
+    if big.any():
+        # Only uint64 fields get there: wrap to the same bits in an int64
+        x = np.where(big, x - 2.0**64, x)
+    return x.astype(np.int64).astype(dtype)
+
+
+def _iter_line_blocks(first_line, fh, blocksize=2**20):
+    """Yield the text of `first_line` and `fh` in blocks of whole lines.
+
+    The blocks are about `blocksize` bytes long and end on a newline (but
+    the last one, if the file does not end with a newline).
+
+    """
+    pending = asbytes(first_line)
+    while True:
+        chunk = asbytes(fh.read(blocksize))
+        if not chunk:
+            break
+        pending += chunk
+        end = pending.rfind(asbytes('\n')) + 1
+        if end:
+            yield pending[:end]
+            pending = pending[end:]
+    if pending:
+        yield pending
+
+
+def _loadtxt_c_chunks(first_line, fh, ncols, comments, delimiter, usecols,
+                      chunksize=None, blocksize=2**20):
+    """Parse the remaining lines of `fh` with the compiled tokenizer.
+
+    The lines are read in blocks of about `blocksize` bytes and parsed
+    directly into float64 arrays of shape (chunksize, ncols), which are
+    yielded as they fill up (the last one may be shorter).  If `chunksize`
+    is None, a single array is grown geometrically to hold all the rows.
+
+    """
+    if chunksize is None:
+        nrows = max(blocksize // (8 * ncols), 1)
+    else:
+        nrows = chunksize
+    out = np.empty((nrows, ncols), dtype=np.float64)
+    row = 0
+    for block in _iter_line_blocks(first_line, fh, blocksize):
+        offset = 0
+        while True:
+            row, offset = _loadtxt_parse(block, offset, out, row,
+                                         comments, delimiter, usecols)
+            if offset == len(block):
+                break
+            if chunksize is None:
+                out.resize((2 * len(out), ncols), refcheck=False)
+            else:
+                yield out
+                out = np.empty((nrows, ncols), dtype=np.float64)
+                row = 0
+    if row or chunksize is None:
+        out.resize((row, ncols), refcheck=False)
+        yield out
+
+
+def _loadtxt_c_block(block, ncols, comments, delimiter, usecols):
+    """Parse a block of whole lines into a float64 array of `ncols` columns."""
+    out = np.empty((len(block) // (8 * ncols) + 1, ncols), dtype=np.float64)
+    (row, offset) = (0, 0)
+    while True:
+        (row, offset) = _loadtxt_parse(block, offset, out, row,
+                                       comments, delimiter, usecols)
+        if offset == len(block):
+            break
+        out.resize((2 * len(out), ncols), refcheck=False)
+    out.resize((row, ncols), refcheck=False)
+    return out
+
+
+def _loadtxt_c_parallel(first_line, fh, ncols, comments, delimiter, usecols,
+                        threads, blocksize=2**20):
+    """Parse the remaining lines of `fh` in `threads` worker threads.
+
+    The text is cut into blocks of whole lines of about `blocksize` bytes,
+    which the workers parse concurrently (the tokenizer releases the GIL).
+    The parsed blocks are then stitched in order into a single float64
+    array of shape (nrows, ncols).
+
+    """
+    import threading
+    import Queue
+
+    todo = Queue.Queue(2 * threads)
+    parsed = {}
+    errors = {}
+
+    def work():
+        while True:
+            item = todo.get()
+            if item is None:
+                return
+            (i, block) = item
+            try:
+                parsed[i] = _loadtxt_c_block(block, ncols, comments,
+                                             delimiter, usecols)
+            except Exception:
+                errors[i] = sys.exc_info()
+
+    workers = [threading.Thread(target=work) for i in range(threads)]
+    for worker in workers:
+        worker.setDaemon(True)
+        worker.start()
+    try:
+        for item in enumerate(_iter_line_blocks(first_line, fh, blocksize)):
+            if errors:
+                break
+            todo.put(item)
+    finally:
+        for worker in workers:
+            todo.put(None)
+        for worker in workers:
+            worker.join()
+    if errors:
+        # Report the error of the first faulty block
+        (exc_type, exc_value, exc_tb) = errors[min(errors.keys())]
+        raise exc_type, exc_value, exc_tb
+    blocks = [parsed[i] for i in range(len(parsed))]
+    if not blocks:
+        return np.empty((0, ncols), dtype=np.float64)
+    return np.concatenate(blocks)
+
+
+def _squeeze_chunk(X):
+    """Squeeze the dimensions of length one of `X` but the first."""
+    shape = [n for n in X.shape[1:] if n != 1]
+    return X.reshape([len(X)] + shape)
+
+
+def _iter_chunks(chunks, convert, fh=None):
+    """Yield ``convert(chunk)`` for each chunk.  `fh`, if given, is closed
+    when the iteration ends, fails or is abandoned."""
+    try:
+        for chunk in chunks:
+            yield convert(chunk)
+    finally:
+        if fh is not None:
+            fh.close()
+
 
 def loadtxt(fname, dtype=float, comments='#', delimiter=None,
-            converters=None, skiprows=0, usecols=None, unpack=False):
+            converters=None, skiprows=0, usecols=None, unpack=False,
+            engine='auto', chunksize=None, threads=1):
     """
     Load data from a text file.
 
@@ -536,11 +1188,37 @@ def loadtxt(fname, dtype=float, comments='#', delimiter=None,
     unpack : bool, optional
         If True, the returned array is transposed, so that arguments may be
         unpacked using ``x, y, z = loadtxt(...)``.  The default is False.
+    engine : {'auto', 'c', 'python'}, optional
+        The parser to use.  The 'c' engine tokenizes the text in compiled
+        code and stores the values directly in a typed buffer; it handles
+        integer and floating point data-types (including record data-types
+        made only of those) for columns without a user converter, with the
+        same results and errors as the 'python' engine.  The 'python' engine splits and converts each line in
+        Python and handles every case.  The default, 'auto', uses the 'c'
+        engine when it can and the 'python' engine otherwise.
+
+        .. versionadded:: 2.0
+    chunksize : int, optional
+        If given, return an iterator over successive arrays of `chunksize`
+        rows (the last one may be shorter) instead of a single array, so
+        that files larger than memory can be processed piecewise.  Only the
+        dimensions of length one past the first are squeezed from each
+        chunk.
+
+        .. versionadded:: 2.0
+    threads : int, optional
+        Number of threads parsing the file with the 'c' engine.  The text
+        is cut in blocks of whole lines that are parsed concurrently and
+        then stitched in order.  Only used by the 'c' engine, and when
+        `chunksize` is not given.  Default is 1.
+
+        .. versionadded:: 2.0
 
     Returns
     -------
-    out : ndarray
-        Data read from the text file.
+    out : ndarray or iterator
+        Data read from the text file, or an iterator over chunks of it if
+        `chunksize` is given.
 
     See Also
     --------
@@ -583,6 +1261,14 @@ def loadtxt(fname, dtype=float, comments='#', delimiter=None,
 
     user_converters = converters
 
+    if engine not in ('auto', 'c', 'python'):
+        raise ValueError("engine must be 'auto', 'c' or 'python', not %r"
+                         % (engine,))
+    if chunksize is not None and chunksize < 1:
+        raise ValueError("chunksize must be a positive integer")
+    if threads < 1:
+        raise ValueError("threads must be a positive integer")
+
     if usecols is not None:
         usecols = list(usecols)
 
@@ -601,7 +1287,6 @@ def loadtxt(fname, dtype=float, comments='#', delimiter=None,
         fh = fname
     else:
         raise ValueError('fname must be a string or file handle')
-    X = []
 
     def flatten_dtype(dt):
         """Unpack a structured data-type."""
@@ -626,6 +1311,69 @@ def loadtxt(fname, dtype=float, comments='#', delimiter=None,
         else:
             return []
 
+    def parse_lines(lines):
+        """Convert the lines, yielding lists of `chunksize` row tuples."""
+        X = []
+        for line in lines:
+            vals = split_line(line)
+            if len(vals) == 0:
+                continue
+
+            if usecols:
+                vals = [vals[i] for i in usecols]
+
+            # Convert each value according to its column and store
+            X.append(tuple([conv(val) for (conv, val) in zip(converters, vals)]))
+            if len(X) == chunksize:
+                yield X
+                X = []
+        if X or chunksize is None:
+            yield X
+
+    def pack(X):
+        """Make an array of the requested dtype from the parsed rows."""
+        if use_c:
+            # The values were parsed as doubles, one column per field of
+            # the flattened data-type: cast them column by column.
+            if len(dtype_types) > 1:
+                flat = np.empty(len(X), dtype=[('', t) for t in dtype_types])
+                for i, name in enumerate(flat.dtype.names):
+                    if dtype_types[i].kind in 'iu':
+                        flat[name] = _floats_to_ints(X[:, i], dtype_types[i])
+                    else:
+                        flat[name] = X[:, i]
+                X = flat.view(dtype)
+            elif dtype.kind in 'iu':
+                X = _floats_to_ints(X, dtype)
+            else:
+                X = X.astype(dtype)
+        elif len(dtype_types) > 1:
+            # We're dealing with a structured array, with a dtype such as
+            # [('x', int), ('y', [('s', int), ('t', float)])]
+            #
+            # First, create the array using a flattened dtype:
+            # [('x', int), ('s', int), ('t', float)]
+            #
+            # Then, view the array using the specified dtype.
+            try:
+                X = np.array(X, dtype=np.dtype([('', t) for t in dtype_types]))
+                X = X.view(dtype)
+            except TypeError:
+                # In the case we have an object dtype
+                X = np.array(X, dtype=dtype)
+        else:
+            X = np.array(X, dtype)
+
+        if chunksize is None:
+            X = np.squeeze(X)
+        else:
+            X = _squeeze_chunk(X)
+        if unpack:
+            return X.T
+        else:
+            return X
+
+    complete = False
     try:
         # Make sure we're dealing with a proper dtype
         dtype = np.dtype(dtype)
@@ -655,6 +1403,7 @@ def loadtxt(fname, dtype=float, comments='#', delimiter=None,
             converters = [defconv for i in xrange(N)]
 
         # By preference, use the converters specified by the user
+        has_user_conv = False
         for i, conv in (user_converters or {}).iteritems():
             if usecols:
                 try:
@@ -663,44 +1412,108 @@ def loadtxt(fname, dtype=float, comments='#', delimiter=None,
                     # Unused converter specified
                     continue
             converters[i] = conv
+            has_user_conv = True
+
+        # The compiled engine only knows how to produce numbers; booleans
+        # need the text of integers, which is lost in the parsed doubles.
+        use_c = not has_user_conv
+        for dt in dtype_types:
+            use_c = use_c and dt.kind in 'iuf'
+        if engine == 'c' and not use_c:
+            raise ValueError("the 'c' engine does not support user converters"
+                             " or non-numeric and boolean data-types")
+        use_c = use_c and engine != 'python'
+
+        if use_c and threads > 1 and chunksize is None:
+            chunks = iter([_loadtxt_c_parallel(first_line, fh, N, comments,
+                                               delimiter, usecols, threads)])
+        elif use_c:
+            chunks = _loadtxt_c_chunks(first_line, fh, N, comments, delimiter,
+                                       usecols, chunksize)
+        else:
+            # Parse each line, including the first
+            chunks = parse_lines(itertools.chain([first_line], fh))
+        if chunksize is None:
+            X = chunks.next()
+        complete = True
+    finally:
+        # The chunk iterator closes the file once it is done with it
+        if isstring and (chunksize is None or not complete):
+            fh.close()
 
-        # Parse each line, including the first
-        for i, line in enumerate(itertools.chain([first_line], fh)):
-            vals = split_line(line)
-            if len(vals) == 0:
-                continue
+    if chunksize is not None:
+        if not isstring:
+            fh = None
+        return _iter_chunks(chunks, pack, fh)
+    return pack(X)
 
-            if usecols:
-                vals = [vals[i] for i in usecols]
 
-            # Convert each value according to its column and store
-            X.append(tuple([conv(val) for (conv, val) in zip(converters, vals)]))
-    finally:
-        if isstring:
-            fh.close()
+_savetxt_spec = re.compile(r'%([-+ #0]*\d{0,3}(?:\.\d{0,2})?)([dieEfgG])')
 
-    if len(dtype_types) > 1:
-        # We're dealing with a structured array, with a dtype such as
-        # [('x', int), ('y', [('s', int), ('t', float)])]
-        #
-        # First, create the array using a flattened dtype:
-        # [('x', int), ('s', int), ('t', float)]
-        #
-        # Then, view the array using the specified dtype.
-        try:
-            X = np.array(X, dtype=np.dtype([('', t) for t in dtype_types]))
-            X = X.view(dtype)
-        except TypeError:
-            # In the case we have an object dtype
-            X = np.array(X, dtype=dtype)
+def _savetxt_columns(X):
+    """Return the columns of `X` as a list of 1-d arrays, or None if some
+    column cannot be formatted by `_format_rows`."""
+    if X.dtype.names is None:
+        if X.ndim != 2:
+            return None
+        columns = [X[:, j] for j in range(X.shape[1])]
     else:
-        X = np.array(X, dtype)
+        if X.ndim != 1:
+            return None
+        columns = [X[name] for name in X.dtype.names]
+    for column in columns:
+        dt = column.dtype
+        if column.ndim != 1 or not (dt.kind in 'bi' or
+                                    (dt.kind == 'u' and dt.itemsize < 8) or
+                                    (dt.kind == 'f' and dt.itemsize <= 8)):
+            return None
+    return columns
+
+
+def _savetxt_blocks(X, format, newline, blocksize=2**16):
+    """Yield the rows of `X` formatted with `format` in blocks of text.
+
+    The rows are formatted by the compiled `_format_rows` when `format` only
+    holds simple numeric conversions and the columns of `X` are numeric;
+    otherwise, or for the blocks whose values the compiled formatter cannot
+    render exactly as Python does, this falls back to ``format % row``.
 
-    X = np.squeeze(X)
-    if unpack:
-        return X.T
-    else:
-        return X
+    """
+    def slow(rows):
+        return ''.join([format % tuple(row) + newline for row in rows])
+
+    columns = _savetxt_columns(X)
+    specs = _savetxt_spec.findall(format)
+    literals = _savetxt_spec.split(format)[::3]
+    if not columns or len(specs) != len(columns) or \
+       '%' in ''.join(literals) or \
+       [1 for (spec, conv) in specs if '#' in spec and conv in 'di']:
+        for i in range(0, len(X), blocksize):
+            yield slow(X[i:i + blocksize])
+        return
+
+    literals[-1] += newline
+    literals = tuple([asbytes(lit) for lit in literals])
+    convs = asbytes(''.join([conv for (spec, conv) in specs]))
+    specs = tuple([asbytes('%' + spec) for (spec, conv) in specs])
+    blocksize = max(blocksize // len(columns), 1)
+    fast = None
+    for i in range(0, len(X), blocksize):
+        text = None
+        if fast is not False:
+            block = tuple([np.require(col[i:i + blocksize],
+                                      (col.dtype.kind == 'f' and np.float64
+                                       or np.longlong), ['C', 'A'])
+                           for col in columns])
+            text = _format_rows(block, specs, convs, literals)
+        if fast is None and text is not None:
+            # Make sure that we agree with Python on the first row
+            fast = text.startswith(asbytes(slow(X[:1])))
+            if not fast:
+                text = None
+        if text is None:
+            text = slow(X[i:i + blocksize])
+        yield text
 
 
 def savetxt(fname, X, fmt='%.18e', delimiter=' ', newline='\n'):
@@ -778,6 +1591,11 @@ def savetxt(fname, X, fmt='%.18e', delimiter=' ', newline='\n'):
     This explanation of ``fmt`` is not complete, for an exhaustive
     specification see [1]_.
 
+    When the columns of `X` are numeric and `fmt` only uses the ``d``,
+    ``i``, ``e``, ``E``, ``f``, ``g`` and ``G`` specifiers, the rows are
+    formatted by compiled code, which is much faster than formatting them
+    one at a time in Python but produces the same text.
+
     References
     ----------
     .. [1] `Format Specification Mini-Language
@@ -843,10 +1661,9 @@ def savetxt(fname, X, fmt='%.18e', delimiter=' ', newline='\n'):
         else:
             format = fmt
 
-    for row in X:
-        fh.write(asbytes(format % tuple(row) + newline))
+    for text in _savetxt_blocks(X, format, newline):
+        fh.write(asbytes(text))
 
-import re
 def fromregex(file, regexp, dtype):
     """
     Construct an array from a text file, using regular expression parsing.
@@ -937,7 +1754,8 @@ def genfromtxt(fname, dtype=float, comments='#', delimiter=None,
                usecols=None, names=None,
                excludelist=None, deletechars=None, replace_space='_',
                autostrip=False, case_sensitive=True, defaultfmt="f%i",
-               unpack=None, usemask=False, loose=True, invalid_raise=True):
+               unpack=None, usemask=False, loose=True, invalid_raise=True,
+               chunksize=None):
     """
     Load data from a text file, with missing values handled as specified.
 
@@ -1009,12 +1827,22 @@ def genfromtxt(fname, dtype=float, comments='#', delimiter=None,
         If True, an exception is raised if an inconsistency is detected in the
         number of columns.
         If False, a warning is emitted and the offending lines are skipped.
+    chunksize : int, optional
+        If given, return an iterator over successive arrays of `chunksize`
+        rows (the last one may be shorter) instead of a single array.  The
+        dtype is guessed from the first chunk only and then kept for all the
+        following ones: values that do not fit it are processed as
+        invalid values of that type, and strings are truncated to the
+        length found in the first chunk.
+
+        .. versionadded:: 2.0
 
     Returns
     -------
-    out : ndarray
+    out : ndarray or iterator
         Data read from the text file. If `usemask` is True, this is a
-        masked array.
+        masked array.  If `chunksize` is given, an iterator over chunks of
+        the data.
 
     See Also
     --------
@@ -1084,6 +1912,8 @@ def genfromtxt(fname, dtype=float, comments='#', delimiter=None,
     #
     if usemask:
         from numpy.ma import MaskedArray, make_mask_descr
+    if chunksize is not None and chunksize < 1:
+        raise ValueError("chunksize must be a positive integer")
     # Check the input dictionary of converters
     user_converters = converters or {}
     if not isinstance(user_converters, dict):
@@ -1331,34 +2161,82 @@ def genfromtxt(fname, dtype=float, comments='#', delimiter=None,
     invalid = []
     append_to_invalid = invalid.append
 
-    # Parse each line
-    for (i, line) in enumerate(itertools.chain([first_line, ], fhd)):
-        values = split_line(line)
-        nbvalues = len(values)
-        # Skip an empty line
-        if nbvalues == 0:
-            continue
-        # Select only the columns we need
-        if usecols:
-            try:
-                values = [values[_] for _ in usecols]
-            except IndexError:
+    def split_rows(lines):
+        "Yield the values of the valid lines, storing the invalid ones."
+        for (i, line) in enumerate(lines):
+            values = split_line(line)
+            nbvalues = len(values)
+            # Skip an empty line
+            if nbvalues == 0:
+                continue
+            # Select only the columns we need
+            if usecols:
+                try:
+                    values = [values[_] for _ in usecols]
+                except IndexError:
+                    append_to_invalid((i, nbvalues))
+                    continue
+            elif nbvalues != nbcols:
                 append_to_invalid((i, nbvalues))
                 continue
-        elif nbvalues != nbcols:
-            append_to_invalid((i, nbvalues))
-            continue
+            yield values
+
+    def mask_row(values):
+        "Flag the missing values of a row."
+        return tuple([v.strip() in m for (v, m) in zip(values, missing_values)])
+
+    def check_invalid(nbrows, footer):
+        "Report the invalid lines found so far, and forget them."
+        if len(invalid) > 0:
+            # Construct the error message
+            template = "    Line #%%i (got %%i columns instead of %i)" % nbcols
+            if footer > 0:
+                nbrows -= footer
+                errmsg = [template % (i + skip_header + 1, nb)
+                          for (i, nb) in invalid if i < nbrows]
+            else:
+                errmsg = [template % (i + skip_header + 1, nb)
+                          for (i, nb) in invalid]
+            del invalid[:]
+            if len(errmsg):
+                errmsg.insert(0, "Some errors were detected !")
+                errmsg = "\n".join(errmsg)
+                # Raise an exception ?
+                if invalid_raise:
+                    raise ValueError(errmsg)
+                # Issue a warning ?
+                else:
+                    warnings.warn(errmsg, ConversionWarning)
+
+    # Parse each line (in chunk mode, only the first chunk, plus the lines
+    # that could belong to the footer)
+    rowgen = split_rows(itertools.chain([first_line, ], fhd))
+    if chunksize is None:
+        lines = rowgen
+    else:
+        lines = itertools.islice(rowgen, chunksize + skip_footer)
+    for values in lines:
         # Store the values
         append_to_rows(tuple(values))
         if usemask:
-            append_to_masks(tuple([v.strip() in m
-                                   for (v, m) in zip(values, missing_values)]))
+            append_to_masks(mask_row(values))
+
+    # In chunk mode, keep the rows that follow the first chunk for later
+    footer = skip_footer
+    pending_rows = pending_masks = None
+    if (chunksize is not None) and (len(rows) == chunksize + skip_footer):
+        pending_rows = rows[chunksize:]
+        del rows[chunksize:]
+        if usemask:
+            pending_masks = masks[chunksize:]
+            del masks[chunksize:]
+        footer = 0
 
     # Strip the last skip_footer data
-    if skip_footer > 0:
-        rows = rows[:-skip_footer]
+    if footer > 0:
+        rows = rows[:-footer]
         if usemask:
-            masks = masks[:-skip_footer]
+            masks = masks[:-footer]
 
     # Upgrade the converters (if needed)
     if dtype is None:
@@ -1378,26 +2256,7 @@ def genfromtxt(fname, dtype=float, comments='#', delimiter=None,
                         raise ConverterError(errmsg)
 
     # Check that we don't have invalid values
-    if len(invalid) > 0:
-        nbrows = len(rows)
-        # Construct the error message
-        template = "    Line #%%i (got %%i columns instead of %i)" % nbcols
-        if skip_footer > 0:
-            nbrows -= skip_footer
-            errmsg = [template % (i + skip_header + 1, nb)
-                      for (i, nb) in invalid if i < nbrows]
-        else:
-            errmsg = [template % (i + skip_header + 1, nb)
-                      for (i, nb) in invalid]
-        if len(errmsg):
-            errmsg.insert(0, "Some errors were detected !")
-            errmsg = "\n".join(errmsg)
-            # Raise an exception ?
-            if invalid_raise:
-                raise ValueError(errmsg)
-            # Issue a warning ?
-            else:
-                warnings.warn(errmsg, ConversionWarning)
+    check_invalid(len(rows), footer)
 
     # Convert each value according to the converter:
     # We want to modify the list in place to avoid creating a new one...
@@ -1408,12 +2267,8 @@ def genfromtxt(fname, dtype=float, comments='#', delimiter=None,
 #    for (i, vals) in enumerate(rows):
 #        rows[i] = tuple([convert(val)
 #                         for (convert, val) in zip(conversionfuncs, vals)])
-    if loose:
-        rows = zip(*[map(converter._loose_call, map(itemgetter(i), rows))
-                     for (i, converter) in enumerate(converters)])
-    else:
-        rows = zip(*[map(converter._strict_call, map(itemgetter(i), rows))
-                     for (i, converter) in enumerate(converters)])
+    rows = zip(*[converter.iterconvert(map(itemgetter(i), rows), loose)
+                 for (i, converter) in enumerate(converters)])
     # Reset the dtype
     data = rows
     if dtype is None:
@@ -1502,21 +2357,77 @@ def genfromtxt(fname, dtype=float, comments='#', delimiter=None,
                 else:
                     mdtype = np.bool
                 outputmask = np.array(masks, dtype=mdtype)
-    # Try to take care of the missing data we missed
-    names = output.dtype.names
-    if usemask and names:
-        for (name, conv) in zip(names or (), converters):
-            missing_values = [conv(_) for _ in conv.missing_values
-                              if _ != asbytes('')]
-            for mval in missing_values:
-                outputmask[name] |= (output[name] == mval)
-    # Construct the final array
-    if usemask:
-        output = output.view(MaskedArray)
-        output._mask = outputmask
-    if unpack:
-        return output.squeeze().T
-    return output.squeeze()
+    def finalize(output, outputmask):
+        "Mask the missing data we missed and squeeze the output."
+        names = output.dtype.names
+        if usemask and names:
+            for (name, conv) in zip(names or (), converters):
+                mvals = [conv(_) for _ in conv.missing_values
+                         if _ != asbytes('')]
+                for mval in mvals:
+                    outputmask[name] |= (output[name] == mval)
+        # Construct the final array
+        if usemask:
+            output = output.view(MaskedArray)
+            output._mask = outputmask
+        if chunksize is None:
+            output = output.squeeze()
+        else:
+            output = _squeeze_chunk(output)
+        if unpack:
+            return output.T
+        return output
+
+    if not usemask:
+        outputmask = None
+    if chunksize is None:
+        return finalize(output, outputmask)
+
+    # The dtypes of the first chunk are used for all the following ones
+    def convert_chunk(rows, masks):
+        "Convert a list of rows with the dtype of the first chunk."
+        check_invalid(len(rows), 0)
+        data = zip(*[conv.iterconvert(map(itemgetter(i), rows), loose)
+                     for (i, conv) in enumerate(converters)])
+        chunk = np.array(data, dtype=output.dtype)
+        chunkmask = None
+        if usemask:
+            chunkmask = np.array(masks, dtype=outputmask.dtype)
+        return finalize(chunk, chunkmask)
+
+    def iter_chunks(first):
+        """Yield the first chunk, then convert and yield the following ones.
+        A file opened by genfromtxt is closed when the iteration ends, fails
+        or is abandoned."""
+        try:
+            yield first
+            if pending_rows is not None:
+                (rows, masks) = (pending_rows, pending_masks)
+                for values in rowgen:
+                    rows.append(tuple(values))
+                    if usemask:
+                        masks.append(mask_row(values))
+                    if len(rows) == chunksize + skip_footer:
+                        if usemask:
+                            chunk = convert_chunk(rows[:chunksize],
+                                                  masks[:chunksize])
+                            del masks[:chunksize]
+                        else:
+                            chunk = convert_chunk(rows[:chunksize], None)
+                        del rows[:chunksize]
+                        yield chunk
+                # Strip the last skip_footer data
+                if skip_footer > 0:
+                    rows = rows[:-skip_footer]
+                    if usemask:
+                        masks = masks[:-skip_footer]
+                if rows:
+                    yield convert_chunk(rows, masks)
+        finally:
+            if isinstance(fname, basestring):
+                fhd.close()
+
+    return iter_chunks(finalize(output, outputmask))
 
 
 
@@ -1576,10 +2487,12 @@ def recfromtxt(fname, **kwargs):
     output = genfromtxt(fname, **kwargs)
     if usemask:
         from numpy.ma.mrecords import MaskedRecords
-        output = output.view(MaskedRecords)
+        rectype = MaskedRecords
     else:
-        output = output.view(np.recarray)
-    return output
+        rectype = np.recarray
+    if kwargs.get('chunksize') is not None:
+        return (chunk.view(rectype) for chunk in output)
+    return output.view(rectype)
 
 
 def recfromcsv(fname, **kwargs):
@@ -1609,7 +2522,9 @@ def recfromcsv(fname, **kwargs):
     output = genfromtxt(fname, **kwargs)
     if usemask:
         from numpy.ma.mrecords import MaskedRecords
-        output = output.view(MaskedRecords)
+        rectype = MaskedRecords
     else:
-        output = output.view(np.recarray)
-    return output
+        rectype = np.recarray
+    if kwargs.get('chunksize') is not None:
+        return (chunk.view(rectype) for chunk in output)
+    return output.view(rectype)
@@ -86,6 +86,285 @@ mnx (intp *i , intp len)
     return mn;
 }
 
+#if defined(WITH_THREAD) && defined(HAVE_PTHREAD_H) && NPY_ALLOW_THREADS
+#define NPY_COUNT_THREADS
+#include <pthread.h>
+#endif
+
+/* The upper limit of numpy.setnumthreads */
+#define COUNT_MAXTHREADS 256
+
+/*
+ * Counting of items into bins, shared by bincount and the histograms.
+ *
+ * Large inputs are cut into pieces that are counted concurrently, each
+ * into bins of its own that are added up at the end.  The number of
+ * pieces follows numpy.setnumthreads and numpy.setthreadthreshold.
+ */
+
+typedef struct {
+    /*
+     * The bin of each item, which must be in range, or NULL to look the
+     * items x up in edges
+     */
+    const intp *bin;
+    const double *x;
+    /* nbins + 1 increasing bin edges and nbins/(last - first edge) */
+    const double *edges;
+    double scale;
+    /*
+     * The weights of the items, or NULL to count them.  Integer weights
+     * are given in lweights instead and added exactly, modulo 2**64.
+     */
+    const double *weights;
+    const npy_longlong *lweights;
+    intp n, nbins;
+    /* The intp counts or double or longlong sums of the bins of each piece */
+    char *out;
+    int npieces;
+} count_job;
+
+/*
+ * The bin of x between the nbins + 1 increasing edges, or -1 if x is out
+ * of range or NaN.  The bins are half open, except the last one which
+ * includes its right edge.  The bin is first guessed as if the bins had
+ * the same width, and only searched for if the guess is wrong.
+ */
+static NPY_INLINE intp
+find_bin(double x, const double *edges, intp nbins, double scale)
+{
+    intp lo, hi, mid;
+
+    if (!(x >= edges[0] && x <= edges[nbins])) {
+        return -1;
+    }
+    mid = (intp)((x - edges[0])*scale);
+    if (mid >= nbins) {
+        mid = nbins - 1;
+    }
+    if (edges[mid] <= x && (mid == nbins - 1 || x < edges[mid + 1])) {
+        return mid;
+    }
+    /* The last bin whose left edge is not above x */
+    lo = 0;
+    hi = nbins - 1;
+    while (lo < hi) {
+        mid = lo + (hi - lo + 1)/2;
+        if (edges[mid] <= x) {
+            lo = mid;
+        }
+        else {
+            hi = mid - 1;
+        }
+    }
+    return lo;
+}
+
+/* The scale argument of find_bin */
+static double
+bin_scale(const double *edges, intp nbins)
+{
+    if (edges[nbins] > edges[0]) {
+        return nbins/(edges[nbins] - edges[0]);
+    }
+    return 0;
+}
+
+/* Count piece k of the items of job into its own bins */
+static void
+count_piece(count_job *job, int k)
+{
+    intp chunk = job->n/job->npieces, rest = job->n % job->npieces;
+    intp start = k*chunk + (k < rest ? k : rest);
+    intp stop = start + chunk + (k < rest ? 1 : 0);
+    intp *count = (intp *)job->out + k*job->nbins;
+    double *sum = (double *)job->out + k*job->nbins;
+    npy_ulonglong *lsum = (npy_ulonglong *)job->out + k*job->nbins;
+    const intp *bin = job->bin;
+    const double *x = job->x, *weights = job->weights;
+    const npy_longlong *lweights = job->lweights;
+    intp i, b;
+
+    if (lweights != NULL) {
+        /* Unsigned sums wrap around instead of overflowing */
+        for (i = start; i < stop; i++) {
+            if (bin != NULL) {
+                b = bin[i];
+            }
+            else {
+                b = find_bin(x[i], job->edges, job->nbins, job->scale);
+            }
+            if (b >= 0) {
+                lsum[b] += (npy_ulonglong)lweights[i];
+            }
+        }
+    }
+    else if (bin != NULL && weights == NULL) {
+        for (i = start; i < stop; i++) {
+            count[bin[i]]++;
+        }
+    }
+    else if (bin != NULL) {
+        for (i = start; i < stop; i++) {
+            sum[bin[i]] += weights[i];
+        }
+    }
+    else if (weights == NULL) {
+        for (i = start; i < stop; i++) {
+            b = find_bin(x[i], job->edges, job->nbins, job->scale);
+            if (b >= 0) {
+                count[b]++;
+            }
+        }
+    }
+    else {
+        for (i = start; i < stop; i++) {
+            b = find_bin(x[i], job->edges, job->nbins, job->scale);
+            if (b >= 0) {
+                sum[b] += weights[i];
+            }
+        }
+    }
+}
+
+/*
+ * The number of pieces to count n items into nbins bins in.  Each piece
+ * needs bins of its own, so there are no more pieces than n/nbins.
+ */
+static int
+count_threads(intp n, intp nbins)
+{
+#ifdef NPY_COUNT_THREADS
+    PyObject *umath, *ret;
+    int nthreads = 1;
+    Py_ssize_t threshold = 0;
+
+    umath = PyImport_ImportModule("numpy.core.umath");
+    if (umath == NULL) {
+        PyErr_Clear();
+        return 1;
+    }
+    ret = PyObject_CallMethod(umath, "getthreads", NULL);
+    Py_DECREF(umath);
+    if (ret == NULL || !PyArg_ParseTuple(ret, "in", &nthreads, &threshold)) {
+        PyErr_Clear();
+        Py_XDECREF(ret);
+        return 1;
+    }
+    Py_DECREF(ret);
+    if (nthreads <= 1 || n < (intp)threshold) {
+        return 1;
+    }
+    if (nthreads > COUNT_MAXTHREADS) {
+        nthreads = COUNT_MAXTHREADS;
+    }
+    if (nbins > 0 && n/nbins < nthreads) {
+        nthreads = (int)(n/nbins);
+    }
+    return (nthreads < 1) ? 1 : nthreads;
+#else
+    return 1;
+#endif
+}
+
+#ifdef NPY_COUNT_THREADS
+typedef struct {
+    count_job *job;
+    int k;
+} count_arg;
+
+static void *
+count_thread(void *arg)
+{
+    count_piece(((count_arg *)arg)->job, ((count_arg *)arg)->k);
+    return NULL;
+}
+#endif
+
+/*
+ * Add the items of job to the nbins zeroed bins at out, in job->npieces
+ * pieces.  Must be called without the GIL.  Returns -1 if out of memory.
+ */
+static int
+count_run(count_job *job, char *out)
+{
+    int npieces = job->npieces, k;
+    size_t elsize;
+    intp i;
+
+    if (job->lweights != NULL) {
+        elsize = sizeof(npy_ulonglong);
+    }
+    else if (job->weights != NULL) {
+        elsize = sizeof(double);
+    }
+    else {
+        elsize = sizeof(intp);
+    }
+
+    if (npieces <= 1) {
+        job->out = out;
+        count_piece(job, 0);
+        return 0;
+    }
+    job->out = (char *)PyDataMem_NEW(npieces*job->nbins*elsize);
+    if (job->out == NULL) {
+        return -1;
+    }
+    memset(job->out, 0, npieces*job->nbins*elsize);
+#ifdef NPY_COUNT_THREADS
+    {
+        pthread_t threads[COUNT_MAXTHREADS];
+        count_arg args[COUNT_MAXTHREADS];
+        int started[COUNT_MAXTHREADS];
+
+        for (k = 1; k < npieces; k++) {
+            args[k].job = job;
+            args[k].k = k;
+            started[k] = pthread_create(&threads[k], NULL,
+                    count_thread, &args[k]) == 0;
+        }
+        count_piece(job, 0);
+        for (k = 1; k < npieces; k++) {
+            if (started[k]) {
+                pthread_join(threads[k], NULL);
+            }
+            else {
+                count_piece(job, k);
+            }
+        }
+    }
+#else
+    for (k = 0; k < npieces; k++) {
+        count_piece(job, k);
+    }
+#endif
+    for (k = 0; k < npieces; k++) {
+        if (job->lweights != NULL) {
+            npy_ulonglong *lsum = (npy_ulonglong *)job->out + k*job->nbins;
+
+            for (i = 0; i < job->nbins; i++) {
+                ((npy_ulonglong *)out)[i] += lsum[i];
+            }
+        }
+        else if (job->weights == NULL) {
+            intp *count = (intp *)job->out + k*job->nbins;
+
+            for (i = 0; i < job->nbins; i++) {
+                ((intp *)out)[i] += count[i];
+            }
+        }
+        else {
+            double *sum = (double *)job->out + k*job->nbins;
+
+            for (i = 0; i < job->nbins; i++) {
+                ((double *)out)[i] += sum[i];
+            }
+        }
+    }
+    PyDataMem_FREE(job->out);
+    return 0;
+}
 
 /*
  * arr_bincount is registered as bincount.
@@ -104,10 +383,11 @@ arr_bincount(PyObject *NPY_UNUSED(self), PyObject *args, PyObject *kwds)
     PyArray_Descr *type;
     PyObject *list = NULL, *weight=Py_None;
     PyObject *lst=NULL, *ans=NULL, *wts=NULL;
-    intp *numbers, *ians, len , mxi, mni, ans_size;
-    int i;
-    double *weights , *dans;
+    intp *numbers, len , mxi, mni, ans_size;
+    int nomem;
+    count_job job;
     static char *kwlist[] = {"list", "weights", NULL};
+    NPY_BEGIN_THREADS_DEF;
 
     if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|O",
                 kwlist, &list, &weight)) {
@@ -131,37 +411,42 @@ arr_bincount(PyObject *NPY_UNUSED(self), PyObject *args, PyObject *kwds)
         goto fail;
     }
     ans_size = numbers [mxi] + 1;
-    type = PyArray_DescrFromType(PyArray_INTP);
+    job.bin = numbers;
+    job.weights = NULL;
+    job.lweights = NULL;
+    job.n = len;
+    job.nbins = ans_size;
     if (weight == Py_None) {
+        type = PyArray_DescrFromType(PyArray_INTP);
         if (!(ans = PyArray_Zeros(1, &ans_size, type, 0))) {
             goto fail;
         }
-        ians = (intp *)(PyArray_DATA(ans));
-        for (i = 0; i < len; i++)
-            ians [numbers [i]] += 1;
-        Py_DECREF(lst);
     }
     else {
         if (!(wts = PyArray_ContiguousFromAny(weight, PyArray_DOUBLE, 1, 1))) {
             goto fail;
         }
-        weights = (double *)PyArray_DATA (wts);
         if (PyArray_SIZE(wts) != len) {
             PyErr_SetString(PyExc_ValueError,
                     "The weights and list don't have the same length.");
             goto fail;
         }
+        job.weights = (double *)PyArray_DATA(wts);
         type = PyArray_DescrFromType(PyArray_DOUBLE);
         if (!(ans = PyArray_Zeros(1, &ans_size, type, 0))) {
             goto fail;
         }
-        dans = (double *)PyArray_DATA (ans);
-        for (i = 0; i < len; i++) {
-            dans[numbers[i]] += weights[i];
-        }
-        Py_DECREF(lst);
-        Py_DECREF(wts);
     }
+    job.npieces = count_threads(len, ans_size);
+    NPY_BEGIN_THREADS;
+    nomem = count_run(&job, PyArray_DATA(ans));
+    NPY_END_THREADS;
+    if (nomem < 0) {
+        PyErr_NoMemory();
+        goto fail;
+    }
+    Py_DECREF(lst);
+    Py_XDECREF(wts);
     return ans;
 
 fail:
@@ -260,6 +545,198 @@ fail:
 }
 
 
+/*
+ * Convert obins to the increasing edges of at least one bin; returns a
+ * new reference, or NULL with an exception set.
+ */
+static PyArrayObject *
+bin_edges(PyObject *obins)
+{
+    PyArrayObject *abins;
+    double *edges;
+    intp i, n;
+
+    abins = (PyArrayObject *)PyArray_ContiguousFromAny(obins,
+            PyArray_DOUBLE, 1, 1);
+    if (abins == NULL) {
+        return NULL;
+    }
+    n = PyArray_SIZE(abins);
+    edges = (double *)PyArray_DATA(abins);
+    if (n < 2) {
+        PyErr_SetString(PyExc_ValueError,
+                "there must be at least two bin edges");
+        Py_DECREF(abins);
+        return NULL;
+    }
+    for (i = 0; i < n - 1; i++) {
+        if (!(edges[i] <= edges[i + 1])) {
+            PyErr_SetString(PyExc_ValueError,
+                    "bins must increase monotonically");
+            Py_DECREF(abins);
+            return NULL;
+        }
+    }
+    return abins;
+}
+
+/*
+ * _histogram(a, bins, weights=None)
+ *
+ * Count the elements of a, or sum their weights, in the bins between the
+ * increasing edges bins in one pass.  The bins are half open except the
+ * last one; elements out of range and NaNs are left out.  Integer and
+ * bool weights are summed exactly into a longlong array, others into a
+ * double array.
+ */
+static PyObject *
+arr_histogram(PyObject *NPY_UNUSED(self), PyObject *args, PyObject *kwds)
+{
+    PyObject *oa, *obins, *oweights = Py_None;
+    PyArrayObject *aa = NULL, *abins = NULL, *aweights = NULL;
+    PyArrayObject *ret = NULL;
+    count_job job;
+    int nomem, rettype;
+    static char *kwlist[] = {"a", "bins", "weights", NULL};
+    NPY_BEGIN_THREADS_DEF;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "OO|O", kwlist,
+                &oa, &obins, &oweights)) {
+        return NULL;
+    }
+    aa = (PyArrayObject *)PyArray_ContiguousFromAny(oa, PyArray_DOUBLE, 0, 0);
+    if (aa == NULL) {
+        return NULL;
+    }
+    if ((abins = bin_edges(obins)) == NULL) {
+        goto fail;
+    }
+    job.bin = NULL;
+    job.x = (double *)PyArray_DATA(aa);
+    job.n = PyArray_SIZE(aa);
+    job.edges = (double *)PyArray_DATA(abins);
+    job.nbins = PyArray_SIZE(abins) - 1;
+    job.scale = bin_scale(job.edges, job.nbins);
+    job.weights = NULL;
+    job.lweights = NULL;
+    rettype = PyArray_INTP;
+    if (oweights != Py_None) {
+        rettype = PyArray_DOUBLE;
+        if (PyArray_Check(oweights) &&
+                (PyArray_ISINTEGER((PyArrayObject *)oweights) ||
+                 PyArray_ISBOOL((PyArrayObject *)oweights))) {
+            rettype = PyArray_LONGLONG;
+        }
+        aweights = (PyArrayObject *)PyArray_FromAny(oweights,
+                PyArray_DescrFromType(rettype), 0, 0,
+                NPY_CARRAY | NPY_FORCECAST, NULL);
+        if (aweights == NULL) {
+            goto fail;
+        }
+        if (PyArray_SIZE(aweights) != job.n) {
+            PyErr_SetString(PyExc_ValueError,
+                    "weights should have the same size as a");
+            goto fail;
+        }
+        if (rettype == PyArray_LONGLONG) {
+            job.lweights = (npy_longlong *)PyArray_DATA(aweights);
+        }
+        else {
+            job.weights = (double *)PyArray_DATA(aweights);
+        }
+    }
+    ret = (PyArrayObject *)PyArray_Zeros(1, &job.nbins,
+            PyArray_DescrFromType(rettype), 0);
+    if (ret == NULL) {
+        goto fail;
+    }
+    job.npieces = count_threads(job.n, job.nbins);
+    NPY_BEGIN_THREADS;
+    nomem = count_run(&job, PyArray_DATA(ret));
+    NPY_END_THREADS;
+    if (nomem < 0) {
+        PyErr_NoMemory();
+        goto fail;
+    }
+
+    Py_DECREF(aa);
+    Py_DECREF(abins);
+    Py_XDECREF(aweights);
+    return (PyObject *)ret;
+
+fail:
+    Py_XDECREF(aa);
+    Py_XDECREF(abins);
+    Py_XDECREF(aweights);
+    Py_XDECREF(ret);
+    return NULL;
+}
+
+/*
+ * _bin_index(x, bins)
+ *
+ * Like digitize(x, bins) for increasing bins, except that the last bin
+ * includes its right edge: i + 1 for the elements of x in bin i, 0 for the
+ * ones below the first edge and len(bins) for the ones above the last edge
+ * and the NaNs.
+ */
+static PyObject *
+arr_bin_index(PyObject *NPY_UNUSED(self), PyObject *args, PyObject *kwds)
+{
+    PyObject *ox, *obins;
+    PyArrayObject *ax = NULL, *abins = NULL, *ret = NULL;
+    double *x, *edges, scale;
+    intp *index, i, n, nbins;
+    static char *kwlist[] = {"x", "bins", NULL};
+    NPY_BEGIN_THREADS_DEF;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "OO", kwlist,
+                &ox, &obins)) {
+        return NULL;
+    }
+    ax = (PyArrayObject *)PyArray_ContiguousFromAny(ox, PyArray_DOUBLE, 1, 1);
+    if (ax == NULL) {
+        return NULL;
+    }
+    if ((abins = bin_edges(obins)) == NULL) {
+        goto fail;
+    }
+    n = PyArray_SIZE(ax);
+    ret = (PyArrayObject *)PyArray_SimpleNew(1, &n, PyArray_INTP);
+    if (ret == NULL) {
+        goto fail;
+    }
+    x = (double *)PyArray_DATA(ax);
+    edges = (double *)PyArray_DATA(abins);
+    nbins = PyArray_SIZE(abins) - 1;
+    scale = bin_scale(edges, nbins);
+    index = (intp *)PyArray_DATA(ret);
+
+    NPY_BEGIN_THREADS;
+    for (i = 0; i < n; i++) {
+        if (x[i] < edges[0]) {
+            index[i] = 0;
+        }
+        else {
+            index[i] = find_bin(x[i], edges, nbins, scale) + 1;
+            if (index[i] == 0) {
+                index[i] = nbins + 1;
+            }
+        }
+    }
+    NPY_END_THREADS;
+
+    Py_DECREF(ax);
+    Py_DECREF(abins);
+    return (PyObject *)ret;
+
+fail:
+    Py_XDECREF(ax);
+    Py_XDECREF(abins);
+    Py_XDECREF(ret);
+    return NULL;
+}
+
 
 static char arr_insert__doc__[] = "Insert vals sequentially into equivalent 1-d positions indicated by mask.";
 
@@ -551,53 +1028,1111 @@ fail:
 
 
 
-static PyTypeObject *PyMemberDescr_TypePtr = NULL;
-static PyTypeObject *PyGetSetDescr_TypePtr = NULL;
-static PyTypeObject *PyMethodDescr_TypePtr = NULL;
+/*
+ * Hash tables used by the set operations of numpy.lib.arraysetops.
+ *
+ * The keys are the elements of a contiguous 1-d array of a boolean,
+ * integer, float or double type, held as their bit pattern in a 64-bit
+ * integer.  Floating point values compare by value like in the sort based
+ * implementations: -0.0 is stored as 0.0 and a NaN never matches anything,
+ * not even itself.  The tables use open addressing with linear probing and
+ * Fibonacci hashing, and are kept at most half full.
+ */
 
-/* Can only be called if doc is currently NULL */
-static PyObject *
-arr_add_docstring(PyObject *NPY_UNUSED(dummy), PyObject *args)
-{
-    PyObject *obj;
-    PyObject *str;
-    char *docstr;
-    static char *msg = "already has a docstring";
+#define SET_HASH_MULT 0x9E3779B97F4A7C15ULL
+#define SET_MINSIZE 64
 
-    /* Don't add docstrings */
-    if (Py_OptimizeFlag > 1) {
-        Py_INCREF(Py_None);
-        return Py_None;
+typedef struct {
+    npy_uint64 *keys;
+    /* The entry number stored in each slot, -1 for an empty slot */
+    intp *slots;
+    intp size, used;
+    int shift;
+} set_table;
+
+/*
+ * The key type of an array: its item size for the integer types, minus its
+ * item size for float and double, 0 when the array cannot be hashed.
+ */
+static int
+set_keytype(PyArrayObject *arr)
+{
+    if (!PyArray_ISNOTSWAPPED(arr)) {
+        return 0;
+    }
+    if (PyArray_ISBOOL(arr) || PyArray_ISINTEGER(arr)) {
+        switch (PyArray_ITEMSIZE(arr)) {
+            case 1:
+            case 2:
+            case 4:
+            case 8:
+                return PyArray_ITEMSIZE(arr);
+        }
     }
-#if defined(NPY_PY3K)
-    if (!PyArg_ParseTuple(args, "OO!", &obj, &PyUnicode_Type, &str)) {
-        return NULL;
+    else if (PyArray_TYPE(arr) == PyArray_FLOAT) {
+        return -(int)sizeof(npy_float);
     }
-
-    docstr = PyBytes_AS_STRING(PyUnicode_AsUTF8String(str));
-#else
-    if (!PyArg_ParseTuple(args, "OO!", &obj, &PyString_Type, &str)) {
-        return NULL;
+    else if (PyArray_TYPE(arr) == PyArray_DOUBLE) {
+        return -(int)sizeof(npy_double);
     }
+    return 0;
+}
 
-    docstr = PyString_AS_STRING(str);
-#endif
-
-#define _TESTDOC1(typebase) (obj->ob_type == &Py##typebase##_Type)
-#define _TESTDOC2(typebase) (obj->ob_type == Py##typebase##_TypePtr)
-#define _ADDDOC(typebase, doc, name) do {                               \
-        Py##typebase##Object *new = (Py##typebase##Object *)obj;        \
-        if (!(doc)) {                                                   \
-            doc = docstr;                                               \
-        }                                                               \
-        else {                                                          \
-            PyErr_Format(PyExc_RuntimeError, "%s method %s", name, msg); \
-            return NULL;                                                \
-        }                                                               \
-    } while (0)
+/* Store the key of the item at p in key; returns 0 for a NaN */
+static NPY_INLINE int
+set_key(const char *p, int keytype, npy_uint64 *key)
+{
+    switch (keytype) {
+        case 1:
+            *key = *(npy_uint8 *)p;
+            return 1;
+        case 2:
+            *key = *(npy_uint16 *)p;
+            return 1;
+        case 4:
+            *key = *(npy_uint32 *)p;
+            return 1;
+        case 8:
+            *key = *(npy_uint64 *)p;
+            return 1;
+        case -4: {
+            npy_float f = *(npy_float *)p;
+            npy_uint32 u;
+
+            if (f != f) {
+                return 0;
+            }
+            if (f == 0) {
+                f = 0;
+            }
+            memcpy(&u, &f, sizeof(u));
+            *key = u;
+            return 1;
+        }
+        default: {
+            npy_double d = *(npy_double *)p;
 
-    if (_TESTDOC1(CFunction)) {
-        _ADDDOC(CFunction, new->m_ml->ml_doc, new->m_ml->ml_name);
+            if (d != d) {
+                return 0;
+            }
+            if (d == 0) {
+                d = 0;
+            }
+            memcpy(key, &d, sizeof(*key));
+            return 1;
+        }
+    }
+}
+
+/* Allocate the arrays of a table of size slots; returns -1 on failure */
+static int
+set_table_alloc(set_table *t, intp size, int shift)
+{
+    intp i;
+
+    t->keys = (npy_uint64 *)PyDataMem_NEW(size*sizeof(npy_uint64));
+    t->slots = (intp *)PyDataMem_NEW(size*sizeof(intp));
+    if (t->keys == NULL || t->slots == NULL) {
+        PyDataMem_FREE(t->keys);
+        PyDataMem_FREE(t->slots);
+        return -1;
+    }
+    for (i = 0; i < size; i++) {
+        t->slots[i] = -1;
+    }
+    t->size = size;
+    t->shift = shift;
+    return 0;
+}
+
+/* Initialize an empty table with room for about n keys */
+static int
+set_table_init(set_table *t, intp n)
+{
+    intp size = SET_MINSIZE;
+    int shift = 64 - 6;
+
+    while (size < 2*n) {
+        size <<= 1;
+        shift--;
+    }
+    t->used = 0;
+    return set_table_alloc(t, size, shift);
+}
+
+static void
+set_table_free(set_table *t)
+{
+    PyDataMem_FREE(t->keys);
+    PyDataMem_FREE(t->slots);
+}
+
+/* The slot holding key, or the empty slot where it belongs */
+static NPY_INLINE intp
+set_table_find(set_table *t, npy_uint64 key)
+{
+    intp i = (intp)((key*SET_HASH_MULT) >> t->shift);
+
+    while (t->slots[i] >= 0 && t->keys[i] != key) {
+        i = (i + 1) & (t->size - 1);
+    }
+    return i;
+}
+
+/*
+ * Put key with entry number k in the empty slot i, doubling the size of
+ * the table when it gets half full.  Returns -1 if out of memory.
+ */
+static int
+set_table_insert(set_table *t, intp i, npy_uint64 key, intp k)
+{
+    set_table old = *t;
+    intp j;
+
+    t->keys[i] = key;
+    t->slots[i] = k;
+    if (2*(++t->used) <= t->size) {
+        return 0;
+    }
+    if (set_table_alloc(t, 2*old.size, old.shift - 1) < 0) {
+        *t = old;
+        return -1;
+    }
+    for (j = 0; j < old.size; j++) {
+        if (old.slots[j] >= 0) {
+            i = set_table_find(t, old.keys[j]);
+            t->keys[i] = old.keys[j];
+            t->slots[i] = old.slots[j];
+        }
+    }
+    set_table_free(&old);
+    return 0;
+}
+
+/*
+ * _unique_hash(ar, return_inverse, return_counts)
+ *
+ * Find the unique elements of the 1-d array ar.  Returns the tuple
+ * (first, inverse, counts): the index in ar of the first occurrence of
+ * each unique element in the order they appear, the unique element number
+ * of each element of ar and the number of occurrences of each unique
+ * element.  inverse and counts are None unless asked for.
+ */
+static PyObject *
+arr_unique_hash(PyObject *NPY_UNUSED(self), PyObject *args, PyObject *kwds)
+{
+    PyObject *obj, *ret;
+    PyArrayObject *ar = NULL, *inverse = NULL;
+    PyArrayObject *first = NULL, *counts = NULL;
+    int return_inverse = 0, return_counts = 0, keytype, nomem = 0;
+    intp *ifirst = NULL, *icounts = NULL, *iinverse = NULL;
+    intp i, n, k, s, nuniq = 0, cap;
+    npy_uint64 key;
+    set_table table;
+    char *data;
+    static char *kwlist[] = {"ar", "return_inverse", "return_counts", NULL};
+    NPY_BEGIN_THREADS_DEF;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|ii", kwlist,
+                &obj, &return_inverse, &return_counts)) {
+        return NULL;
+    }
+    ar = (PyArrayObject *)PyArray_ContiguousFromAny(obj, PyArray_NOTYPE, 1, 1);
+    if (ar == NULL) {
+        return NULL;
+    }
+    keytype = set_keytype(ar);
+    if (keytype == 0) {
+        PyErr_SetString(PyExc_TypeError,
+                "the array cannot be hashed, it must have a native "
+                "boolean, integer, float or double type");
+        goto fail;
+    }
+    n = PyArray_SIZE(ar);
+    data = PyArray_DATA(ar);
+    if (return_inverse) {
+        inverse = (PyArrayObject *)PyArray_SimpleNew(1, &n, PyArray_INTP);
+        if (inverse == NULL) {
+            goto fail;
+        }
+        iinverse = (intp *)PyArray_DATA(inverse);
+    }
+    cap = SET_MINSIZE;
+    ifirst = (intp *)PyDataMem_NEW(cap*sizeof(intp));
+    if (return_counts) {
+        icounts = (intp *)PyDataMem_NEW(cap*sizeof(intp));
+    }
+    if (ifirst == NULL || (return_counts && icounts == NULL)) {
+        PyErr_NoMemory();
+        goto fail;
+    }
+    if (set_table_init(&table, 0) < 0) {
+        PyErr_NoMemory();
+        goto fail;
+    }
+
+    NPY_BEGIN_THREADS;
+    for (i = 0; i < n; i++, data += PyArray_ITEMSIZE(ar)) {
+        if (set_key(data, keytype, &key)) {
+            s = set_table_find(&table, key);
+            k = table.slots[s];
+            if (k < 0) {
+                k = nuniq;
+                if (set_table_insert(&table, s, key, k) < 0) {
+                    nomem = 1;
+                    break;
+                }
+            }
+        }
+        else {
+            /* Every NaN is a unique element of its own */
+            k = nuniq;
+        }
+        if (k == nuniq) {
+            if (nuniq == cap) {
+                intp *tmp;
+
+                cap *= 2;
+                tmp = (intp *)PyDataMem_RENEW(ifirst, cap*sizeof(intp));
+                if (tmp == NULL) {
+                    nomem = 1;
+                    break;
+                }
+                ifirst = tmp;
+                if (return_counts) {
+                    tmp = (intp *)PyDataMem_RENEW(icounts, cap*sizeof(intp));
+                    if (tmp == NULL) {
+                        nomem = 1;
+                        break;
+                    }
+                    icounts = tmp;
+                }
+            }
+            ifirst[nuniq] = i;
+            if (return_counts) {
+                icounts[nuniq] = 0;
+            }
+            nuniq++;
+        }
+        if (return_counts) {
+            icounts[k]++;
+        }
+        if (return_inverse) {
+            iinverse[i] = k;
+        }
+    }
+    NPY_END_THREADS;
+    set_table_free(&table);
+    if (nomem) {
+        PyErr_NoMemory();
+        goto fail;
+    }
+
+    first = (PyArrayObject *)PyArray_SimpleNew(1, &nuniq, PyArray_INTP);
+    if (first == NULL) {
+        goto fail;
+    }
+    memcpy(PyArray_DATA(first), ifirst, nuniq*sizeof(intp));
+    if (return_counts) {
+        counts = (PyArrayObject *)PyArray_SimpleNew(1, &nuniq, PyArray_INTP);
+        if (counts == NULL) {
+            goto fail;
+        }
+        memcpy(PyArray_DATA(counts), icounts, nuniq*sizeof(intp));
+    }
+    PyDataMem_FREE(ifirst);
+    PyDataMem_FREE(icounts);
+    Py_DECREF(ar);
+    ret = Py_BuildValue("NOO", first,
+            inverse ? (PyObject *)inverse : Py_None,
+            counts ? (PyObject *)counts : Py_None);
+    Py_XDECREF(inverse);
+    Py_XDECREF(counts);
+    return ret;
+
+fail:
+    PyDataMem_FREE(ifirst);
+    PyDataMem_FREE(icounts);
+    Py_XDECREF(ar);
+    Py_XDECREF(inverse);
+    Py_XDECREF(first);
+    Py_XDECREF(counts);
+    return NULL;
+}
+
+/*
+ * _in1d_hash(ar1, ar2)
+ *
+ * Return a boolean array telling for each element of the 1-d array ar1
+ * whether it is in the 1-d array ar2.  Both arrays must have the same type.
+ */
+static PyObject *
+arr_in1d_hash(PyObject *NPY_UNUSED(self), PyObject *args, PyObject *kwds)
+{
+    PyObject *obj1, *obj2;
+    PyArrayObject *ar1 = NULL, *ar2 = NULL, *ret = NULL;
+    int keytype, nomem = 0;
+    intp i, n1, n2, s;
+    npy_uint64 key;
+    set_table table;
+    char *data;
+    npy_bool *found;
+    static char *kwlist[] = {"ar1", "ar2", NULL};
+    NPY_BEGIN_THREADS_DEF;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "OO", kwlist,
+                &obj1, &obj2)) {
+        return NULL;
+    }
+    ar1 = (PyArrayObject *)PyArray_ContiguousFromAny(obj1,
+            PyArray_NOTYPE, 1, 1);
+    if (ar1 == NULL) {
+        return NULL;
+    }
+    ar2 = (PyArrayObject *)PyArray_ContiguousFromAny(obj2,
+            PyArray_TYPE(ar1), 1, 1);
+    if (ar2 == NULL) {
+        goto fail;
+    }
+    keytype = set_keytype(ar1);
+    if (keytype == 0 || !PyArray_EquivArrTypes(ar1, ar2)) {
+        PyErr_SetString(PyExc_TypeError,
+                "the arrays cannot be hashed, they must have the same "
+                "native boolean, integer, float or double type");
+        goto fail;
+    }
+    n1 = PyArray_SIZE(ar1);
+    n2 = PyArray_SIZE(ar2);
+    ret = (PyArrayObject *)PyArray_SimpleNew(1, &n1, PyArray_BOOL);
+    if (ret == NULL) {
+        goto fail;
+    }
+    found = (npy_bool *)PyArray_DATA(ret);
+    if (set_table_init(&table, n2) < 0) {
+        PyErr_NoMemory();
+        goto fail;
+    }
+
+    NPY_BEGIN_THREADS;
+    data = PyArray_DATA(ar2);
+    for (i = 0; i < n2; i++, data += PyArray_ITEMSIZE(ar2)) {
+        if (set_key(data, keytype, &key)) {
+            s = set_table_find(&table, key);
+            if (table.slots[s] < 0 &&
+                    set_table_insert(&table, s, key, i) < 0) {
+                nomem = 1;
+                break;
+            }
+        }
+    }
+    data = PyArray_DATA(ar1);
+    for (i = 0; i < n1 && !nomem; i++, data += PyArray_ITEMSIZE(ar1)) {
+        found[i] = set_key(data, keytype, &key) &&
+                table.slots[set_table_find(&table, key)] >= 0;
+    }
+    NPY_END_THREADS;
+    set_table_free(&table);
+    if (nomem) {
+        PyErr_NoMemory();
+        goto fail;
+    }
+
+    Py_DECREF(ar1);
+    Py_DECREF(ar2);
+    return (PyObject *)ret;
+
+fail:
+    Py_XDECREF(ar1);
+    Py_XDECREF(ar2);
+    Py_XDECREF(ret);
+    return NULL;
+}
+
+
+
+/*
+ * Text tokenizer used by the compiled engine of numpy.loadtxt.
+ *
+ * The tokenizer does not touch any Python object, so that it can run with
+ * the GIL released when the numbers can be converted with the C library
+ * strtod, that is when it is known to round correctly and the current
+ * locale uses '.' as decimal point.  Otherwise they are converted with
+ * PyOS_string_to_double while holding the GIL.
+ */
+
+#if defined(__GLIBC__)
+#define TXT_HAVE_GOOD_STRTOD 1
+#include <locale.h>
+#endif
+
+/* The characters stripped by bytes.strip() and split on by bytes.split() */
+#define TXT_ISSPACE(c) ((c) == ' ' || (c) == '\t' || (c) == '\n' || \
+                        (c) == '\r' || (c) == '\v' || (c) == '\f')
+
+/* Status codes of txt_parse */
+enum {
+    TXT_OK = 0,
+    TXT_BAD_VALUE,
+    TXT_BAD_INDEX,
+    TXT_BAD_NCOLS,
+    TXT_NO_MEMORY
+};
+
+typedef struct {
+    /* The text to parse and the start of the next line to parse */
+    const char *buf, *bufend, *line;
+    /* The comment string and the delimiter (NULL for whitespace) */
+    const char *comments, *delim;
+    Py_ssize_t lcomments, ldelim;
+    /* The output rows of ncols doubles, and the next row to fill */
+    double *data;
+    intp nrows, ncols, row;
+    /* The columns to store, or NULL for the first ncols ones */
+    intp *usecols;
+    /* Whether the numbers are converted with strtod */
+    int use_strtod;
+    /* Scratch space: token start/end pairs and a copy of a token */
+    const char **tokens;
+    Py_ssize_t ntok, maxtok;
+    char *tmp;
+    Py_ssize_t ltmp;
+} txt_parser;
+
+/* Return a pointer to the first occurrence of sub in [s, end), or NULL */
+static const char *
+txt_find(const char *s, const char *end, const char *sub, Py_ssize_t lsub)
+{
+    if (lsub == 1) {
+        return memchr(s, sub[0], end - s);
+    }
+    for (; end - s >= lsub; s++) {
+        if (s[0] == sub[0] && memcmp(s, sub, lsub) == 0) {
+            return s;
+        }
+    }
+    return NULL;
+}
+
+/* Whether the GIL can be released around txt_parse */
+static int
+txt_can_use_strtod(void)
+{
+#if defined(TXT_HAVE_GOOD_STRTOD)
+    struct lconv *locale_data = localeconv();
+
+    return strcmp(locale_data->decimal_point, ".") == 0;
+#else
+    return 0;
+#endif
+}
+
+/*
+ * Convert the token [s, end) to a double with the same rules as
+ * float(token): surrounding whitespace is ignored and the whole
+ * remainder must be a valid number.  The stripped token is left in
+ * p->tmp, so that it can be reported in case of error.
+ */
+static int
+txt_to_double(txt_parser *p, const char *s, const char *end, double *result)
+{
+    char *endptr;
+    Py_ssize_t len;
+
+    while (s < end && TXT_ISSPACE(*s)) {
+        s++;
+    }
+    while (end > s && TXT_ISSPACE(end[-1])) {
+        end--;
+    }
+    len = end - s;
+    if (len + 1 > p->ltmp) {
+        char *new_tmp = realloc(p->tmp, len + 1);
+        if (new_tmp == NULL) {
+            return TXT_NO_MEMORY;
+        }
+        p->tmp = new_tmp;
+        p->ltmp = len + 1;
+    }
+    memcpy(p->tmp, s, len);
+    p->tmp[len] = '\0';
+    if (len == 0) {
+        return TXT_BAD_VALUE;
+    }
+#if defined(TXT_HAVE_GOOD_STRTOD)
+    if (p->use_strtod) {
+        /* strtod also accepts hexadecimal numbers and nan(...) */
+        if (strpbrk(p->tmp, "xX(") != NULL) {
+            return TXT_BAD_VALUE;
+        }
+        *result = strtod(p->tmp, &endptr);
+    }
+    else
+#endif
+    {
+#if PY_VERSION_HEX >= 0x02070000
+        *result = PyOS_string_to_double(p->tmp, &endptr, NULL);
+        if (*result == -1.0 && PyErr_Occurred()) {
+            PyErr_Clear();
+            endptr = p->tmp;
+        }
+#else
+        *result = PyOS_ascii_strtod(p->tmp, &endptr);
+#endif
+    }
+    if (endptr != p->tmp + len) {
+        return TXT_BAD_VALUE;
+    }
+    return TXT_OK;
+}
+
+/* Split the line [s, end) into p->tokens */
+static int
+txt_split(txt_parser *p, const char *s, const char *end)
+{
+    const char *q;
+
+    p->ntok = 0;
+    while (s <= end) {
+        if (p->delim == NULL) {
+            if (s == end) {
+                break;
+            }
+            for (q = s; q < end && !TXT_ISSPACE(*q); q++) {
+            }
+        }
+        else {
+            q = txt_find(s, end, p->delim, p->ldelim);
+            if (q == NULL) {
+                q = end;
+            }
+        }
+        if (2*(p->ntok + 1) > p->maxtok) {
+            const char **new_tokens;
+
+            p->maxtok = 2*p->maxtok + 32;
+            new_tokens = realloc((void *)p->tokens,
+                    p->maxtok*sizeof(char *));
+            if (new_tokens == NULL) {
+                return TXT_NO_MEMORY;
+            }
+            p->tokens = new_tokens;
+        }
+        p->tokens[2*p->ntok] = s;
+        p->tokens[2*p->ntok + 1] = q;
+        p->ntok++;
+        if (p->delim == NULL) {
+            for (s = q; s < end && TXT_ISSPACE(*s); s++) {
+            }
+        }
+        else {
+            s = q + p->ldelim;
+        }
+    }
+    return TXT_OK;
+}
+
+/*
+ * Parse the lines of p->buf from p->line on, until the end of the text or
+ * until the output is full.  On return p->line and p->row point to the
+ * first line not parsed and to the next row to fill.
+ */
+static int
+txt_parse(txt_parser *p)
+{
+    const char *eol, *s, *end;
+    intp j, k;
+    int status;
+
+    while (p->line < p->bufend && p->row < p->nrows) {
+        eol = memchr(p->line, '\n', p->bufend - p->line);
+        eol = (eol == NULL) ? p->bufend : eol + 1;
+
+        /* Chop off comments and strip */
+        end = NULL;
+        if (p->lcomments > 0) {
+            end = txt_find(p->line, eol, p->comments, p->lcomments);
+        }
+        if (end == NULL) {
+            end = eol;
+        }
+        s = p->line;
+        while (s < end && TXT_ISSPACE(*s)) {
+            s++;
+        }
+        while (end > s && TXT_ISSPACE(end[-1])) {
+            end--;
+        }
+        if (s == end) {
+            p->line = eol;
+            continue;
+        }
+
+        /* Split at the delimiter and convert the columns */
+        status = txt_split(p, s, end);
+        if (status != TXT_OK) {
+            return status;
+        }
+        for (j = 0; j < p->ncols; j++) {
+            if (p->usecols != NULL) {
+                k = p->usecols[j];
+                if (k < 0) {
+                    k += p->ntok;
+                }
+                if (k < 0 || k >= p->ntok) {
+                    return TXT_BAD_INDEX;
+                }
+            }
+            else {
+                k = j;
+                if (k >= p->ntok) {
+                    return TXT_BAD_NCOLS;
+                }
+            }
+            status = txt_to_double(p, p->tokens[2*k], p->tokens[2*k + 1],
+                    &p->data[p->row*p->ncols + j]);
+            if (status != TXT_OK) {
+                return status;
+            }
+        }
+        p->row++;
+        p->line = eol;
+    }
+    return TXT_OK;
+}
+
+/*
+ * arr_loadtxt_parse is registered as _loadtxt_parse.
+ *
+ * Tokenizes the lines of `block`, starting at byte `offset`, and stores
+ * the values of the selected columns as doubles in `out`, a C-contiguous
+ * 2-d double array, starting at row `row`.  Each line is cut at the first
+ * occurrence of `comments`, stripped and split at `delimiter` (any run of
+ * whitespace if None), exactly as loadtxt does in Python; blank lines are
+ * skipped.  The columns stored are `usecols` if given, else the first
+ * out.shape[1] values of the line.
+ *
+ * Parsing stops at the end of the block or when `out` is full, so the
+ * caller can grow `out` and resume.  Returns the tuple (row, offset) of
+ * the next row of `out` to fill and the byte offset of the first line of
+ * `block` that has not been parsed.
+ */
+static PyObject *
+arr_loadtxt_parse(PyObject *NPY_UNUSED(self), PyObject *args, PyObject *kwds)
+{
+    const char *buf, *comments, *delim = NULL;
+    int lbuf, lcomments, status;
+    Py_ssize_t ldelim = 0, offset;
+    PyObject *oout, *odelim = Py_None, *ousecols = Py_None, *ret = NULL;
+    PyArrayObject *usecols = NULL;
+    intp row;
+    txt_parser p;
+    static char *kwlist[] = {"block", "offset", "out", "row", "comments",
+                             "delimiter", "usecols", NULL};
+    NPY_BEGIN_THREADS_DEF;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "s#nO!ns#|OO", kwlist,
+                &buf, &lbuf, &offset, &PyArray_Type, &oout, &row,
+                &comments, &lcomments, &odelim, &ousecols)) {
+        return NULL;
+    }
+    if (PyArray_NDIM(oout) != 2 || PyArray_TYPE(oout) != NPY_DOUBLE ||
+            !PyArray_ISCARRAY(oout)) {
+        PyErr_SetString(PyExc_ValueError,
+                "out must be a writeable C-contiguous 2-d double array");
+        return NULL;
+    }
+    memset(&p, 0, sizeof(p));
+    p.nrows = PyArray_DIM(oout, 0);
+    p.ncols = PyArray_DIM(oout, 1);
+    if (offset < 0 || offset > lbuf || row < 0 || row > p.nrows) {
+        PyErr_SetString(PyExc_ValueError, "offset or row out of bounds");
+        return NULL;
+    }
+    if (odelim != Py_None) {
+        if (PyBytes_AsStringAndSize(odelim, (char **)&delim, &ldelim) < 0) {
+            return NULL;
+        }
+        if (ldelim == 0) {
+            PyErr_SetString(PyExc_ValueError, "empty separator");
+            return NULL;
+        }
+    }
+    if (ousecols != Py_None) {
+        usecols = (PyArrayObject *)PyArray_ContiguousFromAny(ousecols,
+                PyArray_INTP, 1, 1);
+        if (usecols == NULL) {
+            return NULL;
+        }
+        if (PyArray_SIZE(usecols) != p.ncols) {
+            PyErr_SetString(PyExc_ValueError,
+                    "usecols must have one entry per column of out");
+            Py_DECREF(usecols);
+            return NULL;
+        }
+        p.usecols = (intp *)PyArray_DATA(usecols);
+    }
+    p.buf = buf;
+    p.bufend = buf + lbuf;
+    p.line = buf + offset;
+    p.comments = comments;
+    p.lcomments = lcomments;
+    p.delim = delim;
+    p.ldelim = ldelim;
+    p.data = (double *)PyArray_DATA(oout);
+    p.row = row;
+    p.use_strtod = txt_can_use_strtod();
+
+    if (p.use_strtod) {
+        NPY_BEGIN_THREADS;
+        status = txt_parse(&p);
+        NPY_END_THREADS;
+    }
+    else {
+        status = txt_parse(&p);
+    }
+
+    switch (status) {
+        case TXT_OK:
+            ret = Py_BuildValue("(nn)", (Py_ssize_t)p.row,
+                    (Py_ssize_t)(p.line - buf));
+            break;
+        case TXT_BAD_VALUE:
+            PyErr_Format(PyExc_ValueError,
+                    "could not convert string to float: %s", p.tmp);
+            break;
+        case TXT_BAD_INDEX:
+            PyErr_SetString(PyExc_IndexError, "list index out of range");
+            break;
+        case TXT_BAD_NCOLS:
+            PyErr_Format(PyExc_ValueError,
+                    "wrong number of columns: expected %ld, got %ld",
+                    (long)p.ncols, (long)p.ntok);
+            break;
+        default:
+            PyErr_NoMemory();
+    }
+    free((void *)p.tokens);
+    free(p.tmp);
+    Py_XDECREF(usecols);
+    return ret;
+}
+
+
+/*
+ * Row formatter used by numpy.savetxt.
+ */
+
+/* A growable output buffer */
+typedef struct {
+    char *data;
+    Py_ssize_t len, size;
+} fmt_buffer;
+
+/* Make room for at least n more bytes; returns -1 if out of memory */
+static int
+fmt_reserve(fmt_buffer *buf, Py_ssize_t n)
+{
+    if (buf->len + n > buf->size) {
+        Py_ssize_t size = 2*buf->size + n;
+        char *data = realloc(buf->data, size);
+
+        if (data == NULL) {
+            return -1;
+        }
+        buf->data = data;
+        buf->size = size;
+    }
+    return 0;
+}
+
+/* The status codes of fmt_rows */
+enum {
+    FMT_OK = 0,
+    FMT_UNSUPPORTED,
+    FMT_NO_MEMORY
+};
+
+/*
+ * Format `nrows` rows of the `ncols` columns in `columns` (arrays of doubles
+ * or of long longs, as flagged by isint) with the printf formats `formats`
+ * into buf, each row being surrounded by the `literals`.  Integer formats
+ * are flagged by intconv.
+ */
+static int
+fmt_rows(fmt_buffer *buf, char **columns, int *isint, char **formats,
+         int *intconv, const char **literals, Py_ssize_t *lliterals,
+         intp ncols, intp nrows)
+{
+    intp i, j;
+    Py_ssize_t n;
+    npy_longlong lvalue = 0;
+    double dvalue = 0;
+
+    for (i = 0; i < nrows; i++) {
+        for (j = 0; j <= ncols; j++) {
+            if (fmt_reserve(buf, lliterals[j]) < 0) {
+                return FMT_NO_MEMORY;
+            }
+            memcpy(buf->data + buf->len, literals[j], lliterals[j]);
+            buf->len += lliterals[j];
+            if (j == ncols) {
+                break;
+            }
+            if (intconv[j]) {
+                if (isint[j]) {
+                    lvalue = ((npy_longlong *)columns[j])[i];
+                }
+                else {
+                    /* Truncate as int() does, if it fits */
+                    dvalue = ((double *)columns[j])[i];
+                    if (!(dvalue > -9.2e18 && dvalue < 9.2e18)) {
+                        return FMT_UNSUPPORTED;
+                    }
+                    lvalue = (npy_longlong)dvalue;
+                }
+            }
+            else {
+                if (isint[j]) {
+                    dvalue = (double)((npy_longlong *)columns[j])[i];
+                }
+                else {
+                    dvalue = ((double *)columns[j])[i];
+                }
+                /* Python does not print the sign of nans */
+                if (dvalue != dvalue) {
+                    dvalue = fabs(dvalue);
+                }
+#if PY_VERSION_HEX < 0x02070000
+                /* Older Pythons use %g for large numbers with %f */
+                if (!(dvalue > -1e50 && dvalue < 1e50)) {
+                    return FMT_UNSUPPORTED;
+                }
+#endif
+            }
+            if (fmt_reserve(buf, 32) < 0) {
+                return FMT_NO_MEMORY;
+            }
+            while (1) {
+                Py_ssize_t avail = buf->size - buf->len;
+
+                if (intconv[j]) {
+                    n = PyOS_snprintf(buf->data + buf->len, avail,
+                            formats[j], lvalue);
+                }
+                else {
+                    n = PyOS_snprintf(buf->data + buf->len, avail,
+                            formats[j], dvalue);
+                }
+                if (n < 0) {
+                    return FMT_UNSUPPORTED;
+                }
+                if (n < avail) {
+                    buf->len += n;
+                    break;
+                }
+                if (fmt_reserve(buf, n + 1) < 0) {
+                    return FMT_NO_MEMORY;
+                }
+            }
+        }
+    }
+    return FMT_OK;
+}
+
+/*
+ * arr_format_rows is registered as _format_rows.
+ *
+ * Formats a table given as a sequence of `columns`, 1-d contiguous arrays
+ * of equal length of long longs or doubles.  Each row is written as
+ * literals[0], column 0, literals[1], ..., column n-1, literals[n], where
+ * column i is formatted by printf with the format specs[i] + convs[i]:
+ * specs[i] holds the flags, width and precision (e.g. "%-10.3") and
+ * convs[i] is one of "dieEfFgG".  Integer conversions of doubles truncate
+ * them as int() does.
+ *
+ * Returns the formatted rows as bytes, or None if a value cannot be
+ * formatted exactly as Python would, in which case the caller should fall
+ * back to Python formatting.
+ */
+static PyObject *
+arr_format_rows(PyObject *NPY_UNUSED(self), PyObject *args)
+{
+    PyObject *ocolumns, *ospecs, *oliterals, *ret = NULL;
+    const char *convs;
+    int lconvs, status;
+    intp ncols, nrows = 0, j;
+    char **columns = NULL, **formats = NULL;
+    const char **literals = NULL;
+    Py_ssize_t *lliterals = NULL;
+    int *isint = NULL, *intconv = NULL;
+    fmt_buffer buf = {NULL, 0, 0};
+
+    if (!PyArg_ParseTuple(args, "O!O!s#O!", &PyTuple_Type, &ocolumns,
+                &PyTuple_Type, &ospecs, &convs, &lconvs,
+                &PyTuple_Type, &oliterals)) {
+        return NULL;
+    }
+    ncols = PyTuple_GET_SIZE(ocolumns);
+    if (PyTuple_GET_SIZE(ospecs) != ncols || lconvs != ncols ||
+            PyTuple_GET_SIZE(oliterals) != ncols + 1) {
+        PyErr_SetString(PyExc_ValueError,
+                "one spec and conversion per column and one more literal "
+                "are needed");
+        return NULL;
+    }
+
+    columns = calloc(ncols + 1, sizeof(char *));
+    formats = calloc(ncols + 1, sizeof(char *));
+    literals = calloc(ncols + 1, sizeof(char *));
+    lliterals = calloc(ncols + 1, sizeof(Py_ssize_t));
+    isint = calloc(ncols + 1, sizeof(int));
+    intconv = calloc(ncols + 1, sizeof(int));
+    if (columns == NULL || formats == NULL ||
+            literals == NULL || lliterals == NULL || isint == NULL ||
+            intconv == NULL) {
+        PyErr_NoMemory();
+        goto finish;
+    }
+
+    for (j = 0; j <= ncols; j++) {
+        if (PyBytes_AsStringAndSize(PyTuple_GET_ITEM(oliterals, j),
+                    (char **)&literals[j], &lliterals[j]) < 0) {
+            goto finish;
+        }
+    }
+    for (j = 0; j < ncols; j++) {
+        PyObject *column = PyTuple_GET_ITEM(ocolumns, j);
+        char *spec;
+        Py_ssize_t lspec;
+
+        if (!PyArray_Check(column) || PyArray_NDIM(column) != 1 ||
+                !PyArray_ISCARRAY_RO(column) || !PyArray_ISNOTSWAPPED(column) ||
+                (!PyArray_EquivTypenums(PyArray_TYPE(column), NPY_LONGLONG) &&
+                 !PyArray_EquivTypenums(PyArray_TYPE(column), NPY_DOUBLE))) {
+            PyErr_SetString(PyExc_ValueError, "columns must be contiguous "
+                    "1-d arrays of long longs or doubles");
+            goto finish;
+        }
+        if (j == 0) {
+            nrows = PyArray_DIM(column, 0);
+        }
+        else if (PyArray_DIM(column, 0) != nrows) {
+            PyErr_SetString(PyExc_ValueError,
+                    "columns must have the same length");
+            goto finish;
+        }
+        columns[j] = PyArray_DATA(column);
+        isint[j] = PyArray_EquivTypenums(PyArray_TYPE(column),
+                NPY_LONGLONG);
+
+        if (PyBytes_AsStringAndSize(PyTuple_GET_ITEM(ospecs, j),
+                    &spec, &lspec) < 0) {
+            goto finish;
+        }
+        if (strchr("dieEfFgG", convs[j]) == NULL || convs[j] == '\0') {
+            PyErr_Format(PyExc_ValueError,
+                    "unsupported conversion '%c'", convs[j]);
+            goto finish;
+        }
+        intconv[j] = (convs[j] == 'd' || convs[j] == 'i');
+        formats[j] = malloc(lspec + sizeof(NPY_LONGLONG_FMT) + 1);
+        if (formats[j] == NULL) {
+            PyErr_NoMemory();
+            goto finish;
+        }
+        memcpy(formats[j], spec, lspec);
+        if (intconv[j]) {
+            strcpy(formats[j] + lspec, NPY_LONGLONG_FMT);
+        }
+        else {
+            formats[j][lspec] = convs[j];
+            formats[j][lspec + 1] = '\0';
+        }
+    }
+
+    /*
+     * The GIL is kept: PyOS_snprintf is the portable snprintf but is part
+     * of the Python API.
+     */
+    status = fmt_rows(&buf, columns, isint, formats, intconv, literals,
+            lliterals, ncols, nrows);
+
+    switch (status) {
+        case FMT_OK:
+            ret = PyBytes_FromStringAndSize(buf.data, buf.len);
+            break;
+        case FMT_UNSUPPORTED:
+            Py_INCREF(Py_None);
+            ret = Py_None;
+            break;
+        default:
+            PyErr_NoMemory();
+    }
+
+finish:
+    if (formats != NULL) {
+        for (j = 0; j < ncols; j++) {
+            free(formats[j]);
+        }
+    }
+    free(columns);
+    free(formats);
+    free((void *)literals);
+    free(lliterals);
+    free(isint);
+    free(intconv);
+    free(buf.data);
+    return ret;
+}
+
+
+static PyTypeObject *PyMemberDescr_TypePtr = NULL;
+static PyTypeObject *PyGetSetDescr_TypePtr = NULL;
+static PyTypeObject *PyMethodDescr_TypePtr = NULL;
+
+/* Can only be called if doc is currently NULL */
+static PyObject *
+arr_add_docstring(PyObject *NPY_UNUSED(dummy), PyObject *args)
+{
+    PyObject *obj;
+    PyObject *str;
+    char *docstr;
+    static char *msg = "already has a docstring";
+
+    /* Don't add docstrings */
+    if (Py_OptimizeFlag > 1) {
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+#if defined(NPY_PY3K)
+    if (!PyArg_ParseTuple(args, "OO!", &obj, &PyUnicode_Type, &str)) {
+        return NULL;
+    }
+
+    docstr = PyBytes_AS_STRING(PyUnicode_AsUTF8String(str));
+#else
+    if (!PyArg_ParseTuple(args, "OO!", &obj, &PyString_Type, &str)) {
+        return NULL;
+    }
+
+    docstr = PyString_AS_STRING(str);
+#endif
+
+#define _TESTDOC1(typebase) (obj->ob_type == &Py##typebase##_Type)
+#define _TESTDOC2(typebase) (obj->ob_type == Py##typebase##_TypePtr)
+#define _ADDDOC(typebase, doc, name) do {                               \
+        Py##typebase##Object *new = (Py##typebase##Object *)obj;        \
+        if (!(doc)) {                                                   \
+            doc = docstr;                                               \
+        }                                                               \
+        else {                                                          \
+            PyErr_Format(PyExc_RuntimeError, "%s method %s", name, msg); \
+            return NULL;                                                \
+        }                                                               \
+    } while (0)
+
+    if (_TESTDOC1(CFunction)) {
+        _ADDDOC(CFunction, new->m_ml->ml_doc, new->m_ml->ml_name);
     }
     else if (_TESTDOC1(Type)) {
         _ADDDOC(Type, new->tp_doc, new->tp_name);
@@ -896,6 +2431,10 @@ static struct PyMethodDef methods[] = {
         METH_VARARGS | METH_KEYWORDS, NULL},
     {"digitize", (PyCFunction)arr_digitize,
         METH_VARARGS | METH_KEYWORDS, NULL},
+    {"_histogram", (PyCFunction)arr_histogram,
+        METH_VARARGS | METH_KEYWORDS, NULL},
+    {"_bin_index", (PyCFunction)arr_bin_index,
+        METH_VARARGS | METH_KEYWORDS, NULL},
     {"interp", (PyCFunction)arr_interp,
         METH_VARARGS | METH_KEYWORDS, NULL},
     {"add_docstring", (PyCFunction)arr_add_docstring,
@@ -904,6 +2443,14 @@ static struct PyMethodDef methods[] = {
         METH_VARARGS | METH_KEYWORDS, NULL},
     {"unpackbits", (PyCFunction)io_unpack,
         METH_VARARGS | METH_KEYWORDS, NULL},
+    {"_loadtxt_parse", (PyCFunction)arr_loadtxt_parse,
+        METH_VARARGS | METH_KEYWORDS, NULL},
+    {"_format_rows", (PyCFunction)arr_format_rows,
+        METH_VARARGS, NULL},
+    {"_unique_hash", (PyCFunction)arr_unique_hash,
+        METH_VARARGS | METH_KEYWORDS, NULL},
+    {"_in1d_hash", (PyCFunction)arr_in1d_hash,
+        METH_VARARGS | METH_KEYWORDS, NULL},
     {NULL, NULL, 0, NULL}    /* sentinel */
 };
 
@@ -217,6 +217,64 @@ class TestStringConverter(TestCase):
         converter = StringConverter(int, default=0,
                                     missing_values=asbytes("N/A"))
         assert_equal(converter.missing_values, set(asbytes_nested(['', 'N/A'])))
+    #
+    def test_iterupgrade(self):
+        "Test the bulk upgrade of a converter"
+        for (values, status) in [(['1', 'true'], 4),
+                                 (['True', 'FALSE'], 0),
+                                 (['1', ' -2 ', '+3'], 1),
+                                 (['1', '2.5', '-inf', 'nan'], 2),
+                                 (['1', '', '2e-3'], 2),
+                                 (['1', '2', '3j', '(1+2j)'], 3),
+                                 (['1', '1.5.5j'], 4)]:
+            converter = StringConverter()
+            converter.iterupgrade(asbytes_nested(values))
+            assert_equal(converter._status, status)
+            for value in asbytes_nested(values):
+                converter(value)
+        # Missing values are skipped
+        converter = StringConverter(missing_values=asbytes('N/A'))
+        converter.iterupgrade(asbytes_nested(['1', 'N/A', '2']))
+        assert_equal(converter._status, 1)
+    #
+    def test_parse_numbers(self):
+        "Check that the bulk parsing only accepts valid numbers"
+        from numpy.lib._iotools import _parse_numbers
+        np.random.seed(0)
+        chars = np.array(list('0123456789+-.eEjx \t'))
+        for i in range(2000):
+            value = asbytes(''.join(chars[np.random.randint(len(chars),
+                                               size=np.random.randint(6))]))
+            if _parse_numbers([value]) is not None:
+                float(value)
+            if _parse_numbers([value], integer=True) is not None:
+                int(value)
+        assert_equal(_parse_numbers(asbytes_nested(['1', ' 2.5', '-inf'])),
+                     [1, 2.5, -np.inf])
+        assert_equal(_parse_numbers(asbytes_nested(['1', '2.5']),
+                                    integer=True), None)
+        assert_equal(_parse_numbers(asbytes_nested(['1', '', '3'])), None)
+        assert_equal(_parse_numbers(asbytes_nested(['1\n2'])), None)
+    #
+    def test_iterconvert(self):
+        "Test the bulk conversion of a sequence of strings"
+        values = asbytes_nested(['1', ' 2.5 ', '-3e2', '7'])
+        converter = StringConverter(float)
+        test = converter.iterconvert(values)
+        assert_equal(test, [1., 2.5, -300., 7.])
+        converter = StringConverter(int, default=-1)
+        assert_equal(converter.iterconvert(values), [1, 2, -300, 7])
+        assert_equal(converter.iterconvert(values + [asbytes('')]),
+                     [1, 2, -300, 7, -1])
+        assert_equal(converter.iterconvert(values + [asbytes('x')]),
+                     [1, 2, -300, 7, -1])
+        self.assertRaises(ValueError, converter.iterconvert,
+                          values + [asbytes('x')], loose=False)
+        converter = StringConverter()
+        converter.iterupgrade(asbytes_nested(['1', '12345678901234567890']))
+        assert_equal(converter.iterconvert(asbytes_nested(['1', '2'])), [1, 2])
+        assert_equal(converter.iterconvert([asbytes('12345678901234567890')]),
+                     [12345678901234567890])
 
 #-------------------------------------------------------------------------------
 
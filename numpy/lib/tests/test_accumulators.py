@@ -0,0 +1,246 @@
+import pickle
+
+import numpy as np
+from numpy.testing import *
+from numpy.lib import RunningMoments, RunningCovariance, RunningMinMax, \
+        RunningHistogram, QuantileSketch, Arrayterator
+
+
+def chunks(a, sizes):
+    """Cut a along its first axis into chunks of the given sizes."""
+    start = 0
+    for size in sizes:
+        yield a[start:start + size]
+        start += size
+    yield a[start:]
+
+
+class TestRunningMoments(TestCase):
+    def test_all_values(self):
+        a = np.random.randn(1000) * 10 + 1e6
+        acc = RunningMoments()
+        for c in chunks(a, [1, 0, 7, 300, 2]):
+            acc.update(c)
+        assert_equal(acc.count, 1000)
+        assert_almost_equal(acc.mean(), a.mean())
+        assert_almost_equal(acc.var(), a.var())
+        assert_almost_equal(acc.var(ddof=1), a.var(ddof=1))
+        assert_almost_equal(acc.std(), a.std())
+
+    def test_axis(self):
+        a = np.random.rand(4, 30, 5)
+        acc = RunningMoments(axis=1)
+        for i in range(0, 30, 7):
+            acc.update(a[:, i:i + 7])
+        assert_equal(acc.count, 30)
+        assert_array_almost_equal(acc.mean(), a.mean(axis=1))
+        assert_array_almost_equal(acc.var(), a.var(axis=1))
+        assert_raises(ValueError, acc.update, a[:3])
+
+        # Blocks of whole rows
+        a = a.reshape(-1, 5)
+        acc = RunningMoments(axis=0)
+        for block in Arrayterator(a, 15):
+            acc.update(block)
+        assert_array_almost_equal(acc.var(), a.var(axis=0))
+
+    def test_types(self):
+        a = np.arange(100, dtype=np.int8)
+        acc = RunningMoments()
+        acc.update(a[:50])
+        acc.update(a[50:])
+        assert_equal(acc.mean().dtype, np.float64)
+        assert_almost_equal(acc.var(), a.var())
+
+        z = np.random.rand(50) + 1j*np.random.rand(50)
+        acc = RunningMoments()
+        acc.update(z[:20])
+        acc.update(z[20:])
+        assert_almost_equal(acc.mean(), z.mean())
+        assert_almost_equal(acc.var(), z.var())
+
+    def test_merge(self):
+        a = np.random.rand(100)
+        acc1, acc2 = RunningMoments(), RunningMoments()
+        acc1.update(a[:10])
+        acc2.update(a[10:])
+        acc1.merge(acc2)
+        acc1.merge(RunningMoments())
+        assert_equal(acc1.count, 100)
+        assert_almost_equal(acc1.var(), a.var())
+        assert_raises(ValueError, acc1.merge, RunningMoments(axis=0))
+        assert_raises(TypeError, acc1.merge, RunningMinMax())
+
+    def test_empty(self):
+        acc = RunningMoments()
+        assert_raises(ValueError, acc.mean)
+        acc.update([])
+        assert_raises(ValueError, acc.var)
+        acc.update([1.])
+        assert_equal(acc.var(), 0)
+        assert_raises(ValueError, acc.var, 1)
+
+    def test_pickle(self):
+        acc = RunningMoments()
+        acc.update([1., 2., 4.])
+        acc = pickle.loads(pickle.dumps(acc))
+        acc.update([5.])
+        assert_almost_equal(acc.var(), np.var([1., 2., 4., 5.]))
+
+
+class TestRunningCovariance(TestCase):
+    def test_cov(self):
+        x = np.random.rand(200, 3)
+        x[:, 2] += x[:, 0]
+        acc = RunningCovariance()
+        for c in chunks(x, [1, 50, 0, 49]):
+            acc.update(c)
+        assert_equal(acc.count, 200)
+        assert_array_almost_equal(acc.mean(), x.mean(axis=0))
+        assert_array_almost_equal(acc.cov(), np.cov(x, rowvar=0))
+        assert_array_almost_equal(acc.cov(ddof=0), np.cov(x, rowvar=0, bias=1))
+        assert_array_almost_equal(acc.corrcoef(), np.corrcoef(x, rowvar=0))
+
+    def test_merge(self):
+        x = np.random.rand(100, 2)
+        acc1, acc2 = RunningCovariance(), RunningCovariance()
+        acc1.update(x[:30])
+        acc2.update(x[30:])
+        acc1.merge(acc2)
+        assert_array_almost_equal(acc1.cov(), np.cov(x, rowvar=0))
+
+    def test_complex(self):
+        x = np.random.rand(100, 2) + 1j*np.random.rand(100, 2)
+        acc = RunningCovariance()
+        acc.update(x[:30])
+        acc.update(x[30:])
+        d = x - x.mean(axis=0)
+        assert_array_almost_equal(acc.cov(), np.dot(d.T, d.conj()) / 99)
+
+    def test_shapes(self):
+        acc = RunningCovariance()
+        acc.update([1., 2., 3.])
+        acc.update([4.])
+        assert_array_almost_equal(acc.cov(), [[np.var([1, 2, 3, 4], ddof=1)]])
+        assert_raises(ValueError, acc.update, np.ones((2, 2)))
+        assert_raises(ValueError, acc.update, np.ones((2, 2, 2)))
+
+
+class TestRunningMinMax(TestCase):
+    def test_minmax(self):
+        a = np.random.randint(-1000, 1000, (50, 4))
+        acc = RunningMinMax()
+        for c in chunks(a, [3, 0, 20]):
+            acc.update(c)
+        assert_equal(acc.count, 200)
+        assert_equal(acc.min(), a.min())
+        assert_equal(acc.max(), a.max())
+
+        acc1, acc2 = RunningMinMax(axis=0), RunningMinMax(axis=0)
+        acc1.update(a[:10])
+        acc2.update(a[10:])
+        acc1.merge(acc2)
+        assert_array_equal(acc1.min(), a.min(axis=0))
+        assert_array_equal(acc1.max(), a.max(axis=0))
+        assert_raises(ValueError, RunningMinMax().min)
+
+    def test_nan(self):
+        acc = RunningMinMax()
+        acc.update([1., np.nan])
+        acc.update([0., 2.])
+        assert_(np.isnan(acc.min()) and np.isnan(acc.max()))
+
+
+class TestRunningHistogram(TestCase):
+    def test_histogram(self):
+        a = np.random.randn(1000)
+        w = np.random.rand(1000)
+        acc = RunningHistogram(20, range=(-2, 2))
+        wacc = RunningHistogram(20, range=(-2, 2))
+        for c, cw in zip(chunks(a, [100, 5]), chunks(w, [100, 5])):
+            acc.update(c)
+            wacc.update(c, weights=cw)
+        h, edges = np.histogram(a, 20, range=(-2, 2))
+        assert_array_equal(acc.histogram()[0], h)
+        assert_array_equal(acc.histogram()[1], edges)
+        assert_array_almost_equal(acc.histogram(normed=True)[0],
+                np.histogram(a, 20, range=(-2, 2), normed=True)[0])
+        assert_array_almost_equal(wacc.histogram()[0],
+                np.histogram(a, 20, range=(-2, 2), weights=w)[0])
+        assert_equal(acc.count, 1000)
+
+    def test_merge(self):
+        acc1 = RunningHistogram([0, 1, 2, 4])
+        acc2 = RunningHistogram([0, 1, 2, 4])
+        acc1.update([0, 1, 1, 5])
+        acc2.update([3, 4, -1])
+        acc1.merge(acc2)
+        assert_array_equal(acc1.counts, [1, 2, 2])
+        assert_equal(acc1.count, 7)
+        assert_raises(ValueError, acc1.merge, RunningHistogram([0, 1, 2, 3]))
+        assert_raises(ValueError, acc1.merge, RunningHistogram([0, 1]))
+
+    def test_bins(self):
+        assert_raises(ValueError, RunningHistogram, 10)
+        assert_raises(ValueError, RunningHistogram, 10, (1, 0))
+        assert_raises(ValueError, RunningHistogram, [0, 2, 1])
+        assert_array_equal(RunningHistogram(2, (1, 1)).edges, [0.5, 1, 1.5])
+
+
+class TestQuantileSketch(TestCase):
+    def test_exact(self):
+        # A sketch that has not compacted anything is exact
+        a = np.random.rand(500)
+        acc = QuantileSketch(size=500)
+        for c in chunks(a, [10, 200]):
+            acc.update(c)
+        q = [0, 1, 25, 50, 77.7, 100]
+        assert_array_almost_equal(acc.percentile(q),
+                                  [np.percentile(a, p) for p in q])
+        assert_almost_equal(acc.median(), np.median(a))
+
+    def test_error_bound(self):
+        a = np.random.rand(100000)
+        size = 200
+        acc = QuantileSketch(size)
+        for c in chunks(a, [1, 999, 10000, 3]):
+            acc.update(c)
+        acc2 = QuantileSketch(size)
+        for c in chunks(a[::-1], [5000]):
+            acc2.update(c)
+        bound = np.log2(len(a) / size) / size
+        s = np.sort(a)
+        for sketch in [acc, acc2]:
+            assert_equal(sketch.count, len(a))
+            assert_(sum([len(v) for v in sketch._levels]) <
+                    size * np.log2(len(a)))
+            for p in [0, 1, 10, 50, 90, 99, 100]:
+                rank = s.searchsorted(sketch.percentile(p)) / float(len(a))
+                assert_(abs(rank - p / 100.) <= bound, (p, rank, bound))
+
+    def test_merge(self):
+        a = np.arange(20000.)
+        parts = [QuantileSketch(100) for i in range(4)]
+        for i, part in enumerate(parts):
+            part.update(a[i::4])
+        acc = parts[0]
+        for part in parts[1:]:
+            acc.merge(part)
+        assert_equal(acc.count, 20000)
+        assert_(abs(acc.median() - 10000) < 20000 * np.log2(200.) / 100)
+        acc = pickle.loads(pickle.dumps(acc))
+        assert_(acc.percentile(0) < 20000 * np.log2(200.) / 100)
+
+    def test_errors(self):
+        acc = QuantileSketch()
+        assert_raises(ValueError, acc.median)
+        acc.update([1, np.nan, 2])
+        assert_equal(acc.count, 2)
+        assert_equal(acc.median(), 1.5)
+        assert_raises(ValueError, acc.percentile, 101)
+        assert_raises(TypeError, acc.update, ['a'])
+        assert_raises(ValueError, QuantileSketch, 1)
+
+
+if __name__ == "__main__":
+    run_module_suite()
@@ -36,6 +36,55 @@ class TestAso(TestCase):
 
         assert_array_equal([], unique([]))
 
+    def test_unique_counts_order(self):
+        a = np.array([5, 7, 1, 2, 1, 5, 7, 5])
+        for kind in ['sort', 'hash']:
+            vals, ind, inv, cnt = unique(a, True, True, True, kind=kind)
+            assert_array_equal(vals, [1, 2, 5, 7])
+            assert_array_equal(ind, [2, 3, 0, 1])
+            assert_array_equal(inv, [2, 3, 0, 1, 0, 2, 3, 2])
+            assert_array_equal(cnt, [2, 1, 3, 2])
+
+            vals, ind, inv, cnt = unique(a, True, True, True, keep_order=True,
+                                         kind=kind)
+            assert_array_equal(vals, [5, 7, 1, 2])
+            assert_array_equal(ind, [0, 1, 2, 3])
+            assert_array_equal(inv, [0, 1, 2, 3, 2, 0, 1, 0])
+            assert_array_equal(cnt, [3, 2, 2, 1])
+
+            assert_array_equal(unique(a, keep_order=True, kind=kind),
+                               [5, 7, 1, 2])
+
+            # Empty input gives index arrays of the same types
+            for b in [a, a[:0]]:
+                r = unique(b, True, True, True, kind=kind)
+                for x in r[1:]:
+                    assert_equal(x.dtype, np.intp)
+
+    def test_unique_kinds(self):
+        rs = np.random.RandomState(1)
+        for dt in '?bBhHiIlLqQfd':
+            a = rs.randint(0, 100, 1000).astype(dt)
+            if dt in 'fd':
+                a[::7] = np.nan
+                a[::11] = -0.
+            for keep_order in [False, True]:
+                r1 = unique(a, True, True, True, keep_order, kind='sort')
+                r2 = unique(a, True, True, True, keep_order, kind='hash')
+                for x, y in zip(r1, r2):
+                    assert_array_equal(x, y, err_msg=dt)
+                assert_array_equal(r2[0][r2[2]], a)
+                assert_equal(r2[3].sum(), a.size)
+
+        # Every NaN is unique, and -0. is the same value as 0.
+        a = np.array([np.nan, 0., 1., np.nan, -0.])
+        vals, cnt = unique(a, return_counts=True, kind='hash')
+        assert_array_equal(vals, [0., 1., np.nan, np.nan])
+        assert_array_equal(cnt, [2, 1, 1, 1])
+
+        assert_raises(TypeError, unique, ['a', 'b'], kind='hash')
+        assert_raises(ValueError, unique, [1, 2], kind='heap')
+
     def test_intersect1d( self ):
         # unique inputs
         a = np.array( [5, 7, 1, 2] )
@@ -199,6 +248,28 @@ class TestAso(TestCase):
 
         assert_array_equal(c, ec)
 
+    def test_in1d_kinds(self):
+        rs = np.random.RandomState(2)
+        for dt in '?bBhHiIlLqQfd':
+            a = rs.randint(0, 100, 1000).astype(dt)
+            for n in [0, 1, 5, 50, 500]:
+                b = rs.randint(0, 100, n).astype(dt)
+                ec = np.array([x in b.tolist() for x in a.tolist()])
+                for kind in [None, 'sort', 'hash']:
+                    assert_array_equal(in1d(a, b, kind=kind), ec,
+                                       err_msg=dt)
+
+        # The arrays are compared in their common type
+        assert_array_equal(in1d([1.5, 2, 300], np.array([2, 44], 'i1'),
+                                kind='hash'), [False, True, False])
+        assert_array_equal(in1d(np.array([-1, 255], 'i2'),
+                                np.array([255], 'u1'), kind='hash'),
+                           [False, True])
+        a = np.array([np.nan, 0., 1.])
+        assert_array_equal(in1d(a, [np.nan, -0.], kind='hash'),
+                           [False, True, False])
+        assert_raises(TypeError, in1d, ['a'], ['a'], kind='hash')
+
     def test_union1d( self ):
         a = np.array( [5, 4, 7, 1, 2] )
         b = np.array( [2, 4, 3, 3, 2, 1, 5] )
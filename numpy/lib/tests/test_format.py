@@ -288,8 +288,11 @@ if sys.version_info[0] >= 3:
 else:
     from cStringIO import StringIO
 
+import warnings
+
 import numpy as np
 from numpy.testing import *
+from numpy.testing.utils import WarningManager
 
 from numpy.lib import format
 
@@ -413,9 +416,9 @@ record_arrays = [
     np.array(NbufferT, dtype=np.dtype(Ndescr).newbyteorder('>')),
 ]
 
-def roundtrip(arr):
+def roundtrip(arr, **kwds):
     f = StringIO()
-    format.write_array(f, arr)
+    format.write_array(f, arr, **kwds)
     f2 = StringIO(f.getvalue())
     arr2 = format.read_array(f2)
     return arr2
@@ -429,6 +432,97 @@ def test_roundtrip():
         arr2 = roundtrip(arr)
         yield assert_array_equal, arr, arr2
 
+def test_chunked_roundtrip():
+    for arr in basic_arrays + record_arrays:
+        if arr.dtype.hasobject:
+            continue
+        for compression in [None, 'zlib']:
+            arr2 = roundtrip(arr, chunksize=4, compression=compression)
+            yield assert_array_equal, arr, arr2
+        arr2 = roundtrip(arr, version=(1, 1))
+        yield assert_array_equal, arr, arr2
+
+def test_chunked_slices():
+    arr = np.arange(300.).reshape((30, 10))
+    fn = os.path.join(tempdir, 'chunked.npy')
+    fp = open(fn, 'wb')
+    try:
+        format.write_array(fp, arr, chunksize=7, compression='zlib')
+    finally:
+        fp.close()
+
+    carr = format.open_chunked(fn)
+    try:
+        assert_equal(carr.shape, arr.shape)
+        assert_equal(carr.dtype, arr.dtype)
+        assert_equal(len(carr), 30)
+        assert_array_equal(np.asarray(carr), arr)
+        for index in [3, -1, slice(4, 9), slice(None, None, -3),
+                      slice(25, 5, -4), slice(8, 8), (2, 5), (slice(3, 20, 2),
+                      slice(None, 4)), (Ellipsis, 3), [1, 5, 2]]:
+            assert_array_equal(carr[index], arr[index])
+        assert_raises(IndexError, carr.__getitem__, 30)
+    finally:
+        carr.close()
+
+def test_chunked_unseekable():
+    class Unseekable(object):
+        def __init__(self):
+            self.data = StringIO()
+            self.write = self.data.write
+
+    arr = np.arange(100)
+    f = Unseekable()
+    format.write_array(f, arr, chunksize=30, compression='zlib')
+    assert_array_equal(format.read_array(StringIO(f.data.getvalue())), arr)
+
+def test_chunked_errors():
+    arr = np.arange(10, dtype=object)
+    f = StringIO()
+    assert_raises(ValueError, format.write_array, f, arr, chunksize=4)
+    arr = np.arange(10)
+    assert_raises(ValueError, format.write_array, f, arr, compression='bz2')
+    assert_raises(ValueError, format.write_array, f, arr, chunksize=0)
+
+    # Truncated and corrupted chunks should fail
+    f = StringIO()
+    format.write_array(f, arr, chunksize=4, compression='zlib')
+    data = f.getvalue()
+    assert_raises(ValueError, format.read_array, StringIO(data[:-3]))
+    data = data[:-3] + asbytes('xyz')
+    assert_raises(ValueError, format.read_array, StringIO(data))
+
+def test_parse_header():
+    for arr in basic_arrays + record_arrays:
+        for kwds in [{}, {'chunksize': 4, 'compression': 'zlib'}]:
+            if kwds and arr.dtype.hasobject:
+                continue
+            f = StringIO()
+            format.write_array(f, arr, **kwds)
+            header = f.getvalue()[format.MAGIC_LEN + 2:]
+            header = header[:header.index(asbytes('\n')) + 1]
+            yield assert_equal, format._parse_header(header), \
+                                format.safe_eval(header)
+
+def test_read_array_info():
+    arr = np.arange(15.).reshape((3, 5)).T
+    f = StringIO()
+    format.write_array(f, arr)
+    f.seek(0)
+    info = format.read_array_info(f)
+    assert_equal(info, {'version': (1, 0), 'shape': (5, 3),
+                        'fortran_order': True, 'dtype': arr.dtype,
+                        'offset': f.tell()})
+    assert_equal(len(f.getvalue()) - info['offset'], arr.nbytes)
+
+    f = StringIO()
+    format.write_array(f, arr, compression='zlib')
+    f.seek(0)
+    info = format.read_array_info(f)
+    assert_equal(info['version'], (1, 1))
+    assert_equal(info['compression'], 'zlib')
+    assert_equal(info['shape'], (5, 3))
+
 def test_memmap_roundtrip():
     # XXX: test crashes nose on windows. Fix this
     if not (sys.platform == 'win32' or sys.platform == 'cygwin'):
@@ -475,10 +569,8 @@ def test_write_version_1_0():
 
     # These should all fail.
     bad_versions = [
-        (1, 1),
         (0, 0),
         (0, 1),
-        (2, 0),
         (2, 2),
         (255, 255),
     ]
@@ -534,6 +626,66 @@ def test_large_header():
     d = {'a':1,'b':2,'c':'x'*256*256}
     assert_raises(ValueError, format.write_array_header_1_0, s, d)
 
+def test_version_2_0():
+    f = StringIO()
+    # requires more than 2 byte for header
+    dt = [(("%d" % i) * 100, float) for i in range(500)]
+    d = np.ones(1000, dtype=dt)
+
+    format.write_array(f, d, version=(2, 0))
+    warn_ctx = WarningManager()
+    warn_ctx.__enter__()
+    try:
+        warnings.filterwarnings('error', '', UserWarning, '.*format')
+        assert_raises(UserWarning, format.write_array, f, d)
+    finally:
+        warn_ctx.__exit__()
+
+    f.seek(0)
+    n = format.read_array(f)
+    assert_array_equal(d, n)
+
+    # 1.0 requested but data cannot be saved this way
+    assert_raises(ValueError, format.write_array, f, d, (1, 0))
+
+def test_version_2_0_memmap():
+    # requires more than 2 byte for header
+    dt = [(("%d" % i) * 100, float) for i in range(500)]
+    d = np.ones(1000, dtype=dt)
+    tf = os.path.join(tempdir, 'version2.npy')
+
+    # 1.0 requested but data cannot be saved this way
+    assert_raises(ValueError, format.open_memmap, tf, mode='w+',
+                  dtype=d.dtype, shape=d.shape, version=(1, 0))
+
+    ma = format.open_memmap(tf, mode='w+', dtype=d.dtype, shape=d.shape,
+                            version=(2, 0))
+    ma[...] = d
+    del ma
+
+    ma = format.open_memmap(tf, mode='r')
+    assert_array_equal(ma, d)
+    del ma
+
+def test_read_blocks():
+    # The data is read in blocks from objects which are not real files,
+    # even if they return short reads.
+    class ShortReads(object):
+        def __init__(self, data):
+            self.data = StringIO(data)
+            self.tell = self.data.tell
+
+        def read(self, n):
+            return self.data.read(min(n, 1000))
+
+    arr = np.arange(200000.).reshape((400, 500))
+    f = StringIO()
+    format.write_array(f, arr)
+    assert_array_equal(format.read_array(ShortReads(f.getvalue())), arr)
+    # Truncated data should fail
+    assert_raises(ValueError, format.read_array,
+                  ShortReads(f.getvalue()[:-10]))
+
 def test_bad_header():
     # header of length less than 2 should fail
     s = StringIO()
@@ -586,12 +586,12 @@ class TestHistogram(TestCase):
 
         # Normalization
         h, b = histogram(a, range=[1, 9], normed=True)
-        assert_equal((h * diff(b)).sum(), 1)
+        assert_almost_equal((h * diff(b)).sum(), 1, decimal=15)
 
         # Weights
         w = arange(10) + .5
         h, b = histogram(a, range=[1, 9], weights=w, normed=True)
-        assert_equal((h * diff(b)).sum(), 1)
+        assert_almost_equal((h * diff(b)).sum(), 1, decimal=15)
 
         h, b = histogram(a, bins=8, range=[1, 9], weights=w)
         assert_equal(h, w[1:-1])
@@ -633,6 +633,44 @@ class TestHistogram(TestCase):
         wa, wb = histogram([1, 2, 2, 4], bins=4, weights=[4, 3, 2, 1], normed=True)
         assert_array_equal(wa, array([4, 5, 0, 1]) / 10. / 3. * 4)
 
+        # Integer weights are added exactly
+        for dt in [np.int64, np.uint64]:
+            w = array([2**53, 1, 1, 1], dtype=dt)
+            wa, wb = histogram([1, 1, 1, 1], bins=2, weights=w)
+            assert_equal(wa.dtype, dt)
+            assert_array_equal(wa, array([0, 2**53 + 3], dtype=dt))
+        w = array([2**63, 2**63, 5], dtype=np.uint64)
+        wa, wb = histogram([1, 1, 1], bins=1, weights=w)
+        assert_array_equal(wa, array([5], dtype=np.uint64))
+
+    def test_edges(self):
+        # Values on an edge go to the bin on its right, except for the
+        # rightmost edge, whatever the widths of the bins.
+        v = [0, 1, 1.5, 2, 3, 3.5, 4, 5, -1, 6, nan]
+        for bins, expected in [([0, 1, 2, 3, 4, 5], [1, 2, 1, 2, 2]),
+                               ([0, 1, 3, 3.5, 5], [1, 3, 1, 3]),
+                               ([0, 1, 1, 2, 5, 5], [1, 0, 2, 4, 1])]:
+            h, b = histogram(v, bins)
+            assert_array_equal(h, expected)
+            h, b = histogram(v, bins, weights=ones(len(v)))
+            assert_array_equal(h, expected)
+
+    def test_threads(self):
+        v = np.random.randn(10000)
+        w = rand(10000)
+        h, b = histogram(v, 50)
+        hw, b = histogram(v, 50, weights=w)
+        old = np.setnumthreads(4), np.setthreadthreshold(0)
+        try:
+            assert_array_equal(histogram(v, 50)[0], h)
+            assert_array_almost_equal(histogram(v, 50, weights=w)[0], hw)
+            wi = np.arange(10000)
+            assert_array_equal(histogram(v, 50, weights=wi)[0],
+                               np.bincount(np.digitize(v, b[1:-1]), wi))
+        finally:
+            np.setnumthreads(old[0])
+            np.setthreadthreshold(old[1])
+
 
 class TestHistogramdd(TestCase):
     def test_simple(self):
@@ -706,6 +744,13 @@ class TestHistogramdd(TestCase):
         hist, edges = histogramdd(x, bins=2)
         assert_array_equal(edges[0], array([-0.5, 0. , 0.5]))
 
+    def test_rightmost_edge(self):
+        # Values on the rightmost edge, or above it by a rounding error,
+        # are counted in the last bin.
+        x = array([[0., 0.], [0.5, 1.], [1., 1. + 1e-12], [0.9999, 1.5]])
+        H, edges = histogramdd(x, bins=[[0, 0.5, 1], [0, 0.5, 1]])
+        assert_array_equal(H, [[1, 0], [0, 2]])
+
 
 class TestUnique(TestCase):
     def test_simple(self):
@@ -1003,6 +1048,23 @@ class TestBincount(TestCase):
         y = np.bincount(x, w)
         assert_array_equal(y, np.array([0, 0.2, 0.5, 0, 0.5, 0.1]))
 
+    def test_threads(self):
+        x = np.random.randint(0, 100, 10000)
+        w = np.random.rand(10000)
+        y = np.bincount(x)
+        yw = np.bincount(x, w)
+        old = np.setnumthreads(4), np.setthreadthreshold(0)
+        try:
+            assert_array_equal(np.bincount(x), y)
+            assert_array_almost_equal(np.bincount(x, w), yw)
+            # Fewer values than bins for each thread
+            y = np.zeros(1001, int)
+            y[[3, 1000]] = 1
+            assert_array_equal(np.bincount([3, 1000]), y)
+        finally:
+            np.setnumthreads(old[0])
+            np.setthreadthreshold(old[1])
+
 
 class TestInterp(TestCase):
     def test_exceptions(self):
@@ -1068,6 +1130,74 @@ def test_percentile_out():
     np.percentile(x, p, axis=1, out=y)
     assert_equal(y, np.percentile(x, p, axis=1))
 
+def test_percentile_sequence():
+    x = np.arange(11.)
+    assert_equal(np.percentile(x, [0, 25, 50, 100]), [0, 2.5, 5, 10])
+    x = np.arange(12).reshape(3, 4)
+    assert_equal(np.percentile(x, (25, 50), axis=1),
+                 [[0.75, 4.75, 8.75], [1.5, 5.5, 9.5]])
+    assert_equal(np.percentile(x, [50], axis=0).shape, (1, 4))
+    assert_equal(np.percentile(x, 50, axis=0), [4, 5, 6, 7])
+    assert_raises(ValueError, np.percentile, x, 101)
+    assert_raises(ValueError, np.percentile, x, [50, -1])
+    assert_raises(ValueError, np.percentile, x, np.nan)
+    assert_raises(ValueError, np.percentile, x, [50, np.inf])
+
+def test_percentile_overwrite():
+    x = np.random.rand(5, 101)
+    expected = np.percentile(x.copy(), [10, 90], axis=1)
+    assert_equal(np.percentile(x, [10, 90], axis=1, overwrite_input=True),
+                 expected)
+    assert_equal(x[:, 10], expected[0])
+    assert_equal(x[:, 90], expected[1])
+    x = np.arange(101.)[::-1].copy()
+    assert_equal(np.percentile(x, 50, overwrite_input=True), 50)
+    assert_equal(x[50], 50)
+
+
+class TestMedian(TestCase):
+    def test_basic(self):
+        a = np.array([[10, 7, 4], [3, 2, 1]])
+        assert_equal(np.median(a), 3.5)
+        assert_equal(np.median(a, axis=0), [6.5, 4.5, 2.5])
+        assert_equal(np.median(a, axis=1), [7, 2])
+        assert_equal(np.median([5]), 5)
+        assert_equal(np.median(np.arange(9)[::-1]), 4)
+
+    def test_against_sort(self):
+        np.random.seed(3)
+        for shape in [(101,), (100,), (7, 31), (6, 30)]:
+            a = np.random.rand(*shape)
+            s = np.sort(a, axis=None)
+            n = s.size
+            assert_equal(np.median(a), (s[(n - 1)//2] + s[n//2])/2.)
+            s = np.sort(a, axis=-1)
+            n = shape[-1]
+            assert_equal(np.median(a, axis=-1),
+                         (s[..., (n - 1)//2] + s[..., n//2])/2.)
+
+    def test_overwrite_input(self):
+        a = np.arange(100.)[::-1].copy()
+        assert_equal(np.median(a, overwrite_input=True), 49.5)
+        assert_equal(a[49:51], [49, 50])
+        a = np.arange(30.).reshape(5, 6)[:, ::-1].copy()
+        assert_equal(np.median(a, axis=0, overwrite_input=True),
+                     np.arange(17., 11., -1))
+        assert_equal(a[2], np.arange(17., 11., -1))
+
+    def test_out(self):
+        a = np.arange(30.).reshape(5, 6)
+        out = np.zeros(6)
+        assert_(np.median(a, axis=0, out=out) is out)
+        assert_equal(out, np.arange(12., 18.))
+
+    def test_subclass(self):
+        # masked values are sorted last, as by MaskedArray.sort
+        a = np.ma.array([0., 5, 6, 7], mask=[1, 0, 0, 0])
+        assert_equal(np.median(a), 6.5)
+        a = np.ma.array([[3., 0, 1], [4, 2, 5]], mask=[[0, 1, 0], [0, 0, 0]])
+        assert_equal(np.median(a, axis=1), [3, 4])
+
 
 if __name__ == "__main__":
     run_module_suite()
@@ -15,7 +15,7 @@ from datetime import datetime
 
 from numpy.lib._iotools import ConverterError, ConverterLockError, \
                                ConversionWarning
-from numpy.compat import asbytes, asbytes_nested, bytes
+from numpy.compat import asbytes, asbytes_nested, asstr, bytes
 
 if sys.version_info[0] >= 3:
     from io import BytesIO
@@ -116,6 +116,26 @@ class TestSaveLoad(RoundtripTest, TestCase):
         RoundtripTest.roundtrip(self, np.save, *args, **kwargs)
         assert_equal(self.arr[0], self.arr_reloaded)
 
+    def test_chunked(self):
+        a = np.arange(1000.).reshape((100, 10))
+        self.roundtrip(a, save_kwds={'compression': 'zlib'})
+        self.roundtrip(a, save_kwds={'chunksize': 64})
+
+        f, name = mkstemp(suffix='.npy')
+        os.close(f)
+        try:
+            np.save(name, a, chunksize=64, compression='zlib')
+            b = np.load(name, mmap_mode='r')
+            try:
+                self.assertTrue(isinstance(b, np.lib.format.ChunkedArray))
+                assert_equal(b[10:20:3, 4], a[10:20:3, 4])
+                assert_equal(b[-1], a[-1])
+            finally:
+                b.close()
+            self.assertRaises(ValueError, np.load, name, mmap_mode='r+')
+        finally:
+            os.unlink(name)
+
 class TestSavezLoad(RoundtripTest, TestCase):
     def roundtrip(self, *args, **kwargs):
         RoundtripTest.roundtrip(self, np.savez, *args, **kwargs)
@@ -164,6 +184,181 @@ class TestSavezLoad(RoundtripTest, TestCase):
         if errors:
             raise AssertionError(errors)
 
+    def test_mmap_members(self):
+        a = np.arange(100.).reshape((10, 10))
+        b = np.asfortranarray(a)
+        c = np.array(['x', 1, None], dtype=object)
+        f, name = mkstemp(suffix='.npz')
+        os.close(f)
+        try:
+            np.savez(name, a=a, b=b, c=c)
+            l = np.load(name, mmap_mode='r')
+            try:
+                for (key, x) in [('a', a), ('b', b)]:
+                    y = l[key]
+                    self.assertTrue(isinstance(y, np.memmap))
+                    self.assertTrue(y is l[key])
+                    assert_equal(y, x)
+                    assert_equal(y.flags.f_contiguous, x.flags.f_contiguous)
+                assert_equal(l['c'], c)
+            finally:
+                l.close()
+            # Arrays which are read are not shared between accesses
+            for mode in [None, 'c']:
+                l = np.load(name, mmap_mode=mode)
+                try:
+                    l['a'][0] = 99
+                    l['c'][0] = 'y'
+                    assert_equal(l['a'], a)
+                    assert_equal(l['c'], c)
+                finally:
+                    l.close()
+            self.assertRaises(ValueError, np.load, name, mmap_mode='w+')
+        finally:
+            os.unlink(name)
+
+    def test_load_info(self):
+        a = np.arange(100.).reshape((10, 10))
+        b = np.zeros(3, dtype=[('x', 'i4'), ('y', 'f8')])
+        c = StringIO()
+        np.savez(c, a=a, b=b)
+        c.seek(0)
+        info = np.load_info(c)
+        assert_equal(sorted(info.keys()), ['a', 'b'])
+        assert_equal(info['b']['dtype'], b.dtype)
+        assert_equal(info['a']['shape'], (10, 10))
+        data = c.getvalue()
+        offset = info['a']['offset']
+        assert_equal(np.fromstring(data[offset:offset + a.nbytes]),
+                     a.ravel())
+
+        c = StringIO()
+        np.savez_compressed(c, a=a)
+        c.seek(0)
+        info = np.load_info(c)
+        assert_equal(info['a']['shape'], (10, 10))
+        assert_equal(info['a']['offset'], None)
+
+class TestSavezCompressedLoad(RoundtripTest, TestCase):
+    def roundtrip(self, *args, **kwargs):
+        RoundtripTest.roundtrip(self, np.savez_compressed, *args, **kwargs)
+        for n, arr in enumerate(self.arr):
+            assert_equal(arr, self.arr_reloaded['arr_%d' % n])
+
+    def test_compressed(self):
+        import zipfile
+        c = StringIO()
+        np.savez_compressed(c, a=np.zeros(10000))
+        self.assertTrue(len(c.getvalue()) < 1000)
+        c.seek(0)
+        info = zipfile.ZipFile(c).getinfo('a.npy')
+        self.assertEqual(info.compress_type, zipfile.ZIP_DEFLATED)
+
+class TestNpzWriter(TestCase):
+    def test_write(self):
+        a = np.arange(100.).reshape((10, 10))
+        b = np.array(['x', 1, None], dtype=object)
+        c = StringIO()
+        npz = np.lib.npyio.NpzWriter(c)
+        npz['a'] = a
+        npz.write('b', b)
+        npz.close()
+        c.seek(0)
+        l = np.load(c)
+        assert_equal(sorted(l.files), ['a', 'b'])
+        assert_equal(l['a'], a)
+        assert_equal(l['b'], b)
+
+    def test_append(self):
+        f, name = mkstemp(suffix='.npz')
+        os.close(f)
+        try:
+            for (i, mode) in enumerate('waa'):
+                npz = np.lib.npyio.NpzWriter(name, compress=True, mode=mode)
+                try:
+                    npz['x%d' % i] = np.arange(i + 1)
+                finally:
+                    npz.close()
+            l = np.load(name)
+            for i in range(3):
+                assert_equal(l['x%d' % i], np.arange(i + 1))
+            l.zip.close()
+        finally:
+            os.unlink(name)
+
+    def test_streaming(self):
+        # Large arrays go straight into the archive, in several blocks
+        import tempfile
+        import zipfile
+        a = np.arange(3 * 2**18).reshape(-1, 3)
+        b = np.array(['x', 1, None], dtype=object)
+        def no_temp(*args, **kwds):
+            raise AssertionError("temporary file created")
+        saved = tempfile.mkstemp, tempfile.TemporaryFile, \
+                tempfile.NamedTemporaryFile
+        tempfile.mkstemp = tempfile.TemporaryFile = \
+                tempfile.NamedTemporaryFile = no_temp
+        try:
+            for compress in [False, True]:
+                c = StringIO()
+                npz = np.NpzWriter(c, compress=compress)
+                try:
+                    npz['a'] = a
+                    npz['b'] = b
+                    npz[u'\xe9'] = a[:10].T
+                finally:
+                    npz.close()
+                c.seek(0)
+                z = zipfile.ZipFile(c)
+                self.assertEqual(z.testzip(), None)
+                assert_equal(z.namelist(), ['a.npy', 'b.npy', u'\xe9.npy'])
+                c.seek(0)
+                l = np.load(c)
+                assert_equal(l['a'], a)
+                assert_equal(l['b'], b)
+                assert_equal(l[u'\xe9'], a[:10].T)
+        finally:
+            tempfile.mkstemp, tempfile.TemporaryFile, \
+                    tempfile.NamedTemporaryFile = saved
+
+    def test_unseekable(self):
+        class Unseekable(object):
+            def __init__(self):
+                self.data = []
+            def write(self, data):
+                self.data.append(data)
+        f = Unseekable()
+        npz = np.NpzWriter(f)
+        npz['a'] = np.arange(10)
+        npz.close()
+        l = np.load(StringIO(''.join(f.data)))
+        assert_equal(l['a'], np.arange(10))
+
+    def test_duplicates(self):
+        f, name = mkstemp(suffix='.npz')
+        os.close(f)
+        try:
+            np.savez(name, a=np.arange(3), b=np.zeros(2))
+            npz = np.NpzWriter(name, mode='a')
+            try:
+                self.assertRaises(ValueError, npz.write, 'a', np.arange(4))
+                npz['c'] = np.ones(2)
+                self.assertRaises(ValueError, npz.write, 'c', np.ones(3))
+            finally:
+                npz.close()
+            l = np.load(name)
+            try:
+                assert_equal(sorted(l.files), ['a', 'b', 'c'])
+                assert_equal(l['a'], np.arange(3))
+                assert_equal(l['c'], np.ones(2))
+            finally:
+                l.close()
+            self.assertRaises(ValueError, np.NpzWriter(name, mode='a').write,
+                              'a', 1)
+        finally:
+            os.unlink(name)
+
+
 class TestSaveTxt(TestCase):
     def test_array(self):
         a = np.array([[1, 2], [3, 4]], float)
@@ -237,6 +432,59 @@ class TestSaveTxt(TestCase):
         finally:
             os.unlink(name)
 
+    def test_fast_format(self):
+        "Test that the compiled formatter writes what Python would"
+        a = np.array([[1.5, -2e-300, np.nan], [np.inf, -0., 1e17],
+                      [-np.inf, 123456.789, -7.25]])
+        b = np.array([(1, 2.5, True), (-3, -4.75, False)],
+                     dtype=[('a', 'i8'), ('b', 'f4'), ('c', '?')])
+        for (x, fmt) in [(a, '%.18e'), (a, '%g'), (a, '%-12.4E'),
+                         (a, '%+08.2f'), (a[1:, 1:], '%d'), (b, '%d'),
+                         (b, ['%5i', '%.3f', '%e']), (b, '%s'),
+                         (b, '%d : %x : %d'), (b, '[%d, %g; %d]')]:
+            c = StringIO()
+            np.savetxt(c, x, fmt=fmt, newline='|')
+            if not isinstance(fmt, str):
+                fmt = ' '.join(fmt)
+            elif fmt.count('%') == 1:
+                fmt = ' '.join([fmt] * len(x[0]))
+            expected = ''.join([fmt % tuple(row) + '|' for row in x])
+            assert_equal(c.getvalue(), asbytes(expected))
+
+    def test_fast_format_rows(self):
+        "Test every row of mixed columns against Python formatting"
+        np.random.seed(7)
+        n = 1000
+        x = np.zeros(n, dtype=[('i', 'i4'), ('f', 'f8'), ('g', 'f4'),
+                               ('u', 'u2'), ('b', '?'), ('l', 'i8')])
+        x['i'] = np.random.randint(-10**6, 10**6, n)
+        x['f'] = np.random.randn(n) * 10.**np.random.randint(-20, 20, n)
+        x['g'] = np.random.randn(n)
+        x['u'] = np.random.randint(0, 2**16, n)
+        x['b'] = np.random.rand(n) > 0.5
+        x['l'] = np.random.randint(-2**31, 2**31, n) * 2**20
+        x['f'][::17] = np.nan
+        x['f'][::19] = -np.inf
+        for fmt in ['%d,%.6e,%g,%5i,%d,%d', '%s %s %s %s %s %s',
+                    '%-8d|%+.3f|%.2E|%05d|%s|%d', '%d %f %s %x %d %i',
+                    '%i;%.10g;%e;%d;%d;%.1f']:
+            for blocksize in [7, 2**16]:
+                text = ''.join([asstr(t) for t in
+                        np.lib.npyio._savetxt_blocks(x, fmt, '\n',
+                                                     blocksize)])
+                lines = text.split('\n')
+                assert_equal(len(lines), n + 1)
+                for row, line in zip(x, lines):
+                    assert_equal(line, fmt % tuple(row), err_msg=fmt)
+
+    def test_fast_format_bigint(self):
+        "Test the fallback for the floats that do not fit a long long"
+        a = np.array([[1.5], [1e20], [-2.5]])
+        c = StringIO()
+        np.savetxt(c, a, fmt='%d')
+        assert_equal(c.getvalue(),
+                     asbytes('1\n%d\n-2\n' % int(1e20)))
+
 
 class TestLoadTxt(TestCase):
     def test_record(self):
@@ -426,6 +674,156 @@ class TestLoadTxt(TestCase):
         finally:
             os.unlink(name)
 
+    def test_engines_agree(self):
+        data = "# header\n 1, 2.5 ,-3 # comment\n\n4,5e3,inf\n7,-8.25,9\n"
+        for kwargs in [dict(), dict(usecols=(2, 0)), dict(usecols=(-1,)),
+                       dict(dtype=int), dict(dtype=np.float32),
+                       dict(dtype=[('a', int), ('b', [('x', float),
+                                                      ('y', float)])])]:
+            if kwargs.get('dtype') is int:
+                data_ = data.replace('inf', '6')
+            else:
+                data_ = data
+            x = np.loadtxt(StringIO(data_), delimiter=',', engine='c',
+                           **kwargs)
+            y = np.loadtxt(StringIO(data_), delimiter=',', engine='python',
+                           **kwargs)
+            assert_equal(x.dtype, y.dtype)
+            assert_array_equal(x, y)
+
+    def test_engines_agree_ints(self):
+        # The values parsed as doubles are converted like int(float(x))
+        values = ['nan', 'inf', '-inf', '1e10', '0.5', '-0.5', '-1', '300',
+                  '1e19', '-1e19', '1e20', '9007199254740993']
+        for dt in [np.int8, np.uint8, np.int32, np.int64, np.uint64,
+                   [('a', np.int32), ('b', float)]]:
+            usecols = (0, 1)[:len(np.dtype(dt).names or 'x')]
+            for v in values:
+                r = []
+                for engine in ['python', 'c']:
+                    try:
+                        r.append(np.loadtxt(StringIO(v + ' 1'), dtype=dt,
+                                            usecols=usecols, engine=engine))
+                    except (ValueError, OverflowError, TypeError), e:
+                        r.append(type(e))
+                if isinstance(r[0], type):
+                    # The python engine fails with a TypeError for values
+                    # out of range in record data-types
+                    if r[0] is TypeError:
+                        assert_equal(r[1], ValueError, err_msg=v)
+                    else:
+                        assert_equal(r[1], r[0], err_msg=v)
+                else:
+                    assert_equal(r[1].dtype, r[0].dtype, err_msg=v)
+                    assert_array_equal(r[1], r[0], err_msg=v)
+        # Booleans need the python engine
+        c = StringIO("0.5\n")
+        assert_raises(ValueError, np.loadtxt, c, dtype=bool)
+        c = StringIO("1\n0\n")
+        assert_array_equal(np.loadtxt(c, dtype=bool), [True, False])
+        c.seek(0)
+        assert_raises(ValueError, np.loadtxt, c, dtype=bool, engine='c')
+
+    def test_engine_c_growth(self):
+        a = np.arange(3000.).reshape(1000, 3) / 7.
+        c = StringIO()
+        np.savetxt(c, a, fmt='%.18e')
+        c.seek(0)
+        x = np.lib.npyio._loadtxt_c_chunks(c.readline(), c, 3, asbytes('#'),
+                                           None, None, blocksize=100).next()
+        assert_array_equal(x, a)
+
+    def test_engine_c_errors(self):
+        c = StringIO("1 2\n3 x\n")
+        assert_raises(ValueError, np.loadtxt, c, engine='c')
+        c = StringIO("1 2 3\n4 5\n")
+        assert_raises(ValueError, np.loadtxt, c, engine='c')
+        c = StringIO("1 2\n3 4\n")
+        assert_raises(ValueError, np.loadtxt, c, engine='c',
+                      converters={0: float})
+        assert_raises(ValueError, np.loadtxt, c, engine='c', dtype='S1')
+        assert_raises(ValueError, np.loadtxt, c, engine='fortran')
+
+    def test_chunksize(self):
+        a = np.arange(21.).reshape(7, 3)
+        c = StringIO()
+        np.savetxt(c, a)
+        for engine in ('c', 'python'):
+            c.seek(0)
+            chunks = list(np.loadtxt(c, chunksize=3, engine=engine))
+            assert_equal([len(x) for x in chunks], [3, 3, 1])
+            assert_array_equal(np.concatenate(chunks), a)
+            c.seek(0)
+            chunks = list(np.loadtxt(c, chunksize=7, usecols=(1,),
+                                     dtype=int, engine=engine))
+            assert_equal(len(chunks), 1)
+            assert_array_equal(chunks[0], a[:, 1].astype(int))
+            c.seek(0)
+            (x, y) = np.loadtxt(c, chunksize=10, usecols=(0, 2), unpack=True,
+                                engine=engine).next()
+            assert_array_equal(x, a[:, 0])
+            assert_array_equal(y, a[:, 2])
+        assert_raises(ValueError, np.loadtxt, c, chunksize=0)
+
+    def test_chunksize_close(self):
+        "Test that the chunk iterator closes the files loadtxt opens"
+        opened = []
+        def tracking_open(*args):
+            f = open(*args)
+            opened.append(f)
+            return f
+        def fail(s):
+            if float(s) > 10:
+                raise ValueError("bad value")
+            return float(s)
+        fd, name = mkstemp()
+        os.close(fd)
+        np.savetxt(name, np.arange(20.).reshape(10, 2))
+        np.lib.npyio.open = tracking_open
+        try:
+            chunks = np.loadtxt(name, chunksize=3)
+            chunks.next()
+            chunks.close()
+            assert_(opened[-1].closed)
+            chunks = np.loadtxt(name, chunksize=3, converters={0: fail})
+            assert_raises(ValueError, list, chunks)
+            assert_(opened[-1].closed)
+            assert_raises(IOError, np.loadtxt, name, chunksize=3, skiprows=10)
+            assert_(opened[-1].closed)
+            assert_equal(len(list(np.loadtxt(name, chunksize=3))), 4)
+            assert_(opened[-1].closed)
+            # Handles given by the caller are left open
+            f = open(name)
+            list(np.loadtxt(f, chunksize=3))
+            assert_(not f.closed)
+            f.close()
+        finally:
+            del np.lib.npyio.open
+            os.unlink(name)
+
+    def test_threads(self):
+        a = np.arange(3000.).reshape(1000, 3) / 7.
+        c = StringIO()
+        np.savetxt(c, a)
+        c.seek(0)
+        x = np.lib.npyio._loadtxt_c_parallel(c.readline(), c, 3,
+                                             asbytes('#'), None, (0, 1, 2),
+                                             4, blocksize=1000)
+        assert_array_equal(x, a)
+        c.seek(0)
+        assert_array_equal(np.loadtxt(c, threads=3, usecols=(2,)), a[:, 2])
+        # Errors are reported for the first faulty block
+        c = StringIO("1 2\n" * 1000 + "3 x\n" + "4 y\n" * 1000)
+        try:
+            np.lib.npyio._loadtxt_c_parallel(c.readline(), c, 2,
+                                             asbytes('#'), None, None,
+                                             4, blocksize=100)
+        except ValueError, e:
+            self.assertTrue(str(e).endswith(": x"))
+        else:
+            raise AssertionError("ValueError not raised")
+        assert_raises(ValueError, np.loadtxt, c, threads=0)
+
 
 class Testfromregex(TestCase):
     def test_record(self):
@@ -1154,6 +1552,66 @@ M   33  21.99
         assert_equal(test.A, [0, 2])
 
 
+    def test_chunksize(self):
+        "Test reading by chunks"
+        data = "a,b,c\n" + "".join(["%i,%i.5,s%i\n" % (i, i, i)
+                                    for i in range(7)])
+        control = np.genfromtxt(StringIO(data), delimiter=',', dtype=None,
+                                names=True)
+        chunks = list(np.genfromtxt(StringIO(data), delimiter=',', dtype=None,
+                                    names=True, chunksize=3))
+        assert_equal([len(x) for x in chunks], [3, 3, 1])
+        for x in chunks:
+            assert_equal(x.dtype, control.dtype)
+        assert_equal(np.concatenate(chunks), control)
+        # The dtype is frozen after the first chunk
+        data = "1,2\n3,4\n5.5,abc\n"
+        chunks = list(np.genfromtxt(StringIO(data), delimiter=',', dtype=None,
+                                    chunksize=2))
+        assert_equal(chunks[1].dtype, np.int)
+        assert_equal(chunks[1], [[-1, -1]])
+        # Footer and masks
+        data = "1,2\n3,N/A\n5,6\n7,8\n# footer\n9,9\n"
+        chunks = list(np.genfromtxt(StringIO(data), delimiter=',',
+                                    missing_values='N/A', usemask=True,
+                                    skip_footer=1, chunksize=2))
+        assert_equal([len(x) for x in chunks], [2, 2])
+        assert_equal(chunks[0].mask, [[0, 0], [0, 1]])
+        assert_equal(chunks[1], [[5, 6], [7, 8]])
+        # Invalid lines are reported in the chunk they belong to
+        data = "1,2\n3,4\n5,6\n7\n"
+        chunks = np.genfromtxt(StringIO(data), delimiter=',', chunksize=2)
+        chunks.next()
+        assert_raises(ValueError, chunks.next)
+
+    def test_chunksize_close(self):
+        "Test that the chunk iterator closes the files genfromtxt opens"
+        opened = []
+        def tracking_open(*args):
+            f = datasource_open(*args)
+            opened.append(f)
+            return f
+        datasource_open = np.lib._datasource.open
+        fd, name = mkstemp()
+        os.write(fd, asbytes("1,2\n3,4\n5,6\n7\n"))
+        os.close(fd)
+        np.lib._datasource.open = tracking_open
+        try:
+            chunks = np.genfromtxt(name, delimiter=',', chunksize=1)
+            chunks.next()
+            chunks.close()
+            assert_(opened[-1].closed)
+            chunks = np.genfromtxt(name, delimiter=',', chunksize=2)
+            assert_raises(ValueError, list, chunks)
+            assert_(opened[-1].closed)
+            chunks = np.genfromtxt(name, delimiter=',', chunksize=2,
+                                   invalid_raise=False)
+            assert_warns(ConversionWarning, list, chunks)
+            assert_(opened[-1].closed)
+        finally:
+            np.lib._datasource.open = datasource_open
+            os.unlink(name)
+
     def test_recfromcsv(self):
         #
         data = StringIO('A,B\n0,1\n2,3')
@@ -256,11 +256,13 @@ class TestMatrixReturn(TestCase):
             'reshape' : (1,),
             'swapaxes' : (0,0),
             'dot': np.array([1.0]),
+            'argpartition' : (0,),
             }
         excluded_methods = [
             'argmin', 'choose', 'dump', 'dumps', 'fill', 'getfield',
             'getA', 'getA1', 'item', 'nonzero', 'put', 'putmask', 'resize',
-            'searchsorted', 'setflags', 'setfield', 'sort', 'take',
+            'searchsorted', 'setflags', 'setfield', 'sort', 'partition',
+            'take',
             'tofile', 'tolist', 'tostring', 'all', 'any', 'sum',
             'argmax', 'argmin', 'min', 'max', 'mean', 'var', 'ptp',
             'prod', 'std', 'ctypes', 'itemset'